@@ -3,8 +3,10 @@ from django.contrib.auth.views import LoginView
 from django.shortcuts import resolve_url
 from django.utils.http import url_has_allowed_host_and_scheme
 
+from core.services.roles import roles_for
+
 def user_in_group(user, group_name: str) -> bool:
-    return user.is_authenticated and user.groups.filter(name=group_name).exists()
+    return roles_for(user).in_group(group_name)
 
 def is_internal(user) -> bool:
     return (
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AutosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'autos'
+
+    def ready(self):
+        from autos.signals import connect_catalog_signals
+
+        connect_catalog_signals()
@@ -0,0 +1,218 @@
+# autos/services.py
+"""
+Snapshot del catálogo de vehículos (marca -> submarca -> año -> versión).
+
+Los selects en cascada del portal y de la UI pedían SubMarca /
+VehiculoCatalogo en cada cambio y armaban el label con __str__ (que
+toca marca y submarca por renglón). Ahora el árbol completo se
+precalcula en blobs JSON (uno con las marcas, uno por marca con sus
+submarcas y uno por submarca con todas sus versiones de todos los años;
+el portal público recibe su propio blob por submarca solo con id / label /
+año, sin tipo_vehiculo ni valor_referencia),
+ya comprimidos y con ETag fuerte, y se guarda en memoria del proceso.
+El navegador carga cada nivel una vez y filtra el año del lado del
+cliente.
+
+La versión del snapshot sale de max(updated_at) + conteos de las tres
+tablas y se guarda en cache; los signals de autos la borran al guardar
+o eliminar, y además expira cada CATALOGO_VERSION_TTL segundos para
+cubrir cargas masivas que no disparan signals. Con la versión en cache
+y el snapshot ya armado, los endpoints no tocan la base de datos.
+"""
+import gzip
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import HttpResponse, HttpResponseNotModified
+
+from autos.models import Marca, SubMarca, VehiculoCatalogo
+from core.services import cache
+
+try:  # opcional: si está instalado se ofrece también br
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+CACHE = cache.namespace("autos", ttl_setting="CATALOGO_VERSION_TTL", ttl=300)
+VERSION_KEY = "catalogo:version"
+
+MARCAS = "marcas"
+SUBMARCAS = "submarcas"
+VERSIONES = "versiones"
+VERSIONES_PORTAL = "versiones_portal"  # público: solo id, label y anio
+
+
+def _compute_version():
+    partes = []
+    for model in (Marca, SubMarca, VehiculoCatalogo):
+        agg = model.objects.aggregate(n=Count("id"), ts=Max("updated_at"))
+        partes.append(f"{agg['n']}:{agg['ts'].isoformat() if agg['ts'] else ''}")
+    return hashlib.sha256("|".join(partes).encode("utf-8")).hexdigest()[:16]
+
+
+def catalog_version():
+    return CACHE.get_or_set(VERSION_KEY, _compute_version)
+
+
+def invalidate_catalog():
+    CACHE.delete(VERSION_KEY)
+
+
+# ---------------------------------------------------------------------
+# Construcción
+# ---------------------------------------------------------------------
+
+def _label(marca, submarca, anio, version, clave_amis):
+    # Igual que VehiculoCatalogo.__str__, sin tocar relaciones
+    texto = " ".join(p for p in (marca, submarca, str(anio), version) if p)
+    if clave_amis:
+        texto += f" | AMIS: {clave_amis}"
+    return texto
+
+
+def _pack(data):
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    blob = {
+        "etag": hashlib.sha256(raw).hexdigest()[:32],
+        "identity": raw,
+        "gzip": gzip.compress(raw, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        blob["br"] = brotli.compress(raw)
+    return blob
+
+
+def build_catalog():
+    """Regresa {(nivel, key): data} con todo el árbol (tres consultas)."""
+    marcas = list(
+        Marca.objects.filter(is_active=True).order_by("nombre").values("id", "nombre")
+    )
+    nombres_marca = {m["id"]: m["nombre"] for m in marcas}
+
+    submarcas_por_marca = {m["id"]: [] for m in marcas}
+    nombres_submarca = {}
+    for s in (
+        SubMarca.objects.filter(is_active=True, marca__is_active=True)
+        .order_by("nombre")
+        .values("id", "nombre", "marca_id")
+    ):
+        submarcas_por_marca[s["marca_id"]].append({"id": s["id"], "nombre": s["nombre"]})
+        nombres_submarca[s["id"]] = s["nombre"]
+
+    versiones_por_submarca = {sid: [] for sid in nombres_submarca}
+    for v in (
+        VehiculoCatalogo.objects.filter(is_active=True, submarca_id__in=list(nombres_submarca))
+        .order_by("-anio", "version")
+        .values(
+            "id", "marca_id", "submarca_id", "anio", "version",
+            "clave_amis", "tipo_vehiculo", "valor_referencia",
+        )
+    ):
+        marca = nombres_marca.get(v["marca_id"], "")
+        submarca = nombres_submarca[v["submarca_id"]]
+        versiones_por_submarca[v["submarca_id"]].append({
+            "id": v["id"],
+            "label": _label(marca, submarca, v["anio"], v["version"], v["clave_amis"]),
+            "marca": marca,
+            "submarca": submarca,
+            "anio": v["anio"],
+            "version": v["version"],
+            "tipo_vehiculo": v["tipo_vehiculo"],
+            "valor_referencia": str(v["valor_referencia"] or ""),
+        })
+
+    tree = {(MARCAS, None): {"results": marcas}}
+    for marca_id, items in submarcas_por_marca.items():
+        tree[(SUBMARCAS, marca_id)] = {"results": items}
+    for submarca_id, items in versiones_por_submarca.items():
+        tree[(VERSIONES, submarca_id)] = {"results": items}
+        tree[(VERSIONES_PORTAL, submarca_id)] = {
+            "results": [{"id": v["id"], "label": v["label"], "anio": v["anio"]} for v in items],
+        }
+    return tree
+
+
+# Snapshot en memoria del proceso, solo el de la versión vigente. La
+# versión vive en el cache (compartido entre workers si se configura).
+_snapshot = {"version": None, "blobs": {}}
+
+_EMPTY = _pack({"results": []})
+
+
+def _blobs(version):
+    if _snapshot["version"] != version:
+        blobs = {key: _pack(data) for key, data in build_catalog().items()}
+        _snapshot.update(version=version, blobs=blobs)
+    return _snapshot["blobs"]
+
+
+def get_blob(nivel, key=None):
+    """Blob (etag, identity, gzip[, br]) del nivel pedido; vacío si no existe."""
+    if nivel != MARCAS:
+        try:
+            key = int(key)
+        except (TypeError, ValueError):
+            return _EMPTY
+
+    return _blobs(catalog_version()).get((nivel, key), _EMPTY)
+
+
+def get_results(nivel, key=None):
+    return json.loads(get_blob(nivel, key)["identity"])["results"]
+
+
+async def aget_blob(nivel, key=None):
+    # Normalmente sale de la memoria del proceso; sólo la primera vez (o
+    # tras invalidar) arma los blobs con el ORM, por eso va al hilo del ORM.
+    return await sync_to_async(get_blob, thread_sensitive=True)(nivel, key)
+
+
+async def aget_results(nivel, key=None):
+    return json.loads((await aget_blob(nivel, key))["identity"])["results"]
+
+
+# ---------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------
+
+def _pick_encoding(request, blob):
+    accept = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    encodings = {e.split(";")[0].strip() for e in accept.split(",")}
+    if "br" in encodings and "br" in blob:
+        return "br"
+    if "gzip" in encodings:
+        return "gzip"
+    return "identity"
+
+
+def blob_response(request, blob):
+    max_age = getattr(settings, "CATALOGO_MAX_AGE", 300)
+    encoding = _pick_encoding(request, blob)
+
+    # ETag fuerte por representación: cada codificación tiene la suya
+    suffix = "" if encoding == "identity" else f"-{encoding}"
+    etag = f'"{blob["etag"]}{suffix}"'
+
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+    if etag in [t.strip() for t in if_none_match.split(",")]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(blob[encoding], content_type="application/json")
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+
+    response["ETag"] = etag
+    response["Cache-Control"] = f"private, max-age={max_age}"
+    response["Vary"] = "Accept-Encoding"
+    return response
+
+
+def catalog_response(request, nivel, key=None):
+    return blob_response(request, get_blob(nivel, key))
+
+
+async def acatalog_response(request, nivel, key=None):
+    return blob_response(request, await aget_blob(nivel, key))
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from autos.services import invalidate_catalog
+
+
+def catalog_changed(sender, instance, **kwargs):
+    # Después del commit: si se invalida antes, otro request podría
+    # recalcular la versión con los datos viejos.
+    transaction.on_commit(invalidate_catalog)
+
+
+def connect_catalog_signals():
+    from autos.models import Marca, SubMarca, VehiculoCatalogo
+
+    for model in (Marca, SubMarca, VehiculoCatalogo):
+        post_save.connect(catalog_changed, sender=model, dispatch_uid=f"catalogo_save_{model.__name__}")
+        post_delete.connect(catalog_changed, sender=model, dispatch_uid=f"catalogo_delete_{model.__name__}")
@@ -1,3 +1,81 @@
-from django.test import TestCase
+import gzip
+import json
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from autos import services as catalogo
+from autos.models import Marca, SubMarca, VehiculoCatalogo
+from portal.views.ajax import portal_ajax_catalogos_por_submarca
+
+
+class CatalogoSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.marca = Marca.objects.create(nombre="Nissan")
+            self.submarca = SubMarca.objects.create(marca=self.marca, nombre="Versa")
+            for anio, version in ((2024, "Sense"), (2024, "Advance"), (2023, "Sense")):
+                VehiculoCatalogo.objects.create(
+                    marca=self.marca, submarca=self.submarca, anio=anio, version=version,
+                )
+
+        user = get_user_model().objects.create_user(username="agente", password="x")
+        self.client.force_login(user)
+
+    def test_bloque_de_submarca_trae_todos_los_anios_con_label(self):
+        results = catalogo.get_results(catalogo.VERSIONES, self.submarca.id)
+
+        self.assertEqual([v["anio"] for v in results], [2024, 2024, 2023])
+        self.assertEqual(results[0]["label"], "Nissan Versa 2024 Advance")
+
+    def test_cache_hit_no_consulta_la_base(self):
+        request = RequestFactory().get("/", {"submarca_id": self.submarca.id})
+        view = async_to_sync(portal_ajax_catalogos_por_submarca)
+        view(request)
+
+        with self.assertNumQueries(0):
+            response = view(request)
+        self.assertEqual(len(json.loads(response.content)["results"]), 3)
+
+    def test_portal_no_expone_campos_internos(self):
+        request = RequestFactory().get("/", {"submarca_id": self.submarca.id})
+        response = async_to_sync(portal_ajax_catalogos_por_submarca)(request)
+
+        for v in json.loads(response.content)["results"]:
+            self.assertEqual(set(v), {"id", "label", "anio"})
+
+        # La UI (con login) sigue recibiendo el bloque completo
+        response = self.client.get(reverse("ui:ajax_catalogos_por_submarca"), {"submarca_id": self.submarca.id})
+        self.assertIn("valor_referencia", json.loads(response.content)["results"][0])
+
+    def test_etag_y_gzip(self):
+        url = reverse("ui:ajax_submarcas_por_marca") + f"?marca_id={self.marca.id}"
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            json.loads(gzip.decompress(response.content))["results"],
+            [{"id": self.submarca.id, "nombre": "Versa"}],
+        )
+
+        again = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_filtro_por_anio_sigue_funcionando(self):
+        url = reverse("ui:ajax_catalogos_por_submarca")
+        response = self.client.get(url, {"submarca_id": self.submarca.id, "anio": "2023"})
+
+        self.assertEqual([v["version"] for v in json.loads(response.content)["results"]], ["Sense"])
+
+    def test_guardar_invalida_el_snapshot(self):
+        catalogo.get_blob(catalogo.MARCAS)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Marca.objects.create(nombre="Audi")
+
+        nombres = [m["nombre"] for m in catalogo.get_results(catalogo.MARCAS)]
+        self.assertEqual(nombres, ["Audi", "Nissan"])
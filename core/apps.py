@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from core.signals import connect_roles_signals, connect_search_signals
+
+        connect_search_signals()
+        connect_roles_signals()
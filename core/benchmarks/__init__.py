@@ -0,0 +1,8 @@
+"""
+Benchmarks del proyecto (no corren con la suite de tests).
+
+- import_time: tiempo de arranque (django.setup, URLconf, checks de un
+  comando) y qué módulos pesados se cargan en él.
+
+Ver el comando benchmark_imports.
+"""
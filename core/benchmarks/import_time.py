@@ -0,0 +1,148 @@
+"""
+Tiempo de arranque del proyecto, medido en intérpretes nuevos.
+
+Cada objetivo corre en su propio `python -c` (así no cuenta lo que ya
+está importado en este proceso):
+
+    setup   django.setup(): settings + apps + modelos
+    urls    + import del URLconf: lo que paga un worker antes del primer
+            request (las vistas y todo lo que importan a nivel módulo)
+    check   + checks del sistema: lo que paga cada comando de manage.py
+            (incluye urls), p.ej. cada cron de marcar_pagos_vencidos
+
+Por objetivo reporta la mediana / mínimo en ms, cuántos módulos quedaron
+en sys.modules, cuáles de PESADOS se cargaron (deberían cargarse solo al
+exportar / generar PDF / cobrar / cotizar) y, con -X importtime, los
+paquetes de primer nivel más caros. El resultado es un dict JSON que se
+puede comparar contra una corrida anterior con comparar().
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+import django
+from django.conf import settings
+
+OBJETIVOS = {
+    "setup": "",
+    "urls": "import_module(settings.ROOT_URLCONF)",
+    "check": "call_command('check', verbosity=0)",
+}
+
+# Módulos que no deben cargarse al arrancar
+PESADOS = (
+    "openpyxl",
+    "xhtml2pdf",
+    "reportlab",
+    "pypdf",
+    "mercadopago",
+    "integrations.providers.insurance.chubb.provider",
+)
+
+METRICAS = {
+    "ms_mediana": False,
+    "modulos": False,
+}
+
+_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+import django
+django.setup()
+from importlib import import_module
+from django.conf import settings
+from django.core.management import call_command
+{codigo}
+print(json.dumps({{
+    "ms": (time.perf_counter() - t0) * 1000,
+    "modulos": len(sys.modules),
+    "pesados": [m for m in {pesados!r} if m in sys.modules],
+}}))
+"""
+
+
+def _correr(objetivo, *, importtime=False):
+    script = _SCRIPT.format(codigo=OBJETIVOS[objetivo], pesados=PESADOS)
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", script]
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+
+    proc = subprocess.run(cmd, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{objetivo}: el subproceso falló\n{proc.stderr[-2000:]}")
+
+    datos = json.loads(proc.stdout.strip().splitlines()[-1])
+    if importtime:
+        datos["top"] = _top_importtime(proc.stderr)
+    return datos
+
+
+def _top_importtime(stderr, n=None):
+    """Paquetes de primer nivel por tiempo acumulado (us -> ms)."""
+    out = {}
+    for linea in stderr.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        if nombre.startswith("  ") or not acumulado.strip().isdigit():
+            continue  # anidado (ya cuenta en su padre) o encabezado
+        nombre = nombre.strip()
+        out[nombre] = out.get(nombre, 0) + int(acumulado) / 1000
+
+    top = sorted(out.items(), key=lambda kv: kv[1], reverse=True)
+    return [{"modulo": m, "ms": round(ms, 1)} for m, ms in top[:n]]
+
+
+def medir(objetivos=tuple(OBJETIVOS), *, repeticiones=5, top=10):
+    resultado = {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "repeticiones": repeticiones,
+        "objetivos": {},
+    }
+
+    for objetivo in objetivos:
+        if objetivo not in OBJETIVOS:
+            raise ValueError(f"Objetivo desconocido: {objetivo} (usa {', '.join(OBJETIVOS)})")
+
+        corridas = [_correr(objetivo) for _ in range(repeticiones)]
+        tiempos = [c["ms"] for c in corridas]
+        entrada = {
+            "ms_mediana": round(statistics.median(tiempos), 1),
+            "ms_min": round(min(tiempos), 1),
+            "modulos": corridas[-1]["modulos"],
+            "pesados": corridas[-1]["pesados"],
+        }
+        if top:
+            entrada["top"] = _correr(objetivo, importtime=True)["top"][:top]
+        resultado["objetivos"][objetivo] = entrada
+
+    return resultado
+
+
+def comparar(actual: dict, baseline: dict, *, tolerancia: float = 0.2) -> list[str]:
+    """Regresiones de `actual` contra `baseline`: métricas > tolerancia y pesados nuevos."""
+    previos = baseline.get("objetivos", {})
+    regresiones = []
+
+    for objetivo, datos in actual.get("objetivos", {}).items():
+        previo = previos.get(objetivo)
+        if previo is None:
+            continue
+
+        for metrica in METRICAS:
+            antes, ahora = previo.get(metrica), datos.get(metrica)
+            if antes is None or ahora is None:
+                continue
+            if ahora > antes * (1 + tolerancia):
+                regresiones.append(f"{objetivo} {metrica}: {antes} -> {ahora}")
+
+        nuevos = sorted(set(datos.get("pesados", [])) - set(previo.get("pesados", [])))
+        if nuevos:
+            regresiones.append(f"{objetivo} carga al arrancar: {', '.join(nuevos)}")
+
+    return regresiones
@@ -0,0 +1,75 @@
+# core/management/commands/benchmark_imports.py
+# Tiempo de arranque (django.setup / URLconf / checks de un comando) en
+# intérpretes nuevos, y qué módulos pesados se cargan al arrancar.
+#
+#   python manage.py benchmark_imports --output benchmarks/imports.json
+#   python manage.py benchmark_imports --compare benchmarks/imports.json
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import import_time
+
+
+class Command(BaseCommand):
+    help = "Mide el tiempo de arranque y los módulos pesados cargados; escribe/compara un baseline JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--objetivos", default=",".join(import_time.OBJETIVOS),
+                            help=f"Separados por coma ({', '.join(import_time.OBJETIVOS)})")
+        parser.add_argument("--repeticiones", type=int, default=5)
+        parser.add_argument("--top", type=int, default=10, help="Paquetes más caros por objetivo (0 = no)")
+        parser.add_argument("--output", help="Archivo JSON donde guardar el resultado (baseline)")
+        parser.add_argument("--compare", help="Baseline JSON contra el cual comparar")
+        parser.add_argument("--tolerancia", type=float, default=0.2, help="Fracción permitida antes de marcar regresión")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        objetivos = [o.strip() for o in options["objetivos"].split(",") if o.strip()]
+        if options["repeticiones"] < 1:
+            raise CommandError("--repeticiones debe ser >= 1")
+
+        baseline = None
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text())
+
+        try:
+            resultado = import_time.medir(objetivos, repeticiones=options["repeticiones"], top=options["top"])
+        except (ValueError, RuntimeError) as e:
+            raise CommandError(str(e))
+
+        self._reporte(resultado, baseline)
+
+        if options["output"]:
+            output = Path(options["output"])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps(resultado, indent=2, ensure_ascii=False))
+            self.stdout.write(f"Baseline guardado en {output}")
+
+        if baseline is not None:
+            regresiones = import_time.comparar(resultado, baseline, tolerancia=options["tolerancia"])
+            if not regresiones:
+                self.stdout.write(self.style.SUCCESS("Sin regresiones contra el baseline"))
+            else:
+                for r in regresiones:
+                    self.stdout.write(self.style.WARNING(f"Regresión: {r}"))
+                if options["fail_on_regression"]:
+                    raise CommandError(f"{len(regresiones)} regresión(es) contra {options['compare']}")
+
+    def _reporte(self, resultado, baseline=None):
+        previos = (baseline or {}).get("objetivos", {})
+
+        self.stdout.write(f"{'objetivo':<8} {'mediana':>9} {'min':>9} {'módulos':>8} {'antes':>9}  pesados")
+        for objetivo, d in resultado["objetivos"].items():
+            antes = previos.get(objetivo, {}).get("ms_mediana")
+            self.stdout.write(
+                f"{objetivo:<8} {d['ms_mediana']:>8}ms {d['ms_min']:>8}ms {d['modulos']:>8} "
+                f"{(str(antes) + 'ms') if antes is not None else '-':>9}  {', '.join(d['pesados']) or '-'}"
+            )
+
+        for objetivo, d in resultado["objetivos"].items():
+            if d.get("top"):
+                self.stdout.write(f"\n{objetivo}: paquetes más caros (-X importtime, acumulado)")
+                for t in d["top"]:
+                    self.stdout.write(f"  {t['ms']:>8}ms  {t['modulo']}")
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from seguros.database import pool_stats
+
+
+class Command(BaseCommand):
+    # Solo ve el pool de su propio proceso; el de los workers de gunicorn
+    # está en /admin/perfiles.json ("pool").
+    help = (
+        "Muestra la configuración de conexiones y las estadísticas del pool de psycopg3 de este proceso "
+        "(el de cada worker: /admin/perfiles.json)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        config = settings.DATABASES[alias]
+
+        self.stdout.write(f"engine: {config['ENGINE']}")
+        self.stdout.write(f"CONN_MAX_AGE: {config.get('CONN_MAX_AGE', 0)}")
+        self.stdout.write(f"CONN_HEALTH_CHECKS: {config.get('CONN_HEALTH_CHECKS', False)}")
+
+        pool = config.get("OPTIONS", {}).get("pool")
+        if not pool:
+            self.stdout.write("pool: deshabilitado")
+            return
+
+        self.stdout.write(f"pool: {pool}")
+        # El pool se abre con la primera conexión del proceso
+        from django.db import connections
+        connections[alias].ensure_connection()
+
+        for key, value in sorted((pool_stats(alias) or {}).items()):
+            self.stdout.write(f"  {key}: {value}")
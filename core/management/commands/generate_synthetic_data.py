@@ -0,0 +1,68 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services import search, synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos (clientes, vehículos, cotizaciones, pólizas, pagos, "
+        "comisiones, eventos y catálogos) para pruebas de carga. "
+        "Ej: --clientes 200000 --agentes 150 deja ~1M de pagos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clientes", type=int, default=synthetic.Volumen.clientes)
+        parser.add_argument("--agentes", type=int, default=synthetic.Volumen.agentes)
+        parser.add_argument("--dias", type=int, default=synthetic.Volumen.dias, help="Días de historia hacia atrás")
+        parser.add_argument("--conversion", type=float, default=synthetic.Volumen.conversion,
+                            help="Fracción de cotizaciones que se emiten")
+        parser.add_argument("--items-catalogo", type=int, default=synthetic.Volumen.items_por_catalogo)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefijo", default="syn", help="Prefijo de agentes / catálogos / configuraciones")
+        parser.add_argument("--lote", type=int, default=1000, help="Clientes por transacción")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Filas por INSERT")
+        parser.add_argument("--reindex", action="store_true", help="Reconstruir el índice de búsqueda al terminar")
+        parser.add_argument("--force", action="store_true", help="Permitir correr con DEBUG=False")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError("DEBUG=False: esto llena la base con datos falsos. Usa --force si es a propósito.")
+
+        volumen = synthetic.Volumen(
+            agentes=options["agentes"],
+            clientes=options["clientes"],
+            dias=options["dias"],
+            conversion=options["conversion"],
+            items_por_catalogo=options["items_catalogo"],
+        )
+        inicio = time.perf_counter()
+
+        def progreso(cargados, filas):
+            seg = time.perf_counter() - inicio
+            self.stdout.write(
+                f"{cargados}/{volumen.clientes} clientes · "
+                f"{sum(filas.values())} filas en el lote · {seg:.0f}s"
+            )
+
+        total = synthetic.generar(
+            volumen,
+            seed=options["seed"],
+            prefijo=options["prefijo"],
+            lote=options["lote"],
+            batch_size=options["batch_size"],
+            progreso=progreso,
+        )
+
+        seg = time.perf_counter() - inicio
+        for model, n in total.items():
+            self.stdout.write(f"  {model._meta.label:<40} {n:>12,}")
+        filas = sum(total.values())
+        self.stdout.write(self.style.SUCCESS(f"{filas:,} filas en {seg:.1f}s ({filas / max(seg, 0.001):,.0f} filas/s)"))
+
+        if options["reindex"]:
+            for entidad in search.REGISTRY:
+                n = search.rebuild(entidad)
+                self.stdout.write(f"índice {entidad}: {n} documentos")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.services import search
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda (clientes, pólizas, pagos, cotizaciones)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--entidad",
+            choices=[e.value for e in search.Entidad],
+            help="Reconstruir solo una entidad",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        entidades = [options["entidad"]] if options["entidad"] else list(search.REGISTRY)
+
+        for entidad in entidades:
+            total = search.rebuild(entidad, batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"{entidad}: {total} documentos indexados"))
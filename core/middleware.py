@@ -0,0 +1,52 @@
+from django.contrib.auth import SESSION_KEY
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+from core.services import profiling
+from core.services.roles import roles_for
+
+
+class RoleSnapshotMiddleware(MiddlewareMixin):
+    """
+    Expone request.roles: los grupos del usuario leídos una vez por
+    request (y reutilizados desde la sesión mientras no cambien).
+    Debe ir después de AuthenticationMiddleware.
+
+    Con MiddlewareMixin sirve en WSGI y ASGI: bajo ASGI process_request
+    corre en el hilo del ORM y las vistas async no se degradan a sync.
+    """
+
+    def process_request(self, request):
+        session = getattr(request, "session", None)
+
+        request.roles = SimpleLazyObject(lambda: roles_for(request.user, session))
+
+        # Con sesión iniciada se resuelve de una vez, así los helpers que
+        # reciben request.user (perms, mixins) ya encuentran el snapshot
+        # en el usuario y no consultan grupos.
+        if session is not None and SESSION_KEY in session:
+            roles_for(request.user, session)
+
+
+class ProfilingMiddleware(MiddlewareMixin):
+    """
+    Mide una muestra de los requests (PROFILING_ENABLED /
+    PROFILING_SAMPLE_RATE): queries, tiempo SQL, queries repetidas, cache,
+    HTTP saliente por host y tiempo total. Ver core.services.profiling.
+    Va arriba en MIDDLEWARE para que el tiempo incluya a los demás.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if profiling.habilitado():
+            profiling.instalar_http()
+
+    def process_request(self, request):
+        request._perfil = profiling.iniciar(request)
+
+    def process_response(self, request, response):
+        perfil = getattr(request, "_perfil", None)
+        if perfil is not None:
+            request._perfil = None
+            profiling.terminar(perfil, request, response)
+        return response
@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-19 04:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entidad', models.CharField(choices=[('CLIENTE', 'Cliente'), ('POLIZA', 'Póliza'), ('PAGO', 'Pago'), ('COTIZACION', 'Cotización')], max_length=12)),
+                ('object_id', models.BigIntegerField()),
+                ('owner_id', models.BigIntegerField(blank=True, db_index=True, null=True)),
+                ('titulo', models.CharField(blank=True, default='', max_length=200)),
+                ('subtitulo', models.CharField(blank=True, default='', max_length=200)),
+                ('url', models.CharField(blank=True, default='', max_length=200)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('entidad', 'object_id'), name='uq_search_document')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entidad', models.CharField(max_length=12)),
+                ('token', models.CharField(max_length=64)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='core.searchdocument')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['entidad', 'token'], name='search_token_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+# En PostgreSQL un LIKE 'x%' solo usa el índice B-tree si la columna usa
+# varchar_pattern_ops (o collation C). MySQL/SQLite usan search_token_idx.
+
+def crear_indice_pattern_ops(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS search_token_like_idx "
+        "ON core_searchtoken (entidad, token varchar_pattern_ops)"
+    )
+
+
+def borrar_indice_pattern_ops(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS search_token_like_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice_pattern_ops, borrar_indice_pattern_ops),
+    ]
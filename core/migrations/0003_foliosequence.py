@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-19 04:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_searchtoken_pattern_ops'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FolioSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=40, unique=True)),
+                ('ultimo', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+# Las secuencias COT-<año> arrancan donde se quedó FolioCotizacionCounter
+# para no repetir folios ya emitidos.
+
+def copiar_contadores(apps, schema_editor):
+    FolioCotizacionCounter = apps.get_model("cotizador", "FolioCotizacionCounter")
+    FolioSequence = apps.get_model("core", "FolioSequence")
+
+    for counter in FolioCotizacionCounter.objects.all():
+        seq, _ = FolioSequence.objects.get_or_create(nombre=f"COT-{counter.anio}")
+        if seq.ultimo < counter.last:
+            seq.ultimo = counter.last
+            seq.save(update_fields=["ultimo"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_foliosequence"),
+        ("cotizador", "0017_cotizacion_cot_created_id_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(copiar_contadores, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,13 @@
 from .base import TimeStampedModel, SoftDeleteModel, MoneyMixin, FormaPagoChoices
+from .search import SearchDocument, SearchToken
+from .folios import FolioSequence
 
-__all__ = ["TimeStampedModel", "SoftDeleteModel", "MoneyMixin", "FormaPagoChoices"]
+__all__ = [
+    "TimeStampedModel",
+    "SoftDeleteModel",
+    "MoneyMixin",
+    "FormaPagoChoices",
+    "SearchDocument",
+    "SearchToken",
+    "FolioSequence",
+]
@@ -0,0 +1,17 @@
+from django.db import models
+
+
+# ---------------------------------------------------------------------
+# Secuencias de folios
+# ---------------------------------------------------------------------
+# Un renglón por secuencia ("COT-2026", "POL-2026", ...). Los procesos
+# no incrementan de uno en uno: reservan bloques de FOLIO_BLOCK_SIZE
+# (ver core.services.folios). En PostgreSQL se usa una SEQUENCE nativa
+# y esta tabla solo sirve de punto de partida.
+
+class FolioSequence(models.Model):
+    nombre = models.CharField(max_length=40, unique=True)
+    ultimo = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.nombre} -> {self.ultimo}"
@@ -0,0 +1,45 @@
+from django.db import models
+
+
+# ---------------------------------------------------------------------
+# Índice de búsqueda (denormalizado)
+# ---------------------------------------------------------------------
+# Un SearchDocument por registro buscable (cliente, póliza, pago,
+# cotización) con sus tokens normalizados. Las búsquedas hacen
+# token LIKE 'q%' sobre un índice B-tree en lugar de icontains con
+# comodín inicial sobre varias tablas unidas.
+
+class SearchDocument(models.Model):
+    class Entidad(models.TextChoices):
+        CLIENTE = "CLIENTE", "Cliente"
+        POLIZA = "POLIZA", "Póliza"
+        PAGO = "PAGO", "Pago"
+        COTIZACION = "COTIZACION", "Cotización"
+
+    entidad = models.CharField(max_length=12, choices=Entidad.choices)
+    object_id = models.BigIntegerField()
+    # Usuario dueño para filtrar por cartera (owner / agente)
+    owner_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+    titulo = models.CharField(max_length=200, blank=True, default="")
+    subtitulo = models.CharField(max_length=200, blank=True, default="")
+    url = models.CharField(max_length=200, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["entidad", "object_id"], name="uq_search_document"),
+        ]
+
+    def __str__(self):
+        return f"{self.entidad} #{self.object_id} {self.titulo}"
+
+
+class SearchToken(models.Model):
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name="tokens")
+    entidad = models.CharField(max_length=12)
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["entidad", "token"], name="search_token_idx"),
+        ]
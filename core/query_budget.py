@@ -0,0 +1,359 @@
+# core/query_budget.py
+"""
+Presupuestos de queries / tiempo para las vistas calientes (tests).
+
+Cada app registra sus vistas en una subclase de QueryBudgetTestCase:
+
+    class UiQueryBudgetTests(QueryBudgetTestCase):
+        PRESUPUESTOS = [
+            Presupuesto("ui:dashboard_admin", queries=12, ms=400),
+            Presupuesto("ui:poliza_detail", queries=20, kwargs=lambda d: {"pk": d.poliza.pk}),
+        ]
+
+El test puebla la base con un volumen chico (10 clientes: ~20 pólizas,
+~130 pagos), mide cada vista, agrega datos hasta el volumen grande
+(x VOLUMEN_FACTOR: ~1,000 pólizas, ~6,000 pagos, ~4,000 eventos) y vuelve
+a medir. Falla si:
+
+    - las queries pasan del presupuesto,
+    - las queries crecen con el número de filas (N+1), salvo escala=True,
+    - con QUERY_BUDGET_ENFORCE_MS, el tiempo en el volumen grande pasa de
+      ms (x QUERY_BUDGET_TIME_FACTOR). Sin él el tiempo solo se reporta.
+
+Producción tiene cientos de miles de pagos: un plan que se degrada más
+allá de estos miles de filas no aparece aquí; para eso está
+generate_synthetic_data + el perfilado.
+
+QUERY_BUDGET_REPORT=<archivo.json> escribe la tabla de mediciones (qué
+vistas escalan con las filas); QUERY_BUDGET_SCALE multiplica los volúmenes.
+"""
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from autos.models import Vehiculo
+from catalogos.models import Aseguradora, ProductoSeguro
+from core.services import cache as cache_ns
+from crm.models import Cliente
+from finanzas.models import Comision, Pago
+from polizas.models import Poliza, PolizaEvento
+
+
+# ---------------------------------------------------------------------
+# Datos
+# ---------------------------------------------------------------------
+
+@dataclass
+class Volumen:
+    agentes: int = 3
+    clientes: int = 10
+    polizas_por_cliente: int = 2
+    pagos_por_poliza: int = 6
+    eventos_por_poliza: int = 4
+
+    def escalar(self, factor):
+        return Volumen(
+            agentes=self.agentes,
+            clientes=self.clientes * factor,
+            polizas_por_cliente=self.polizas_por_cliente,
+            pagos_por_poliza=self.pagos_por_poliza,
+            eventos_por_poliza=self.eventos_por_poliza,
+        )
+
+
+@dataclass
+class Datos:
+    """Lo que los presupuestos necesitan para armar URLs y usuarios."""
+    admin: object
+    agentes: list
+    aseguradora: object
+    producto: object
+    cliente_portal: object
+    usuario_portal: object
+    poliza: object
+    polizas: list = field(default_factory=list)
+
+
+def _bulk(model, objs):
+    """bulk_create que regresa los objetos con pk también en MySQL."""
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs, batch_size=1000)
+    model.objects.bulk_create(objs, batch_size=1000)
+    return list(reversed(model.objects.order_by("-pk")[:len(objs)]))
+
+
+PAGO_ESTATUS = (
+    (Pago.Estatus.PAGADO, 60),
+    (Pago.Estatus.PENDIENTE, 25),
+    (Pago.Estatus.VENCIDO, 15),
+)
+
+EVENTO_TIPOS = (
+    PolizaEvento.Tipo.CREADA,
+    PolizaEvento.Tipo.MARCADA_VIGENTE,
+    PolizaEvento.Tipo.PAGO_PAGADO,
+    PolizaEvento.Tipo.PAGO_VENCIDO,
+)
+
+
+def _pagos(poliza, n, rng):
+    estatus, pesos = zip(*PAGO_ESTATUS)
+    monto = (poliza.prima_total / n).quantize(Decimal("0.01"))
+    pagos = []
+    for i in range(n):
+        e = rng.choices(estatus, pesos)[0]
+        programada = poliza.vigencia_desde + timedelta(days=30 * i)
+        pagos.append(Pago(
+            poliza=poliza,
+            cliente=poliza.cliente,
+            monto=monto,
+            monto_pagado=monto if e == Pago.Estatus.PAGADO else Decimal("0.00"),
+            estatus=e,
+            fecha_programada=programada,
+            fecha_vencimiento=programada + timedelta(days=10),
+            fecha_pago=programada if e == Pago.Estatus.PAGADO else None,
+        ))
+    return pagos
+
+
+def _eventos(poliza, n):
+    return [
+        PolizaEvento(
+            poliza=poliza,
+            tipo=EVENTO_TIPOS[i % len(EVENTO_TIPOS)],
+            titulo="Evento",
+            actor_id=poliza.agente_id,
+        )
+        for i in range(n)
+    ]
+
+
+def poblar(volumen, *, datos=None, seed=0):
+    """
+    Agrega `volumen` (clientes con pólizas, pagos, eventos y comisiones)
+    con bulk_create. Con `datos` reutiliza admin/agentes/aseguradora y
+    suma filas; así el volumen grande incluye al chico.
+    """
+    rng = random.Random(seed)
+    hoy = timezone.localdate()
+    User = get_user_model()
+
+    if datos is None:
+        admin = User.objects.create_superuser(username="budget-admin", password="x")
+        agentes = [
+            User.objects.create_user(username=f"budget-agente-{i}", password="x")
+            for i in range(volumen.agentes)
+        ]
+        aseguradora = Aseguradora.objects.create(nombre="Aseguradora presupuesto")
+        producto = ProductoSeguro.objects.create(aseguradora=aseguradora, nombre_producto="Autos")
+        usuario_portal = User.objects.create_user(username="budget-cliente", password="x")
+        cliente_portal = Cliente.objects.create(
+            tipo_cliente=Cliente.TipoCliente.PERSONA,
+            nombre="Cliente portal",
+            user_portal=usuario_portal,
+            estatus=Cliente.Estatus.ACTIVO,
+        )
+        datos = Datos(
+            admin=admin,
+            agentes=agentes,
+            aseguradora=aseguradora,
+            producto=producto,
+            cliente_portal=cliente_portal,
+            usuario_portal=usuario_portal,
+            poliza=None,
+        )
+    # El cliente del portal gana pólizas con cada volumen
+    clientes = [datos.cliente_portal]
+
+    inicio = Cliente.objects.count()
+    clientes += _bulk(Cliente, [
+        Cliente(
+            tipo_cliente=Cliente.TipoCliente.PERSONA,
+            nombre=f"Cliente {inicio + i}",
+            apellido_paterno="Presupuesto",
+            email_principal=f"cliente{inicio + i}@example.com",
+            estatus=Cliente.Estatus.ACTIVO,
+            owner=rng.choice(datos.agentes) if datos.agentes else None,
+        )
+        for i in range(volumen.clientes)
+    ])
+
+    vehiculos = _bulk(Vehiculo, [
+        Vehiculo(
+            cliente=cliente,
+            marca_texto="Nissan",
+            submarca_texto="Versa",
+            modelo_anio=rng.randint(2015, 2025),
+        )
+        for cliente in clientes
+        for _ in range(volumen.polizas_por_cliente)
+    ])
+
+    base = Poliza.objects.count()
+    polizas = _bulk(Poliza, [
+        Poliza(
+            cliente=vehiculo.cliente,
+            vehiculo=vehiculo,
+            aseguradora=datos.aseguradora,
+            producto=datos.producto,
+            agente=rng.choice(datos.agentes) if datos.agentes else None,
+            numero_poliza=f"PRES-{base + i:06d}",
+            fecha_emision=hoy - timedelta(days=rng.randint(0, 300)),
+            vigencia_desde=hoy - timedelta(days=rng.randint(0, 300)),
+            vigencia_hasta=hoy + timedelta(days=rng.randint(1, 365)),
+            estatus=Poliza.Estatus.VIGENTE,
+            prima_neta=Decimal(rng.randint(5000, 30000)),
+            prima_total=Decimal(rng.randint(6000, 35000)),
+        )
+        for i, vehiculo in enumerate(vehiculos)
+    ])
+
+    pagos, eventos, comisiones = [], [], []
+    for poliza in polizas:
+        pagos += _pagos(poliza, volumen.pagos_por_poliza, rng)
+        eventos += _eventos(poliza, volumen.eventos_por_poliza)
+        if poliza.agente_id:
+            comisiones.append(Comision(
+                poliza=poliza,
+                agente_id=poliza.agente_id,
+                base_calculo=poliza.prima_neta,
+                monto_comision=(poliza.prima_neta * Decimal("0.10")).quantize(Decimal("0.01")),
+            ))
+
+    # La póliza de referencia (vistas de detalle) también crece con el volumen
+    if datos.poliza is not None:
+        pagos += _pagos(datos.poliza, volumen.clientes, rng)
+        eventos += _eventos(datos.poliza, volumen.clientes)
+
+    Pago.objects.bulk_create(pagos, batch_size=1000)
+    PolizaEvento.objects.bulk_create(eventos, batch_size=1000)
+    Comision.objects.bulk_create(comisiones, batch_size=1000)
+
+    datos.polizas.extend(polizas)
+    if datos.poliza is None:
+        datos.poliza = polizas[0]
+    return datos
+
+
+# ---------------------------------------------------------------------
+# Presupuestos
+# ---------------------------------------------------------------------
+
+@dataclass
+class Presupuesto:
+    url_name: str
+    queries: int
+    ms: float = 1000
+    kwargs: Callable = None
+    params: dict = field(default_factory=dict)
+    usuario: str = "admin"          # admin | portal
+    escala: bool = False            # True si crecer con las filas es esperado (exports)
+
+
+@dataclass
+class Medicion:
+    queries: int
+    ms: float
+    status: int
+
+
+def _factor(nombre, default):
+    try:
+        return float(os.environ.get(nombre, default))
+    except ValueError:
+        return default
+
+
+class QueryBudgetTestCase(TestCase):
+    PRESUPUESTOS = []
+    VOLUMEN = Volumen()
+    VOLUMEN_FACTOR = 50
+
+    def _limpiar_caches(self):
+        cache.clear()
+        cache_ns.clear_local()
+
+    def medir(self, presupuesto, datos):
+        usuario = datos.usuario_portal if presupuesto.usuario == "portal" else datos.admin
+        # Sesión nueva en cada medición: el snapshot de roles vive en la sesión
+        self.client.logout()
+        self.client.force_login(usuario)
+        url = reverse(
+            presupuesto.url_name,
+            kwargs=presupuesto.kwargs(datos) if presupuesto.kwargs else None,
+        )
+
+        # En frío: los snapshots en cache ocultarían las queries
+        self._limpiar_caches()
+        with CaptureQueriesContext(connection) as ctx:
+            inicio = time.perf_counter()
+            response = self.client.get(url, presupuesto.params)
+            ms = (time.perf_counter() - inicio) * 1000
+
+        return Medicion(queries=len(ctx.captured_queries), ms=round(ms, 1), status=response.status_code)
+
+    def test_presupuestos(self):
+        if not self.PRESUPUESTOS:
+            return
+
+        escala = max(1, int(_factor("QUERY_BUDGET_SCALE", 1)))
+        factor_tiempo = _factor("QUERY_BUDGET_TIME_FACTOR", 1)
+        volumen = self.VOLUMEN.escalar(escala)
+
+        datos = poblar(volumen, seed=1)
+        chico = {p.url_name: self.medir(p, datos) for p in self.PRESUPUESTOS}
+
+        poblar(volumen.escalar(self.VOLUMEN_FACTOR - 1), datos=datos, seed=2)
+        grande = {p.url_name: self.medir(p, datos) for p in self.PRESUPUESTOS}
+
+        reporte = []
+        for p in self.PRESUPUESTOS:
+            a, b = chico[p.url_name], grande[p.url_name]
+            reporte.append({
+                "vista": p.url_name,
+                "presupuesto_queries": p.queries,
+                "presupuesto_ms": p.ms,
+                "queries": [a.queries, b.queries],
+                "ms": [a.ms, b.ms],
+                "escala_con_filas": b.queries > a.queries,
+            })
+
+            with self.subTest(vista=p.url_name):
+                self.assertEqual(b.status, 200, f"{p.url_name} respondió {b.status}")
+                self.assertLessEqual(
+                    b.queries, p.queries,
+                    f"{p.url_name}: {b.queries} queries, presupuesto {p.queries}",
+                )
+                if not p.escala:
+                    self.assertEqual(
+                        a.queries, b.queries,
+                        f"{p.url_name}: las queries crecen con las filas ({a.queries} -> {b.queries})",
+                    )
+                if getattr(settings, "QUERY_BUDGET_ENFORCE_MS", False):
+                    self.assertLessEqual(
+                        b.ms, p.ms * factor_tiempo,
+                        f"{p.url_name}: {b.ms}ms, presupuesto {p.ms}ms",
+                    )
+
+        ruta = os.environ.get("QUERY_BUDGET_REPORT")
+        if ruta:
+            previo = []
+            if os.path.exists(ruta):
+                with open(ruta) as fh:
+                    previo = [r for r in json.load(fh) if r["vista"] not in chico]
+            with open(ruta, "w") as fh:
+                json.dump(previo + reporte, fh, indent=2)
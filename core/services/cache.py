@@ -0,0 +1,224 @@
+# core/services/cache.py
+"""
+Capa de cache del proyecto.
+
+CACHES["default"] sale de CACHE_URL: en producción es compartido entre
+los workers de gunicorn (filecache:// o rediscache://); antes no había
+CACHES y cada worker tenía su propio LocMemCache (el token de Chubb, los
+snapshots del portal, etc. se calculaban una vez por worker).
+
+Cada módulo usa su propio namespace en lugar de armar llaves a mano:
+
+    PORTAL = cache.namespace("portal", ttl_setting="PORTAL_SNAPSHOT_TTL", ttl=600)
+    PORTAL.get_or_set(f"snapshot:{cliente_id}", lambda: ...)
+
+    - llaves "<namespace>:<llave>"; con versioned=True llevan además la
+      versión del namespace y clear() la incrementa (invalida todo sin
+      borrar llave por llave),
+    - TTL por namespace (fijo o leído de settings en cada uso),
+    - get_or_set con protección contra estampida: un solo proceso
+      calcula (lock con cache.add); los demás esperan el valor hasta
+      CACHE_LOCK_TIMEOUT segundos,
+    - L1 opcional en memoria del proceso (l1_ttl segundos) delante del
+      cache compartido, para valores que se leen en cada request,
+    - contadores por namespace (stats()): hits L1 / L2, misses, sets y
+      esperas por lock.
+"""
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.services import profiling
+
+MISSING = object()
+LOCK_POLL = 0.05
+
+_namespaces = {}
+_lock = threading.Lock()
+
+
+class Namespace:
+    def __init__(self, name, *, ttl=300, ttl_setting=None, l1_ttl=0, versioned=False):
+        self.name = name
+        self._ttl = ttl
+        self.ttl_setting = ttl_setting
+        self.l1_ttl = l1_ttl
+        self.versioned = versioned
+        self.counters = Counter()
+        self._l1 = {}
+
+    # -----------------------------------------------------------------
+    # Llaves
+    # -----------------------------------------------------------------
+
+    @property
+    def ttl(self):
+        if self.ttl_setting:
+            return getattr(settings, self.ttl_setting, self._ttl)
+        return self._ttl
+
+    def _version_key(self):
+        return f"{self.name}:__version__"
+
+    def version(self):
+        if not self.versioned:
+            return None
+        version = cache.get(self._version_key())
+        if version is None:
+            version = 1
+            cache.add(self._version_key(), version, None)
+        return version
+
+    def key(self, key):
+        if self.versioned:
+            return f"{self.name}:v{self.version()}:{key}"
+        return f"{self.name}:{key}"
+
+    def _count(self, what, n=1):
+        with _lock:
+            self.counters[what] += n
+        if what in ("hits", "l1_hits", "misses"):
+            profiling.registrar_cache(self.name, what, n)
+
+    # -----------------------------------------------------------------
+    # L1
+    # -----------------------------------------------------------------
+
+    def _l1_get(self, full):
+        if not self.l1_ttl:
+            return MISSING
+        item = self._l1.get(full)
+        if item is None or item[0] < time.monotonic():
+            return MISSING
+        return item[1]
+
+    def _l1_set(self, full, value):
+        if self.l1_ttl:
+            self._l1[full] = (time.monotonic() + self.l1_ttl, value)
+
+    def clear_local(self):
+        self._l1.clear()
+
+    # -----------------------------------------------------------------
+    # Operaciones
+    # -----------------------------------------------------------------
+
+    def get(self, key, default=None):
+        full = self.key(key)
+        value = self._l1_get(full)
+        if value is not MISSING:
+            self._count("l1_hits")
+            return value
+
+        value = cache.get(full, MISSING)
+        if value is MISSING:
+            self._count("misses")
+            return default
+
+        self._count("hits")
+        self._l1_set(full, value)
+        return value
+
+    def get_many(self, keys):
+        """{llave: valor} solo con las que existen (una ida al cache)."""
+        fulls = {self.key(k): k for k in keys}
+        found = cache.get_many(list(fulls))
+        self._count("hits", len(found))
+        self._count("misses", len(fulls) - len(found))
+        return {fulls[f]: v for f, v in found.items()}
+
+    def set(self, key, value, ttl=None):
+        full = self.key(key)
+        cache.set(full, value, self.ttl if ttl is None else ttl)
+        self._l1_set(full, value)
+        self._count("sets")
+
+    def delete(self, key):
+        full = self.key(key)
+        self._l1.pop(full, None)
+        cache.delete(full)
+
+    def delete_many(self, keys):
+        fulls = [self.key(k) for k in keys]
+        for full in fulls:
+            self._l1.pop(full, None)
+        if fulls:
+            cache.delete_many(fulls)
+
+    def incr(self, key, ttl=None):
+        """Contador compartido (p.ej. versiones); si no existe empieza en 1."""
+        full = self.key(key)
+        try:
+            return cache.incr(full)
+        except ValueError:
+            cache.set(full, 1, ttl)
+            return 1
+
+    def clear(self):
+        """Invalida todo el namespace (solo versioned)."""
+        if not self.versioned:
+            raise ValueError(f"El namespace {self.name} no es versionado")
+        self.clear_local()
+        try:
+            cache.incr(self._version_key())
+        except ValueError:
+            cache.set(self._version_key(), 2, None)
+
+    def get_or_set(self, key, fn, ttl=None, lock_timeout=None):
+        """
+        Valor en cache o fn() guardado. ttl puede ser un callable que
+        recibe el valor (p.ej. tokens con expires_in).
+        """
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        full = self.key(key)
+        lock_key = f"{full}:lock"
+        lock_timeout = lock_timeout or getattr(settings, "CACHE_LOCK_TIMEOUT", 30)
+
+        if not cache.add(lock_key, 1, lock_timeout):
+            # Otro proceso lo está calculando: se espera su resultado
+            self._count("lock_waits")
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL)
+                value = cache.get(full, MISSING)
+                if value is not MISSING:
+                    self._l1_set(full, value)
+                    return value
+            # El que tenía el lock murió o tardó demasiado: se calcula aquí
+
+        try:
+            value = fn()
+            self.set(key, value, ttl(value) if callable(ttl) else ttl)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    def stats(self):
+        with _lock:
+            return dict(self.counters)
+
+
+def namespace(name, **kwargs):
+    """Namespace registrado (uno por nombre en el proceso)."""
+    with _lock:
+        ns = _namespaces.get(name)
+        if ns is None:
+            ns = _namespaces[name] = Namespace(name, **kwargs)
+        return ns
+
+
+def stats():
+    """Contadores de este proceso por namespace."""
+    return {name: ns.stats() for name, ns in sorted(_namespaces.items())}
+
+
+def clear_local():
+    """Vacía los L1 del proceso (tests / después de cache.clear())."""
+    for ns in _namespaces.values():
+        ns.clear_local()
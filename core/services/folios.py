@@ -0,0 +1,133 @@
+# core/services/folios.py
+"""
+Folios por bloques (COT, POL, ...).
+
+Antes cada cotización hacía SELECT ... FOR UPDATE sobre el renglón del
+año en FolioCotizacionCounter; todas las altas concurrentes esperaban
+ese mismo candado. Ahora cada proceso reserva un bloque de
+FOLIO_BLOCK_SIZE números de una vez y los reparte en memoria:
+
+    - PostgreSQL: SEQUENCE nativa por nombre (INCREMENT BY tamaño del
+      bloque), nextval no bloquea a nadie.
+    - Otros (MySQL, SQLite): UPDATE ultimo = ultimo + tamaño sobre
+      FolioSequence, un candado corto por bloque en lugar de por folio.
+
+Los bloques nunca se traslapan, así que los folios son únicos. Pueden
+quedar huecos (un worker que reinicia pierde lo que le quedaba del
+bloque) y el orden entre workers no es estrictamente creciente.
+"""
+import re
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+
+from core.models import FolioSequence
+
+_lock = threading.Lock()
+_blocks = {}  # nombre -> [siguiente, fin]
+
+
+def _block_size():
+    return max(1, getattr(settings, "FOLIO_BLOCK_SIZE", 100))
+
+
+def _pg_sequence_name(nombre):
+    return "folio_" + re.sub(r"[^a-z0-9_]", "_", nombre.lower())
+
+
+def _pg_nextval(seq):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(%s), "
+            "(SELECT increment_by FROM pg_sequences WHERE sequencename = %s)",
+            [seq, seq],
+        )
+        valor, incremento = cursor.fetchone()
+    return valor + 1, valor + incremento
+
+
+def _reserve_pg(nombre, size):
+    seq = _pg_sequence_name(nombre)
+
+    try:
+        # Savepoint: si la secuencia no existe no se aborta la transacción
+        with transaction.atomic():
+            return _pg_nextval(seq)
+    except DatabaseError:
+        pass
+
+    # Primera vez: la secuencia arranca donde va la tabla
+    inicio = (
+        FolioSequence.objects.filter(nombre=nombre)
+        .values_list("ultimo", flat=True)
+        .first()
+    ) or 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE SEQUENCE IF NOT EXISTS {seq} "
+            f"INCREMENT BY {int(size)} MINVALUE 0 START WITH {int(inicio)}"
+        )
+    return _pg_nextval(seq)
+
+
+def _reserve_table(nombre, size):
+    with transaction.atomic():
+        FolioSequence.objects.get_or_create(nombre=nombre)
+        FolioSequence.objects.filter(nombre=nombre).update(ultimo=F("ultimo") + size)
+        fin = FolioSequence.objects.filter(nombre=nombre).values_list("ultimo", flat=True).get()
+    return fin - size + 1, fin
+
+
+def reserve_block(nombre, size=None):
+    """Reserva un bloque en la base. Regresa (primero, último)."""
+    size = size or _block_size()
+    if connection.vendor == "postgresql":
+        return _reserve_pg(nombre, size)
+    return _reserve_table(nombre, size)
+
+
+def _adopt(nombre, inicio, fin):
+    with _lock:
+        _blocks[nombre] = [inicio, fin]
+
+
+def next_value(nombre):
+    """Siguiente número de la secuencia nombre (desde el bloque del proceso)."""
+    with _lock:
+        block = _blocks.get(nombre)
+        if block is not None and block[0] <= block[1]:
+            valor = block[0]
+            block[0] += 1
+            return valor
+
+    inicio, fin = reserve_block(nombre)
+
+    if connection.in_atomic_block:
+        # La reserva se confirma con la transacción externa: si esta se
+        # revierte, otro proceso puede recibir el mismo rango, así que el
+        # resto del bloque solo se usa después del commit.
+        transaction.on_commit(lambda: _adopt(nombre, inicio + 1, fin))
+    else:
+        _adopt(nombre, inicio + 1, fin)
+
+    return inicio
+
+
+def reset():
+    """Olvida los bloques del proceso (tests / después de un fork)."""
+    with _lock:
+        _blocks.clear()
+
+
+# ---------------------------------------------------------------------
+# Formatos
+# ---------------------------------------------------------------------
+
+def folio_cotizacion(anio):
+    return f"COT-{anio}-{next_value(f'COT-{anio}'):06d}"
+
+
+def numero_poliza(aseguradora_id, anio):
+    return f"POL-{aseguradora_id}-{anio}-{next_value(f'POL-{anio}'):06d}"
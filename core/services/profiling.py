@@ -0,0 +1,318 @@
+# core/services/profiling.py
+"""
+Perfilado por request (ver core.middleware.ProfilingMiddleware).
+
+Con PROFILING_ENABLED, una fracción de los requests (PROFILING_SAMPLE_RATE)
+se mide completa:
+
+    - SQL: número de queries y tiempo, vía connection.execute_wrapper,
+    - queries repetidas: la misma firma (SQL con listas IN colapsadas)
+      PROFILING_DUPLICATE_THRESHOLD veces o más es candidata a N+1,
+    - cache: hits / misses de los namespaces de core.services.cache,
+    - HTTP saliente: tiempo y llamadas por host (requests: clientes sync
+      de Chubb y SDK de MercadoPago; httpx: clientes async de Chubb),
+    - tiempo total y status,
+    - el pool de conexiones de psycopg3 del worker que atendió (pool_stats),
+      así perfiles.json muestra el pool de cada worker y no solo el del
+      proceso de manage.py db_pool_stats.
+
+Cada muestra se compara contra el presupuesto de la vista
+(PROFILING_BUDGET_MS / PROFILING_BUDGET_QUERIES o PROFILING_BUDGETS por
+view_name), se loguea como warning si lo excede y se guarda en un buffer
+circular de PROFILING_BUFFER_SIZE muestras en el cache compartido, así la
+página del admin ve las de todos los workers.
+"""
+import contextvars
+import logging
+import os
+import random
+import re
+import socket
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_actual = contextvars.ContextVar("perfil_actual", default=None)
+
+_IN_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+def firma_sql(sql):
+    """SQL normalizado: mismas queries con distinto número de params en IN."""
+    return _ESPACIOS.sub(" ", _IN_LIST.sub("(%s...)", sql)).strip()
+
+
+class Perfil:
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.inicio = time.perf_counter()
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.sql = Counter()
+        self.cache = Counter()
+        self.http_ms = defaultdict(float)
+        self.http_count = Counter()
+        self._wrapped = []
+
+    # -----------------------------------------------------------------
+    # SQL
+    # -----------------------------------------------------------------
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_ms += (time.perf_counter() - inicio) * 1000
+            self.sql_count += 1
+            self.sql[firma_sql(sql)] += 1
+
+    def conectar(self):
+        # Conexiones del hilo actual; bajo ASGI el ORM del request corre en
+        # un solo hilo (thread_sensitive), el mismo que este middleware.
+        for conn in connections.all(initialized_only=False):
+            conn.execute_wrappers.append(self)
+            self._wrapped.append(conn)
+
+    def desconectar(self):
+        for conn in self._wrapped:
+            if self in conn.execute_wrappers:
+                conn.execute_wrappers.remove(self)
+        self._wrapped = []
+
+    # -----------------------------------------------------------------
+    # Resultado
+    # -----------------------------------------------------------------
+
+    def duplicadas(self):
+        umbral = getattr(settings, "PROFILING_DUPLICATE_THRESHOLD", 3)
+        return [
+            {"sql": sql[:300], "veces": veces}
+            for sql, veces in self.sql.most_common(5)
+            if veces >= umbral
+        ]
+
+    def cerrar(self, view_name, status):
+        total_ms = (time.perf_counter() - self.inicio) * 1000
+        muestra = {
+            "ts": time.time(),
+            "method": self.method,
+            "path": self.path,
+            "view": view_name,
+            "status": status,
+            "total_ms": round(total_ms, 1),
+            "sql_count": self.sql_count,
+            "sql_ms": round(self.sql_ms, 1),
+            "duplicadas": self.duplicadas(),
+            "cache": dict(self.cache),
+            "http": {
+                host: {"ms": round(ms, 1), "llamadas": self.http_count[host]}
+                for host, ms in self.http_ms.items()
+            },
+            "worker": worker_id(),
+            "pool": pool_stats(),
+        }
+        muestra["excesos"] = excesos(muestra)
+        return muestra
+
+
+# ---------------------------------------------------------------------
+# Hooks (no hacen nada fuera de un request muestreado)
+# ---------------------------------------------------------------------
+
+def registrar_cache(namespace, que, n=1):
+    perfil = _actual.get()
+    if perfil is not None and n:
+        perfil.cache[que] += n
+
+
+def registrar_http(url, ms):
+    perfil = _actual.get()
+    if perfil is not None:
+        host = urlsplit(url).hostname or "?"
+        perfil.http_ms[host] += ms
+        perfil.http_count[host] += 1
+
+
+_instalado = False
+
+
+def _medir_sync(original):
+    def send(transport, request, *args, **kwargs):
+        if _actual.get() is None:
+            return original(transport, request, *args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return original(transport, request, *args, **kwargs)
+        finally:
+            registrar_http(str(request.url), (time.perf_counter() - inicio) * 1000)
+
+    return send
+
+
+def _medir_async(original):
+    async def send(transport, request, *args, **kwargs):
+        if _actual.get() is None:
+            return await original(transport, request, *args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return await original(transport, request, *args, **kwargs)
+        finally:
+            registrar_http(str(request.url), (time.perf_counter() - inicio) * 1000)
+
+    return send
+
+
+def instalar_http():
+    """
+    Mide todo lo que sale por requests (HTTPAdapter.send) y por httpx
+    (HTTPTransport / AsyncHTTPTransport). Idempotente.
+    """
+    global _instalado
+    if _instalado:
+        return
+
+    from requests.adapters import HTTPAdapter
+
+    HTTPAdapter.send = _medir_sync(HTTPAdapter.send)
+
+    try:
+        import httpx
+    except ImportError:  # opcional: solo en modo ASGI
+        httpx = None
+    if httpx is not None:
+        httpx.HTTPTransport.handle_request = _medir_sync(httpx.HTTPTransport.handle_request)
+        httpx.AsyncHTTPTransport.handle_async_request = _medir_async(httpx.AsyncHTTPTransport.handle_async_request)
+
+    _instalado = True
+
+
+# ---------------------------------------------------------------------
+# Pool de conexiones (por worker)
+# ---------------------------------------------------------------------
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def pool_stats():
+    """{alias: estadísticas} de los alias con pool en este proceso."""
+    from seguros.database import pool_stats as _stats
+
+    out = {}
+    for alias in settings.DATABASES:
+        stats = _stats(alias)
+        if stats:
+            out[alias] = stats
+    return out
+
+
+def pools(items):
+    """Último pool reportado por cada worker en las muestras (más reciente primero)."""
+    out = {}
+    for muestra in items:
+        worker = muestra.get("worker")
+        if worker and worker not in out and muestra.get("pool"):
+            out[worker] = {"ts": muestra["ts"], "pool": muestra["pool"]}
+    return out
+
+
+# ---------------------------------------------------------------------
+# Muestreo
+# ---------------------------------------------------------------------
+
+def habilitado():
+    return getattr(settings, "PROFILING_ENABLED", False)
+
+
+def iniciar(request):
+    """Perfil del request si cae en la muestra; None si no."""
+    if not habilitado():
+        return None
+    if random.random() >= getattr(settings, "PROFILING_SAMPLE_RATE", 0.01):
+        return None
+
+    perfil = Perfil(request.method, request.path)
+    perfil.conectar()
+    _actual.set(perfil)
+    return perfil
+
+
+def terminar(perfil, request, response):
+    perfil.desconectar()
+    # set(None) y no reset(token): bajo ASGI process_request y
+    # process_response corren en contextos distintos
+    _actual.set(None)
+
+    match = getattr(request, "resolver_match", None)
+    muestra = perfil.cerrar(match.view_name if match else "", response.status_code)
+
+    if muestra["excesos"]:
+        logger.warning(
+            "Vista sobre presupuesto %s %s: %s",
+            muestra["view"] or muestra["path"], muestra["excesos"],
+            {k: muestra[k] for k in ("total_ms", "sql_count", "sql_ms")},
+        )
+    guardar(muestra)
+    return muestra
+
+
+def presupuesto(view_name):
+    budgets = getattr(settings, "PROFILING_BUDGETS", {}).get(view_name, {})
+    return {
+        "ms": budgets.get("ms", getattr(settings, "PROFILING_BUDGET_MS", 500)),
+        "queries": budgets.get("queries", getattr(settings, "PROFILING_BUDGET_QUERIES", 50)),
+    }
+
+
+def excesos(muestra):
+    limite = presupuesto(muestra["view"])
+    out = []
+    if muestra["total_ms"] > limite["ms"]:
+        out.append(f"tiempo {muestra['total_ms']}ms > {limite['ms']}ms")
+    if muestra["sql_count"] > limite["queries"]:
+        out.append(f"queries {muestra['sql_count']} > {limite['queries']}")
+    if muestra["duplicadas"]:
+        out.append(f"N+1: {len(muestra['duplicadas'])} firma(s) repetida(s)")
+    return out
+
+
+# ---------------------------------------------------------------------
+# Buffer circular (cache compartido)
+# ---------------------------------------------------------------------
+
+def _buffer():
+    from core.services import cache
+
+    return cache.namespace("profiling", ttl_setting="PROFILING_TTL", ttl=86400)
+
+
+def _tamano():
+    return getattr(settings, "PROFILING_BUFFER_SIZE", 200)
+
+
+def guardar(muestra):
+    ns = _buffer()
+    slot = (ns.incr("cursor", ttl=None) - 1) % _tamano()
+    ns.set(f"slot:{slot}", muestra)
+
+
+def muestras(solo_excesos=False):
+    """Muestras del buffer, la más reciente primero."""
+    items = _buffer().get_many([f"slot:{i}" for i in range(_tamano())]).values()
+    items = sorted(items, key=lambda m: m["ts"], reverse=True)
+    if solo_excesos:
+        items = [m for m in items if m["excesos"]]
+    return items
+
+
+def limpiar():
+    ns = _buffer()
+    ns.delete_many(["cursor"] + [f"slot:{i}" for i in range(_tamano())])
@@ -0,0 +1,179 @@
+# core/services/roles.py
+"""
+Snapshot de roles (grupos) del usuario.
+
+Antes cada helper de permisos hacía su propio user.groups.filter(...),
+y una lista con checks por renglón repetía la misma consulta muchas
+veces. Ahora los grupos se leen una vez, se guardan en el usuario
+(alcance request) y en la sesión (alcance sesión), y se exponen como
+request.roles.
+
+Invalidación: cada cambio de grupos incrementa una versión por usuario
+(y una global al renombrar/borrar grupos) en el cache; la copia de la
+sesión se descarta si su versión no coincide o si tiene más de
+ROLES_SESSION_TTL segundos (tope por si el cache no es compartido entre
+workers).
+"""
+import time
+
+from django.conf import settings
+
+from core.services import cache
+
+SESSION_KEY = "_roles_snapshot"
+USER_ATTR = "_roles_snapshot"
+
+SUPERVISOR_GROUPS = ("Supervisor", "Admin")
+INTERNAL_GROUPS = ("Admin", "Supervisor", "Agente", "Operador", "Lectura")
+
+# Orden de prioridad para el rol que se muestra en la UI
+_ROLE_LABELS = (
+    ("Admin", "SUPERADMIN", "Super Administrador"),
+    ("Supervisor", "SUPERVISOR", "Supervisor"),
+    ("Agente", "AGENTE", "Agente"),
+    ("Operador", "OPERADOR", "Operador"),
+    ("Lectura", "LECTURA", "Lectura"),
+)
+
+
+class RoleSnapshot:
+    def __init__(self, groups=(), is_authenticated=False, is_superuser=False, is_staff=False):
+        self.groups = frozenset(groups)
+        self.is_authenticated = is_authenticated
+        self.is_superuser = is_superuser
+        self.is_staff = is_staff
+
+    def in_group(self, *names):
+        return self.is_authenticated and not self.groups.isdisjoint(names)
+
+    @property
+    def is_admin(self):
+        return self.is_superuser or self.in_group("Admin")
+
+    @property
+    def is_supervisor(self):
+        # Supervisor o Admin (los helpers históricos los tratan igual)
+        return self.is_superuser or self.in_group(*SUPERVISOR_GROUPS)
+
+    @property
+    def is_agente(self):
+        return self.in_group("Agente")
+
+    @property
+    def is_internal(self):
+        return self.is_authenticated and (
+            self.is_superuser or self.is_staff or self.in_group(*INTERNAL_GROUPS)
+        )
+
+    @property
+    def role(self):
+        return self._role()[0]
+
+    @property
+    def role_label(self):
+        return self._role()[1]
+
+    def _role(self):
+        if not self.is_authenticated:
+            return "", ""
+        if self.is_superuser:
+            return "SUPERADMIN", "Super Administrador"
+        for group, role, label in _ROLE_LABELS:
+            if group in self.groups:
+                return role, label
+        return "USUARIO", "Usuario"
+
+    def __repr__(self):
+        return f"<RoleSnapshot {sorted(self.groups)}>"
+
+
+ANONYMOUS = RoleSnapshot()
+
+
+# ---------------------------------------------------------------------
+# Versiones (invalidación)
+# ---------------------------------------------------------------------
+
+VERSIONES = cache.namespace("roles", ttl=None)
+
+
+def _version_key(user_id):
+    return f"version:{user_id}"
+
+
+_GLOBAL_VERSION_KEY = "version:global"
+
+
+def _version(user_id):
+    # Una sola ida al cache por las dos versiones
+    found = VERSIONES.get_many([_GLOBAL_VERSION_KEY, _version_key(user_id)])
+    return f"{found.get(_GLOBAL_VERSION_KEY, 0)}.{found.get(_version_key(user_id), 0)}"
+
+
+def invalidate_user(user_id):
+    VERSIONES.incr(_version_key(user_id))
+
+
+def invalidate_all():
+    VERSIONES.incr(_GLOBAL_VERSION_KEY)
+
+
+# ---------------------------------------------------------------------
+# Carga
+# ---------------------------------------------------------------------
+
+def _build(user, groups):
+    return RoleSnapshot(
+        groups=groups,
+        is_authenticated=True,
+        is_superuser=user.is_superuser,
+        is_staff=user.is_staff,
+    )
+
+
+def roles_for(user, session=None):
+    """
+    Snapshot de roles de user. Se calcula una sola vez por request (se
+    guarda en el objeto usuario); si se pasa session, además se reutiliza
+    entre requests mientras la versión no cambie.
+    """
+    if user is None or not user.is_authenticated:
+        return ANONYMOUS
+
+    snapshot = getattr(user, USER_ATTR, None)
+    if snapshot is not None:
+        return snapshot
+
+    version = _version(user.pk) if session is not None else None
+    groups = None
+
+    if session is not None:
+        data = session.get(SESSION_KEY)
+        ttl = getattr(settings, "ROLES_SESSION_TTL", 300)
+        if (
+            data
+            and data.get("uid") == user.pk
+            and data.get("v") == version
+            and time.time() - data.get("ts", 0) < ttl
+        ):
+            groups = data.get("groups", [])
+
+    if groups is None:
+        groups = list(user.groups.values_list("name", flat=True))
+        if session is not None:
+            session[SESSION_KEY] = {
+                "uid": user.pk,
+                "v": version,
+                "ts": time.time(),
+                "groups": groups,
+            }
+
+    snapshot = _build(user, groups)
+    setattr(user, USER_ATTR, snapshot)
+    return snapshot
+
+
+def forget(user):
+    """Descarta el snapshot guardado en el objeto usuario."""
+    if user is not None and hasattr(user, USER_ATTR):
+        delattr(user, USER_ATTR)
@@ -0,0 +1,309 @@
+# core/services/search.py
+"""
+Servicio de búsqueda sobre el índice denormalizado (SearchDocument /
+SearchToken).
+
+Cada registro buscable se indexa como tokens normalizados (minúsculas,
+sin acentos, partidos por símbolos). Una búsqueda "juan gom" regresa los
+registros que tienen un token que empieza con "juan" Y otro que empieza
+con "gom", usando token LIKE 'x%' sobre índice en lugar de icontains
+sobre varias tablas.
+"""
+import re
+import unicodedata
+
+from django.apps import apps
+from django.db import transaction
+from django.urls import reverse
+
+from core.models import SearchDocument, SearchToken
+
+Entidad = SearchDocument.Entidad
+
+MAX_TOKEN_LEN = 64
+MAX_TERMS = 6
+
+_SPLIT_RE = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return text.lower()
+
+
+def tokenize(*texts):
+    tokens = set()
+    for text in texts:
+        for token in _SPLIT_RE.split(normalize(text)):
+            if token:
+                tokens.add(token[:MAX_TOKEN_LEN])
+    return tokens
+
+
+def query_terms(q):
+    terms = sorted(tokenize(q), key=len, reverse=True)
+    return terms[:MAX_TERMS]
+
+
+# ---------------------------------------------------------------------
+# Documentos por entidad
+# ---------------------------------------------------------------------
+
+def _cliente_texts(cliente):
+    if cliente is None:
+        return []
+    return [
+        cliente.nombre,
+        cliente.apellido_paterno,
+        cliente.apellido_materno,
+        cliente.nombre_comercial,
+        cliente.rfc,
+        cliente.email_principal,
+        cliente.telefono_principal,
+    ]
+
+
+def _user_texts(user):
+    if user is None:
+        return []
+    return [user.first_name, user.last_name, user.username]
+
+
+def _doc_cliente(cliente):
+    return {
+        "owner_id": cliente.owner_id,
+        "titulo": str(cliente),
+        "subtitulo": cliente.rfc or cliente.email_principal,
+        "url": reverse("ui:cliente_detail", args=[cliente.pk]),
+        "texts": _cliente_texts(cliente),
+    }
+
+
+def _doc_poliza(poliza):
+    return {
+        "owner_id": poliza.agente_id,
+        "titulo": poliza.numero_poliza or f"Póliza #{poliza.pk}",
+        "subtitulo": str(poliza.cliente) if poliza.cliente_id else "",
+        "url": reverse("ui:poliza_detail", args=[poliza.pk]),
+        "texts": [
+            poliza.numero_poliza,
+            poliza.aseguradora.nombre if poliza.aseguradora_id else "",
+            *_cliente_texts(poliza.cliente),
+            *_user_texts(poliza.agente),
+        ],
+    }
+
+
+def _doc_pago(pago):
+    poliza = pago.poliza
+    cliente = poliza.cliente if poliza else pago.cliente
+    return {
+        "owner_id": poliza.agente_id if poliza else None,
+        "titulo": f"Pago #{pago.pk}" + (f" | {poliza.numero_poliza}" if poliza else ""),
+        "subtitulo": str(cliente) if cliente else "",
+        "url": reverse("ui:poliza_detail", args=[poliza.pk]) if poliza else "",
+        "texts": [
+            pago.referencia,
+            poliza.numero_poliza if poliza else "",
+            poliza.aseguradora.nombre if poliza and poliza.aseguradora_id else "",
+            *_cliente_texts(cliente),
+            *_user_texts(poliza.agente if poliza else None),
+        ],
+    }
+
+
+def _doc_cotizacion(cotizacion):
+    return {
+        "owner_id": cotizacion.owner_id,
+        "titulo": cotizacion.folio or f"Cotización #{cotizacion.pk}",
+        "subtitulo": str(cotizacion.cliente) if cotizacion.cliente_id else "",
+        "url": reverse("ui:cotizacion_detail", args=[cotizacion.pk]),
+        "texts": [
+            cotizacion.folio,
+            *_cliente_texts(cotizacion.cliente),
+            *_user_texts(cotizacion.owner),
+        ],
+    }
+
+
+# entidad -> (modelo, select_related para indexar, builder)
+REGISTRY = {
+    Entidad.CLIENTE: ("crm.Cliente", ("owner",), _doc_cliente),
+    Entidad.POLIZA: ("polizas.Poliza", ("cliente", "aseguradora", "agente"), _doc_poliza),
+    Entidad.PAGO: (
+        "finanzas.Pago",
+        ("cliente", "poliza", "poliza__cliente", "poliza__aseguradora", "poliza__agente"),
+        _doc_pago,
+    ),
+    Entidad.COTIZACION: ("cotizador.Cotizacion", ("cliente", "owner"), _doc_cotizacion),
+}
+
+
+def entidad_de(model):
+    label = model._meta.label
+    for entidad, (model_label, _related, _builder) in REGISTRY.items():
+        if model_label == label:
+            return entidad
+    return None
+
+
+def indexable_queryset(entidad):
+    model_label, related, _builder = REGISTRY[entidad]
+    return apps.get_model(model_label).objects.select_related(*related)
+
+
+# ---------------------------------------------------------------------
+# Indexación
+# ---------------------------------------------------------------------
+
+@transaction.atomic
+def index_objects(entidad, objects):
+    """Crea/actualiza los documentos y tokens de objects (misma entidad)."""
+    objects = list(objects)
+    if not objects:
+        return 0
+
+    _model_label, _related, builder = REGISTRY[entidad]
+
+    existing = {
+        d.object_id: d
+        for d in SearchDocument.objects.filter(
+            entidad=entidad,
+            object_id__in=[o.pk for o in objects],
+        )
+    }
+
+    nuevos, cambiados, tokens_por_objeto = [], [], {}
+    for obj in objects:
+        data = builder(obj)
+        tokens_por_objeto[obj.pk] = tokenize(*data.pop("texts"))
+        data["titulo"] = (data["titulo"] or "")[:200]
+        data["subtitulo"] = (data["subtitulo"] or "")[:200]
+
+        doc = existing.get(obj.pk)
+        if doc is None:
+            nuevos.append(SearchDocument(entidad=entidad, object_id=obj.pk, **data))
+        else:
+            for field, value in data.items():
+                setattr(doc, field, value)
+            cambiados.append(doc)
+
+    if nuevos:
+        SearchDocument.objects.bulk_create(nuevos)
+        # bulk_create no regresa pk en todos los backends (MySQL)
+        existing.update({
+            d.object_id: d
+            for d in SearchDocument.objects.filter(
+                entidad=entidad,
+                object_id__in=[d.object_id for d in nuevos],
+            )
+        })
+    if cambiados:
+        SearchDocument.objects.bulk_update(
+            cambiados,
+            ["owner_id", "titulo", "subtitulo", "url"],
+        )
+        SearchToken.objects.filter(document__in=cambiados).delete()
+
+    SearchToken.objects.bulk_create(
+        [
+            SearchToken(document=existing[object_id], entidad=entidad, token=token)
+            for object_id, tokens in tokens_por_objeto.items()
+            for token in tokens
+        ],
+        batch_size=1000,
+    )
+
+    return len(objects)
+
+
+def index_instance(instance):
+    entidad = entidad_de(type(instance))
+    if entidad is None:
+        return 0
+    obj = indexable_queryset(entidad).filter(pk=instance.pk).first()
+    if obj is None:
+        return 0
+    return index_objects(entidad, [obj])
+
+
+def remove_instance(model, pk):
+    entidad = entidad_de(model)
+    if entidad is None:
+        return
+    SearchDocument.objects.filter(entidad=entidad, object_id=pk).delete()
+
+
+def rebuild(entidad, batch_size=500):
+    qs = indexable_queryset(entidad).order_by("pk")
+    total = 0
+    last_pk = 0
+    while True:
+        batch = list(qs.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        total += index_objects(entidad, batch)
+        last_pk = batch[-1].pk
+    return total
+
+
+# ---------------------------------------------------------------------
+# Consulta
+# ---------------------------------------------------------------------
+
+def matching_ids(entidad, q):
+    """
+    Subquery con los object_id de entidad que cumplen todos los términos
+    de q, o None si q no tiene términos.
+    """
+    terms = query_terms(q)
+    if not terms:
+        return None
+
+    docs = SearchDocument.objects.filter(entidad=entidad)
+    for term in terms:
+        docs = docs.filter(
+            pk__in=SearchToken.objects.filter(
+                entidad=entidad,
+                # Los tokens ya van normalizados en minúsculas; en MySQL
+                # startswith es LIKE BINARY y no usa el índice de token.
+                token__istartswith=term,
+            ).values("document_id")
+        )
+    return docs.values("object_id")
+
+
+def filter_queryset(queryset, entidad, q, field="pk"):
+    """Filtra queryset por la búsqueda q. field es el campo que apunta a la entidad."""
+    ids = matching_ids(entidad, q)
+    if ids is None:
+        return queryset
+    return queryset.filter(**{f"{field}__in": ids})
+
+
+def omnibox(q, owner_id=None, limit=8):
+    """
+    Resultados agrupados por entidad para la búsqueda global. owner_id
+    restringe a la cartera del usuario (None = todo).
+    """
+    resultados = []
+    for entidad in REGISTRY:
+        ids = matching_ids(entidad, q)
+        if ids is None:
+            return []
+
+        docs = SearchDocument.objects.filter(entidad=entidad, object_id__in=ids)
+        if owner_id is not None:
+            docs = docs.filter(owner_id=owner_id)
+
+        for doc in docs.order_by("-updated_at")[:limit]:
+            resultados.append({
+                "entidad": doc.entidad,
+                "entidad_label": doc.get_entidad_display(),
+                "id": doc.object_id,
+                "titulo": doc.titulo,
+                "subtitulo": doc.subtitulo,
+                "url": doc.url,
+            })
+    return resultados
@@ -0,0 +1,693 @@
+# core/services/synthetic.py
+"""
+Generador de datos sintéticos para pruebas de carga / escala.
+
+Puebla el esquema completo (agentes, clientes, vehículos, cotizaciones
+con sus intentos por proveedor, pólizas, pagos, comisiones, eventos y
+catálogos canónicos con sus mapeos) con volúmenes y distribuciones
+parecidas a producción:
+
+    - carteras desiguales: pocos agentes concentran muchos clientes,
+    - más actividad reciente que antigua (el negocio crece),
+    - ~35% de cotizaciones se emiten; la forma de pago define cuántos
+      pagos tiene la póliza (contado 1 ... mensual 12),
+    - el estatus de pagos, pólizas y comisiones sale de las fechas
+      (lo vencido es vencido respecto a hoy).
+
+Todo sale de un random.Random(seed): mismo seed + misma base vacía =
+mismos datos.
+
+Carga por lotes de clientes (una transacción por lote) con bulk_create
+en orden de dependencias (padres antes que hijos). Los PKs se asignan
+aquí, no en la base: así los hijos conocen el id del padre sin releer
+(MySQL no regresa ids en bulk_create) y al final se ajustan las
+secuencias (PostgreSQL). Folios y números de póliza se reservan con
+core.services.folios, igual que las altas normales.
+
+bulk_create no dispara señales ni save(): el índice de búsqueda no se
+actualiza (ver rebuild_search_index).
+"""
+import random
+import string
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from autos.models import Vehiculo
+from catalogos.models import Aseguradora, ProductoSeguro
+from core.models import FormaPagoChoices
+from core.services import folios
+from cotizador.models import Cotizacion, CotizacionProveedor
+from crm.models import Cliente
+from finanzas.models import Comision, Pago
+from integrations.models import AseguradoraConfiguracion, Catalog, CatalogItem, ProviderCatalogMapping
+from polizas.models import Poliza, PolizaEvento
+
+
+# ---------------------------------------------------------------------
+# Parámetros
+# ---------------------------------------------------------------------
+
+@dataclass
+class Volumen:
+    agentes: int = 20
+    clientes: int = 1000
+    dias: int = 730                     # historia hacia atrás desde hoy
+    conversion: float = 0.35            # cotizaciones que terminan en póliza
+    items_por_catalogo: int = 500
+
+
+PROVEEDORES = (
+    # provider, aseguradora
+    (AseguradoraConfiguracion.Provider.CHUBB, "Chubb Seguros"),
+    (AseguradoraConfiguracion.Provider.QUALITAS, "Quálitas"),
+    (AseguradoraConfiguracion.Provider.GNP, "GNP Seguros"),
+)
+
+CATALOGOS = (
+    ("VEHICLE", "Vehículos"),
+    ("VEHICLE_USE", "Usos de vehículo"),
+    ("PAYMENT_FREQUENCY", "Frecuencias de pago"),
+    ("COVERAGE_PACKAGE", "Paquetes de cobertura"),
+    ("STATE", "Estados"),
+    ("MUNICIPALITY", "Municipios"),
+)
+
+NOMBRES = (
+    "Juan", "María", "José", "Guadalupe", "Luis", "Ana", "Carlos", "Laura",
+    "Miguel", "Sofía", "Jorge", "Fernanda", "Ricardo", "Patricia", "Alejandro",
+    "Daniela", "Fernando", "Gabriela", "Roberto", "Valeria",
+)
+APELLIDOS = (
+    "Hernández", "García", "Martínez", "López", "González", "Pérez", "Rodríguez",
+    "Sánchez", "Ramírez", "Cruz", "Flores", "Gómez", "Morales", "Vázquez",
+    "Reyes", "Jiménez", "Torres", "Díaz", "Gutiérrez", "Ruiz",
+)
+ESTADOS = (
+    ("Ciudad de México", "Ciudad de México", "03"),
+    ("Guadalajara", "Jalisco", "44"),
+    ("Monterrey", "Nuevo León", "64"),
+    ("Puebla", "Puebla", "72"),
+    ("Chihuahua", "Chihuahua", "31"),
+    ("Querétaro", "Querétaro", "76"),
+    ("Mérida", "Yucatán", "97"),
+    ("Tijuana", "Baja California", "22"),
+)
+VEHICULOS = (
+    ("Nissan", "Versa"), ("Nissan", "March"), ("Nissan", "Sentra"),
+    ("Chevrolet", "Aveo"), ("Chevrolet", "Onix"), ("Volkswagen", "Jetta"),
+    ("Volkswagen", "Vento"), ("Toyota", "Corolla"), ("Toyota", "Hilux"),
+    ("Kia", "Rio"), ("Mazda", "3"), ("Honda", "CR-V"), ("Ford", "Ranger"),
+)
+
+# (valor, peso)
+CLIENTE_ESTATUS = ((Cliente.Estatus.ACTIVO, 70), (Cliente.Estatus.PROSPECTO, 20), (Cliente.Estatus.INACTIVO, 10))
+CLIENTE_ORIGEN = (("PORTAL", 30), ("REFERIDO", 25), ("AGENTE", 35), ("CAMPAÑA", 10))
+VEHICULOS_POR_CLIENTE = ((1, 75), (2, 20), (3, 5))
+COTIZACIONES_POR_VEHICULO = ((1, 55), (2, 30), (3, 10), (4, 5))
+COTIZACION_ESTATUS = (
+    (Cotizacion.Estatus.BORRADOR, 15),
+    (Cotizacion.Estatus.ENVIADA, 35),
+    (Cotizacion.Estatus.RECHAZADA, 20),
+    (Cotizacion.Estatus.VENCIDA, 30),
+)
+COTIZACION_ORIGEN = (
+    (Cotizacion.Origen.PORTAL_PUBLICO, 30),
+    (Cotizacion.Origen.CRM, 30),
+    (Cotizacion.Origen.AGENTE, 35),
+    (Cotizacion.Origen.API, 5),
+)
+USOS = ((Vehiculo.TipoUso.PARTICULAR, 80), (Vehiculo.TipoUso.PLATAFORMA, 10), (Vehiculo.TipoUso.COMERCIAL, 7), (Vehiculo.TipoUso.CARGA, 3))
+FORMA_PAGO = (
+    (FormaPagoChoices.CONTADO, 40),
+    (FormaPagoChoices.MENSUAL, 35),
+    (FormaPagoChoices.TRIMESTRAL, 10),
+    (FormaPagoChoices.SEMESTRAL, 15),
+)
+PAGOS_POR_FORMA = {
+    FormaPagoChoices.CONTADO: 1,
+    FormaPagoChoices.SEMESTRAL: 2,
+    FormaPagoChoices.TRIMESTRAL: 4,
+    FormaPagoChoices.MENSUAL: 12,
+}
+METODOS = ((Pago.Metodo.TARJETA, 45), (Pago.Metodo.SPEI, 25), (Pago.Metodo.MERCADOPAGO, 15), (Pago.Metodo.OXXO, 10), (Pago.Metodo.EFECTIVO, 5))
+
+PROB_PAGO_A_TIEMPO = 0.88       # pagos ya exigibles que se pagaron
+PROB_CANCELADA = 0.03
+PROB_COMISION_PAGADA = 0.85     # comisiones de más de 45 días
+PROB_PROVEEDOR_OK = 0.9
+
+IVA = Decimal("0.16")
+CENTAVOS = Decimal("0.01")
+
+
+def _elegir(rng, opciones):
+    valores, pesos = zip(*opciones)
+    return rng.choices(valores, pesos)[0]
+
+
+def _dinero(valor):
+    return Decimal(str(valor)).quantize(CENTAVOS)
+
+
+# ---------------------------------------------------------------------
+# PKs y fechas
+# ---------------------------------------------------------------------
+
+class Ids:
+    """Reparte PKs consecutivos por modelo a partir del máximo actual."""
+
+    def __init__(self):
+        self._siguiente = {}
+
+    def __call__(self, model):
+        if model not in self._siguiente:
+            maximo = model.objects.aggregate(m=Max("pk"))["m"] or 0
+            self._siguiente[model] = maximo + 1
+        valor = self._siguiente[model]
+        self._siguiente[model] += 1
+        return valor
+
+    def modelos(self):
+        return list(self._siguiente)
+
+
+def reset_sequences(models):
+    """Secuencias/autoincrement al día después de insertar PKs explícitos."""
+    sql = connection.ops.sequence_reset_sql(no_style(), models)
+    if sql:
+        with connection.cursor() as cursor:
+            for stmt in sql:
+                cursor.execute(stmt)
+
+
+@contextmanager
+def fechas_explicitas(models):
+    """
+    Apaga auto_now / auto_now_add de los modelos mientras dura el bloque,
+    para que created_at / updated_at sean los generados (los reportes
+    filtran por created_at) y no la hora de la carga.
+    """
+    cambiados = []
+    for model in models:
+        for f in model._meta.concrete_fields:
+            if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False):
+                cambiados.append((f, f.auto_now, f.auto_now_add))
+                f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in cambiados:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+def _numeros(nombre, n):
+    """n números de la secuencia de folios (en PostgreSQL el bloque es fijo)."""
+    out = []
+    while len(out) < n:
+        inicio, fin = folios.reserve_block(nombre, n - len(out))
+        out.extend(range(inicio, fin + 1))
+    return out[:n]
+
+
+# ---------------------------------------------------------------------
+# Generador
+# ---------------------------------------------------------------------
+
+# Orden de inserción: cada modelo después de aquellos a los que apunta
+ORDEN = (Cliente, Vehiculo, Cotizacion, CotizacionProveedor, Poliza, Pago, PolizaEvento, Comision)
+
+
+class Generador:
+    def __init__(self, volumen, *, seed=0, prefijo="syn", batch_size=2000):
+        self.volumen = volumen
+        self.rng = random.Random(seed)
+        self.prefijo = prefijo
+        self.batch_size = batch_size
+        self.ids = Ids()
+        self.ahora = timezone.now()
+        self.hoy = timezone.localdate()
+        self.total = Counter()
+
+    # -----------------------------------------------------------------
+    # Base: agentes, aseguradoras, configuraciones, catálogos
+    # -----------------------------------------------------------------
+
+    def preparar(self):
+        self.agentes = self._agentes()
+        # Carteras desiguales (Pareto): pocos agentes con muchos clientes
+        self.pesos_agentes = [self.rng.paretovariate(1.2) for _ in self.agentes]
+        self.proveedores = self._proveedores()
+        self._catalogos()
+
+    def _agentes(self):
+        User = get_user_model()
+        grupo, _ = Group.objects.get_or_create(name="Agente")
+        usernames = [f"{self.prefijo}-agente-{i:04d}" for i in range(self.volumen.agentes)]
+        existentes = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+
+        nuevos = []
+        for username in usernames:
+            if username in existentes:
+                continue
+            user = User(
+                pk=self.ids(User),
+                username=username,
+                first_name=self.rng.choice(NOMBRES),
+                last_name=self.rng.choice(APELLIDOS),
+                email=f"{username}@example.com",
+                is_active=True,
+            )
+            user.set_unusable_password()
+            nuevos.append(user)
+
+        if nuevos:
+            User.objects.bulk_create(nuevos, batch_size=self.batch_size)
+            UserProfile.objects.bulk_create(
+                [UserProfile(user_id=u.pk, rol=UserProfile.Rol.AGENTE) for u in nuevos],
+                batch_size=self.batch_size,
+            )
+            User.groups.through.objects.bulk_create(
+                [User.groups.through(user_id=u.pk, group_id=grupo.pk) for u in nuevos],
+                batch_size=self.batch_size,
+            )
+            self.total[User] += len(nuevos)
+
+        return list(User.objects.filter(username__in=usernames).order_by("username").values_list("pk", flat=True))
+
+    def _proveedores(self):
+        """(config, aseguradora, producto) por proveedor; configs inactivas."""
+        out = []
+        for provider, nombre in PROVEEDORES:
+            aseguradora, _ = Aseguradora.objects.get_or_create(nombre=nombre)
+            producto, _ = ProductoSeguro.objects.get_or_create(
+                aseguradora=aseguradora,
+                nombre_producto="Autos Amplia",
+            )
+            # Inactiva: el broker nunca debe cotizar contra estos datos
+            config, _ = AseguradoraConfiguracion.objects.get_or_create(
+                provider=provider,
+                ambiente=AseguradoraConfiguracion.Ambiente.SIT,
+                ramo=AseguradoraConfiguracion.Ramo.AUTOS,
+                resource_id=self.prefijo,
+                defaults={
+                    "aseguradora": aseguradora,
+                    "nombre": f"{nombre} (sintético)",
+                    "activo": False,
+                    "base_url": "https://example.invalid",
+                },
+            )
+            out.append((config, aseguradora, producto))
+        return out
+
+    def _catalogos(self):
+        n = self.volumen.items_por_catalogo
+        for code, name in CATALOGOS:
+            catalog, _ = Catalog.objects.get_or_create(code=code, defaults={"name": name})
+            codigos = [f"{self.prefijo.upper()}-{i:06d}" for i in range(n)]
+            existentes = set(
+                CatalogItem.objects.filter(catalog=catalog, code__in=codigos).values_list("code", flat=True)
+            )
+            items = [
+                CatalogItem(
+                    pk=self.ids(CatalogItem),
+                    catalog=catalog,
+                    code=codigo,
+                    name=f"{name} {i}",
+                    sort_order=i,
+                )
+                for i, codigo in enumerate(codigos)
+                if codigo not in existentes
+            ]
+            if not items:
+                continue
+
+            # Cada proveedor mapea ~90% de los elementos (los huecos existen)
+            mapeos = [
+                ProviderCatalogMapping(
+                    pk=self.ids(ProviderCatalogMapping),
+                    provider=config,
+                    catalog=catalog,
+                    catalog_item=item,
+                    external_code=f"{config.provider}-{item.code}",
+                    external_name=item.name.upper(),
+                )
+                for config, _, _ in self.proveedores
+                for item in items
+                if self.rng.random() < 0.9
+            ]
+            with transaction.atomic():
+                CatalogItem.objects.bulk_create(items, batch_size=self.batch_size)
+                ProviderCatalogMapping.objects.bulk_create(mapeos, batch_size=self.batch_size)
+            self.total[CatalogItem] += len(items)
+            self.total[ProviderCatalogMapping] += len(mapeos)
+
+    # -----------------------------------------------------------------
+    # Lotes de clientes
+    # -----------------------------------------------------------------
+
+    def _momento(self):
+        """Instante en la historia, más denso hacia hoy."""
+        dias = self.volumen.dias * self.rng.random() ** 1.5
+        return self.ahora - timedelta(days=dias, seconds=self.rng.randint(0, 86399))
+
+    def lote(self, n):
+        """Genera e inserta n clientes con todo lo que cuelga de ellos."""
+        filas = {model: [] for model in ORDEN}
+        for _ in range(n):
+            self._cliente(filas)
+        self.asignar_folios(filas)
+
+        with fechas_explicitas(ORDEN), transaction.atomic():
+            for model in ORDEN:
+                model.objects.bulk_create(filas[model], batch_size=self.batch_size)
+                self.total[model] += len(filas[model])
+
+        return {model: len(objs) for model, objs in filas.items()}
+
+    def _cliente(self, filas):
+        rng = self.rng
+        alta = self._momento()
+        pk = self.ids(Cliente)
+        ciudad, estado, cp = rng.choice(ESTADOS)
+        nombre, apellido = rng.choice(NOMBRES), rng.choice(APELLIDOS)
+        empresa = rng.random() < 0.15
+        owner = rng.choices(self.agentes, self.pesos_agentes)[0] if self.agentes else None
+
+        cliente = Cliente(
+            pk=pk,
+            tipo_cliente=Cliente.TipoCliente.EMPRESA if empresa else Cliente.TipoCliente.PERSONA,
+            nombre_comercial=f"{apellido} y Asociados S.A. de C.V." if empresa else "",
+            nombre="" if empresa else nombre,
+            apellido_paterno="" if empresa else apellido,
+            apellido_materno="" if empresa else rng.choice(APELLIDOS),
+            email_principal=f"cliente{pk}@example.com",
+            telefono_principal=f"55{rng.randint(10_000_000, 99_999_999)}",
+            rfc="".join(rng.choices(string.ascii_uppercase, k=4)) + f"{rng.randint(0, 999999):06d}",
+            estatus=_elegir(rng, CLIENTE_ESTATUS),
+            origen=_elegir(rng, CLIENTE_ORIGEN),
+            owner_id=owner,
+            codigo_postal=f"{cp}{rng.randint(0, 999):03d}",
+            ciudad=ciudad,
+            estado=estado,
+            created_at=alta,
+            updated_at=alta,
+        )
+        filas[Cliente].append(cliente)
+
+        for _ in range(_elegir(rng, VEHICULOS_POR_CLIENTE)):
+            self._vehiculo(filas, cliente, alta)
+
+    def _vehiculo(self, filas, cliente, alta):
+        rng = self.rng
+        marca, submarca = rng.choice(VEHICULOS)
+        anio = self.hoy.year - min(int(rng.expovariate(1 / 5)), 18)
+        vehiculo = Vehiculo(
+            pk=self.ids(Vehiculo),
+            cliente_id=cliente.pk,
+            tipo_uso=_elegir(rng, USOS),
+            marca_texto=marca,
+            submarca_texto=submarca,
+            modelo_anio=anio,
+            vin="".join(rng.choices(string.ascii_uppercase + string.digits, k=17)),
+            placas="".join(rng.choices(string.ascii_uppercase, k=3)) + f"{rng.randint(0, 9999):04d}",
+            valor_comercial=_dinero(rng.uniform(120_000, 650_000) * 0.9 ** (self.hoy.year - anio)),
+            created_at=alta,
+            updated_at=alta,
+        )
+        filas[Vehiculo].append(vehiculo)
+
+        for _ in range(_elegir(rng, COTIZACIONES_POR_VEHICULO)):
+            self._cotizacion(filas, cliente, vehiculo, alta)
+
+    def _cotizacion(self, filas, cliente, vehiculo, alta):
+        rng = self.rng
+        creada = max(alta, self._momento())
+        desde = timezone.localtime(creada).date() + timedelta(days=rng.randint(0, 10))
+        emitida = rng.random() < self.volumen.conversion
+
+        cot = Cotizacion(
+            pk=self.ids(Cotizacion),
+            origen=_elegir(rng, COTIZACION_ORIGEN),
+            cliente_id=cliente.pk,
+            vehiculo_id=vehiculo.pk,
+            conductor_nombre=str(cliente),
+            conductor_edad=rng.randint(19, 75),
+            codigo_postal=cliente.codigo_postal,
+            ciudad=cliente.ciudad,
+            estado=cliente.estado,
+            tipo_cotizacion=Cotizacion.Tipo.INDIVIDUAL,
+            vigencia_desde=desde,
+            vigencia_hasta=desde + timedelta(days=365),
+            forma_pago_preferida=_elegir(rng, FORMA_PAGO),
+            estatus=Cotizacion.Estatus.EMITIDA if emitida else _elegir(rng, COTIZACION_ESTATUS),
+            owner_id=cliente.owner_id,
+            created_by_id=cliente.owner_id,
+            emitida_at=min(creada + timedelta(days=rng.randint(1, 10)), self.ahora) if emitida else None,
+            created_at=creada,
+            updated_at=creada,
+        )
+        filas[Cotizacion].append(cot)
+
+        # Un intento por proveedor; base de prima según el valor del auto
+        base = float(vehiculo.valor_comercial) * rng.uniform(0.035, 0.06)
+        ganador = None
+        for config, aseguradora, producto in self.proveedores:
+            ok = rng.random() < PROB_PROVEEDOR_OK
+            total = _dinero(base * rng.uniform(0.85, 1.15)) if ok else None
+            filas[CotizacionProveedor].append(CotizacionProveedor(
+                pk=self.ids(CotizacionProveedor),
+                cotizacion_id=cot.pk,
+                provider_code=config.provider,
+                success=ok,
+                elapsed_ms=int(rng.lognormvariate(7.2, 0.5)),
+                provider_quote_id=f"Q{cot.pk}-{config.pk}" if ok else "",
+                currency="MXN" if ok else "",
+                net_premium=_dinero(float(total) / 1.16 * 0.93) if ok else None,
+                fees=_dinero(float(total) / 1.16 * 0.07) if ok else None,
+                taxes=_dinero(float(total) - float(total) / 1.16) if ok else None,
+                total_premium=total,
+                error_message="" if ok else "Timeout del proveedor",
+                error_type="" if ok else "ProviderTimeout",
+                error_retryable=not ok,
+                created_at=creada,
+                updated_at=creada,
+            ))
+            if ok and (ganador is None or total < ganador[0]):
+                ganador = (total, aseguradora, producto)
+
+        if emitida and ganador is not None:
+            self._poliza(filas, cot, vehiculo, ganador)
+
+    def _poliza(self, filas, cot, vehiculo, ganador):
+        rng = self.rng
+        prima_total, aseguradora, producto = ganador
+        emision = timezone.localtime(cot.emitida_at).date()
+        desde = cot.vigencia_desde
+        hasta = cot.vigencia_hasta
+        forma_pago = cot.forma_pago_preferida or FormaPagoChoices.CONTADO
+
+        cancelada = rng.random() < PROB_CANCELADA
+        if cancelada:
+            estatus = Poliza.Estatus.CANCELADA
+        elif hasta < self.hoy:
+            estatus = Poliza.Estatus.VENCIDA
+        elif desde <= self.hoy:
+            estatus = Poliza.Estatus.VIGENTE
+        else:
+            estatus = Poliza.Estatus.EN_PROCESO
+
+        subtotal = _dinero(prima_total / (1 + IVA))
+        gastos = _dinero(min(subtotal * Decimal("0.07"), Decimal("900")))
+        poliza = Poliza(
+            pk=self.ids(Poliza),
+            cliente_id=cot.cliente_id,
+            vehiculo_id=vehiculo.pk,
+            aseguradora=aseguradora,
+            producto=producto,
+            numero_poliza="",  # se asigna por lote (reserve_block)
+            fecha_emision=emision,
+            vigencia_desde=desde,
+            vigencia_hasta=hasta,
+            estatus=estatus,
+            prima_neta=subtotal - gastos,
+            gastos_expedicion=gastos,
+            subtotal=subtotal,
+            iva=prima_total - subtotal,
+            prima_total=prima_total,
+            forma_pago=forma_pago,
+            agente_id=cot.owner_id,
+            fecha_cancelacion=emision + timedelta(days=rng.randint(30, 200)) if cancelada else None,
+            motivo_cancelacion=Poliza.MotivoCancelacion.FALTA_PAGO if cancelada else "",
+            created_at=cot.emitida_at,
+            updated_at=cot.emitida_at,
+        )
+        filas[Poliza].append(poliza)
+
+        actor = poliza.agente_id
+        eventos = [
+            (PolizaEvento.Tipo.CREADA, "Póliza creada", cot.emitida_at),
+        ]
+        if estatus != Poliza.Estatus.EN_PROCESO:
+            eventos.append((PolizaEvento.Tipo.MARCADA_VIGENTE, "Póliza marcada como vigente", cot.emitida_at + timedelta(hours=2)))
+
+        eventos += self._pagos(filas, poliza)
+
+        if poliza.agente_id:
+            eventos += self._comision(filas, poliza)
+        if cancelada:
+            eventos.append((PolizaEvento.Tipo.CANCELADA, "Póliza cancelada", self._instante(poliza.fecha_cancelacion)))
+        elif estatus == Poliza.Estatus.VENCIDA:
+            eventos.append((PolizaEvento.Tipo.POLIZA_VENCIDA, "Póliza vencida", self._instante(hasta + timedelta(days=1))))
+
+        filas[PolizaEvento].extend(
+            PolizaEvento(
+                pk=self.ids(PolizaEvento),
+                poliza_id=poliza.pk,
+                tipo=tipo,
+                titulo=titulo,
+                actor_id=actor,
+                created_at=cuando,
+            )
+            for tipo, titulo, cuando in eventos
+            if cuando <= self.ahora
+        )
+
+    def _instante(self, fecha):
+        return timezone.make_aware(
+            datetime.combine(fecha, time.min) + timedelta(seconds=self.rng.randint(8 * 3600, 20 * 3600))
+        )
+
+    def _pagos(self, filas, poliza):
+        """Plan de pagos de la póliza; regresa los eventos que genera."""
+        rng = self.rng
+        n = PAGOS_POR_FORMA.get(poliza.forma_pago, 1)
+        monto = _dinero(poliza.prima_total / n)
+        cancelada_desde = poliza.fecha_cancelacion
+        eventos = []
+
+        for i in range(n):
+            programada = poliza.vigencia_desde + timedelta(days=i * 365 // n)
+            vencimiento = programada + timedelta(days=15)
+            fecha_pago = None
+
+            if cancelada_desde and programada >= cancelada_desde:
+                estatus = Pago.Estatus.CANCELADO
+            elif programada > self.hoy:
+                estatus = Pago.Estatus.PENDIENTE
+            elif rng.random() < PROB_PAGO_A_TIEMPO:
+                estatus = Pago.Estatus.PAGADO
+                fecha_pago = min(programada + timedelta(days=rng.randint(-5, 14)), self.hoy)
+            elif vencimiento < self.hoy:
+                estatus = Pago.Estatus.VENCIDO
+            else:
+                estatus = Pago.Estatus.PENDIENTE
+
+            pagado = estatus == Pago.Estatus.PAGADO
+            creado = poliza.created_at
+            filas[Pago].append(Pago(
+                pk=self.ids(Pago),
+                poliza_id=poliza.pk,
+                cliente_id=poliza.cliente_id,
+                concepto=f"Pago {i + 1}/{n}",
+                monto=monto,
+                monto_pagado=monto if pagado else None,
+                estatus=estatus,
+                metodo=_elegir(rng, METODOS) if pagado else None,
+                referencia=f"SYN-{poliza.pk}-{i + 1}",
+                fecha_programada=programada,
+                fecha_vencimiento=vencimiento,
+                fecha_pago=fecha_pago,
+                created_at=creado,
+                updated_at=creado,
+            ))
+
+            if pagado:
+                eventos.append((PolizaEvento.Tipo.PAGO_PAGADO, f"Pago {i + 1}/{n} pagado", self._instante(fecha_pago)))
+            elif estatus == Pago.Estatus.VENCIDO:
+                eventos.append((PolizaEvento.Tipo.PAGO_VENCIDO, f"Pago {i + 1}/{n} vencido", self._instante(vencimiento + timedelta(days=1))))
+
+        return eventos
+
+    def _comision(self, filas, poliza):
+        rng = self.rng
+        porcentaje = Decimal(rng.choice((8, 10, 12, 15)))
+        antiguedad = (self.hoy - poliza.fecha_emision).days
+
+        fecha_pago = None
+        if poliza.estatus == Poliza.Estatus.CANCELADA:
+            estatus = Comision.Estatus.CANCELADA
+        elif antiguedad > 45 and rng.random() < PROB_COMISION_PAGADA:
+            estatus = Comision.Estatus.PAGADA
+            fecha_pago = poliza.fecha_emision + timedelta(days=rng.randint(20, 45))
+        else:
+            estatus = Comision.Estatus.PENDIENTE
+
+        filas[Comision].append(Comision(
+            pk=self.ids(Comision),
+            poliza_id=poliza.pk,
+            agente_id=poliza.agente_id,
+            porcentaje=porcentaje,
+            base_calculo=poliza.prima_neta,
+            monto_comision=_dinero(poliza.prima_neta * porcentaje / 100),
+            estatus=estatus,
+            fecha_generacion=poliza.fecha_emision,
+            fecha_pago=fecha_pago,
+            created_at=poliza.created_at,
+            updated_at=poliza.created_at,
+        ))
+
+        eventos = [(PolizaEvento.Tipo.COMISION_GENERADA, "Comisión generada", poliza.created_at + timedelta(hours=3))]
+        if fecha_pago:
+            eventos.append((PolizaEvento.Tipo.COMISION_PAGADA, "Comisión pagada", self._instante(fecha_pago)))
+        return eventos
+
+    # -----------------------------------------------------------------
+    # Folios
+    # -----------------------------------------------------------------
+
+    def asignar_folios(self, filas):
+        """Folios COT / números POL del lote, reservados por año como en las altas."""
+        por_anio = {}
+        for cot in filas[Cotizacion]:
+            por_anio.setdefault(cot.vigencia_desde.year, []).append(cot)
+        for anio, cots in por_anio.items():
+            for cot, n in zip(cots, _numeros(f"COT-{anio}", len(cots))):
+                cot.folio = f"COT-{anio}-{n:06d}"
+
+        por_anio = {}
+        for poliza in filas[Poliza]:
+            por_anio.setdefault(poliza.fecha_emision.year, []).append(poliza)
+        for anio, polizas in por_anio.items():
+            for poliza, n in zip(polizas, _numeros(f"POL-{anio}", len(polizas))):
+                poliza.numero_poliza = f"POL-{poliza.aseguradora_id}-{anio}-{n:06d}"
+
+
+def generar(volumen, *, seed=0, prefijo="syn", lote=1000, batch_size=2000, progreso=None):
+    """
+    Carga `volumen` completo por lotes de `lote` clientes. `progreso`
+    (opcional) recibe (clientes_cargados, filas_del_lote) tras cada lote.
+    Regresa un Counter de filas insertadas por modelo.
+    """
+    gen = Generador(volumen, seed=seed, prefijo=prefijo, batch_size=batch_size)
+    gen.preparar()
+
+    cargados = 0
+    while cargados < volumen.clientes:
+        filas = gen.lote(min(lote, volumen.clientes - cargados))
+        cargados += filas[Cliente]
+        if progreso:
+            progreso(cargados, filas)
+
+    reset_sequences(gen.ids.modelos())
+    return gen.total
@@ -0,0 +1,89 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from core.services import roles, search
+
+
+def _reindex(instance):
+    search.index_instance(instance)
+
+    # Los datos del cliente / póliza viven también en los documentos que
+    # los referencian (póliza, pago, cotización).
+    label = instance._meta.label
+    if label == "crm.Cliente":
+        for entidad, field in (
+            (search.Entidad.POLIZA, "cliente_id"),
+            (search.Entidad.PAGO, "cliente_id"),
+            (search.Entidad.COTIZACION, "cliente_id"),
+        ):
+            qs = search.indexable_queryset(entidad).filter(**{field: instance.pk})
+            search.index_objects(entidad, qs)
+    elif label == "polizas.Poliza":
+        qs = search.indexable_queryset(search.Entidad.PAGO).filter(poliza_id=instance.pk)
+        search.index_objects(search.Entidad.PAGO, qs)
+
+
+def search_index_on_save(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    transaction.on_commit(lambda: _reindex(instance))
+
+
+def search_index_on_delete(sender, instance, **kwargs):
+    search.remove_instance(sender, instance.pk)
+
+
+def connect_search_signals():
+    from django.apps import apps
+
+    for model_label, _related, _builder in search.REGISTRY.values():
+        model = apps.get_model(model_label)
+        post_save.connect(
+            search_index_on_save,
+            sender=model,
+            dispatch_uid=f"search_index_save_{model_label}",
+        )
+        post_delete.connect(
+            search_index_on_delete,
+            sender=model,
+            dispatch_uid=f"search_index_delete_{model_label}",
+        )
+
+
+# ---------------------------------------------------------------------
+# Snapshot de roles
+# ---------------------------------------------------------------------
+
+def roles_on_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear", "pre_clear"):
+        return
+
+    if not reverse:
+        # user.groups.add/remove/clear(...)
+        roles.forget(instance)
+        roles.invalidate_user(instance.pk)
+    elif pk_set:
+        # group.user_set.add/remove(...)
+        for user_id in pk_set:
+            roles.invalidate_user(user_id)
+    else:
+        # group.user_set.clear(): no sabemos a quién afectó
+        roles.invalidate_all()
+
+
+def roles_on_group_changed(sender, instance, **kwargs):
+    # Renombrar o borrar un grupo afecta a todos sus usuarios
+    roles.invalidate_all()
+
+
+def connect_roles_signals():
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group
+
+    m2m_changed.connect(
+        roles_on_groups_changed,
+        sender=get_user_model().groups.through,
+        dispatch_uid="roles_groups_changed",
+    )
+    post_save.connect(roles_on_group_changed, sender=Group, dispatch_uid="roles_group_save")
+    post_delete.connect(roles_on_group_changed, sender=Group, dispatch_uid="roles_group_delete")
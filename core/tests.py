@@ -1,3 +1,438 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+import environ
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from core.benchmarks import import_time
+from core.middleware import ProfilingMiddleware, RoleSnapshotMiddleware
+from core.models import FolioSequence, SearchDocument
+from core.services import cache as cache_ns
+from core.services import folios, profiling, roles, search, synthetic
+from cotizador.models import Cotizacion
+from crm.models import Cliente
+from finanzas.models import Pago
+from polizas.models import Poliza
+from seguros.database import database_config
+
+
+class TokenizeTests(SimpleTestCase):
+    def test_quita_acentos_y_parte_por_simbolos(self):
+        self.assertEqual(
+            search.tokenize("José Gómez-Núñez", "jose@correo.mx"),
+            {"jose", "gomez", "nunez", "correo", "mx"},
+        )
+
+    def test_query_vacia_no_tiene_terminos(self):
+        self.assertEqual(search.query_terms("  -- "), [])
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.agente = User.objects.create_user(username="agente", password="x")
+        self.otro = User.objects.create_user(username="otro", password="x")
+
+    def _cliente(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Cliente.objects.create(tipo_cliente=Cliente.TipoCliente.PERSONA, **kwargs)
+
+    def test_guardar_indexa_y_filtra_por_prefijo(self):
+        juan = self._cliente(nombre="Juan", apellido_paterno="Gómez", owner=self.agente)
+        self._cliente(nombre="Juana", apellido_paterno="Pérez", owner=self.agente)
+
+        qs = search.filter_queryset(Cliente.objects.all(), search.Entidad.CLIENTE, "juan gom")
+
+        self.assertEqual(list(qs), [juan])
+
+    def test_actualizar_reemplaza_tokens(self):
+        cliente = self._cliente(nombre="Juan", owner=self.agente)
+
+        cliente.nombre = "Pedro"
+        with self.captureOnCommitCallbacks(execute=True):
+            cliente.save()
+
+        qs = Cliente.objects.all()
+        self.assertFalse(search.filter_queryset(qs, search.Entidad.CLIENTE, "juan").exists())
+        self.assertTrue(search.filter_queryset(qs, search.Entidad.CLIENTE, "pedro").exists())
+
+    def test_borrar_quita_el_documento(self):
+        cliente = self._cliente(nombre="Juan", owner=self.agente)
+        cliente.delete()
+
+        self.assertFalse(SearchDocument.objects.filter(object_id=cliente.pk).exists())
+
+    def test_omnibox_respeta_cartera(self):
+        self._cliente(nombre="Juan", owner=self.agente)
+        self._cliente(nombre="Juan", owner=self.otro)
+
+        self.assertEqual(len(search.omnibox("juan")), 2)
+        self.assertEqual(len(search.omnibox("juan", owner_id=self.agente.id)), 1)
+
+    def test_rebuild_reindexa_lo_existente(self):
+        Cliente.objects.create(tipo_cliente=Cliente.TipoCliente.PERSONA, nombre="Sin", owner=self.agente)
+        self.assertFalse(SearchDocument.objects.exists())
+
+        self.assertEqual(search.rebuild(search.Entidad.CLIENTE), 1)
+        self.assertEqual(len(search.omnibox("sin")), 1)
+
+
+class RoleSnapshotTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="agente", password="x")
+        self.user.groups.add(Group.objects.create(name="Agente"))
+        self.user = get_user_model().objects.get(pk=self.user.pk)
+
+    def test_grupos_se_consultan_una_vez_por_request(self):
+        with self.assertNumQueries(1):
+            for _ in range(5):
+                snapshot = roles.roles_for(self.user)
+                self.assertTrue(snapshot.is_agente)
+                self.assertFalse(snapshot.is_supervisor)
+
+        self.assertEqual(snapshot.role, "AGENTE")
+
+    def test_sesion_reutiliza_el_snapshot(self):
+        session = {}
+        roles.roles_for(self.user, session)
+
+        otro_request = get_user_model().objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(roles.roles_for(otro_request, session).is_agente)
+
+    def test_cambio_de_grupos_invalida_la_sesion(self):
+        session = {}
+        roles.roles_for(self.user, session)
+
+        self.user.groups.add(Group.objects.create(name="Supervisor"))
+        self.assertTrue(roles.roles_for(self.user, session).is_supervisor)
+
+        otro_request = get_user_model().objects.get(pk=self.user.pk)
+        self.assertTrue(roles.roles_for(otro_request, session).is_supervisor)
+
+    def test_middleware_expone_request_roles(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        request.session = {}
+
+        middleware = RoleSnapshotMiddleware(lambda r: r)
+        request = middleware(request)
+
+        self.assertEqual(request.roles.role_label, "Agente")
+
+
+class CacheNamespaceTests(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def test_versionado_y_contadores(self):
+        ns = cache_ns.Namespace("prueba", ttl=60, versioned=True)
+        ns.set("a", 1)
+        self.assertEqual(ns.get("a"), 1)
+
+        ns.clear()
+        self.assertIsNone(ns.get("a"))
+        self.assertEqual(ns.stats(), {"sets": 1, "hits": 1, "misses": 1})
+
+    def test_l1_evita_ir_al_cache_compartido(self):
+        from django.core.cache import cache
+
+        ns = cache_ns.Namespace("prueba_l1", l1_ttl=60)
+        ns.set("a", "x")
+        cache.clear()  # el compartido ya no lo tiene; el L1 sí
+
+        self.assertEqual(ns.get("a"), "x")
+        self.assertEqual(ns.stats()["l1_hits"], 1)
+
+        ns.clear_local()
+        self.assertIsNone(ns.get("a"))
+
+    def test_get_or_set_espera_al_que_tiene_el_lock(self):
+        from django.core.cache import cache
+
+        ns = cache_ns.Namespace("prueba_lock")
+        llamadas = []
+
+        # Otro proceso tiene el lock y deja el valor mientras esperamos
+        cache.add(f"{ns.key('k')}:lock", 1, 5)
+        original_sleep = cache_ns.time.sleep
+
+        def sleep(segundos):
+            cache.set(ns.key("k"), "del otro")
+
+        cache_ns.time.sleep = sleep
+        try:
+            valor = ns.get_or_set("k", lambda: llamadas.append(1) or "mio", lock_timeout=5)
+        finally:
+            cache_ns.time.sleep = original_sleep
+
+        self.assertEqual(valor, "del otro")
+        self.assertEqual(llamadas, [])
+        self.assertEqual(ns.stats()["lock_waits"], 1)
+
+        # ttl callable (p.ej. expires_in de un token)
+        self.assertEqual(ns.get_or_set("t", lambda: {"ttl": 5}, ttl=lambda v: v["ttl"]), {"ttl": 5})
+
+@override_settings(FOLIO_BLOCK_SIZE=5)
+class FolioSequenceTests(TransactionTestCase):
+    def setUp(self):
+        folios.reset()
+        self.addCleanup(folios.reset)
+
+    def test_un_bloque_por_cada_n_folios(self):
+        valores = [folios.next_value("COT-2026") for _ in range(7)]
+
+        self.assertEqual(valores, [1, 2, 3, 4, 5, 6, 7])
+        # Dos bloques reservados: 1-5 y 6-10
+        self.assertEqual(FolioSequence.objects.get(nombre="COT-2026").ultimo, 10)
+
+    def test_bloques_de_otro_proceso_no_se_traslapan(self):
+        folios.next_value("POL-2026")
+
+        # Otro worker reserva su propio bloque
+        self.assertEqual(folios.reserve_block("POL-2026"), (6, 10))
+
+        folios.reset()  # reinicio: se pierde lo que quedaba (huecos)
+        self.assertEqual(folios.next_value("POL-2026"), 11)
+
+    def test_arranca_donde_va_la_secuencia(self):
+        FolioSequence.objects.create(nombre="COT-2030", ultimo=41)
+
+        self.assertEqual(folios.folio_cotizacion(2030), "COT-2030-000042")
+
+    def test_reserva_dentro_de_transaccion_revertida_no_se_reutiliza(self):
+        try:
+            with transaction.atomic():
+                self.assertEqual(folios.next_value("COT-2031"), 1)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        # El bloque se revirtió junto con la transacción y no quedó en memoria
+        self.assertEqual(folios.next_value("COT-2031"), 1)
+
+
+class DatabaseConfigTests(SimpleTestCase):
+    def _config(self, **environ_vars):
+        env = environ.Env()
+        env.ENVIRON = {
+            "MYSQL_DB": "seguros", "MYSQL_USER": "u", "MYSQL_PASSWORD": "p",
+            "POSTGRES_DB": "seguros", "POSTGRES_USER": "u", "POSTGRES_PASSWORD": "p",
+            **environ_vars,
+        }
+        return database_config(env)
+
+    def test_mysql_por_default_con_conexiones_persistentes(self):
+        config = self._config()
+
+        self.assertEqual(config["ENGINE"], "django.db.backends.mysql")
+        self.assertEqual(config["CONN_MAX_AGE"], 60)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("pool", config["OPTIONS"])
+
+    def test_postgresql_con_worker_async_usa_pool(self):
+        config = self._config(DB_ENGINE="postgresql", GUNICORN_WORKER_CLASS="uvicorn_worker.UvicornWorker")
+
+        self.assertEqual(config["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+        self.assertEqual(config["OPTIONS"]["pool"]["max_size"], 10)
+
+    def test_pool_forzado_en_worker_sync_es_chico(self):
+        config = self._config(DB_ENGINE="postgresql", DB_POOL="true", DB_POOL_MAX_SIZE="4")
+
+        self.assertEqual(config["OPTIONS"]["pool"]["min_size"], 1)
+        self.assertEqual(config["OPTIONS"]["pool"]["max_size"], 4)
+
+    def test_mysql_en_asgi_no_reutiliza_conexiones(self):
+        config = self._config(GUNICORN_WORKER_CLASS="uvicorn_worker.UvicornWorker")
+
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+
+    def test_engine_desconocido(self):
+        with self.assertRaises(ValueError):
+            self._config(DB_ENGINE="oracle")
+
+
+@override_settings(
+    PROFILING_ENABLED=True,
+    PROFILING_SAMPLE_RATE=1.0,
+    PROFILING_DUPLICATE_THRESHOLD=3,
+    PROFILING_BUFFER_SIZE=2,
+    PROFILING_BUDGET_QUERIES=3,
+)
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def _view(self, request):
+        from django.http import HttpResponse
+
+        for nombre in ("a", "b", "c", "d"):
+            list(Cliente.objects.filter(nombre=nombre))
+        ns = cache_ns.namespace("prueba_perfil")
+        ns.get("nada")
+        profiling.registrar_http("https://api.example.com/quote", 12.5)
+        return HttpResponse("ok")
+
+    def test_muestra_queries_duplicadas_cache_y_http(self):
+        request = RequestFactory().get("/ui/algo/")
+
+        with self.assertLogs("core.services.profiling", "WARNING"):
+            ProfilingMiddleware(self._view)(request)
+
+        muestra = profiling.muestras()[0]
+        self.assertEqual(muestra["sql_count"], 4)
+        self.assertEqual(muestra["duplicadas"][0]["veces"], 4)
+        self.assertEqual(muestra["cache"], {"misses": 1})
+        self.assertEqual(muestra["http"], {"api.example.com": {"ms": 12.5, "llamadas": 1}})
+        self.assertEqual(len(muestra["excesos"]), 2)
+
+        # Fuera del request ya no se cuenta nada
+        list(Cliente.objects.all())
+        self.assertIsNone(profiling._actual.get())
+
+    def test_instalar_http_mide_httpx_async(self):
+        import httpx
+        from asgiref.sync import async_to_sync
+        from requests.adapters import HTTPAdapter
+
+        async def responder(transport, request):
+            return httpx.Response(200, request=request)
+
+        async def llamar():
+            async with httpx.AsyncClient() as client:
+                await client.get("https://chubb.example.com/token")
+
+        with mock.patch.object(profiling, "_instalado", False), \
+                mock.patch.object(HTTPAdapter, "send", HTTPAdapter.send), \
+                mock.patch.object(httpx.HTTPTransport, "handle_request", httpx.HTTPTransport.handle_request), \
+                mock.patch.object(httpx.AsyncHTTPTransport, "handle_async_request", responder):
+            profiling.instalar_http()
+
+            async_to_sync(llamar)()  # fuera de un request: no cuenta
+            perfil = profiling.Perfil("GET", "/")
+            token = profiling._actual.set(perfil)
+            try:
+                async_to_sync(llamar)()
+            finally:
+                profiling._actual.reset(token)
+
+        self.assertEqual(dict(perfil.http_count), {"chubb.example.com": 1})
+
+    def test_pool_de_cada_worker_en_las_muestras(self):
+        from django.http import HttpResponse
+
+        stats = {"default": {"pool_size": 4, "pool_available": 1, "requests_waiting": 2}}
+        with mock.patch.object(profiling, "pool_stats", return_value=stats):
+            ProfilingMiddleware(lambda r: HttpResponse("ok"))(RequestFactory().get("/"))
+
+        muestra = profiling.muestras()[0]
+        self.assertEqual(muestra["worker"], profiling.worker_id())
+        self.assertEqual(muestra["pool"], stats)
+
+        viejo = {**muestra, "ts": muestra["ts"] - 10, "pool": {"default": {"pool_size": 1}}}
+        otro = {**muestra, "worker": "web-2:7", "pool": {"default": {"pool_size": 8}}}
+        workers = profiling.pools([otro, muestra, viejo])
+        self.assertEqual(workers[profiling.worker_id()]["pool"], stats)
+        self.assertEqual(workers["web-2:7"]["pool"], {"default": {"pool_size": 8}})
+
+    def test_buffer_circular(self):
+        from django.http import HttpResponse
+
+        middleware = ProfilingMiddleware(lambda r: HttpResponse("ok"))
+        for path in ("/1/", "/2/", "/3/"):
+            middleware(RequestFactory().get(path))
+
+        self.assertEqual([m["path"] for m in profiling.muestras()], ["/3/", "/2/"])
+
+    @override_settings(PROFILING_SAMPLE_RATE=0.0)
+    def test_fuera_de_la_muestra_no_guarda(self):
+        from django.http import HttpResponse
+
+        ProfilingMiddleware(lambda r: HttpResponse("ok"))(RequestFactory().get("/"))
+
+        self.assertEqual(profiling.muestras(), [])
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_endpoint_json_solo_staff(self):
+        User = get_user_model()
+        self.client.force_login(User.objects.create_user(username="normal", password="x"))
+        self.assertEqual(self.client.get("/admin/perfiles.json").status_code, 302)
+
+        self.client.force_login(User.objects.create_user(username="staff", password="x", is_staff=True))
+        response = self.client.get("/admin/perfiles.json")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("muestras", response.json())
+        self.assertEqual(response.json()["pool"]["worker"], profiling.worker_id())
+        self.assertEqual(self.client.get("/admin/perfiles/").status_code, 200)
+
+
+class SyntheticDataTests(TestCase):
+    VOLUMEN = synthetic.Volumen(agentes=3, clientes=40, items_por_catalogo=5)
+
+    def test_genera_datos_consistentes(self):
+        total = synthetic.generar(self.VOLUMEN, seed=7, lote=15)
+
+        self.assertEqual(total[Cliente], 40)
+        self.assertEqual(Cliente.objects.count(), 40)
+        self.assertEqual(Pago.objects.count(), total[Pago])
+        self.assertGreater(total[Poliza], 0)
+
+        # El plan de pagos corresponde a la forma de pago
+        for poliza in Poliza.objects.all():
+            self.assertEqual(poliza.pagos.count(), synthetic.PAGOS_POR_FORMA[poliza.forma_pago])
+
+        # Folios únicos y fechas repartidas en la historia (no la hora de carga)
+        folios_cot = list(Cotizacion.objects.values_list("folio", flat=True))
+        self.assertEqual(len(folios_cot), len(set(folios_cot)))
+        self.assertGreater(Cliente.objects.values("created_at__date").distinct().count(), 10)
+
+        # Las altas normales siguen funcionando después de los PKs explícitos
+        nuevo = Cliente.objects.create(tipo_cliente=Cliente.TipoCliente.PERSONA, nombre="Nuevo")
+        self.assertGreater(nuevo.pk, max(Cliente.objects.exclude(pk=nuevo.pk).values_list("pk", flat=True)))
+
+    def test_mismo_seed_mismos_datos(self):
+        class Rollback(Exception):
+            pass
+
+        def corrida():
+            try:
+                with transaction.atomic():
+                    synthetic.generar(self.VOLUMEN, seed=3)
+                    filas = list(Pago.objects.order_by("pk").values_list("pk", "estatus", "monto", "fecha_programada"))
+                    raise Rollback
+            except Rollback:
+                return filas
+
+        self.assertEqual(corrida(), corrida())
+
+    @override_settings(DEBUG=False)
+    def test_comando_no_corre_sin_debug(self):
+        with self.assertRaises(CommandError):
+            call_command("generate_synthetic_data", clientes=1)
+
+
+class ImportTimeTests(SimpleTestCase):
+    def test_arrancar_no_carga_modulos_pesados(self):
+        # Intérprete nuevo: URLconf completo (todas las vistas)
+        resultado = import_time.medir(["urls"], repeticiones=1, top=0)
+
+        self.assertEqual(resultado["objetivos"]["urls"]["pesados"], [])
+
+    def test_comparar_marca_tiempo_y_pesados_nuevos(self):
+        baseline = {"objetivos": {"urls": {"ms_mediana": 100, "modulos": 900, "pesados": []}}}
+        actual = {"objetivos": {"urls": {"ms_mediana": 150, "modulos": 905, "pesados": ["openpyxl"]}}}
+
+        regresiones = import_time.comparar(actual, baseline, tolerancia=0.2)
+
+        self.assertEqual(regresiones, [
+            "urls ms_mediana: 100 -> 150",
+            "urls carga al arrancar: openpyxl",
+        ])
@@ -1,7 +1,12 @@
+from django.conf import settings
+from django.contrib import admin
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import redirect
+from django.http import JsonResponse
+from django.shortcuts import redirect, render
 from django.views import View
 
+from core.services import profiling
+
 # Al entrar a la pagina de inicio
 # Si el usuario esta autenticado se va al dashboard
 # Si es publico o cliente, se va a la pagina de inicio de portal:cotizar
@@ -16,4 +21,32 @@ class HomeRedirectView(View):
 
         # Público / clientes
         return redirect("portal:cotizar")
-    
\ No newline at end of file
+    
+
+# Perfilado (admin): buffer de muestras de core.services.profiling
+# ?excesos=1 deja solo las vistas sobre presupuesto
+
+def perfiles(request):
+    items = profiling.muestras(solo_excesos=bool(request.GET.get("excesos")))
+    return render(request, "core/admin_perfiles.html", {
+        **admin.site.each_context(request),
+        "title": "Perfilado de requests",
+        "muestras": items,
+        "habilitado": profiling.habilitado(),
+        "sample_rate": getattr(settings, "PROFILING_SAMPLE_RATE", 0),
+    })
+
+
+def perfiles_json(request):
+    todas = profiling.muestras()
+    items = [m for m in todas if m["excesos"]] if request.GET.get("excesos") else todas
+    return JsonResponse({
+        "muestras": items,
+        # Pool de psycopg3: el de este worker en vivo y el último que
+        # reportó cada worker en sus muestras
+        "pool": {
+            "worker": profiling.worker_id(),
+            "actual": profiling.pool_stats(),
+            "workers": profiling.pools(todas),
+        },
+    })
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-19 04:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('autos', '0002_alter_vehiculo_vin'),
+        ('cotizador', '0016_remove_cotizacionitem_uq_cotizacion_item_unico_and_more'),
+        ('crm', '0008_codigopostal_cliente_ciudad_cliente_estado_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cotizacion',
+            index=models.Index(fields=['-created_at', '-id'], name='cot_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cotizacion',
+            index=models.Index(fields=['owner', '-created_at', '-id'], name='cot_owner_created_idx'),
+        ),
+    ]
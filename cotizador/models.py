@@ -3,12 +3,12 @@ from django.db import models
 from django.db.models import Q
 from django.db.models.constraints import UniqueConstraint, CheckConstraint
 from core.models import TimeStampedModel, MoneyMixin
+from core.services import folios
 from crm.models import Cliente
 from autos.models import Vehiculo, Flotilla
 from catalogos.models import Aseguradora, ProductoSeguro, CoberturaCatalogo
 from tarifas.models import ReglaTarifa
 
-from django.db import transaction
 from django.utils import timezone
 from core.models import FormaPagoChoices
 
@@ -16,6 +16,8 @@ from core.models import FormaPagoChoices
 # Folios de Cotizaciones 
 # ---------------------------------------------------------------------
 class FolioCotizacionCounter(models.Model):
+    # Histórico: los folios ahora salen de core.FolioSequence por bloques
+    # (la migración core 0004 copió estos contadores).
     anio = models.PositiveIntegerField(unique=True)
     last = models.PositiveIntegerField(default=0)
 
@@ -24,11 +26,7 @@ class FolioCotizacionCounter(models.Model):
 
     @classmethod
     def next_folio(cls, anio: int) -> str:
-        with transaction.atomic():
-            counter, _ = cls.objects.select_for_update().get_or_create(anio=anio)
-            counter.last += 1
-            counter.save()
-            return f"COT-{anio}-{counter.last:06d}"
+        return folios.folio_cotizacion(anio)
 
 # ---------------------------------------------------------------------
 # Cotizaciones / Comparativos (A + B)
@@ -121,6 +119,9 @@ class Cotizacion(TimeStampedModel):
         indexes = [
             models.Index(fields=["cliente", "estatus", "created_at"]),
             models.Index(fields=["owner", "estatus"]),
+            # Listado de cotizaciones (keyset por created_at, id), general y por owner
+            models.Index(fields=["-created_at", "-id"], name="cot_created_id_idx"),
+            models.Index(fields=["owner", "-created_at", "-id"], name="cot_owner_created_idx"),
         ]
         permissions = [
             ("send_cotizacion", "Puede enviar cotización"),
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Mapping
+
+from django.db import transaction
+from django.utils import timezone
+
+from autos.models import Vehiculo, VehiculoCatalogo
+from cotizador.models import (
+    Cotizacion,
+    CotizacionItem,
+    CotizacionItemCalculo,
+    FolioCotizacionCounter,
+)
+from crm.models import Cliente
+from crm.services import codigos_postales
+
+
+@dataclass(frozen=True)
+class PortalIntakeContext:
+    """
+    Todo lo que se puede resolver antes de abrir la transacción.
+    """
+
+    codigo_postal: str
+    ciudad: str
+    estado: str
+    catalogo: VehiculoCatalogo
+    vigencia_desde: date
+    vigencia_hasta: date
+    folio: str
+
+
+class PortalQuoteIntakeService:
+    """
+    Alta de una cotización del portal público en una sola transacción:
+    cliente prospecto, vehículo, cotización y opciones del motor.
+
+    - CP y catálogo se resuelven antes (índice de CP en memoria; el
+      catálogo llega del form con marca/submarca ya cargadas).
+    - El folio se reserva antes de la transacción, así el candado del
+      contador dura solo ese UPDATE y no toda la captura. Si la
+      transacción falla el folio queda sin usar (huecos permitidos).
+    - Items y cálculos se insertan con bulk_create.
+    """
+
+    @classmethod
+    def resolve_context(cls, data: Mapping[str, Any]) -> PortalIntakeContext:
+        cp = codigos_postales.buscar(data["codigo_postal"])
+
+        hoy = timezone.localdate()
+
+        return PortalIntakeContext(
+            codigo_postal=data["codigo_postal"],
+            ciudad=cp.ciudad if cp else "",
+            estado=cp.estado if cp else "",
+            catalogo=data["catalogo"],
+            vigencia_desde=hoy,
+            vigencia_hasta=hoy + timedelta(days=365),
+            folio=FolioCotizacionCounter.next_folio(hoy.year),
+        )
+
+    @classmethod
+    def submit(cls, *, data: Mapping[str, Any], engine) -> Cotizacion:
+        ctx = cls.resolve_context(data)
+
+        with transaction.atomic():
+            cliente = cls._upsert_cliente(data, ctx)
+            vehiculo = cls._create_vehiculo(cliente, ctx)
+            cot = cls._create_cotizacion(data, ctx, cliente, vehiculo)
+
+            cls._save_results(cot, engine.quote(cot))
+
+        return cot
+
+    # -------------------------------------------------------------
+    # Pasos
+    # -------------------------------------------------------------
+
+    @classmethod
+    def _upsert_cliente(cls, data, ctx) -> Cliente:
+        campos = {
+            "tipo_cliente": Cliente.TipoCliente.PERSONA,
+            "nombre": data["nombre"],
+            "email_principal": data["email"],
+            "telefono_principal": data["telefono"],
+            "codigo_postal": ctx.codigo_postal,
+            "ciudad": ctx.ciudad,
+            "estado": ctx.estado,
+        }
+
+        cliente = (
+            Cliente.objects
+            .filter(email_principal=data["email"])
+            .order_by("-id")
+            .first()
+        )
+
+        if cliente is None:
+            return Cliente.objects.create(
+                estatus=Cliente.Estatus.PROSPECTO,
+                origen=Cotizacion.Origen.PORTAL_PUBLICO,
+                **campos,
+            )
+
+        # Actualizamos los datos de contacto capturados.
+        for field, value in campos.items():
+            setattr(cliente, field, value)
+        cliente.save()
+
+        return cliente
+
+    @classmethod
+    def _create_vehiculo(cls, cliente, ctx) -> Vehiculo:
+        catalogo = ctx.catalogo
+
+        return Vehiculo.objects.create(
+            cliente=cliente,
+            catalogo=catalogo,
+
+            # El modelo tiene PARTICULAR como default.
+            # Lo indicamos explícitamente porque es una regla
+            # del flujo público actual.
+            tipo_uso=Vehiculo.TipoUso.PARTICULAR,
+
+            marca_texto=catalogo.marca.nombre,
+            submarca_texto=catalogo.submarca.nombre,
+            modelo_anio=catalogo.anio,
+            version=catalogo.version or "",
+            tipo_vehiculo=catalogo.tipo_vehiculo or "",
+            valor_comercial=catalogo.valor_referencia,
+        )
+
+    @classmethod
+    def _create_cotizacion(cls, data, ctx, cliente, vehiculo) -> Cotizacion:
+        return Cotizacion.objects.create(
+            folio=ctx.folio,
+            cliente=cliente,
+            vehiculo=vehiculo,
+            flotilla=None,
+
+            tipo_cotizacion=Cotizacion.Tipo.INDIVIDUAL,
+
+            vigencia_desde=ctx.vigencia_desde,
+            vigencia_hasta=ctx.vigencia_hasta,
+
+            estatus=Cotizacion.Estatus.BORRADOR,
+            origen=Cotizacion.Origen.PORTAL_PUBLICO,
+
+            codigo_postal=ctx.codigo_postal,
+            ciudad=ctx.ciudad,
+            estado=ctx.estado,
+
+            conductor_nombre=data["nombre"],
+            conductor_genero=data["genero"],
+            conductor_edad=data["edad"],
+        )
+
+    @classmethod
+    def _save_results(cls, cot, results) -> list[CotizacionItem]:
+        if not results:
+            return []
+
+        items = CotizacionItem.objects.bulk_create([
+            CotizacionItem(
+                cotizacion=cot,
+                aseguradora_id=r.aseguradora_id,
+                producto_id=r.producto_id,
+
+                prima_neta=r.prima_neta,
+                derechos=r.derechos,
+                recargos=r.recargos,
+                descuentos=r.descuentos,
+                iva=r.iva,
+                prima_total=r.prima_total,
+
+                forma_pago=r.forma_pago,
+                meses=r.meses,
+                ranking=r.ranking,
+                seleccionada=False,
+            )
+            for r in results
+        ])
+
+        # MySQL no regresa los ids de un bulk_create; la cotización es
+        # nueva, así que sus items son justo los recién insertados.
+        if any(item.pk is None for item in items):
+            items = list(cot.items.order_by("id"))
+
+        CotizacionItemCalculo.objects.bulk_create([
+            CotizacionItemCalculo(
+                item=item,
+                prima_base=r.prima_base,
+                factor_total=r.factor_total,
+                detalle_json=r.detalle_json or {},
+            )
+            for item, r in zip(items, results)
+        ])
+
+        return items
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Mapping
 
+from asgiref.sync import sync_to_async
+
 from cotizador.models import (
     Cotizacion,
     CotizacionProveedor,
@@ -67,3 +69,36 @@ class CotizacionProviderService:
             attempt=attempt,
             request_json=request_json,
         )
+
+    async def aquote_many(
+        self,
+        *,
+        cotizacion: Cotizacion,
+        requests: Mapping[str, InternalQuoteRequest],
+        request_json: Mapping[str, Any] | None = None,
+    ) -> list[CotizacionProveedor]:
+        """
+        Cotiza con todos los proveedores en paralelo (QuoteService.aquote_many)
+        y persiste cada intento en el hilo del ORM, en el orden de `requests`.
+        """
+
+        if not isinstance(cotizacion, Cotizacion):
+            raise TypeError(
+                "cotizacion debe ser una instancia de Cotizacion."
+            )
+
+        batch = await self.quote_service.aquote_many(requests)
+
+        persist = sync_to_async(
+            self.persistence_service.persist,
+            thread_sensitive=True,
+        )
+
+        return [
+            await persist(
+                cotizacion=cotizacion,
+                attempt=attempt,
+                request_json=request_json,
+            )
+            for attempt in batch.attempts
+        ]
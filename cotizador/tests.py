@@ -4,7 +4,7 @@ from datetime import timedelta
 
 from django.test import TestCase
 from django.utils import timezone
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 from autos.models import Vehiculo, VehiculoCatalogo, Marca, SubMarca
 from crm.models import Cliente
@@ -24,6 +24,7 @@ from cotizador.services.provider_quote_service import (
 )
 from integrations.quotes.contracts import (
     QuoteAttempt,
+    QuoteBatchResult,
     QuoteCoverage,
     QuoteOption,
     QuoteProviderError,
@@ -527,6 +528,50 @@ class CotizacionProviderServiceTests(TestCase):
             registro_esperado,
         )
 
+    async def test_aquote_many_persiste_cada_intento_en_orden(self):
+        attempts = (
+            Mock(spec=QuoteAttempt, provider_code="CHUBB"),
+            Mock(spec=QuoteAttempt, provider_code="MOCK"),
+        )
+
+        provider = Mock()
+        provider.provider_code = "CHUBB"
+
+        quote_service = QuoteService(
+            providers=[provider],
+        )
+
+        quote_service.aquote_many = AsyncMock(
+            return_value=QuoteBatchResult(attempts=attempts),
+        )
+
+        persistence_service = Mock()
+        persistence_service.persist.side_effect = (
+            lambda **kwargs: kwargs["attempt"].provider_code
+        )
+
+        service = CotizacionProviderService(
+            quote_service=quote_service,
+            persistence_service=persistence_service,
+        )
+
+        requests = {
+            "CHUBB": self.request,
+            "MOCK": self.request,
+        }
+
+        registros = await service.aquote_many(
+            cotizacion=self.cotizacion,
+            requests=requests,
+        )
+
+        quote_service.aquote_many.assert_awaited_once_with(requests)
+
+        self.assertEqual(
+            registros,
+            ["CHUBB", "MOCK"],
+        )
+
 class QuoteRequestServiceTests(TestCase):
 
     def setUp(self):
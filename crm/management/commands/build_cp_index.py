@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from crm.services import codigos_postales
+
+
+class Command(BaseCommand):
+    help = "Genera el índice binario de códigos postales (SEPOMEX) y rangos de zonas de tarifa."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="Ruta del archivo (default: settings.CP_INDEX_PATH)")
+
+    def handle(self, *args, **options):
+        path = options["output"] or codigos_postales.default_path()
+        if not path:
+            raise CommandError("Define CP_INDEX_PATH o usa --output.")
+
+        inicio = time.monotonic()
+        total = codigos_postales.build_index(path)
+        elapsed = time.monotonic() - inicio
+
+        self.stdout.write(self.style.SUCCESS(f"{total} códigos postales en {path} ({elapsed:.1f}s)"))
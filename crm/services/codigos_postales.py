@@ -0,0 +1,311 @@
+# crm/services/codigos_postales.py
+"""
+Índice en memoria de códigos postales (SEPOMEX).
+
+CodigoPostal tiene ~145k renglones (uno por colonia). Para validar un CP,
+obtener ciudad/estado o resolver la zona de tarifa no hace falta ir a la
+base: build_cp_index genera un archivo binario con
+
+    - los CPs distintos como enteros ordenados (búsqueda binaria),
+    - por CP el índice de municipio, ciudad y estado en una tabla de
+      textos internados (cada nombre se guarda una sola vez),
+    - los rangos cp_inicio/cp_fin de ZonaTarifaDetalle ordenados.
+
+El archivo se abre con mmap, así que todos los workers de gunicorn
+comparten las mismas páginas y abrirlo no cuesta nada. Si el archivo no
+existe (desarrollo, tests) las funciones consultan la base como antes.
+
+Regenerar con `python manage.py build_cp_index` al actualizar SEPOMEX o
+las zonas de tarifa; los procesos detectan el archivo nuevo por mtime.
+"""
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+from django.conf import settings
+
+MAGIC = b"CPIX"
+FORMAT_VERSION = 1
+
+# magic, versión, n_cps, n_textos, bytes_textos, n_zonas
+_HEADER = struct.Struct("<4sIIIII")
+
+RECHECK_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class CPInfo:
+    codigo_postal: str
+    municipio: str
+    ciudad: str
+    estado: str
+
+
+def _cp_int(codigo_postal):
+    cp = (codigo_postal or "").strip()
+    if len(cp) != 5 or not cp.isdigit():
+        return None
+    return int(cp)
+
+
+def _range_int(value):
+    value = (value or "").strip()
+    return int(value) if value.isdigit() else None
+
+
+def default_path():
+    # CP_INDEX_PATH vacío desactiva el índice (todo va a la base)
+    return getattr(settings, "CP_INDEX_PATH", None) or None
+
+
+# ---------------------------------------------------------------------
+# Construcción
+# ---------------------------------------------------------------------
+
+def build_index(path=None):
+    """Genera el archivo del índice desde la base. Regresa el número de CPs."""
+    from crm.models import CodigoPostal
+    from tarifas.models import ZonaTarifaDetalle
+
+    path = path or default_path()
+    if not path:
+        raise ValueError("Define CP_INDEX_PATH o indica la ruta del índice.")
+
+    textos, posiciones = [], {}
+
+    def intern(value):
+        value = value or ""
+        if value not in posiciones:
+            posiciones[value] = len(textos)
+            textos.append(value)
+        return posiciones[value]
+
+    intern("")
+
+    por_cp = {}
+    for cp, municipio, ciudad, estado in (
+        CodigoPostal.objects
+        .order_by("codigo_postal", "id")
+        .values_list("codigo_postal", "municipio", "ciudad", "estado")
+        .iterator(chunk_size=5000)
+    ):
+        n = _cp_int(cp)
+        # Varias colonias por CP: se queda el primer renglón
+        if n is None or n in por_cp:
+            continue
+        por_cp[n] = (intern(municipio), intern(ciudad), intern(estado))
+
+    cps = sorted(por_cp)
+
+    zonas = []
+    for zona_id, inicio, fin in ZonaTarifaDetalle.objects.filter(
+        zona__is_active=True,
+    ).values_list("zona_id", "cp_inicio", "cp_fin"):
+        a, b = _range_int(inicio), _range_int(fin)
+        if a is None:
+            continue
+        zonas.append((a, b if b is not None else a, zona_id))
+    zonas.sort()
+
+    # Máximo acumulado de cp_fin: permite cortar la búsqueda hacia atrás
+    max_fin, acumulado = [], 0
+    for _inicio, fin, _zona in zonas:
+        acumulado = max(acumulado, fin)
+        max_fin.append(acumulado)
+
+    blob = b"".join(t.encode("utf-8") for t in textos)
+    offsets = [0]
+    for t in textos:
+        offsets.append(offsets[-1] + len(t.encode("utf-8")))
+
+    def u32(values):
+        return struct.pack(f"<{len(values)}I", *values)
+
+    partes = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, len(cps), len(textos), len(blob), len(zonas)),
+        u32(cps),
+        u32([por_cp[c][0] for c in cps]),
+        u32([por_cp[c][1] for c in cps]),
+        u32([por_cp[c][2] for c in cps]),
+        u32([z[0] for z in zonas]),
+        u32([z[1] for z in zonas]),
+        u32([z[2] for z in zonas]),
+        u32(max_fin),
+        u32(offsets),
+        blob,
+    ]
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        for parte in partes:
+            fh.write(parte)
+    # Reemplazo atómico: los workers que tienen mapeado el archivo viejo
+    # siguen leyendo su inodo hasta recargar.
+    os.replace(tmp, path)
+
+    return len(cps)
+
+
+# ---------------------------------------------------------------------
+# Lectura
+# ---------------------------------------------------------------------
+
+class CPIndex:
+    def __init__(self, path):
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n, n_textos, n_bytes, n_zonas = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Índice de CP inválido: {path}")
+
+        view = memoryview(self._mm)
+        pos = _HEADER.size
+
+        def take(count):
+            nonlocal pos
+            arr = view[pos:pos + 4 * count].cast("I")
+            pos += 4 * count
+            return arr
+
+        self.cps = take(n)
+        self._municipio = take(n)
+        self._ciudad = take(n)
+        self._estado = take(n)
+        self._zona_inicio = take(n_zonas)
+        self._zona_fin = take(n_zonas)
+        self._zona_id = take(n_zonas)
+        self._zona_max_fin = take(n_zonas)
+        self._offsets = take(n_textos + 1)
+        self._textos = view[pos:pos + n_bytes]
+        self._cache_textos = {}
+
+    def __len__(self):
+        return len(self.cps)
+
+    def _texto(self, i):
+        texto = self._cache_textos.get(i)
+        if texto is None:
+            texto = bytes(self._textos[self._offsets[i]:self._offsets[i + 1]]).decode("utf-8")
+            self._cache_textos[i] = texto
+        return texto
+
+    def _pos(self, n):
+        i = bisect_left(self.cps, n)
+        if i < len(self.cps) and self.cps[i] == n:
+            return i
+        return None
+
+    def exists(self, codigo_postal):
+        n = _cp_int(codigo_postal)
+        return n is not None and self._pos(n) is not None
+
+    def lookup(self, codigo_postal):
+        n = _cp_int(codigo_postal)
+        i = self._pos(n) if n is not None else None
+        if i is None:
+            return None
+        return CPInfo(
+            codigo_postal=f"{n:05d}",
+            municipio=self._texto(self._municipio[i]),
+            ciudad=self._texto(self._ciudad[i]),
+            estado=self._texto(self._estado[i]),
+        )
+
+    def zona_id(self, codigo_postal):
+        n = _cp_int(codigo_postal)
+        if n is None:
+            return None
+        # Rangos ordenados por inicio: se revisan los que empiezan <= n,
+        # del más cercano hacia atrás, hasta que ningún rango anterior
+        # pueda llegar a n.
+        i = bisect_right(self._zona_inicio, n)
+        while i > 0 and self._zona_max_fin[i - 1] >= n:
+            i -= 1
+            if self._zona_fin[i] >= n:
+                return self._zona_id[i]
+        return None
+
+
+_state = {"index": None, "path": None, "mtime": None, "checked": 0.0}
+
+
+def get_index():
+    """Índice mapeado del proceso, o None si no hay archivo."""
+    now = time.monotonic()
+    path = default_path()
+    if path is None:
+        return None
+
+    if _state["path"] == path and now - _state["checked"] < RECHECK_SECONDS:
+        return _state["index"]
+
+    _state["checked"] = now
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        _state.update(index=None, path=path, mtime=None)
+        return None
+
+    if _state["index"] is None or _state["path"] != path or _state["mtime"] != mtime:
+        _state.update(index=CPIndex(path), path=path, mtime=mtime)
+    return _state["index"]
+
+
+def reset():
+    _state.update(index=None, path=None, mtime=None, checked=0.0)
+
+
+# ---------------------------------------------------------------------
+# API
+# ---------------------------------------------------------------------
+
+def existe(codigo_postal):
+    index = get_index()
+    if index is not None:
+        return index.exists(codigo_postal)
+
+    from crm.models import CodigoPostal
+    return CodigoPostal.objects.filter(codigo_postal=codigo_postal).exists()
+
+
+def buscar(codigo_postal):
+    """CPInfo del código postal, o None."""
+    index = get_index()
+    if index is not None:
+        return index.lookup(codigo_postal)
+
+    from crm.models import CodigoPostal
+    cp = CodigoPostal.objects.filter(codigo_postal=codigo_postal).order_by("id").first()
+    if cp is None:
+        return None
+    return CPInfo(cp.codigo_postal, cp.municipio, cp.ciudad, cp.estado)
+
+
+def zona_para_cp(codigo_postal):
+    """id de ZonaTarifa cuyo rango cp_inicio/cp_fin contiene el CP, o None."""
+    index = get_index()
+    if index is not None:
+        return index.zona_id(codigo_postal)
+
+    n = _cp_int(codigo_postal)
+    if n is None:
+        return None
+
+    from tarifas.models import ZonaTarifaDetalle
+    for zona_id, inicio, fin in (
+        ZonaTarifaDetalle.objects
+        .filter(zona__is_active=True)
+        .exclude(cp_inicio="")
+        .values_list("zona_id", "cp_inicio", "cp_fin")
+    ):
+        a, b = _range_int(inicio), _range_int(fin)
+        if a is None:
+            continue
+        if a <= n <= (b if b is not None else a):
+            return zona_id
+    return None
@@ -1,3 +1,66 @@
-from django.test import TestCase
+import os
+import tempfile
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from crm.models import CodigoPostal
+from crm.services import codigos_postales
+from tarifas.models import ZonaTarifa, ZonaTarifaDetalle
+
+
+class CodigosPostalesIndexTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "cp_index.bin")
+
+        override = override_settings(CP_INDEX_PATH=self.path)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        codigos_postales.reset()
+        self.addCleanup(codigos_postales.reset)
+
+        for cp, colonia, municipio, estado in (
+            ("06700", "Roma Norte", "Cuauhtémoc", "Ciudad de México"),
+            ("06700", "Roma Sur", "Cuauhtémoc", "Ciudad de México"),
+            ("44100", "Centro", "Guadalajara", "Jalisco"),
+        ):
+            CodigoPostal.objects.create(
+                codigo_postal=cp, colonia=colonia, municipio=municipio,
+                ciudad=municipio, estado=estado,
+            )
+
+        self.cdmx = ZonaTarifa.objects.create(codigo="CDMX", nombre="CDMX")
+        ZonaTarifaDetalle.objects.create(zona=self.cdmx, cp_inicio="01000", cp_fin="16999")
+
+    def test_sin_archivo_consulta_la_base(self):
+        self.assertTrue(codigos_postales.existe("44100"))
+        self.assertEqual(codigos_postales.buscar("44100").estado, "Jalisco")
+        self.assertEqual(codigos_postales.zona_para_cp("06700"), self.cdmx.id)
+
+    def test_indice_responde_sin_consultas(self):
+        call_command("build_cp_index", stdout=open(os.devnull, "w"))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(codigos_postales.existe("06700"))
+            self.assertFalse(codigos_postales.existe("99999"))
+            self.assertFalse(codigos_postales.existe("abc"))
+
+            info = codigos_postales.buscar("06700")
+            self.assertEqual(info.municipio, "Cuauhtémoc")
+            self.assertEqual(info.estado, "Ciudad de México")
+
+            self.assertEqual(codigos_postales.zona_para_cp("06700"), self.cdmx.id)
+            self.assertIsNone(codigos_postales.zona_para_cp("44100"))
+
+    def test_reconstruir_reemplaza_el_indice(self):
+        codigos_postales.build_index()
+        self.assertEqual(len(codigos_postales.get_index()), 2)
+
+        CodigoPostal.objects.create(codigo_postal="64000", municipio="Monterrey", estado="Nuevo León")
+        codigos_postales.build_index()
+        codigos_postales.reset()
+
+        self.assertTrue(codigos_postales.existe("64000"))
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class DocumentosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'documentos'
+
+    def ready(self):
+        from documentos.signals import connect_documentos_signals
+
+        connect_documentos_signals()
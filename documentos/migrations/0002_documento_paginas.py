@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documento',
+            name='paginas',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -20,6 +20,7 @@ class Documento(TimeStampedModel):
     file = models.FileField(upload_to="docs/%Y/%m/")
     tamano = models.PositiveIntegerField(default=0)
     hash = models.CharField(max_length=64, blank=True, default="", db_index=True)
+    paginas = models.PositiveIntegerField(null=True, blank=True)
     subido_por = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="documentos_subidos"
     )
@@ -0,0 +1,168 @@
+# documentos/services/__init__.py
+"""
+Ingesta de documentos (pólizas, endosos, comprobantes de pago).
+
+Antes cada vista creaba el Documento a su manera: una leía el archivo
+completo a memoria para sacar el hash (con uploads de hasta 25 MB) y las
+otras no lo calculaban. Aquí todas pasan por guardar_documento:
+
+    - el archivo se escribe al storage por chunks y en esa misma lectura
+      se calcula el SHA-256, el tamaño y (si es PDF) el número de páginas,
+    - si ya existe un Documento con el mismo hash, el blob recién escrito
+      se borra y el nuevo Documento apunta al existente: un solo archivo
+      en disco, muchos Documento,
+    - al borrar un Documento, el archivo solo se elimina si ya ningún
+      otro lo usa (eliminar_documento).
+"""
+import hashlib
+import os
+import re
+
+from django.core.files import File
+from django.db import transaction
+
+from documentos.models import Documento
+
+CHUNK_SIZE = 64 * 1024
+
+# "/Type /Page" (no "/Pages") en objetos sin comprimir
+PDF_PAGE_RE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+PDF_PAGE_OVERLAP = 32
+
+EXT_TIPO = {
+    ".pdf": Documento.Tipo.PDF,
+    ".jpg": Documento.Tipo.IMG,
+    ".jpeg": Documento.Tipo.IMG,
+    ".png": Documento.Tipo.IMG,
+    ".webp": Documento.Tipo.IMG,
+    ".xml": Documento.Tipo.XML,
+    ".doc": Documento.Tipo.DOC,
+    ".docx": Documento.Tipo.DOC,
+}
+
+
+def tipo_por_nombre(nombre, content_type=""):
+    ext = os.path.splitext(nombre or "")[1].lower()
+    if ext in EXT_TIPO:
+        return EXT_TIPO[ext]
+    content_type = (content_type or "").lower()
+    if content_type == "application/pdf":
+        return Documento.Tipo.PDF
+    if content_type.startswith("image/"):
+        return Documento.Tipo.IMG
+    return Documento.Tipo.OTRO
+
+
+class HashingFile(File):
+    """
+    Envuelve el upload: todo lo que el storage lee pasa por aquí y se va
+    acumulando en el hash, el tamaño y el conteo de páginas. Si el storage
+    vuelve al inicio (seek(0)) se reinicia.
+    """
+
+    def __init__(self, file, name=None, contar_paginas=False):
+        super().__init__(file, name=name)
+        self.contar_paginas = contar_paginas
+        self._reset()
+
+    def _reset(self):
+        self.sha256 = hashlib.sha256()
+        self.leidos = 0
+        self.paginas = 0
+        self._cola = b""
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if offset == 0 and whence == os.SEEK_SET:
+            self._reset()
+        return self.file.seek(offset, whence)
+
+    def read(self, *args):
+        data = self.file.read(*args)
+        if data:
+            self.sha256.update(data)
+            self.leidos += len(data)
+            if self.contar_paginas:
+                # la cola cubre el patrón partido entre dos chunks
+                ventana = self._cola + data
+                self.paginas += len(PDF_PAGE_RE.findall(ventana)) - len(PDF_PAGE_RE.findall(self._cola))
+                self._cola = ventana[-PDF_PAGE_OVERLAP:]
+        return data
+
+    @property
+    def hexdigest(self):
+        return self.sha256.hexdigest()
+
+
+def _paginas_pypdf(field_file):
+    # PDFs con object streams (comprimidos) no exponen "/Type /Page" en claro
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    try:
+        with field_file.open("rb") as fh:
+            return len(PdfReader(fh).pages)
+    except Exception:
+        return None
+
+
+def guardar_documento(archivo, *, tipo=None, nombre_archivo=None, subido_por=None):
+    """
+    Crea un Documento a partir de un UploadedFile (o cualquier File),
+    deduplicando por SHA-256.
+    """
+    nombre_archivo = (nombre_archivo or "").strip() or archivo.name
+    tipo = tipo or tipo_por_nombre(archivo.name, getattr(archivo, "content_type", ""))
+
+    field = Documento._meta.get_field("file")
+    storage = field.storage
+
+    contenido = HashingFile(archivo, name=archivo.name, contar_paginas=(tipo == Documento.Tipo.PDF))
+    contenido.seek(0)
+    nombre = storage.save(field.generate_filename(None, os.path.basename(archivo.name)), contenido, max_length=field.max_length)
+    hash_archivo = contenido.hexdigest
+
+    existente = (
+        Documento.objects
+        .filter(hash=hash_archivo)
+        .exclude(file="")
+        .values_list("file", "paginas")
+        .first()
+    )
+    if existente and existente[0] != nombre and storage.exists(existente[0]):
+        storage.delete(nombre)
+        nombre, paginas = existente
+    else:
+        paginas = contenido.paginas if tipo == Documento.Tipo.PDF else None
+
+    doc = Documento(
+        nombre_archivo=nombre_archivo,
+        tipo=tipo,
+        tamano=contenido.leidos,
+        hash=hash_archivo,
+        paginas=paginas,
+        subido_por=subido_por if getattr(subido_por, "is_authenticated", False) else None,
+    )
+    doc.file.name = nombre
+
+    if tipo == Documento.Tipo.PDF and not doc.paginas:
+        doc.paginas = _paginas_pypdf(doc.file)
+
+    try:
+        with transaction.atomic():
+            doc.save()
+    except Exception:
+        if not existente or existente[0] != nombre:
+            storage.delete(nombre)
+        raise
+    return doc
+
+
+def eliminar_documento(documento):
+    """Borra el Documento; el archivo solo si ningún otro Documento lo comparte."""
+    archivo = documento.file
+    nombre = archivo.name if archivo else ""
+    documento.delete()
+
+    if nombre and not Documento.objects.filter(file=nombre).exists():
+        archivo.storage.delete(nombre)
@@ -0,0 +1,179 @@
+# documentos/services/entrega.py
+"""
+Entrega de documentos (descarga / ver en línea).
+
+Antes documento_download autorizaba con hasta cinco consultas (grupo,
+Poliza, Cliente, Pago, Cliente otra vez) y luego mandaba el archivo con
+FileResponse, ocupando un worker de gunicorn toda la transferencia.
+Ahora:
+
+    - una sola consulta: el Documento con EXISTS hacia Poliza, Pago
+      (comprobante) y Endoso, y de ahí al agente / cliente del portal,
+    - la decisión (y los datos del archivo) se memoriza en cache por
+      (usuario, documento) DOCUMENTOS_ACCESO_TTL segundos; la llave lleva
+      la versión del usuario, que documentos.signals sube cuando cambia
+      el agente / cliente / documento de la póliza, el comprobante de un
+      pago, el portal del cliente o los permisos del usuario,
+    - con DOCUMENTOS_X_ACCEL el archivo lo envía nginx (X-Accel-Redirect a
+      una location internal); nginx resuelve Range y condicionales.
+      Sin nginx (desarrollo) se usa FileResponse como antes.
+    - ETag = hash del contenido: If-None-Match regresa 304 sin tocar el
+      archivo.
+"""
+import mimetypes
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db.models import Exists, OuterRef, Q
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import content_disposition_header, parse_etags
+
+from core.services import cache
+from documentos.models import Documento
+
+
+CACHE = cache.namespace("documentos", ttl_setting="DOCUMENTOS_ACCESO_TTL", ttl=60)
+VERSIONES = cache.namespace("documentos_version", ttl=None)
+
+_GLOBAL_VERSION_KEY = "version:global"
+
+
+def _version_key(user_id):
+    return f"version:{user_id}"
+
+
+def _version(user_id):
+    # Una sola ida al cache por las dos versiones
+    found = VERSIONES.get_many([_GLOBAL_VERSION_KEY, _version_key(user_id)])
+    return f"{found.get(_GLOBAL_VERSION_KEY, 0)}.{found.get(_version_key(user_id), 0)}"
+
+
+def _key(user_id, documento_id):
+    return f"acceso:{user_id}:{_version(user_id)}:{documento_id}"
+
+
+def _de_usuario(user_id, prefix=""):
+    # Agente de la póliza o cliente con portal activo
+    return Q(**{f"{prefix}agente_id": user_id}) | Q(**{
+        f"{prefix}cliente__user_portal_id": user_id,
+        f"{prefix}cliente__portal_activo": True,
+    })
+
+
+def _cargar(user_id, documento_id):
+    from finanzas.models import Pago
+    from polizas.models import Endoso, Poliza
+
+    polizas = Poliza.objects.filter(documento_id=OuterRef("pk"))
+    pagos = Pago.objects.filter(comprobante_id=OuterRef("pk"))
+    endosos = Endoso.objects.filter(documento_id=OuterRef("pk"))
+
+    row = (
+        Documento.objects
+        .filter(pk=documento_id)
+        .annotate(
+            en_poliza=Exists(polizas),
+            en_pago=Exists(pagos),
+            en_endoso=Exists(endosos),
+            poliza_propia=Exists(polizas.filter(_de_usuario(user_id))),
+            pago_propio=Exists(pagos.filter(_de_usuario(user_id, "poliza__"))),
+            endoso_propio=Exists(endosos.filter(_de_usuario(user_id, "poliza__"))),
+        )
+        .values(
+            "file", "nombre_archivo", "hash", "tamano", "updated_at",
+            "en_poliza", "en_pago", "en_endoso", "poliza_propia", "pago_propio", "endoso_propio",
+        )
+        .first()
+    )
+    if row is None:
+        return {"existe": False}
+
+    return {
+        "existe": True,
+        "file": row["file"],
+        "nombre": row["nombre_archivo"],
+        "tamano": row["tamano"],
+        "etag": row["hash"] or f"{documento_id}-{row['tamano']}-{int(row['updated_at'].timestamp())}",
+        "vinculado": row["en_poliza"] or row["en_pago"] or row["en_endoso"],
+        "propio": row["poliza_propia"] or row["pago_propio"] or row["endoso_propio"],
+    }
+
+
+def acceso_documento(user, documento_id):
+    """
+    Datos del documento, si el usuario es dueño (agente o cliente del
+    portal) y si tiene el permiso de descarga.
+    """
+    def cargar():
+        acceso = _cargar(user.pk, documento_id)
+        acceso["puede_descargar"] = user.has_perm("documentos.download_documento")
+        return acceso
+
+    return CACHE.get_or_set(_key(user.pk, documento_id), cargar)
+
+
+def invalidate(*user_ids):
+    """Descarta los accesos memorizados de esos usuarios (todos sus documentos)."""
+    for user_id in {u for u in user_ids if u}:
+        VERSIONES.incr(_version_key(user_id))
+
+
+def invalidate_all():
+    VERSIONES.incr(_GLOBAL_VERSION_KEY)
+
+
+def autorizar(request, documento_id, *, descarga=True):
+    """
+    Regresa el acceso o lanza Http404 / PermissionDenied.
+
+    descarga=True (documento_download): requiere download_documento y,
+    salvo Admin/Supervisor, ser dueño. descarga=False (ver_documento):
+    como antes, cualquier usuario interno; los del portal solo lo suyo.
+    """
+    acceso = acceso_documento(request.user, documento_id)
+
+    if descarga and not acceso["puede_descargar"]:
+        raise PermissionDenied("No tienes permiso para descargar documentos.")
+
+    if not acceso["existe"]:
+        raise Http404("Documento no encontrado")
+
+    # Admin/Supervisor: acceso total
+    if request.roles.is_supervisor or (not descarga and request.roles.is_internal):
+        return acceso
+
+    if not acceso["vinculado"]:
+        raise PermissionDenied("Documento no ligado a póliza/pago.")
+    if not acceso["propio"]:
+        raise PermissionDenied("No autorizado.")
+    return acceso
+
+
+def responder(request, acceso, *, as_attachment, content_type=None):
+    if not acceso["file"]:
+        raise Http404("Documento no encontrado")
+
+    etag = f'"{acceso["etag"]}"'
+    if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    content_type = content_type or mimetypes.guess_type(acceso["nombre"])[0] or "application/octet-stream"
+
+    if getattr(settings, "DOCUMENTOS_X_ACCEL", False):
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = getattr(settings, "DOCUMENTOS_X_ACCEL_PREFIX", "/_protected/media/") + quote(acceso["file"])
+        response["Content-Disposition"] = content_disposition_header(as_attachment, acceso["nombre"])
+    else:
+        storage = Documento._meta.get_field("file").storage
+        try:
+            fh = storage.open(acceso["file"], "rb")
+        except FileNotFoundError:
+            raise Http404("Archivo no existe")
+        response = FileResponse(fh, as_attachment=as_attachment, filename=acceso["nombre"], content_type=content_type)
+
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, max-age=0, must-revalidate"
+    return response
@@ -0,0 +1,114 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+
+from documentos.services import entrega
+
+# Campos de los que depende el acceso a un documento (ver entrega._cargar)
+CAMPOS = {
+    "polizas.Poliza": ("agente_id", "cliente_id", "documento_id"),
+    "polizas.Endoso": ("poliza_id", "documento_id"),
+    "finanzas.Pago": ("poliza_id", "comprobante_id"),
+    "crm.Cliente": ("user_portal_id", "portal_activo"),
+}
+ATTR = "_documentos_acceso_antes"
+
+
+def _usuarios_de_polizas(poliza_ids):
+    from polizas.models import Poliza
+
+    users = set()
+    for agente_id, portal_id in (
+        Poliza.objects.filter(pk__in=[p for p in poliza_ids if p])
+        .values_list("agente_id", "cliente__user_portal_id")
+    ):
+        users.update((agente_id, portal_id))
+    return users
+
+
+def _usuarios_de_clientes(cliente_ids):
+    from crm.models import Cliente
+
+    return set(
+        Cliente._base_manager.filter(pk__in=[c for c in cliente_ids if c])
+        .values_list("user_portal_id", flat=True)
+    )
+
+
+def _afectados(label, antes, ahora):
+    if label == "crm.Cliente":
+        return {antes["user_portal_id"], ahora["user_portal_id"]}
+    if label == "polizas.Poliza":
+        return {antes["agente_id"], ahora["agente_id"]} | _usuarios_de_clientes(
+            {antes["cliente_id"], ahora["cliente_id"]}
+        )
+    return _usuarios_de_polizas({antes["poliza_id"], ahora["poliza_id"]})
+
+
+def _foto(instance, campos):
+    # Solo lo que ya está cargado: leer un campo diferido haría un SELECT
+    return {campo: instance.__dict__[campo] for campo in campos if campo in instance.__dict__}
+
+
+def acceso_antes(sender, instance, **kwargs):
+    # post_init: los valores con los que se cargó la instancia, sin consultar
+    instance.__dict__[ATTR] = _foto(instance, CAMPOS[sender._meta.label])
+
+
+def acceso_cambio(sender, instance, created=False, **kwargs):
+    campos = CAMPOS[sender._meta.label]
+    antes = instance.__dict__.get(ATTR)
+    ahora = _foto(instance, campos)
+    # Lo guardado pasa a ser la referencia para el siguiente save()
+    instance.__dict__[ATTR] = ahora
+    if kwargs.get("raw") or created or antes is None or ahora == antes:
+        return
+
+    if len(antes) < len(campos) or len(ahora) < len(campos):
+        # Cargado con only()/defer(): sin todos los campos no sabemos a
+        # quién afectaba el cambio.
+        transaction.on_commit(entrega.invalidate_all)
+        return
+
+    users = _afectados(sender._meta.label, antes, ahora)
+    # Después del commit: si se borra antes, otro request podría volver
+    # a guardar el acceso con los datos viejos.
+    transaction.on_commit(lambda: entrega.invalidate(*users))
+
+
+def permisos_de_usuario(sender, instance, action, reverse, pk_set, **kwargs):
+    # user.user_permissions / user.groups (el permiso puede venir del grupo)
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        transaction.on_commit(lambda: entrega.invalidate(instance.pk))
+    elif pk_set:
+        transaction.on_commit(lambda: entrega.invalidate(*pk_set))
+    else:
+        transaction.on_commit(entrega.invalidate_all)
+
+
+def permisos_de_grupo(sender, action, **kwargs):
+    # group.permissions: no sabemos a quién afectó
+    if action in ("post_add", "post_remove", "post_clear"):
+        transaction.on_commit(entrega.invalidate_all)
+
+
+def grupo_borrado(sender, instance, **kwargs):
+    transaction.on_commit(entrega.invalidate_all)
+
+
+def connect_documentos_signals():
+    from django.apps import apps
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group
+
+    for label in CAMPOS:
+        model = apps.get_model(label)
+        post_init.connect(acceso_antes, sender=model, dispatch_uid=f"documentos_acceso_antes_{label}")
+        post_save.connect(acceso_cambio, sender=model, dispatch_uid=f"documentos_acceso_cambio_{label}")
+
+    User = get_user_model()
+    for through in (User.user_permissions.through, User.groups.through):
+        m2m_changed.connect(permisos_de_usuario, sender=through, dispatch_uid=f"documentos_permisos_{through.__name__}")
+    m2m_changed.connect(permisos_de_grupo, sender=Group.permissions.through, dispatch_uid="documentos_permisos_grupo")
+    post_delete.connect(grupo_borrado, sender=Group, dispatch_uid="documentos_grupo_delete")
@@ -1,3 +1,205 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from autos.models import Vehiculo
+from catalogos.models import Aseguradora, ProductoSeguro
+from core.services.roles import roles_for
+from crm.models import Cliente
+from documentos import services
+from documentos.models import Documento
+from documentos.services import entrega
+from polizas.models import Poliza
+
+PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+    b"2 0 obj << /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 >> endobj\n"
+    b"3 0 obj << /Type /Page /Parent 2 0 R >> endobj\n"
+    b"4 0 obj << /Type/Page /Parent 2 0 R >> endobj\n"
+    b"%%EOF\n"
+)
+
+
+class GuardarDocumentoTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media)
+        self.override.enable()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media, ignore_errors=True)
+
+    def _upload(self, nombre="poliza.pdf", contenido=PDF):
+        return SimpleUploadedFile(nombre, contenido, content_type="application/pdf")
+
+    def test_hash_tamano_y_paginas_en_una_lectura(self):
+        import hashlib
+
+        doc = services.guardar_documento(self._upload())
+
+        self.assertEqual(doc.hash, hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(doc.tamano, len(PDF))
+        self.assertEqual(doc.tipo, Documento.Tipo.PDF)
+        self.assertEqual(doc.paginas, 2)
+        with doc.file.open("rb") as fh:
+            self.assertEqual(fh.read(), PDF)
+
+    def test_paginas_partidas_entre_chunks(self):
+        contenido = PDF.replace(b"%PDF-1.4\n", b"%PDF-1.4\n" + b"%" * 200 + b"\n")
+        archivo = services.HashingFile(self._upload(contenido=contenido), contar_paginas=True)
+
+        # chunks chicos: "/Type /Page" queda partido en varios
+        list(archivo.chunks(chunk_size=7))
+        self.assertEqual(archivo.paginas, 2)
+        self.assertEqual(archivo.leidos, len(contenido))
+
+    def test_contenido_repetido_comparte_blob(self):
+        a = services.guardar_documento(self._upload("a.pdf"))
+        b = services.guardar_documento(self._upload("b.pdf"), nombre_archivo="Póliza renovada")
+
+        self.assertEqual(a.file.name, b.file.name)
+        self.assertEqual(b.nombre_archivo, "Póliza renovada")
+        self.assertEqual(Documento.objects.filter(hash=a.hash).count(), 2)
+
+        storage = a.file.storage
+        _dirs, archivos = storage.listdir(a.file.name.rsplit("/", 1)[0])
+        self.assertEqual(len(archivos), 1)
+
+        # El archivo se conserva mientras otro Documento lo use
+        services.eliminar_documento(a)
+        self.assertTrue(storage.exists(b.file.name))
+        services.eliminar_documento(b)
+        self.assertFalse(storage.exists(b.file.name))
+
+
+class EntregaDocumentoTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media)
+        self.override.enable()
+        cache.clear()
+
+        User = get_user_model()
+        permiso = Permission.objects.get(codename="download_documento")
+        self.agente = User.objects.create_user(username="agente", password="x")
+        self.otro = User.objects.create_user(username="otro", password="x")
+        for user in (self.agente, self.otro):
+            user.user_permissions.add(permiso)
+
+        self.doc = services.guardar_documento(SimpleUploadedFile("poliza.pdf", PDF))
+        cliente = Cliente.objects.create(tipo_cliente=Cliente.TipoCliente.PERSONA, nombre="Ana")
+        aseguradora = Aseguradora.objects.create(nombre="Chubb")
+        self.poliza = Poliza.objects.create(
+            cliente=cliente,
+            vehiculo=Vehiculo.objects.create(cliente=cliente, marca_texto="Nissan", modelo_anio=2024),
+            aseguradora=aseguradora,
+            producto=ProductoSeguro.objects.create(aseguradora=aseguradora, nombre_producto="Autos"),
+            agente=self.agente,
+            numero_poliza="POL-1",
+            vigencia_desde=date(2025, 1, 1),
+            vigencia_hasta=date(2026, 1, 1),
+            documento=self.doc,
+            estatus=Poliza.Estatus.VIGENTE,
+        )
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media, ignore_errors=True)
+
+    def _request(self, user, **headers):
+        request = RequestFactory().get("/", **headers)
+        request.user = get_user_model().objects.get(pk=user.pk)
+        request.roles = roles_for(request.user)
+        return request
+
+    def test_autoriza_en_una_consulta_y_memoriza(self):
+        request = self._request(self.agente)
+
+        with self.assertNumQueries(3):  # documento + joins, permisos de usuario y de grupo
+            acceso = entrega.autorizar(request, self.doc.pk)
+        self.assertTrue(acceso["propio"])
+
+        otra_vez = self._request(self.agente)
+        with self.assertNumQueries(0):
+            entrega.autorizar(otra_vez, self.doc.pk)
+
+        with self.assertRaises(PermissionDenied):
+            entrega.autorizar(self._request(self.otro), self.doc.pk)
+
+    def test_cambio_de_agente_invalida_el_acceso_memorizado(self):
+        entrega.autorizar(self._request(self.agente), self.doc.pk)
+        with self.assertRaises(PermissionDenied):
+            entrega.autorizar(self._request(self.otro), self.doc.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.poliza.agente = self.otro
+            self.poliza.save()
+
+        with self.assertRaises(PermissionDenied):
+            entrega.autorizar(self._request(self.agente), self.doc.pk)
+        self.assertTrue(entrega.autorizar(self._request(self.otro), self.doc.pk)["propio"])
+
+    def test_guardar_no_consulta_los_valores_anteriores(self):
+        poliza = Poliza.objects.get(pk=self.poliza.pk)
+        entrega.autorizar(self._request(self.agente), self.doc.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                poliza.agente = self.otro
+                poliza.save(update_fields=["agente"])
+
+        # Antes del UPDATE no hay SELECT de los valores viejos
+        self.assertTrue(ctx.captured_queries[0]["sql"].startswith("UPDATE"))
+        with self.assertRaises(PermissionDenied):
+            entrega.autorizar(self._request(self.agente), self.doc.pk)
+
+    def test_portal_desactivado_invalida_el_acceso_memorizado(self):
+        portal = get_user_model().objects.create_user(username="ana", password="x")
+        portal.user_permissions.add(Permission.objects.get(codename="download_documento"))
+        cliente = self.poliza.cliente
+        cliente.user_portal = portal
+        cliente.save()
+        entrega.autorizar(self._request(portal), self.doc.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cliente.portal_activo = False
+            cliente.save()
+
+        with self.assertRaises(PermissionDenied):
+            entrega.autorizar(self._request(portal), self.doc.pk)
+
+    def test_quitar_permiso_invalida_el_acceso_memorizado(self):
+        entrega.autorizar(self._request(self.agente), self.doc.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.agente.user_permissions.clear()
+
+        with self.assertRaises(PermissionDenied):
+            entrega.autorizar(self._request(self.agente), self.doc.pk)
+
+    @override_settings(DOCUMENTOS_X_ACCEL=True, DOCUMENTOS_X_ACCEL_PREFIX="/_protected/media/")
+    def test_x_accel_y_etag(self):
+        acceso = entrega.autorizar(self._request(self.agente), self.doc.pk)
+
+        response = entrega.responder(self._request(self.agente), acceso, as_attachment=True)
+        self.assertEqual(response["X-Accel-Redirect"], f"/_protected/media/{self.doc.file.name}")
+        self.assertEqual(response["ETag"], f'"{self.doc.hash}"')
+        self.assertIn("attachment", response["Content-Disposition"])
+        self.assertEqual(response.content, b"")
+
+        response = entrega.responder(
+            self._request(self.agente, HTTP_IF_NONE_MATCH=f'"{self.doc.hash}"'), acceso, as_attachment=True,
+        )
+        self.assertEqual(response.status_code, 304)
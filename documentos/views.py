@@ -1,70 +1,22 @@
-from django.shortcuts import render
+import mimetypes
 
 from django.contrib.auth.decorators import login_required
-from django.core.exceptions import PermissionDenied
-from django.http import FileResponse
 from django.shortcuts import get_object_or_404, redirect
 from documentos.models import Documento
-from crm.models import Cliente
-from polizas.models import Poliza, Endoso
-from finanzas.models import Pago
+from documentos.services import entrega
+from polizas.models import Endoso
 from polizas.services import log_poliza_event
 from django.contrib import messages
 
 @login_required
 def documento_download(request, pk: int):
-    doc = get_object_or_404(Documento, pk=pk)
-
-    # Permiso base (si aún no lo estás asignando a clientes portal, puedes relajarlo temporalmente)
-    if not request.user.has_perm("documentos.download_documento"):
-        raise PermissionDenied("No tienes permiso para descargar documentos.")
-
-    # Admin/Supervisor: acceso total
-    if request.user.is_superuser or request.user.groups.filter(name__in=["Admin", "Supervisor"]).exists():
-        return FileResponse(doc.file.open("rb"), as_attachment=True, filename=doc.nombre_archivo)
-
-    # Buscar si el doc es la póliza PDF
-    pol = (
-        Poliza.objects
-        .filter(documento_id=doc.id)
-        .select_related("cliente")
-        .first()
-    )
-    if pol:
-        # Cliente portal: solo sus pólizas
-        if Cliente.objects.filter(user_portal=request.user, portal_activo=True, id=pol.cliente_id).exists():
-            return FileResponse(doc.file.open("rb"), as_attachment=True, filename=doc.nombre_archivo)
-
-        # Agente: solo su cartera
-        if pol.agente_id == request.user.id:
-            return FileResponse(doc.file.open("rb"), as_attachment=True, filename=doc.nombre_archivo)
-
-        raise PermissionDenied("No autorizado.")
-
-    # Buscar si el doc es comprobante de pago
-    pago = (
-        Pago.objects
-        .filter(comprobante_id=doc.id)
-        .select_related("poliza__cliente")
-        .first()
-    )
-    if pago:
-        # Cliente portal: solo sus pagos
-        if Cliente.objects.filter(user_portal=request.user, portal_activo=True, id=pago.poliza.cliente_id).exists():
-            return FileResponse(doc.file.open("rb"), as_attachment=True, filename=doc.nombre_archivo)
-
-        # Agente: solo su cartera
-        if pago.poliza.agente_id == request.user.id:
-            return FileResponse(doc.file.open("rb"), as_attachment=True, filename=doc.nombre_archivo)
-
-        raise PermissionDenied("No autorizado.")
-
-    # Documento huérfano
-    raise PermissionDenied("Documento no ligado a póliza/pago.")
+    # Autorización en una consulta (memorizada); el archivo lo manda nginx si está X-Accel
+    acceso = entrega.autorizar(request, pk)
+    return entrega.responder(request, acceso, as_attachment=True)
 
 
 # Subir comprobante de Endoso
-import hashlib
+from documentos.services import guardar_documento
 
 def subir_endoso_pdf(request, endoso_id):
     endoso = get_object_or_404(Endoso, id=endoso_id)
@@ -75,17 +27,11 @@ def subir_endoso_pdf(request, endoso_id):
         messages.error(request, "Debes seleccionar un archivo.")
         return redirect("ui:poliza_detail", pk=endoso.poliza_id)
 
-    # 🔹 calcular hash (opcional pero PRO)
-    hash_archivo = hashlib.sha256(archivo.read()).hexdigest()
-    archivo.seek(0)  # regresa el puntero)
-
-    doc = Documento.objects.create(
-        nombre_archivo=archivo.name,
+    # 🔹 hash, tamaño y páginas se calculan al escribir (por chunks, con dedupe)
+    doc = guardar_documento(
+        archivo,
         tipo=Documento.Tipo.OTRO,  # o puedes crear tipo ENDOSO
-        file=archivo,
-        tamano=archivo.size,
-        hash=hash_archivo,
-        subido_por=request.user if request.user.is_authenticated else None,
+        subido_por=request.user,
     )
 
     # 🔹 ligar documento al endoso
@@ -110,25 +56,11 @@ def subir_endoso_pdf(request, endoso_id):
     messages.success(request, "Documento adjuntado correctamente.")
     return redirect("ui:poliza_detail", pk=endoso.poliza_id)
 
-import os
-from django.http import FileResponse, Http404
-from django.shortcuts import get_object_or_404
-from django.contrib.auth.decorators import login_required
-
-from documentos.models import Documento
-
 # Usado en Ver Documento en Endoso, PolizaDetail, PolizaList
 @login_required
 def ver_documento(request, documento_id):
-    documento = get_object_or_404(Documento, id=documento_id)
-
-    if not documento.file:
-        raise Http404("Documento no encontrado")
-
-    try:
-        return FileResponse(
-            documento.file.open("rb"),
-            content_type="application/pdf"
-        )
-    except FileNotFoundError:
-        raise Http404("Archivo no existe")
+    acceso = entrega.autorizar(request, documento_id, descarga=False)
+    return entrega.responder(
+        request, acceso, as_attachment=False,
+        content_type=mimetypes.guess_type(acceso["nombre"] or "")[0] or "application/pdf",
+    )
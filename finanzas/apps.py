@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class FinanzasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'finanzas'
+
+    def ready(self):
+        from integrations import outbox
+        from finanzas.signals import connect_finanzas_signals
+        from finanzas.services.recordatorios_whatsapp import (
+            AL_ENVIAR_RECORDATORIO,
+            recordatorio_whatsapp_enviado,
+        )
+
+        outbox.register_handler(AL_ENVIAR_RECORDATORIO, recordatorio_whatsapp_enviado)
+        connect_finanzas_signals()
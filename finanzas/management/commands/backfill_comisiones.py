@@ -0,0 +1,46 @@
+# finanzas/management/commands/backfill_comisiones.py
+# Genera las comisiones faltantes de pólizas históricas (con agente),
+# por lotes: una consulta de existentes y un bulk_create por lote.
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+
+from finanzas.services.comisiones import generar_comisiones_lote
+from polizas.models import Poliza
+
+ESTATUS_DEFAULT = (Poliza.Estatus.VIGENTE, Poliza.Estatus.VENCIDA)
+
+
+class Command(BaseCommand):
+    help = "Backfill de comisiones para pólizas que no la tienen (idempotente)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--desde", help="vigencia_desde >= YYYY-MM-DD")
+        parser.add_argument("--hasta", help="vigencia_desde <= YYYY-MM-DD")
+        parser.add_argument("--estatus", action="append", default=[], help="Estatus de póliza (repetible; default VIGENTE y VENCIDA)")
+        parser.add_argument("--batch", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        qs = (
+            Poliza.objects
+            .filter(agente__isnull=False, estatus__in=options["estatus"] or ESTATUS_DEFAULT)
+            .exclude(comisiones__isnull=False)
+        )
+        if options["desde"]:
+            qs = qs.filter(vigencia_desde__gte=parse_date(options["desde"]))
+        if options["hasta"]:
+            qs = qs.filter(vigencia_desde__lte=parse_date(options["hasta"]))
+
+        dry = options["dry_run"]
+        batch = max(1, options["batch"])
+        modo = "[DRY RUN] " if dry else ""
+
+        ids = list(qs.order_by("id").values_list("id", flat=True))
+        total = 0
+        for i in range(0, len(ids), batch):
+            polizas = Poliza.objects.filter(pk__in=ids[i:i + batch]).only(
+                "id", "agente_id", "aseguradora_id", "producto_id", "prima_neta",
+            )
+            total += len(generar_comisiones_lote(polizas, dry_run=dry))
+
+        self.stdout.write(self.style.SUCCESS(f"{modo}Comisiones generadas: {total} de {len(ids)} pólizas"))
@@ -0,0 +1,55 @@
+# finanzas/management/commands/generar_planes_pagos.py
+# Genera planes de pago en lote (renovaciones / importaciones).
+# Con --dry-run solo muestra el diff contra los pagos actuales.
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from finanzas.models import Pago
+from finanzas.services.pagos import SIN_CAMBIOS, generar_planes_pagos
+from polizas.models import Poliza
+
+
+class Command(BaseCommand):
+    help = "Genera el plan de pagos de muchas pólizas con un solo bulk_create (idempotente)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poliza", type=int, action="append", default=[], help="id de póliza (repetible)")
+        parser.add_argument("--vigentes", action="store_true", help="Todas las pólizas vigentes")
+        parser.add_argument("--overwrite", action="store_true", help="Reemplaza planes distintos sin pagos con movimiento")
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--batch", type=int, default=500)
+        parser.add_argument("--verbose-diff", action="store_true")
+
+    def handle(self, *args, **options):
+        qs = Poliza.objects.all()
+        if options["poliza"]:
+            qs = qs.filter(pk__in=options["poliza"])
+        elif options["vigentes"]:
+            qs = qs.filter(estatus=Poliza.Estatus.VIGENTE)
+        else:
+            raise CommandError("Indica --poliza <id> o --vigentes.")
+
+        dry = options["dry_run"]
+        batch = max(1, options["batch"])
+        modo = "[DRY RUN] " if dry else ""
+
+        ids = list(qs.order_by("id").values_list("id", flat=True))
+        acciones = Counter()
+
+        for i in range(0, len(ids), batch):
+            polizas = Poliza.objects.filter(pk__in=ids[i:i + batch]).order_by("id")
+            for diff in generar_planes_pagos(polizas, overwrite=options["overwrite"], dry_run=dry):
+                acciones[diff.accion] += 1
+                if options["verbose_diff"] and diff.accion != SIN_CAMBIOS:
+                    self._print_diff(diff)
+
+        resumen = ", ".join(f"{k}={v}" for k, v in sorted(acciones.items())) or "sin pólizas"
+        self.stdout.write(self.style.SUCCESS(f"{modo}Planes de pago: {resumen}"))
+
+    def _print_diff(self, diff):
+        self.stdout.write(f"póliza {diff.poliza_id}: {diff.accion}")
+        for fecha, monto, estatus in diff.actuales:
+            self.stdout.write(f"  - {fecha} {monto} {Pago.Estatus(estatus).label}")
+        for cuota in diff.nuevas:
+            self.stdout.write(f"  + {cuota.fecha} {cuota.monto}")
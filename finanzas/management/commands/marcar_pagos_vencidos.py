@@ -5,10 +5,12 @@
 # Regla: SI fecha_programada y estatus=PENDIENTE → si fecha_programada < hoy --> VENCIDO.
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.utils import timezone
 from django.utils.timezone import localdate
 
 from finanzas.models import Pago, Poliza
 from polizas.services import log_poliza_event
+from portal.services import dashboard as portal_dashboard
 
 class Command(BaseCommand):
     help = "Actualiza estatus de pagos: PENDIENTE->VENCIDO por fecha, y PENDIENTE/VENCIDO->CANCELADO si póliza cancelada."
@@ -83,11 +85,20 @@ class Command(BaseCommand):
 
         # Modo rápido sin bitácora: bulk update
         if not log_poliza_event or not PolizaEvento:
-            upd_cancelar = qs_cancelar.update(estatus=Pago.Estatus.CANCELADO)
-            upd_vencer = qs_vencer.update(estatus=Pago.Estatus.VENCIDO)
+            # update() no dispara signals: se invalida a mano el dashboard del portal
+            clientes = set()
+            for qs in (qs_cancelar, qs_vencer):
+                for ids in qs.values_list("cliente_id", "poliza__cliente_id"):
+                    clientes.update(ids)
+
+            # updated_at a mano: update() no toca auto_now y la versión de los PDFs cacheados depende de él
+            ahora = timezone.now()
+            upd_cancelar = qs_cancelar.update(estatus=Pago.Estatus.CANCELADO, updated_at=ahora)
+            upd_vencer = qs_vencer.update(estatus=Pago.Estatus.VENCIDO, updated_at=ahora)
             self.stdout.write(self.style.SUCCESS(
                 f"Actualizados (sin bitácora): CANCELADO={upd_cancelar}, VENCIDO={upd_vencer}. (hoy={today})"
             ))
+            portal_dashboard.invalidate(*clientes)
             return
 
         # Con bitácora: iterar
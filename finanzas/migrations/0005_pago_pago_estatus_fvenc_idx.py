@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-19 04:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0008_codigopostal_cliente_ciudad_cliente_estado_and_more'),
+        ('documentos', '0001_initial'),
+        ('finanzas', '0004_seguimientocobranza_configuracioncomision'),
+        ('polizas', '0014_poliza_financiamiento_poliza_gastos_expedicion_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pago',
+            index=models.Index(fields=['estatus', 'fecha_vencimiento', 'id'], name='pago_estatus_fvenc_idx'),
+        ),
+    ]
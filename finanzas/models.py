@@ -179,6 +179,8 @@ class Pago(TimeStampedModel):
             models.Index(fields=["provider_preference_id"]),
             models.Index(fields=["referencia"]),
             models.Index(fields=["fecha_programada"]),
+            # Cartera vencida (keyset por fecha_vencimiento, id)
+            models.Index(fields=["estatus", "fecha_vencimiento", "id"], name="pago_estatus_fvenc_idx"),
         ]
         verbose_name = "Pago"
         verbose_name_plural = "Pagos"
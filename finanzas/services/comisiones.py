@@ -40,12 +40,15 @@ def marcar_comision_pagada(*, comision, usuario=None, notas=""):
     return comision
 
 
+import uuid
 from decimal import Decimal, ROUND_HALF_UP
 
 from django.conf import settings
 from django.db import transaction
 
+from core.services import cache
 from finanzas.models import Comision
+from polizas.models import PolizaEvento
 from polizas.services import log_poliza_event
 
 def redondear_monto(valor):
@@ -63,16 +66,85 @@ def obtener_base_comision(poliza):
     return Decimal("0.00")
 
 
-def resolver_porcentaje_comision(poliza, agente=None):
+# ---------------------------------------------------------------------
+# Tabla de porcentajes (ConfiguracionComision)
+# ---------------------------------------------------------------------
+
+CACHE = cache.namespace("comisiones", ttl=300)
+CONFIG_VERSION_KEY = "config:version"
+
+_tabla = {"version": None, "tabla": None}
+
+
+class TablaComisiones:
     """
-    Fase 1:
-    Usa porcentaje global definido en settings.
+    ConfiguracionComision activa en memoria. Gana la regla más específica:
+
+        aseguradora + producto + ramo
+        aseguradora + producto
+        aseguradora + ramo
+        aseguradora
+        COMISION_PORCENTAJE_DEFAULT
+
+    El ramo de la póliza es el tipo_producto de su producto (AUTO, MOTO...).
+    """
+
+    def __init__(self, reglas, ramos, default):
+        self.reglas = reglas    # (aseguradora_id, producto_id|None, ramo|"") -> porcentaje
+        self.ramos = ramos      # producto_id -> tipo_producto
+        self.default = default
+
+    @classmethod
+    def build(cls):
+        from catalogos.models import ProductoSeguro
+        from finanzas.models import ConfiguracionComision
+
+        reglas = {
+            (a, p, (r or "").strip().upper()): redondear_monto(pct)
+            for a, p, r, pct in ConfiguracionComision.objects.filter(activo=True).values_list(
+                "aseguradora_id", "producto_id", "ramo", "porcentaje",
+            )
+        }
+        ramos = dict(ProductoSeguro.objects.values_list("id", "tipo_producto"))
+        default = redondear_monto(getattr(settings, "COMISION_PORCENTAJE_DEFAULT", Decimal("10.00")))
+        return cls(reglas, ramos, default)
+
+    def porcentaje(self, aseguradora_id, producto_id):
+        ramo = (self.ramos.get(producto_id) or "").upper()
+        for key in (
+            (aseguradora_id, producto_id, ramo),
+            (aseguradora_id, producto_id, ""),
+            (aseguradora_id, None, ramo),
+            (aseguradora_id, None, ""),
+        ):
+            if key in self.reglas:
+                return self.reglas[key]
+        return self.default
+
+
+def tabla_comisiones():
+    """Tabla del proceso; se reconstruye cuando cambia la versión en cache."""
+    version = CACHE.get_or_set(CONFIG_VERSION_KEY, lambda: uuid.uuid4().hex)
+
+    if _tabla["version"] != version:
+        _tabla.update(version=version, tabla=TablaComisiones.build())
+    return _tabla["tabla"]
+
+
+def invalidar_tabla_comisiones():
+    CACHE.delete(CONFIG_VERSION_KEY)
+
+
+def resolver_porcentaje_comision(poliza, agente=None, tabla=None):
+    """
+    Porcentaje según ConfiguracionComision (aseguradora/producto/ramo) o
+    el default de settings.
 
     Fase 2:
-    Aquí podrá consultarse ConfiguracionComision por aseguradora/producto/ramo
-    y después overrides por agente.
+    Aquí podrán agregarse overrides por agente.
     """
-    return redondear_monto(getattr(settings, "COMISION_PORCENTAJE_DEFAULT", Decimal("10.00")))
+    tabla = tabla or tabla_comisiones()
+    return tabla.porcentaje(poliza.aseguradora_id, poliza.producto_id)
 
 
 @transaction.atomic
@@ -125,3 +197,91 @@ def generar_comision_poliza(*, poliza, agente, usuario=None):
     )
 
     return comision
+
+
+# ---------------------------------------------------------------------
+# Lote
+# ---------------------------------------------------------------------
+
+def _evento_comision(comision, agente_nombre, usuario=None):
+    return PolizaEvento(
+        poliza_id=comision.poliza_id,
+        tipo=PolizaEvento.Tipo.COMISION_GENERADA,
+        titulo="Comisión generada",
+        detalle=f"Se generó comisión de {comision.monto_comision} para {agente_nombre}.",
+        data={
+            "comision_id": comision.id,
+            "agente_id": comision.agente_id,
+            "agente": agente_nombre,
+            "porcentaje": str(comision.porcentaje),
+            "base_calculo": str(comision.base_calculo),
+            "base_origen": "prima_neta",
+            "monto_comision": str(comision.monto_comision),
+            "poliza_id": comision.poliza_id,
+        },
+        actor=usuario,
+        dedupe_key=f"COMISION_GENERADA:{comision.poliza_id}:{comision.agente_id}",
+    )
+
+
+def generar_comisiones_lote(polizas, *, usuario=None, dry_run=False):
+    """
+    Genera las comisiones faltantes (póliza + su agente) de muchas
+    pólizas: una consulta para las existentes, un bulk_create con
+    ignore_conflicts sobre uq_comision_poliza_agente (si otro proceso
+    ya la creó no truena) y los PolizaEvento también en bloque.
+
+    Regresa la lista de Comision calculadas (sin pk si dry_run).
+    """
+    polizas = [p for p in polizas if p.agente_id]
+    if not polizas:
+        return []
+
+    tabla = tabla_comisiones()
+    existentes = set(
+        Comision.objects
+        .filter(poliza_id__in=[p.pk for p in polizas])
+        .values_list("poliza_id", "agente_id")
+    )
+
+    nuevas = []
+    for poliza in polizas:
+        if (poliza.pk, poliza.agente_id) in existentes:
+            continue
+        base_calculo = obtener_base_comision(poliza)
+        if base_calculo <= 0:
+            continue
+        porcentaje = tabla.porcentaje(poliza.aseguradora_id, poliza.producto_id)
+        nuevas.append(Comision(
+            poliza_id=poliza.pk,
+            agente_id=poliza.agente_id,
+            porcentaje=porcentaje,
+            base_calculo=base_calculo,
+            monto_comision=redondear_monto(base_calculo * (porcentaje / Decimal("100"))),
+            estatus=Comision.Estatus.PENDIENTE,
+        ))
+
+    if dry_run or not nuevas:
+        return nuevas
+
+    with transaction.atomic():
+        Comision.objects.bulk_create(nuevas, batch_size=1000, ignore_conflicts=True)
+
+        # ignore_conflicts no regresa pk: se releen (una consulta) para el evento
+        pares = {(c.poliza_id, c.agente_id) for c in nuevas}
+        creadas = [
+            c for c in (
+                Comision.objects
+                .filter(poliza_id__in={pid for pid, _a in pares})
+                .select_related("agente")
+            )
+            if (c.poliza_id, c.agente_id) in pares
+        ]
+
+        PolizaEvento.objects.bulk_create(
+            [_evento_comision(c, str(c.agente), usuario) for c in creadas],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+    return creadas
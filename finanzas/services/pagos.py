@@ -1,20 +1,54 @@
 # Para crear el Plan de Pagos
-from datetime import timedelta
+import calendar
+from dataclasses import dataclass, field
+from datetime import date
 from decimal import Decimal, ROUND_HALF_UP
+from typing import List
+
 from django.db import transaction
 from django.utils.timezone import localdate
 
 from finanzas.models import Pago
 from polizas.models import Poliza
 
+# forma de pago -> (número de pagos, meses entre pagos)
+PLANES = {
+    "CONTADO": (1, 0),
+    "MENSUAL": (12, 1),
+    "TRIMESTRAL": (4, 3),
+    "SEMESTRAL": (2, 6),
+}
+
+# Pagos que ya tienen movimiento: un plan con alguno de estos no se reemplaza en lote
+ESTATUS_CON_MOVIMIENTO = (
+    Pago.Estatus.PAGADO,
+    Pago.Estatus.PARCIAL,
+    Pago.Estatus.EN_PROCESO,
+    Pago.Estatus.PENDIENTE_REVISION,
+)
+
 
 def _norm_forma_pago(fp: str) -> str:
     return (fp or "").strip().upper()
 
 
-def crear_plan_pagos(poliza: Poliza, *, overwrite=False):
+def sumar_meses(fecha: date, meses: int) -> date:
+    """Mismo día `meses` después; si el mes es más corto, el último día (31/ene + 1 = 28/feb)."""
+    total = fecha.month - 1 + meses
+    anio, mes = fecha.year + total // 12, total % 12 + 1
+    return fecha.replace(year=anio, month=mes, day=min(fecha.day, calendar.monthrange(anio, mes)[1]))
+
+
+@dataclass(frozen=True)
+class Cuota:
+    numero: int
+    fecha: date
+    monto: Decimal
+
+
+def calcular_plan(poliza: Poliza) -> List[Cuota]:
     """
-    Crea pagos según poliza.forma_pago.
+    Cuotas según poliza.forma_pago (en memoria, sin tocar la base).
     Reglas:
       - CONTADO: 1 pago
       - MENSUAL: 12 pagos
@@ -22,64 +56,155 @@ def crear_plan_pagos(poliza: Poliza, *, overwrite=False):
       - SEMESTRAL: 2 pagos
 
     Base de fechas:
-      - inicia en vigencia_desde (si existe) o hoy.
+      - inicia en vigencia_desde (si existe) o hoy; cada cuota cae el
+        mismo día del mes correspondiente (meses de calendario).
     Montos:
       - distribuye prima_total en N pagos (redondeo a 2 decimales; ajusta el último).
     """
-    fp = _norm_forma_pago(poliza.forma_pago)
+    # fallback razonable: un pago
+    n, meses = PLANES.get(_norm_forma_pago(poliza.forma_pago), (1, 0))
     start = poliza.vigencia_desde or localdate()
 
-    if fp in ("CONTADO",):
-        n, step_days = 1, None
-    elif fp in ("MENSUAL",):
-        n, step_days = 12, 30
-    elif fp in ("TRIMESTRAL",):
-        n, step_days = 4, 90
-    elif fp in ("SEMESTRAL",):
-        n, step_days = 2, 182
-    else:
-        # fallback razonable
-        n, step_days = 1, None
-    
+    total = Decimal(poliza.prima_total or 0).quantize(Decimal("0.01"))
+    base = (total / Decimal(n)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+    cuotas = []
+    for i in range(n):
+        # Ajuste final por redondeo
+        monto = base if i < n - 1 else (total - base * (n - 1)).quantize(Decimal("0.01"))
+        cuotas.append(Cuota(numero=i + 1, fecha=sumar_meses(start, meses * i), monto=monto))
+    return cuotas
+
+
+def _pago(poliza: Poliza, cuota: Cuota) -> Pago:
+    return Pago(
+        poliza=poliza,
+        cliente_id=poliza.cliente_id,
+        fecha_programada=cuota.fecha,
+        fecha_vencimiento=cuota.fecha,  # + timedelta(days=5)
+        monto=cuota.monto,
+        moneda="MXN",
+        estatus=Pago.Estatus.PENDIENTE,
+        metodo="",
+        referencia="",
+    )
+
+
+# ---------------------------------------------------------------------
+# Lote
+# ---------------------------------------------------------------------
+
+@dataclass
+class PlanDiff:
+    """
+    Resultado por póliza:
+      - CREAR: no tiene plan
+      - SIN_CAMBIOS: el plan actual ya coincide
+      - REEMPLAZAR: difiere y overwrite=True
+      - DIFERENTE: difiere y overwrite=False (no se toca)
+      - BLOQUEADA: difiere pero ya tiene pagos con movimiento
+    """
+    poliza_id: int
+    accion: str
+    nuevas: List[Cuota] = field(default_factory=list)
+    actuales: List[tuple] = field(default_factory=list)  # (fecha_programada, monto, estatus)
+
+
+CREAR = "CREAR"
+SIN_CAMBIOS = "SIN_CAMBIOS"
+REEMPLAZAR = "REEMPLAZAR"
+DIFERENTE = "DIFERENTE"
+BLOQUEADA = "BLOQUEADA"
+
+
+def diff_planes(polizas, *, overwrite=False) -> List[PlanDiff]:
+    """Compara el plan calculado contra los pagos actuales (una consulta)."""
+    polizas = list(polizas)
+
+    actuales = {p.pk: [] for p in polizas}
+    for poliza_id, fecha, monto, estatus in (
+        Pago.objects
+        .filter(poliza_id__in=list(actuales))
+        .exclude(estatus=Pago.Estatus.CANCELADO)
+        .order_by("fecha_programada", "id")
+        .values_list("poliza_id", "fecha_programada", "monto", "estatus")
+    ):
+        actuales[poliza_id].append((fecha, monto, estatus))
+
+    diffs = []
+    for poliza in polizas:
+        nuevas = calcular_plan(poliza)
+        existentes = actuales[poliza.pk]
+
+        if not existentes:
+            accion = CREAR
+        elif [(c.fecha, c.monto) for c in nuevas] == [(f, m) for f, m, _e in existentes]:
+            accion = SIN_CAMBIOS
+        elif any(e in ESTATUS_CON_MOVIMIENTO for _f, _m, e in existentes):
+            accion = BLOQUEADA
+        else:
+            accion = REEMPLAZAR if overwrite else DIFERENTE
+
+        diffs.append(PlanDiff(poliza_id=poliza.pk, accion=accion, nuevas=nuevas, actuales=existentes))
+    return diffs
+
+
+def _despues_de_guardar(poliza_ids, cliente_ids):
+    # bulk_create no dispara post_save: índice de búsqueda y dashboard del portal a mano
+    from core.services import search
+    from portal.services import dashboard
+
+    search.index_objects(
+        search.Entidad.PAGO,
+        search.indexable_queryset(search.Entidad.PAGO).filter(poliza_id__in=poliza_ids),
+    )
+    dashboard.invalidate(*cliente_ids)
+
+
+def generar_planes_pagos(polizas, *, overwrite=False, dry_run=False) -> List[PlanDiff]:
+    """
+    Genera los planes de muchas pólizas (renovaciones, importaciones):
+    una consulta para los pagos actuales, un DELETE para los que se
+    reemplazan y un bulk_create con todas las cuotas nuevas. Es
+    idempotente: las pólizas con plan igual o con otro plan (sin
+    overwrite) no se tocan. Con dry_run solo regresa el diff.
+    """
+    polizas = {p.pk: p for p in polizas}
+    diffs = diff_planes(polizas.values(), overwrite=overwrite)
+
+    if dry_run:
+        return diffs
+
+    a_escribir = [d for d in diffs if d.accion in (CREAR, REEMPLAZAR)]
+    if not a_escribir:
+        return diffs
+
     with transaction.atomic():
-        qs = Pago.objects.filter(poliza=poliza).exclude(estatus=Pago.Estatus.CANCELADO)
-
-        if qs.exists():
-            if not overwrite:
-                return 0  # ya hay plan
-            qs.delete()
-
-        total = Decimal(poliza.prima_total or 0).quantize(Decimal("0.01"))
-        if n == 0:
-            return 0
-
-        # monto base
-        base = (total / Decimal(n)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-        created = 0
-        sum_created = Decimal("0.00")
-
-        for i in range(1, n + 1):
-            if i < n:
-                monto = base
-                sum_created += monto
-            else:
-                # Ajuste final por redondeo
-                monto = (total - sum_created).quantize(Decimal("0.01"))
-
-            fecha = start if (step_days is None) else (start + timedelta(days=step_days * (i - 1)))
-
-            Pago.objects.create(
-                poliza=poliza,
-                cliente=poliza.cliente,
-                fecha_programada=fecha,
-                fecha_vencimiento=fecha,  # + timedelta(days=5)
-                monto=monto,
-                moneda="MXN",
-                estatus=Pago.Estatus.PENDIENTE,
-                metodo="",
-                referencia="",
-            )
-            created += 1
-
-    return created
+        reemplazar = [d.poliza_id for d in a_escribir if d.accion == REEMPLAZAR]
+        if reemplazar:
+            Pago.objects.filter(poliza_id__in=reemplazar).exclude(estatus=Pago.Estatus.CANCELADO).delete()
+
+        Pago.objects.bulk_create(
+            [_pago(polizas[d.poliza_id], c) for d in a_escribir for c in d.nuevas],
+            batch_size=1000,
+        )
+
+        poliza_ids = [d.poliza_id for d in a_escribir]
+        cliente_ids = {polizas[pid].cliente_id for pid in poliza_ids}
+        transaction.on_commit(lambda: _despues_de_guardar(poliza_ids, cliente_ids))
+
+    return diffs
+
+
+def crear_plan_pagos(poliza: Poliza, *, overwrite=False):
+    """
+    Crea los pagos de la póliza en un solo INSERT. Regresa cuántos creó
+    (0 si ya tenía plan y no se pidió overwrite).
+    """
+    if overwrite:
+        with transaction.atomic():
+            Pago.objects.filter(poliza=poliza).exclude(estatus=Pago.Estatus.CANCELADO).delete()
+            return crear_plan_pagos(poliza)
+
+    (diff,) = generar_planes_pagos([poliza])
+    return len(diff.nuevas) if diff.accion == CREAR else 0
@@ -37,7 +37,7 @@ def construir_mensaje_recordatorio(pago, *, categoria=None, dias=None):
     )
 
 
-def registrar_recordatorio_pago(
+def evento_recordatorio_pago(
     *,
     pago,
     actor=None,
@@ -45,35 +45,71 @@ def registrar_recordatorio_pago(
     categoria=None,
     dias=None,
     usar_dedupe=False,
+    mensaje=None,
 ):
-    mensaje = construir_mensaje_recordatorio(pago, categoria=categoria, dias=dias)
+    """PolizaEvento (sin guardar) del recordatorio, o None si el pago no tiene póliza."""
+    if not pago.poliza:
+        return None
+
+    mensaje = mensaje or construir_mensaje_recordatorio(pago, categoria=categoria, dias=dias)
 
     dedupe_key = None
     if usar_dedupe and categoria and dias is not None:
         dedupe_key = f"PAGO_RECORDATORIO_ENVIADO:{pago.id}:{categoria}:{dias}"
 
-    if pago.poliza:
+    return PolizaEvento(
+        poliza=pago.poliza,
+        tipo=PolizaEvento.Tipo.PAGO_RECORDATORIO_ENVIADO,
+        actor=actor,
+        titulo="Recordatorio de pago enviado",
+        detalle=f"Se generó recordatorio para el pago #{pago.id}.",
+        data={
+            "pago_id": pago.id,
+            "canal": canal,
+            "categoria": categoria or "",
+            "dias": dias if dias is not None else "",
+            "estatus_pago": pago.estatus,
+            "fecha_programada": str(pago.fecha_programada) if pago.fecha_programada else "",
+            "fecha_vencimiento": str(pago.fecha_vencimiento) if pago.fecha_vencimiento else "",
+            "monto": str(pago.monto),
+            "moneda": pago.moneda,
+            "referencia": pago.referencia,
+            "mensaje": mensaje,
+            "fecha_envio": str(localdate()),
+        },
+        dedupe_key=dedupe_key,
+    )
+
+
+def registrar_recordatorio_pago(
+    *,
+    pago,
+    actor=None,
+    canal="MANUAL",
+    categoria=None,
+    dias=None,
+    usar_dedupe=False,
+):
+    mensaje = construir_mensaje_recordatorio(pago, categoria=categoria, dias=dias)
+
+    evt = evento_recordatorio_pago(
+        pago=pago,
+        actor=actor,
+        canal=canal,
+        categoria=categoria,
+        dias=dias,
+        usar_dedupe=usar_dedupe,
+        mensaje=mensaje,
+    )
+    if evt is not None:
         log_poliza_event(
-            poliza=pago.poliza,
-            tipo=PolizaEvento.Tipo.PAGO_RECORDATORIO_ENVIADO,
-            actor=actor,
-            titulo="Recordatorio de pago enviado",
-            detalle=f"Se generó recordatorio para el pago #{pago.id}.",
-            data={
-                "pago_id": pago.id,
-                "canal": canal,
-                "categoria": categoria or "",
-                "dias": dias if dias is not None else "",
-                "estatus_pago": pago.estatus,
-                "fecha_programada": str(pago.fecha_programada) if pago.fecha_programada else "",
-                "fecha_vencimiento": str(pago.fecha_vencimiento) if pago.fecha_vencimiento else "",
-                "monto": str(pago.monto),
-                "moneda": pago.moneda,
-                "referencia": pago.referencia,
-                "mensaje": mensaje,
-                "fecha_envio": str(localdate()),
-            },
-            dedupe_key=dedupe_key,
+            poliza=evt.poliza,
+            tipo=evt.tipo,
+            actor=evt.actor,
+            titulo=evt.titulo,
+            detalle=evt.detalle,
+            data=evt.data,
+            dedupe_key=evt.dedupe_key,
         )
 
     return mensaje
@@ -1,114 +1,149 @@
 from django.utils.timezone import localdate
 from datetime import timedelta
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, CharField, Exists, F, IntegerField, OuterRef, Q, Value, When
+from django.db.models.functions import Cast, Concat
 
 from finanzas.models import Pago
-from finanzas.services.recordatorios import registrar_recordatorio_pago
-from finanzas.services.recordatorios_whatsapp import enviar_recordatorio_whatsapp
+from finanzas.services.recordatorios_dispatch import Recordatorio, guardar_eventos
+from finanzas.services.recordatorios_whatsapp import encolar_recordatorio_whatsapp
+from integrations.providers.whatsapp import WhatsAppCloudProvider
+from polizas.models import PolizaEvento
 
 
 DIAS_POR_VENCER = [7, 3, 1]
 DIAS_VENCIDO = [1, 3, 7]
 
+CHUNK_SIZE = 1000
 
-def _procesar_recordatorio(*, pago, categoria, dias, dry_run=False):
-    if dry_run:
-        return {"ok": True, "modo": "dry-run"}
 
-    whatsapp_enabled = bool(getattr(settings, "WHATSAPP_ENABLED", False))
+def candidatos_queryset(hoy):
+    """
+    Todos los recordatorios del día en una sola consulta.
 
-    if whatsapp_enabled:
-        return enviar_recordatorio_whatsapp(
-            pago=pago,
-            actor=None,
-            categoria=categoria,
-            dias=dias,
-        )
+    Cada pago trae anotados categoria y dias según su fecha_vencimiento
+    (hoy ± offset) y se descartan con NOT EXISTS los que ya tienen su
+    PolizaEvento de recordatorio (misma dedupe_key que registra el envío),
+    así una segunda corrida no vuelve a cargar ni a enviar nada.
+    """
+    por_vencer = {hoy + timedelta(days=d): d for d in DIAS_POR_VENCER}
+    vencido = {hoy - timedelta(days=d): d for d in DIAS_VENCIDO}
 
-    registrar_recordatorio_pago(
-        pago=pago,
-        actor=None,
-        canal="AUTOMATICO",
-        categoria=categoria,
-        dias=dias,
-        usar_dedupe=True,
+    es_por_vencer = Q(
+        estatus__in=[Pago.Estatus.PENDIENTE, Pago.Estatus.PARCIAL],
+        fecha_vencimiento__in=list(por_vencer),
+    )
+    es_vencido = Q(
+        estatus=Pago.Estatus.VENCIDO,
+        fecha_vencimiento__in=list(vencido),
     )
-    return {"ok": True, "modo": "solo-evento"}
-
-
-def generar_recordatorios_automaticos(*, dry_run=False):
-    hoy = localdate()
-    generados = 0
-    detalle = {
-        "por_vencer": {7: 0, 3: 0, 1: 0},
-        "vencido": {1: 0, 3: 0, 7: 0},
-        "errores": [],
-    }
 
-    # Por vencer
-    for dias in DIAS_POR_VENCER:
-        fecha_objetivo = hoy + timedelta(days=dias)
+    ya_enviado = PolizaEvento.objects.filter(
+        poliza_id=OuterRef("poliza_id"),
+        tipo=PolizaEvento.Tipo.PAGO_RECORDATORIO_ENVIADO,
+        dedupe_key=OuterRef("recordatorio_key"),
+    )
 
-        pagos = (
-            Pago.objects
-            .select_related("poliza", "cliente")
-            .filter(
-                estatus__in=[Pago.Estatus.PENDIENTE, Pago.Estatus.PARCIAL],
-                fecha_vencimiento=fecha_objetivo,
-            )
-            .exclude(poliza__estatus="CANCELADA")
+    return (
+        Pago.objects
+        .select_related("poliza", "cliente")
+        .filter(es_por_vencer | es_vencido)
+        .exclude(poliza__estatus="CANCELADA")
+        .annotate(
+            categoria=Case(
+                When(es_por_vencer, then=Value("POR_VENCER")),
+                default=Value("VENCIDO"),
+                output_field=CharField(),
+            ),
+            dias=Case(
+                *[When(es_por_vencer & Q(fecha_vencimiento=f), then=Value(d)) for f, d in por_vencer.items()],
+                *[When(es_vencido & Q(fecha_vencimiento=f), then=Value(d)) for f, d in vencido.items()],
+                output_field=IntegerField(),
+            ),
+        )
+        .alias(
+            recordatorio_key=Concat(
+                Value("PAGO_RECORDATORIO_ENVIADO:"),
+                Cast("id", CharField()),
+                Value(":"),
+                F("categoria"),
+                Value(":"),
+                Cast("dias", CharField()),
+                output_field=CharField(),
+            ),
         )
+        .filter(~Exists(ya_enviado))
+        .order_by("fecha_vencimiento", "id")
+    )
 
-        for pago in pagos:
-            result = _procesar_recordatorio(
-                pago=pago,
-                categoria="POR_VENCER",
-                dias=dias,
-                dry_run=dry_run,
-            )
 
+def _candidatos(hoy):
+    for pago in candidatos_queryset(hoy).iterator(chunk_size=CHUNK_SIZE):
+        yield Recordatorio(pago=pago, categoria=pago.categoria, dias=pago.dias)
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _encolar(recordatorios, provider):
+    # El worker del outbox hace el envío (rate limit, reintentos) y su
+    # al_enviar registra el PolizaEvento; aquí solo se insertan los mensajes.
+    enviados, errores = [], []
+    with transaction.atomic():
+        for rec in recordatorios:
+            result = encolar_recordatorio_whatsapp(
+                pago=rec.pago,
+                categoria=rec.categoria,
+                dias=rec.dias,
+                provider=provider,
+            )
             if result.get("ok"):
-                generados += 1
-                detalle["por_vencer"][dias] += 1
+                enviados.append(rec)
             else:
-                detalle["errores"].append({
-                    "pago_id": pago.id,
-                    "categoria": "POR_VENCER",
-                    "dias": dias,
-                    "error": result.get("error") or result.get("data"),
+                errores.append({
+                    "pago_id": rec.pago.id,
+                    "categoria": rec.categoria,
+                    "dias": rec.dias,
+                    "error": result.get("error"),
                 })
+    return enviados, errores
 
-    # Vencidos
-    for dias in DIAS_VENCIDO:
-        fecha_objetivo = hoy - timedelta(days=dias)
 
-        pagos = (
-            Pago.objects
-            .select_related("poliza", "cliente")
-            .filter(
-                estatus=Pago.Estatus.VENCIDO,
-                fecha_vencimiento=fecha_objetivo,
-            )
-            .exclude(poliza__estatus="CANCELADA")
-        )
-
-        for pago in pagos:
-            result = _procesar_recordatorio(
-                pago=pago,
-                categoria="VENCIDO",
-                dias=dias,
-                dry_run=dry_run,
-            )
+def generar_recordatorios_automaticos(*, dry_run=False):
+    hoy = localdate()
+    detalle = {
+        "por_vencer": {7: 0, 3: 0, 1: 0},
+        "vencido": {1: 0, 3: 0, 7: 0},
+        "errores": [],
+    }
 
-            if result.get("ok"):
-                generados += 1
-                detalle["vencido"][dias] += 1
-            else:
-                detalle["errores"].append({
-                    "pago_id": pago.id,
-                    "categoria": "VENCIDO",
-                    "dias": dias,
-                    "error": result.get("error") or result.get("data"),
-                })
+    generados = 0
+    whatsapp_enabled = bool(getattr(settings, "WHATSAPP_ENABLED", False))
+    provider = WhatsAppCloudProvider() if whatsapp_enabled else None
+
+    # Se procesa por bloques mientras se lee el cursor
+    for recordatorios in _chunks(_candidatos(hoy), CHUNK_SIZE):
+        if dry_run:
+            enviados, errores = recordatorios, []
+        elif whatsapp_enabled:
+            enviados, errores = _encolar(recordatorios, provider)
+        else:
+            guardar_eventos(recordatorios, canal="AUTOMATICO")
+            enviados, errores = recordatorios, []
+
+        for rec in enviados:
+            grupo = "por_vencer" if rec.categoria == "POR_VENCER" else "vencido"
+            detalle[grupo][rec.dias] += 1
+        detalle["errores"].extend(errores)
+        generados += len(enviados)
 
     return generados, detalle
@@ -0,0 +1,154 @@
+# finanzas/services/recordatorios_dispatch.py
+"""
+Envío masivo de recordatorios de pago por WhatsApp.
+
+Antes cada recordatorio era un requests.post bloqueante (sin reutilizar
+conexión) seguido de su propio INSERT de PolizaEvento; una corrida de
+miles de pagos tardaba horas. Aquí:
+
+    - los payloads se arman antes, en el hilo principal (sin tocar la
+      base desde los hilos de envío),
+    - se envían con WHATSAPP_DISPATCH_WORKERS hilos sobre la Session
+      compartida del provider (pool de conexiones),
+    - un token bucket limita a WHATSAPP_RATE_PER_SECOND mensajes por
+      segundo para no pasar el throughput del número en Meta,
+    - 429 / 5xx / errores de red / códigos de throttling de Meta se
+      reintentan con backoff exponencial hasta WHATSAPP_MAX_RETRIES,
+    - los PolizaEvento de los enviados se guardan con bulk_create por
+      lotes (ignore_conflicts respeta la dedupe_key).
+"""
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from django.conf import settings
+
+from finanzas.services.recordatorios import evento_recordatorio_pago
+from finanzas.services.recordatorios_whatsapp import (
+    payload_recordatorio,
+    telefono_cliente_para_recordatorio,
+)
+from integrations.providers.whatsapp import TokenBucket, WhatsAppCloudProvider, es_transitorio
+from polizas.models import PolizaEvento
+
+BACKOFF_BASE = 0.5
+EVENT_BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class Recordatorio:
+    pago: object
+    categoria: Optional[str] = None
+    dias: Optional[int] = None
+
+
+def _send_with_retry(provider, payload, bucket, max_retries, sleep):
+    intento = 0
+    while True:
+        bucket.acquire()
+        try:
+            result = provider.send(payload)
+        except requests.RequestException as exc:
+            result = {"ok": False, "error": str(exc), "transient": True}
+
+        if result.get("ok") or intento >= max_retries or not es_transitorio(result):
+            result["intentos"] = intento + 1
+            return result
+
+        sleep(BACKOFF_BASE * (2 ** intento) + random.uniform(0, BACKOFF_BASE))
+        intento += 1
+
+
+def _error(rec, error):
+    return {
+        "pago_id": rec.pago.id,
+        "categoria": rec.categoria,
+        "dias": rec.dias,
+        "error": error,
+    }
+
+
+def guardar_eventos(recordatorios, *, actor=None, canal="WHATSAPP"):
+    """bulk_create de los PolizaEvento de recordatorios ya enviados."""
+    eventos = []
+    for rec in recordatorios:
+        evt = evento_recordatorio_pago(
+            pago=rec.pago,
+            actor=actor,
+            canal=canal,
+            categoria=rec.categoria,
+            dias=rec.dias,
+            usar_dedupe=bool(rec.categoria and rec.dias is not None),
+        )
+        if evt is not None:
+            eventos.append(evt)
+
+    if eventos:
+        PolizaEvento.objects.bulk_create(eventos, batch_size=EVENT_BATCH_SIZE, ignore_conflicts=True)
+    return len(eventos)
+
+
+def dispatch_recordatorios(
+    recordatorios,
+    *,
+    provider=None,
+    actor=None,
+    workers=None,
+    rate=None,
+    max_retries=None,
+    sleep=time.sleep,
+):
+    """
+    Envía los recordatorios (pagos con poliza y cliente ya cargados).
+    Regresa (enviados, errores): lista de Recordatorio y lista de dicts
+    con pago_id / categoria / dias / error.
+    """
+    provider = provider or WhatsAppCloudProvider()
+    workers = workers or getattr(settings, "WHATSAPP_DISPATCH_WORKERS", 16)
+    rate = rate or getattr(settings, "WHATSAPP_RATE_PER_SECOND", 80)
+    if max_retries is None:
+        max_retries = getattr(settings, "WHATSAPP_MAX_RETRIES", 3)
+
+    enviados, errores = [], []
+
+    if not provider.enabled:
+        return enviados, [_error(rec, "WhatsApp disabled in settings") for rec in recordatorios]
+
+    jobs = []
+    for rec in recordatorios:
+        telefono = telefono_cliente_para_recordatorio(rec.pago)
+        if not telefono:
+            errores.append(_error(rec, "Cliente sin teléfono válido"))
+            continue
+        jobs.append((rec, payload_recordatorio(provider, rec.pago, telefono)))
+
+    if not jobs:
+        return enviados, errores
+
+    bucket = TokenBucket(rate)
+    pendientes_guardar = []
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wa-dispatch") as pool:
+        futures = {
+            pool.submit(_send_with_retry, provider, payload, bucket, max_retries, sleep): rec
+            for rec, payload in jobs
+        }
+        for future in as_completed(futures):
+            rec = futures[future]
+            result = future.result()
+
+            if result.get("ok"):
+                enviados.append(rec)
+                pendientes_guardar.append(rec)
+                # Por lotes: si la corrida se cae a la mitad, lo enviado ya quedó registrado
+                if len(pendientes_guardar) >= EVENT_BATCH_SIZE:
+                    guardar_eventos(pendientes_guardar, actor=actor)
+                    pendientes_guardar = []
+            else:
+                errores.append(_error(rec, result.get("error") or result.get("data")))
+
+    guardar_eventos(pendientes_guardar, actor=actor)
+    return enviados, errores
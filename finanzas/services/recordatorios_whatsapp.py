@@ -1,7 +1,10 @@
 from django.conf import settings
 
+from integrations import outbox
 from integrations.providers.whatsapp import WhatsAppCloudProvider
-from finanzas.services.recordatorios import registrar_recordatorio_pago
+from finanzas.services.recordatorios import construir_mensaje_recordatorio, registrar_recordatorio_pago
+
+AL_ENVIAR_RECORDATORIO = "finanzas.recordatorio_pago"
 
 
 def normalizar_telefono_mx(numero: str) -> str:
@@ -60,3 +63,66 @@ def enviar_recordatorio_whatsapp(*, pago, actor=None, categoria=None, dias=None)
         )
 
     return result
+
+
+def payload_recordatorio(provider, pago, telefono):
+    return provider.template_recordatorio_payload(
+        to=telefono,
+        cliente_nombre=pago.cliente.nombre_mostrar if pago.cliente else "Cliente",
+        poliza_numero=pago.poliza.numero_poliza if pago.poliza else "-",
+        monto=f"{pago.moneda} {pago.monto}",
+        fecha_vencimiento=pago.fecha_vencimiento.strftime("%d/%m/%Y") if pago.fecha_vencimiento else "-",
+    )
+
+
+def encolar_recordatorio_whatsapp(*, pago, actor=None, categoria=None, dias=None, provider=None):
+    """
+    Deja el recordatorio en el outbox; el worker lo envía y al enviarse
+    registra el PolizaEvento (ver recordatorio_whatsapp_enviado).
+
+    Con categoria y dias (corrida automática) el mensaje lleva la misma
+    dedupe_key que el evento: volver a correr antes de que el worker lo
+    envíe no lo encola dos veces.
+    """
+    provider = provider or WhatsAppCloudProvider()
+    if not provider.enabled:
+        return {"ok": False, "error": "WhatsApp disabled in settings"}
+
+    telefono = telefono_cliente_para_recordatorio(pago)
+    if not telefono:
+        return {"ok": False, "error": "Cliente sin teléfono válido"}
+
+    msg = outbox.encolar(
+        canal="WHATSAPP",
+        destinatario=telefono,
+        payload=payload_recordatorio(provider, pago, telefono),
+        contenido=construir_mensaje_recordatorio(pago, categoria=categoria, dias=dias),
+        cliente=pago.cliente,
+        usuario=actor,
+        al_enviar=AL_ENVIAR_RECORDATORIO,
+        referencia={"pago_id": pago.id, "categoria": categoria, "dias": dias},
+        dedupe_key=(
+            f"PAGO_RECORDATORIO_ENVIADO:{pago.id}:{categoria}:{dias}"
+            if categoria and dias is not None else None
+        ),
+    )
+    return {"ok": True, "outbox_id": msg.id}
+
+
+def recordatorio_whatsapp_enviado(mensaje):
+    from finanzas.models import Pago
+
+    ref = mensaje.referencia or {}
+    pago = Pago.objects.select_related("poliza", "cliente").filter(pk=ref.get("pago_id")).first()
+    if pago is None:
+        return
+
+    categoria, dias = ref.get("categoria"), ref.get("dias")
+    registrar_recordatorio_pago(
+        pago=pago,
+        actor=mensaje.usuario,
+        canal="WHATSAPP",
+        categoria=categoria,
+        dias=dias,
+        usar_dedupe=True if categoria and dias is not None else False,
+    )
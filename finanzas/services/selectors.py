@@ -10,6 +10,8 @@ def estado_cuenta_por_poliza(poliza):
     pagos = (
         Pago.objects
         .filter(poliza=poliza)
+        # el template usa p.poliza / p.poliza.cliente / p.comprobante por fila
+        .select_related("poliza__cliente", "comprobante")
         .order_by("fecha_programada", "id")
     )
 
@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from finanzas.services import comisiones
+
+
+def configuracion_comision_changed(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    # Cambia la versión: cada proceso reconstruye su tabla en la siguiente comisión
+    transaction.on_commit(comisiones.invalidar_tabla_comisiones)
+
+
+def connect_finanzas_signals():
+    from catalogos.models import ProductoSeguro
+    from finanzas.models import ConfiguracionComision
+
+    # ProductoSeguro: la tabla también guarda su tipo_producto (ramo)
+    for model in (ConfiguracionComision, ProductoSeguro):
+        post_save.connect(configuracion_comision_changed, sender=model, dispatch_uid=f"comisiones_tabla_save_{model.__name__}")
+        post_delete.connect(configuracion_comision_changed, sender=model, dispatch_uid=f"comisiones_tabla_delete_{model.__name__}")
@@ -1,3 +1,368 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from autos.models import Vehiculo
+from catalogos.models import Aseguradora, ProductoSeguro
+from crm.models import Cliente
+from finanzas.models import Comision, ConfiguracionComision, Pago
+from finanzas.services import comisiones
+from finanzas.services import pagos as planes
+from finanzas.services.recordatorios_automaticos import (
+    candidatos_queryset,
+    generar_recordatorios_automaticos,
+)
+from finanzas.services.recordatorios_dispatch import Recordatorio, dispatch_recordatorios
+from finanzas.services.recordatorios_whatsapp import encolar_recordatorio_whatsapp
+from integrations import outbox
+from integrations.models import OutboxMessage
+from integrations.providers.whatsapp import TokenBucket, WhatsAppCloudProvider
+from polizas.models import Poliza, PolizaEvento
+
+
+class FakeProvider(WhatsAppCloudProvider):
+    """Responde con la lista de respuestas por teléfono (la última se repite)."""
+
+    def __init__(self, respuestas=None):
+        super().__init__(session=object())
+        self.enabled = True
+        self.respuestas = respuestas or {}
+        self.llamadas = []
+
+    def send(self, payload):
+        to = payload["to"]
+        self.llamadas.append(to)
+        cola = self.respuestas.get(to) or [{"ok": True, "status_code": 200}]
+        return dict(cola.pop(0) if len(cola) > 1 else cola[0])
+
+
+class RecordatoriosFixtureMixin:
+    def setUp(self):
+        self.hoy = timezone.localdate()
+        aseguradora = Aseguradora.objects.create(nombre="Chubb")
+        self.producto = ProductoSeguro.objects.create(aseguradora=aseguradora, nombre_producto="Autos")
+        self.aseguradora = aseguradora
+
+    def _pago(self, telefono, *, dias, estatus=Pago.Estatus.PENDIENTE):
+        cliente = Cliente.objects.create(
+            tipo_cliente=Cliente.TipoCliente.PERSONA,
+            nombre=f"Cliente {telefono}",
+            telefono_principal=telefono,
+        )
+        vehiculo = Vehiculo.objects.create(
+            cliente=cliente, marca_texto="Nissan", submarca_texto="Versa", modelo_anio=2024,
+        )
+        poliza = Poliza.objects.create(
+            cliente=cliente,
+            vehiculo=vehiculo,
+            aseguradora=self.aseguradora,
+            producto=self.producto,
+            numero_poliza=f"POL-{telefono}",
+            vigencia_desde=self.hoy - timedelta(days=30),
+            vigencia_hasta=self.hoy + timedelta(days=335),
+            estatus=Poliza.Estatus.VIGENTE,
+        )
+        return Pago.objects.create(
+            poliza=poliza,
+            cliente=cliente,
+            monto=Decimal("500.00"),
+            estatus=estatus,
+            fecha_programada=self.hoy + timedelta(days=dias),
+            fecha_vencimiento=self.hoy + timedelta(days=dias),
+        )
+
+
+class TokenBucketTests(TestCase):
+    def test_espera_cuando_se_acaban_los_tokens(self):
+        reloj = {"t": 0.0}
+        esperas = []
+
+        def sleep(segundos):
+            esperas.append(segundos)
+            reloj["t"] += segundos
+
+        bucket = TokenBucket(2, clock=lambda: reloj["t"], sleep=sleep)
+        for _ in range(4):
+            bucket.acquire()
+
+        # 2 de ráfaga y luego uno cada 0.5 s
+        self.assertEqual(esperas, [0.5, 0.5])
+
+
+class DispatchRecordatoriosTests(RecordatoriosFixtureMixin, TestCase):
+    def test_reintenta_transitorios_y_registra_eventos_en_bloque(self):
+        ok = self._pago("6561111111", dias=3)
+        lento = self._pago("6562222222", dias=3)
+        malo = self._pago("6563333333", dias=3)
+        sin_tel = self._pago("", dias=3)
+
+        provider = FakeProvider({
+            "526562222222": [{"ok": False, "status_code": 429}, {"ok": True, "status_code": 200}],
+            "526563333333": [{"ok": False, "status_code": 400, "data": {"error": {"code": 100}}}],
+        })
+        recordatorios = [
+            Recordatorio(pago=p, categoria="POR_VENCER", dias=3) for p in (ok, lento, malo, sin_tel)
+        ]
+
+        with self.assertNumQueries(1):
+            enviados, errores = dispatch_recordatorios(
+                recordatorios, provider=provider, workers=4, rate=1000, sleep=lambda s: None,
+            )
+
+        self.assertEqual({r.pago.id for r in enviados}, {ok.id, lento.id})
+        self.assertEqual({e["pago_id"] for e in errores}, {malo.id, sin_tel.id})
+        self.assertEqual(provider.llamadas.count("526562222222"), 2)
+        self.assertEqual(provider.llamadas.count("526563333333"), 1)
+
+        eventos = PolizaEvento.objects.filter(tipo=PolizaEvento.Tipo.PAGO_RECORDATORIO_ENVIADO)
+        self.assertEqual(
+            set(eventos.values_list("dedupe_key", flat=True)),
+            {
+                f"PAGO_RECORDATORIO_ENVIADO:{ok.id}:POR_VENCER:3",
+                f"PAGO_RECORDATORIO_ENVIADO:{lento.id}:POR_VENCER:3",
+            },
+        )
+
+
+class GenerarRecordatoriosAutomaticosTests(RecordatoriosFixtureMixin, TestCase):
+    @override_settings(WHATSAPP_ENABLED=False)
+    def test_sin_whatsapp_registra_eventos_sin_duplicar(self):
+        pago = self._pago("6561111111", dias=7)
+        self._pago("6562222222", dias=5)
+
+        total, detalle = generar_recordatorios_automaticos()
+        self.assertEqual(total, 1)
+        self.assertEqual(detalle["por_vencer"][7], 1)
+
+        generar_recordatorios_automaticos()
+        self.assertEqual(
+            PolizaEvento.objects.filter(
+                dedupe_key=f"PAGO_RECORDATORIO_ENVIADO:{pago.id}:POR_VENCER:7",
+            ).count(),
+            1,
+        )
+
+
+    @override_settings(WHATSAPP_ENABLED=True)
+    def test_con_whatsapp_encola_en_el_outbox_sin_duplicar(self):
+        pago = self._pago("6561111111", dias=3)
+        dedupe_key = f"PAGO_RECORDATORIO_ENVIADO:{pago.id}:POR_VENCER:3"
+
+        total, _ = generar_recordatorios_automaticos()
+        self.assertEqual(total, 1)
+        # Antes de que el worker lo envíe, una segunda corrida no lo duplica
+        generar_recordatorios_automaticos()
+
+        msg = OutboxMessage.objects.get()
+        self.assertEqual(msg.dedupe_key, dedupe_key)
+        self.assertFalse(PolizaEvento.objects.filter(dedupe_key=dedupe_key).exists())
+
+        outbox.process_batch(provider=FakeProvider())
+
+        self.assertTrue(PolizaEvento.objects.filter(dedupe_key=dedupe_key).exists())
+        self.assertEqual(generar_recordatorios_automaticos()[0], 0)
+
+class CandidatosRecordatorioTests(RecordatoriosFixtureMixin, TestCase):
+    def test_una_consulta_con_offset_y_sin_los_ya_enviados(self):
+        por_vencer = self._pago("6561111111", dias=3)
+        vencido = self._pago("6562222222", dias=-7, estatus=Pago.Estatus.VENCIDO)
+        self._pago("6563333333", dias=-7)  # PENDIENTE con fecha pasada: no aplica
+        enviado = self._pago("6564444444", dias=1)
+
+        PolizaEvento.objects.create(
+            poliza=enviado.poliza,
+            tipo=PolizaEvento.Tipo.PAGO_RECORDATORIO_ENVIADO,
+            dedupe_key=f"PAGO_RECORDATORIO_ENVIADO:{enviado.id}:POR_VENCER:1",
+        )
+
+        with self.assertNumQueries(1):
+            pagos = list(candidatos_queryset(self.hoy).iterator())
+            # poliza y cliente ya vienen cargados
+            [(p.poliza.numero_poliza, p.cliente.telefono_principal) for p in pagos]
+
+        self.assertEqual(
+            {(p.id, p.categoria, p.dias) for p in pagos},
+            {(por_vencer.id, "POR_VENCER", 3), (vencido.id, "VENCIDO", 7)},
+        )
+
+
+class RecordatorioOutboxTests(RecordatoriosFixtureMixin, TestCase):
+    @override_settings(WHATSAPP_ENABLED=True)
+    def test_recordatorio_manual_se_encola_y_registra_evento_al_enviarse(self):
+        pago = self._pago("6561111111", dias=3)
+
+        result = encolar_recordatorio_whatsapp(pago=pago, categoria="POR_VENCER", dias=3)
+
+        self.assertTrue(result["ok"])
+        self.assertFalse(PolizaEvento.objects.filter(tipo=PolizaEvento.Tipo.PAGO_RECORDATORIO_ENVIADO).exists())
+
+        outbox.process_batch(provider=FakeProvider())
+
+        self.assertEqual(OutboxMessage.objects.get().status, OutboxMessage.Status.SENT)
+        self.assertTrue(
+            PolizaEvento.objects.filter(
+                dedupe_key=f"PAGO_RECORDATORIO_ENVIADO:{pago.id}:POR_VENCER:3",
+            ).exists()
+        )
+
+
+class PlanPagosTests(RecordatoriosFixtureMixin, TestCase):
+    def _poliza(self, forma_pago, desde, telefono="6561111111"):
+        pago = self._pago(telefono, dias=0)
+        poliza = pago.poliza
+        pago.delete()
+        poliza.forma_pago = forma_pago
+        poliza.vigencia_desde = desde
+        poliza.prima_total = Decimal("1000.00")
+        poliza.save()
+        return poliza
+
+    def test_sumar_meses_respeta_fin_de_mes(self):
+        from datetime import date
+
+        self.assertEqual(planes.sumar_meses(date(2025, 1, 31), 1), date(2025, 2, 28))
+        self.assertEqual(planes.sumar_meses(date(2024, 1, 31), 1), date(2024, 2, 29))
+        self.assertEqual(planes.sumar_meses(date(2025, 11, 15), 3), date(2026, 2, 15))
+
+    def test_plan_mensual_en_un_insert_e_idempotente(self):
+        from datetime import date
+
+        poliza = self._poliza("MENSUAL", date(2025, 1, 31))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(planes.crear_plan_pagos(poliza), 12)
+
+        pagos = list(Pago.objects.filter(poliza=poliza).order_by("fecha_programada"))
+        self.assertEqual(pagos[1].fecha_programada, date(2025, 2, 28))
+        self.assertEqual(pagos[2].fecha_programada, date(2025, 3, 31))
+        self.assertEqual(sum(p.monto for p in pagos), Decimal("1000.00"))
+        self.assertEqual(pagos[-1].monto, Decimal("83.37"))
+
+        self.assertEqual(planes.crear_plan_pagos(poliza), 0)
+        self.assertEqual(Pago.objects.filter(poliza=poliza).count(), 12)
+
+    def test_lote_dry_run_y_overwrite(self):
+        from datetime import date
+
+        nueva = self._poliza("TRIMESTRAL", date(2025, 1, 1))
+        cambiada = self._poliza("CONTADO", date(2025, 1, 1), telefono="6562222222")
+        planes.crear_plan_pagos(cambiada)
+        cambiada.forma_pago = "SEMESTRAL"
+        cambiada.save()
+
+        diffs = {d.poliza_id: d for d in planes.generar_planes_pagos([nueva, cambiada], dry_run=True)}
+        self.assertEqual(diffs[nueva.pk].accion, planes.CREAR)
+        self.assertEqual(diffs[cambiada.pk].accion, planes.DIFERENTE)
+        self.assertEqual(Pago.objects.filter(poliza=nueva).count(), 0)
+
+        planes.generar_planes_pagos([nueva, cambiada], overwrite=True)
+        self.assertEqual(Pago.objects.filter(poliza=nueva).count(), 4)
+        self.assertEqual(
+            list(Pago.objects.filter(poliza=cambiada).order_by("fecha_programada").values_list("fecha_programada", flat=True)),
+            [date(2025, 1, 1), date(2025, 7, 1)],
+        )
+
+        # Con un pago ya cobrado el plan no se reemplaza en lote
+        Pago.objects.filter(poliza=cambiada).update(estatus=Pago.Estatus.PAGADO)
+        cambiada.forma_pago = "CONTADO"
+        (diff,) = planes.generar_planes_pagos([cambiada], overwrite=True)
+        self.assertEqual(diff.accion, planes.BLOQUEADA)
+
+
+@override_settings(COMISION_PORCENTAJE_DEFAULT=Decimal("10.00"))
+class ComisionesLoteTests(RecordatoriosFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.agente = get_user_model().objects.create_user(username="agente", password="x")
+        comisiones.invalidar_tabla_comisiones()
+
+    def _poliza(self, telefono, prima_neta="1000.00"):
+        pago = self._pago(telefono, dias=0)
+        poliza = pago.poliza
+        pago.delete()
+        poliza.agente = self.agente
+        poliza.prima_neta = Decimal(prima_neta)
+        poliza.save()
+        return poliza
+
+    def test_gana_la_regla_mas_especifica(self):
+        moto = ProductoSeguro.objects.create(
+            aseguradora=self.aseguradora, nombre_producto="Motos", tipo_producto=ProductoSeguro.TipoProducto.MOTO,
+        )
+        otra = Aseguradora.objects.create(nombre="GNP")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ConfiguracionComision.objects.create(aseguradora=self.aseguradora, porcentaje=Decimal("12"))
+            ConfiguracionComision.objects.create(aseguradora=self.aseguradora, ramo="MOTO", porcentaje=Decimal("14"))
+            ConfiguracionComision.objects.create(aseguradora=self.aseguradora, producto=self.producto, porcentaje=Decimal("15"))
+            ConfiguracionComision.objects.create(aseguradora=otra, porcentaje=Decimal("20"), activo=False)
+
+        tabla = comisiones.tabla_comisiones()
+
+        self.assertEqual(tabla.porcentaje(self.aseguradora.pk, self.producto.pk), Decimal("15.00"))
+        self.assertEqual(tabla.porcentaje(self.aseguradora.pk, moto.pk), Decimal("14.00"))
+        self.assertEqual(tabla.porcentaje(otra.pk, None), Decimal("10.00"))
+
+        # Al cambiar la configuración la tabla se reconstruye
+        with self.captureOnCommitCallbacks(execute=True):
+            ConfiguracionComision.objects.filter(producto=self.producto).update(porcentaje=Decimal("16"))
+            ConfiguracionComision.objects.get(producto=self.producto).save()
+        self.assertEqual(
+            comisiones.tabla_comisiones().porcentaje(self.aseguradora.pk, self.producto.pk), Decimal("16.00"),
+        )
+
+    def test_lote_en_bloque_e_idempotente(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ConfiguracionComision.objects.create(aseguradora=self.aseguradora, porcentaje=Decimal("12.5"))
+        polizas = [self._poliza(f"65611111{i:02d}") for i in range(5)]
+        sin_prima = self._poliza("6569999999", prima_neta="0")
+        comisiones.generar_comision_poliza(poliza=polizas[0], agente=self.agente)
+
+        self.assertEqual(len(comisiones.generar_comisiones_lote(polizas, dry_run=True)), 4)
+        self.assertEqual(Comision.objects.count(), 1)
+
+        comisiones.tabla_comisiones()  # tabla ya cargada
+        with self.assertNumQueries(6):  # existentes, savepoint, insert, releer, eventos, release
+            creadas = comisiones.generar_comisiones_lote(polizas + [sin_prima])
+
+        self.assertEqual(len(creadas), 4)
+        self.assertEqual({c.monto_comision for c in creadas}, {Decimal("125.00")})
+        self.assertEqual(
+            PolizaEvento.objects.filter(tipo=PolizaEvento.Tipo.COMISION_GENERADA).count(), 5,
+        )
+
+        self.assertEqual(comisiones.generar_comisiones_lote(polizas), [])
+        self.assertEqual(Comision.objects.count(), 5)
+
+    def test_backfill_command(self):
+        polizas = [self._poliza(f"65622222{i:02d}") for i in range(3)]
+
+        call_command("backfill_comisiones", "--batch", "2", "--dry-run", stdout=StringIO())
+        self.assertFalse(Comision.objects.exists())
+
+        out = StringIO()
+        call_command("backfill_comisiones", "--batch", "2", stdout=out)
+        self.assertIn("Comisiones generadas: 3", out.getvalue())
+        self.assertEqual(
+            set(Comision.objects.values_list("poliza_id", flat=True)), {p.pk for p in polizas},
+        )
+
+
+class MarcarPagosVencidosTests(RecordatoriosFixtureMixin, TestCase):
+    def test_bulk_update_cambia_la_version_de_los_pdfs(self):
+        from ui.services.pdf_cache import version_for
+
+        pago = self._pago("6563333333", dias=-5)
+        Pago.objects.filter(pk=pago.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        qs = Pago.objects.filter(pk=pago.pk)
+        antes = version_for(qs, "updated_at", "poliza__updated_at")
+
+        call_command("marcar_pagos_vencidos", stdout=StringIO())
+
+        self.assertEqual(qs.get().estatus, Pago.Estatus.VENCIDO)
+        self.assertNotEqual(version_for(qs, "updated_at", "poliza__updated_at"), antes)
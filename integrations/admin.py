@@ -2,6 +2,7 @@ from django.contrib import admin
 
 from integrations.models import (
     AseguradoraConfiguracion,
+    OutboxMessage,
     ProviderSetting,
 )
 
@@ -296,3 +297,39 @@ class ProviderCatalogMappingAdmin(admin.ModelAdmin):
         "catalog_item__sort_order",
         "catalog_item__name",
     )
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "canal",
+        "destinatario",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+        "created_at",
+    )
+
+    list_filter = (
+        "canal",
+        "status",
+    )
+
+    search_fields = (
+        "destinatario",
+        "dedupe_key",
+        "cliente__nombre",
+    )
+
+    raw_id_fields = (
+        "cliente",
+        "usuario",
+    )
+
+    readonly_fields = (
+        "created_at",
+        "sent_at",
+        "last_attempt_at",
+    )
@@ -0,0 +1,8 @@
+"""
+Benchmarks de integraciones (no corren con la suite de tests).
+
+- chubb_stub: servidor local que repite respuestas grabadas de Chubb.
+- quote_pipeline: pipeline de cotización end to end contra el stub.
+
+Ver el comando benchmark_quote_pipeline.
+"""
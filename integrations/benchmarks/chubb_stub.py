@@ -0,0 +1,182 @@
+"""
+Servidor local que se hace pasar por Chubb.
+
+Repite respuestas grabadas (fixtures/chubb) para:
+
+    POST /token                  -> token.json
+    POST <prefijo>/quote         -> quote.json
+    GET  <prefijo>/catalogs/...  -> catalogs/<ruta con "_">.json
+
+con latencia configurable (latency_ms ± jitter_ms) e inyección de
+errores (error_rate: fracción de requests que responden error_status).
+
+Uso:
+
+    with ChubbStubServer(latency_ms=80, error_rate=0.02) as stub:
+        stub.base_url   # http://127.0.0.1:<puerto>/chubb
+        stub.token_url  # http://127.0.0.1:<puerto>/token
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "chubb"
+
+PREFIX = "/chubb"
+
+
+class ChubbStubServer:
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        fixtures_dir: Path = FIXTURES_DIR,
+        seed: int | None = None,
+    ) -> None:
+        if not 0 <= error_rate <= 1:
+            raise ValueError(
+                "error_rate debe estar entre 0 y 1."
+            )
+
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.fixtures_dir = Path(fixtures_dir)
+        self.requests = Counter()
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._responses: dict[str, bytes] = {}
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    # -----------------------------------------------------------------
+    # Ciclo de vida
+    # -----------------------------------------------------------------
+
+    def start(self) -> "ChubbStubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._handle(self)
+
+            def do_POST(self):
+                stub._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="chubb-stub",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "ChubbStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}{PREFIX}"
+
+    @property
+    def token_url(self) -> str:
+        return f"{self.url}/token"
+
+    # -----------------------------------------------------------------
+    # Respuestas
+    # -----------------------------------------------------------------
+
+    def _fixture_name(self, method: str, path: str) -> str | None:
+        if method == "POST" and path == "/token":
+            return "token.json"
+
+        if not path.startswith(PREFIX + "/"):
+            return None
+
+        path = path[len(PREFIX):]
+
+        if method == "POST" and path == "/quote":
+            return "quote.json"
+
+        if method == "GET" and path.startswith("/catalogs/"):
+            name = path[len("/catalogs/"):].strip("/").replace("/", "_")
+            return f"catalogs/{name}.json"
+
+        return None
+
+    def _fixture(self, name: str) -> bytes | None:
+        with self._lock:
+            if name not in self._responses:
+                fixture = self.fixtures_dir / name
+                self._responses[name] = (
+                    fixture.read_bytes() if fixture.is_file() else None
+                )
+            return self._responses[name]
+
+    def _delay(self) -> tuple[float, bool]:
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+            fail = self._random.random() < self.error_rate
+        return max(0.0, self.latency_ms + jitter) / 1000, fail
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        if length:
+            handler.rfile.read(length)
+
+        path = urlsplit(handler.path).path
+        name = self._fixture_name(handler.command, path)
+
+        with self._lock:
+            self.requests[f"{handler.command} {path}"] += 1
+
+        delay, fail = self._delay()
+        time.sleep(delay)
+
+        body = self._fixture(name) if name else None
+
+        if body is None:
+            status = 404
+            body = json.dumps({"message": f"Sin fixture para {path}"}).encode()
+        elif fail:
+            status = self.error_status
+            body = json.dumps({"message": "Error inyectado por el stub"}).encode()
+        else:
+            status = 200
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
@@ -0,0 +1,402 @@
+"""
+Benchmark del pipeline de cotización completo contra el stub de Chubb:
+
+    ChubbQuoteProviderBuilder.build
+        -> QuoteRequestService.build
+        -> QuoteService.quote_many
+        -> QuotePersistenceService.persist
+
+Por nivel de concurrencia (hilos, cada uno con su conexión a la BD)
+reporta throughput, percentiles de latencia, errores y queries por
+cotización; aparte, en una pasada secuencial con tracemalloc, la memoria
+asignada por cotización. El resultado es un dict JSON (baseline) que se
+puede comparar contra una corrida anterior con comparar().
+
+Crea sus propios datos (ambiente BENCH); el comando benchmark_quote_pipeline
+lo corre sobre una base de pruebas desechable.
+"""
+from __future__ import annotations
+
+import json
+import platform
+import queue
+import statistics
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+
+import django
+from django.db import connection, connections
+from django.utils import timezone
+
+from autos.models import Marca, SubMarca, Vehiculo, VehiculoCatalogo
+from core.services.profiling import Perfil
+from cotizador.models import Cotizacion
+from cotizador.services.quote_persistence_service import QuotePersistenceService
+from cotizador.services.quote_request_service import QuoteRequestService
+from crm.models import Cliente
+from integrations.configuration.services import ProviderConfigurationService
+from integrations.models import (
+    AseguradoraConfiguracion,
+    Catalog,
+    CatalogItem,
+    ProviderCatalogMapping,
+    ProviderSetting,
+)
+from integrations.providers.chubb.quote_provider_builder import ChubbQuoteProviderBuilder
+from integrations.quotes.service import QuoteService
+
+AMBIENTE = "BENCH"
+RAMO = "AUTOS"
+
+# métrica -> True si más alto es mejor
+METRICAS = {
+    "throughput_qps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "queries_por_cotizacion": False,
+    "error_rate": False,
+}
+
+
+# ---------------------------------------------------------------------
+# Datos
+# ---------------------------------------------------------------------
+
+def preparar_datos(*, base_url: str, token_url: str):
+    """Configuración Chubb, mapeos de catálogo y una cotización. Regresa la cotización."""
+    configuration, _ = AseguradoraConfiguracion.objects.update_or_create(
+        provider="CHUBB",
+        ambiente=AMBIENTE,
+        ramo=RAMO,
+        defaults={
+            "nombre": "Chubb benchmark",
+            "activo": True,
+            "prioridad": 1,
+            "token_url": token_url,
+            "base_url": base_url,
+            "client_id": "bench-client",
+            "client_secret": "bench-secret",
+            "resource_id": "bench-resource",
+            "api_version": "1",
+            "timeout": 30,
+            "grouping_id": 353991,
+            "rate_id": 308,
+            "business_profile_id": 7195,
+            "business_profile_name": "BASE_BENCH",
+            "source_application_id": 23,
+            "supports_quote": True,
+        },
+    )
+
+    settings = [
+        ("PRODUCT_ID", "1", ProviderSetting.ValueType.INTEGER),
+        ("AGENT_OPTION_ID", "91840", ProviderSetting.ValueType.STRING),
+        ("CONDUIT_ID", "0", ProviderSetting.ValueType.INTEGER),
+        ("CALCULATION_TYPE_ID", "2", ProviderSetting.ValueType.INTEGER),
+        ("CURRENCY_ID", "1", ProviderSetting.ValueType.INTEGER),
+        ("PAYMENT_TYPE_ID", "12", ProviderSetting.ValueType.INTEGER),
+        ("INSURED_AMOUNT_TYPE_ID", "2", ProviderSetting.ValueType.INTEGER),
+        ("DEDUCTIBLE_TYPE_ID", "1", ProviderSetting.ValueType.INTEGER),
+        ("NADASC", "false", ProviderSetting.ValueType.BOOLEAN),
+        (
+            "GENDER_IDS",
+            json.dumps({"MASCULINO": 1, "FEMENINO": 2}),
+            ProviderSetting.ValueType.JSON,
+        ),
+    ]
+
+    for key, value, value_type in settings:
+        ProviderSetting.objects.update_or_create(
+            configuracion=configuration,
+            key=key,
+            defaults={
+                "value": value,
+                "value_type": value_type,
+                "activo": True,
+            },
+        )
+
+    cliente = Cliente.objects.create(
+        tipo_cliente=Cliente.TipoCliente.PERSONA,
+        nombre="Benchmark",
+        apellido_paterno="Cotizador",
+        email_principal="benchmark@example.com",
+    )
+
+    marca, _ = Marca.objects.get_or_create(nombre="ACURA")
+    submarca, _ = SubMarca.objects.get_or_create(marca=marca, nombre="TL")
+    catalogo, _ = VehiculoCatalogo.objects.get_or_create(
+        marca=marca,
+        submarca=submarca,
+        anio=2015,
+        version="SEDAN 3.7L AUT",
+    )
+
+    vehiculo = Vehiculo.objects.create(
+        cliente=cliente,
+        catalogo=catalogo,
+        marca_texto="ACURA",
+        submarca_texto="TL",
+        modelo_anio=2015,
+        version="SEDAN 3.7L AUT",
+        tipo_uso=Vehiculo.TipoUso.PARTICULAR,
+        placas="BENCH01",
+    )
+
+    hoy = timezone.localdate()
+
+    cotizacion = Cotizacion.objects.create(
+        cliente=cliente,
+        vehiculo=vehiculo,
+        flotilla=None,
+        tipo_cotizacion=Cotizacion.Tipo.INDIVIDUAL,
+        vigencia_desde=hoy,
+        vigencia_hasta=hoy + timedelta(days=365),
+        conductor_nombre="Benchmark Cotizador",
+        conductor_genero=Cotizacion.GeneroConductor.MASCULINO,
+        conductor_edad=25,
+        estado="CHIHUAHUA",
+        ciudad="CHIHUAHUA",
+    )
+
+    mappings = [
+        ("VEHICLE", f"VEHICULO_CATALOGO_{catalogo.id}", "ACURA TL 2015", "01010100101"),
+        ("VEHICLE_USE", "PARTICULAR", "Particular", "01"),
+        ("STATE", "CHIHUAHUA", "Chihuahua", "5"),
+        ("MUNICIPALITY", "CHIHUAHUA", "Chihuahua", "369"),
+        ("COVERAGE_PACKAGE", "AMPLIA", "Amplia", "1"),
+    ]
+
+    for catalog_code, internal_code, internal_name, external_code in mappings:
+        catalog, _ = Catalog.objects.get_or_create(
+            code=catalog_code,
+            defaults={"name": catalog_code},
+        )
+        item, _ = CatalogItem.objects.get_or_create(
+            catalog=catalog,
+            code=internal_code,
+            defaults={"name": internal_name},
+        )
+        ProviderCatalogMapping.objects.update_or_create(
+            provider=configuration,
+            catalog=catalog,
+            catalog_item=item,
+            defaults={
+                "external_code": external_code,
+                "external_name": internal_name,
+            },
+        )
+
+    return cotizacion
+
+
+# ---------------------------------------------------------------------
+# Una cotización
+# ---------------------------------------------------------------------
+
+def cotizar(cotizacion) -> bool:
+    """Pipeline completo; True si el intento fue exitoso."""
+    provider = ChubbQuoteProviderBuilder().build(ambiente=AMBIENTE, ramo=RAMO)
+    configuration = ProviderConfigurationService.get_active(
+        provider="CHUBB",
+        ambiente=AMBIENTE,
+        ramo=RAMO,
+    )
+
+    request = QuoteRequestService.build(
+        cotizacion=cotizacion,
+        provider_id=configuration.id,
+        package_code="AMPLIA",
+        garage=False,
+    )
+
+    batch = QuoteService(providers=[provider]).quote_many({"CHUBB": request})
+
+    for attempt in batch.attempts:
+        QuotePersistenceService.persist(
+            cotizacion=cotizacion,
+            attempt=attempt,
+            request_json=QuoteRequestService.to_dict(request),
+        )
+
+    return batch.has_results
+
+
+# ---------------------------------------------------------------------
+# Corridas
+# ---------------------------------------------------------------------
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    k = (len(ordenados) - 1) * p / 100
+    i = int(k)
+    j = min(i + 1, len(ordenados) - 1)
+    return ordenados[i] + (ordenados[j] - ordenados[i]) * (k - i)
+
+
+def correr_nivel(cotizacion, *, concurrencia: int, cotizaciones: int) -> dict:
+    pendientes = queue.Queue()
+    for _ in range(cotizaciones):
+        pendientes.put(None)
+
+    latencias = []
+    queries = []
+    errores = [0]
+    lock = threading.Lock()
+
+    def worker():
+        perfil = Perfil("BENCH", "")
+        perfil.conectar()
+        try:
+            while True:
+                try:
+                    pendientes.get_nowait()
+                except queue.Empty:
+                    return
+
+                antes = perfil.sql_count
+                inicio = time.perf_counter()
+                try:
+                    ok = cotizar(cotizacion)
+                except Exception:
+                    ok = False
+                ms = (time.perf_counter() - inicio) * 1000
+
+                with lock:
+                    latencias.append(ms)
+                    queries.append(perfil.sql_count - antes)
+                    if not ok:
+                        errores[0] += 1
+        finally:
+            perfil.desconectar()
+            if threading.current_thread() is not threading.main_thread():
+                connections.close_all()
+
+    inicio = time.perf_counter()
+    if concurrencia == 1:
+        worker()
+    else:
+        hilos = [
+            threading.Thread(target=worker, name=f"bench-{i}")
+            for i in range(concurrencia)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+    wall = time.perf_counter() - inicio
+
+    total = len(latencias)
+    return {
+        "concurrencia": concurrencia,
+        "cotizaciones": total,
+        "errores": errores[0],
+        "error_rate": round(errores[0] / total, 4) if total else 0.0,
+        "wall_s": round(wall, 3),
+        "throughput_qps": round(total / wall, 2) if wall else 0.0,
+        "p50_ms": round(_percentil(latencias, 50), 2),
+        "p95_ms": round(_percentil(latencias, 95), 2),
+        "p99_ms": round(_percentil(latencias, 99), 2),
+        "max_ms": round(max(latencias, default=0.0), 2),
+        "queries_por_cotizacion": round(statistics.fmean(queries), 2) if queries else 0.0,
+    }
+
+
+def medir_memoria(cotizacion, *, cotizaciones: int) -> dict:
+    """Pasada secuencial con tracemalloc (lenta; no se mezcla con la latencia)."""
+    picos = []
+    netos = []
+
+    cotizar(cotizacion)  # calentamiento: imports, caches de clase
+
+    tracemalloc.start()
+    try:
+        for _ in range(cotizaciones):
+            actual, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            cotizar(cotizacion)
+            despues, pico = tracemalloc.get_traced_memory()
+            picos.append(pico - actual)
+            netos.append(despues - actual)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "cotizaciones": cotizaciones,
+        "pico_kb_por_cotizacion": round(statistics.fmean(picos) / 1024, 1) if picos else 0.0,
+        "neto_kb_por_cotizacion": round(statistics.fmean(netos) / 1024, 1) if netos else 0.0,
+    }
+
+
+def correr(
+    *,
+    stub,
+    niveles=(1, 4, 16),
+    cotizaciones: int = 50,
+    cotizaciones_memoria: int = 20,
+) -> dict:
+    cotizacion = preparar_datos(base_url=stub.base_url, token_url=stub.token_url)
+
+    return {
+        "meta": {
+            "fecha": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "db": connection.vendor,
+            "stub": {
+                "latency_ms": stub.latency_ms,
+                "jitter_ms": stub.jitter_ms,
+                "error_rate": stub.error_rate,
+            },
+            "cotizaciones_por_nivel": cotizaciones,
+        },
+        "niveles": [
+            correr_nivel(cotizacion, concurrencia=n, cotizaciones=cotizaciones)
+            for n in niveles
+        ],
+        "memoria": (
+            medir_memoria(cotizacion, cotizaciones=cotizaciones_memoria)
+            if cotizaciones_memoria
+            else {}
+        ),
+    }
+
+
+# ---------------------------------------------------------------------
+# Baseline
+# ---------------------------------------------------------------------
+
+def comparar(actual: dict, baseline: dict, *, tolerancia: float = 0.2) -> list[str]:
+    """Regresiones de `actual` contra `baseline` mayores a `tolerancia` (fracción)."""
+    previos = {n["concurrencia"]: n for n in baseline.get("niveles", [])}
+    regresiones = []
+
+    for nivel in actual.get("niveles", []):
+        previo = previos.get(nivel["concurrencia"])
+        if previo is None:
+            continue
+
+        for metrica, mas_es_mejor in METRICAS.items():
+            antes = previo.get(metrica)
+            ahora = nivel.get(metrica)
+            if antes is None or ahora is None:
+                continue
+
+            if mas_es_mejor:
+                empeora = ahora < antes * (1 - tolerancia)
+            elif antes == 0:
+                empeora = ahora > 0
+            else:
+                empeora = ahora > antes * (1 + tolerancia)
+
+            if empeora:
+                regresiones.append(
+                    f"c={nivel['concurrencia']} {metrica}: {antes} -> {ahora}"
+                )
+
+    return regresiones
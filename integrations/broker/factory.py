@@ -1,5 +1,3 @@
-from integrations.providers.insurance.chubb.provider import ChubbProvider
-
 """
 Factory del Switchh Insurance Engine.
 
@@ -12,16 +10,41 @@ implementación lista para ser utilizada por el Insurance Broker.
 No contiene lógica de negocio.
 No realiza llamadas HTTP.
 No conoce modelos Django.
+
+Los Providers se registran por ruta (módulo.Clase) y se importan la
+primera vez que se piden: arrancar un worker o un comando no carga los
+clientes de cada aseguradora. settings.INSURANCE_PROVIDERS agrega o
+reemplaza rutas sin tocar este archivo.
 """
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+PROVIDERS = {
+    "CHUBB": "integrations.providers.insurance.chubb.provider.ChubbProvider",
+}
+
+
+def provider_paths():
+    return {**PROVIDERS, **getattr(settings, "INSURANCE_PROVIDERS", {})}
 
-def get_provider(code, provider_config=None):
-    providers = {
-        "CHUBB": ChubbProvider,
-    }
 
-    provider_class = providers.get(code)
+@lru_cache(maxsize=None)
+def _load(path):
+    return import_string(path)
 
-    if not provider_class:
+
+def get_provider_class(code):
+    path = provider_paths().get(code)
+
+    if not path:
         raise ValueError(f"Proveedor no soportado: {code}")
 
+    return _load(path)
+
+
+def get_provider(code, provider_config=None):
+    provider_class = get_provider_class(code)
+
     return provider_class(provider_config=provider_config)
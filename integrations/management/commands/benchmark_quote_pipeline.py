@@ -0,0 +1,99 @@
+# integrations/management/commands/benchmark_quote_pipeline.py
+# Benchmark del pipeline de cotización contra un stub local de Chubb.
+# Corre sobre una base de pruebas desechable (como manage.py test), así
+# que no toca datos reales.
+#
+#   python manage.py benchmark_quote_pipeline --concurrencia 1,4,16 \
+#       --latency-ms 80 --jitter-ms 20 --output benchmarks/quote_pipeline.json
+#   python manage.py benchmark_quote_pipeline --compare benchmarks/quote_pipeline.json
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from integrations.benchmarks import quote_pipeline
+from integrations.benchmarks.chubb_stub import ChubbStubServer
+
+
+class Command(BaseCommand):
+    help = "Benchmark de builder -> quote_many -> persist contra un stub de Chubb; escribe/compara un baseline JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrencia", default="1,4,16", help="Niveles separados por coma")
+        parser.add_argument("--cotizaciones", type=int, default=50, help="Cotizaciones por nivel")
+        parser.add_argument("--memoria", type=int, default=20, help="Cotizaciones en la pasada con tracemalloc (0 = no medir)")
+        parser.add_argument("--latency-ms", type=float, default=50)
+        parser.add_argument("--jitter-ms", type=float, default=10)
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", help="Archivo JSON donde guardar el resultado (baseline)")
+        parser.add_argument("--compare", help="Baseline JSON contra el cual comparar")
+        parser.add_argument("--tolerancia", type=float, default=0.2, help="Fracción permitida antes de marcar regresión")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            niveles = [int(n) for n in options["concurrencia"].split(",") if n.strip()]
+        except ValueError:
+            raise CommandError("--concurrencia debe ser una lista de enteros, p.ej. 1,4,16")
+        if not niveles or min(niveles) < 1:
+            raise CommandError("--concurrencia debe tener niveles >= 1")
+
+        baseline = None
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text())
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with ChubbStubServer(
+                latency_ms=options["latency_ms"],
+                jitter_ms=options["jitter_ms"],
+                error_rate=options["error_rate"],
+                seed=options["seed"],
+            ) as stub:
+                resultado = quote_pipeline.correr(
+                    stub=stub,
+                    niveles=niveles,
+                    cotizaciones=options["cotizaciones"],
+                    cotizaciones_memoria=options["memoria"],
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self._reporte(resultado)
+
+        if options["output"]:
+            output = Path(options["output"])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps(resultado, indent=2, ensure_ascii=False))
+            self.stdout.write(f"Baseline guardado en {output}")
+
+        if baseline is not None:
+            regresiones = quote_pipeline.comparar(resultado, baseline, tolerancia=options["tolerancia"])
+            if not regresiones:
+                self.stdout.write(self.style.SUCCESS("Sin regresiones contra el baseline"))
+            else:
+                for r in regresiones:
+                    self.stdout.write(self.style.WARNING(f"Regresión: {r}"))
+                if options["fail_on_regression"]:
+                    raise CommandError(f"{len(regresiones)} regresión(es) contra {options['compare']}")
+
+    def _reporte(self, resultado):
+        self.stdout.write(
+            f"{'conc':>5} {'cotiz':>6} {'err':>5} {'qps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'q/cot':>6}"
+        )
+        for n in resultado["niveles"]:
+            self.stdout.write(
+                f"{n['concurrencia']:>5} {n['cotizaciones']:>6} {n['errores']:>5} {n['throughput_qps']:>8} "
+                f"{n['p50_ms']:>8} {n['p95_ms']:>8} {n['p99_ms']:>8} {n['max_ms']:>8} {n['queries_por_cotizacion']:>6}"
+            )
+        memoria = resultado.get("memoria")
+        if memoria:
+            self.stdout.write(
+                f"Memoria por cotización: pico {memoria['pico_kb_por_cotizacion']} KB, "
+                f"neto {memoria['neto_kb_por_cotizacion']} KB"
+            )
@@ -0,0 +1,45 @@
+# integrations/management/commands/outbox_worker.py
+# Envía los mensajes del outbox (WhatsApp / email).
+# En PRODUCCION corre como servicio (systemd / supervisor); --once para cron.
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from integrations import outbox
+
+
+class Command(BaseCommand):
+    help = "Procesa el outbox de mensajes salientes en lotes, con reintentos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Procesa lo pendiente y termina.")
+        parser.add_argument("--batch", type=int, default=0)
+        parser.add_argument("--idle-sleep", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        once = options["once"]
+        batch = options["batch"] or None
+        idle_sleep = options["idle_sleep"]
+
+        totales = {"tomados": 0, "enviados": 0, "reintentos": 0, "fallidos": 0}
+
+        while True:
+            close_old_connections()
+            res = outbox.process_batch(batch)
+            for k in totales:
+                totales[k] += res[k]
+
+            if res["tomados"]:
+                self.stdout.write(
+                    f"Lote: enviados={res['enviados']} reintentos={res['reintentos']} fallidos={res['fallidos']}"
+                )
+                continue
+
+            if once:
+                break
+            time.sleep(idle_sleep)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox: enviados={totales['enviados']} reintentos={totales['reintentos']} fallidos={totales['fallidos']}"
+        ))
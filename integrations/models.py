@@ -1,4 +1,5 @@
 # integrations/models.py
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
@@ -72,6 +73,55 @@ class IntegrationEvent(models.Model):
     def __str__(self):
         return f"{self.provider}:{self.event_type}:{self.event_id} ({self.status})"
 
+
+# Outbox de mensajes salientes (WhatsApp / email)
+class OutboxMessage(models.Model):
+    class Canal(models.TextChoices):
+        WHATSAPP = "WHATSAPP", "WhatsApp"
+        EMAIL = "EMAIL", "Email"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pendiente"    # en cola (o esperando reintento)
+        SENDING = "SENDING", "Enviando"     # tomado por un worker
+        SENT = "SENT", "Enviado"
+        FAILED = "FAILED", "Fallido"        # error definitivo o sin intentos
+
+    canal = models.CharField(max_length=12, choices=Canal.choices, db_index=True)
+    destinatario = models.CharField(max_length=200)  # teléfono (52...) o email
+    payload = models.JSONField(default=dict, blank=True)  # WA: body de la Graph API; email: subject/body
+    contenido = models.TextField(blank=True, default="")  # texto que se registra en crm.Mensaje
+    sensible = models.BooleanField(default=False)  # se borra el payload al enviarse (contraseñas)
+
+    cliente = models.ForeignKey("crm.Cliente", on_delete=models.SET_NULL, null=True, blank=True, related_name="outbox")
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+
+    # Acción al enviarse (ver integrations.outbox.register_handler) y sus datos
+    al_enviar = models.CharField(max_length=60, blank=True, default="")
+    referencia = models.JSONField(null=True, blank=True)
+
+    dedupe_key = models.CharField(max_length=160, null=True, blank=True, default=None, unique=True)
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    http_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    response = models.JSONField(null=True, blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.canal}:{self.destinatario} ({self.status})"
+
 # Configuracion usada para Quote Engine
 
 from django.db import models
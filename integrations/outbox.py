@@ -0,0 +1,313 @@
+# integrations/outbox.py
+"""
+Outbox transaccional de mensajes salientes (WhatsApp / email).
+
+Los envíos ya no se hacen dentro del request o del comando: se inserta
+un OutboxMessage en la misma transacción que el cambio que lo origina
+(si la transacción se revierte, el mensaje tampoco existe) y el worker
+(`python manage.py outbox_worker`) lo envía después:
+
+    - toma lotes con SELECT ... FOR UPDATE SKIP LOCKED (varios workers
+      no se pisan) y los marca SENDING con un lease; si el worker muere,
+      al vencer el lease otro los vuelve a tomar,
+    - WhatsApp: hilos sobre la Session compartida del provider con el
+      mismo token bucket que el envío masivo de recordatorios,
+    - email: una sola conexión SMTP por lote,
+    - errores transitorios se reintentan con backoff exponencial
+      (OUTBOX_BACKOFF_SECONDS * 2^intentos) hasta OUTBOX_MAX_ATTEMPTS;
+      los definitivos (número inválido, etc.) quedan FAILED,
+    - lo enviado se registra en crm.Mensaje y se ejecuta su acción
+      al_enviar (p.ej. el PolizaEvento del recordatorio).
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from integrations.models import OutboxMessage
+from integrations.providers.whatsapp import TokenBucket, WhatsAppCloudProvider, es_transitorio
+
+logger = logging.getLogger(__name__)
+
+ASUNTO_CONVERSACION = "Mensajes automáticos"
+MAX_BACKOFF_SECONDS = 6 * 60 * 60
+
+_handlers = {}
+
+
+def register_handler(nombre, fn):
+    """fn(mensaje) se ejecuta después de enviar un mensaje con al_enviar=nombre."""
+    _handlers[nombre] = fn
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# ---------------------------------------------------------------------
+# Encolar
+# ---------------------------------------------------------------------
+
+def encolar(
+    *,
+    canal,
+    destinatario,
+    payload,
+    contenido="",
+    cliente=None,
+    usuario=None,
+    al_enviar="",
+    referencia=None,
+    dedupe_key=None,
+    sensible=False,
+):
+    """
+    Crea el mensaje en la transacción actual. Con dedupe_key repetida no
+    se duplica: regresa el mensaje existente.
+    """
+    campos = dict(
+        canal=canal,
+        destinatario=destinatario,
+        payload=payload,
+        contenido=contenido,
+        cliente=cliente,
+        usuario=usuario,
+        al_enviar=al_enviar,
+        referencia=referencia,
+        dedupe_key=dedupe_key,
+        sensible=sensible,
+    )
+    if not dedupe_key:
+        return OutboxMessage.objects.create(**campos)
+
+    try:
+        with transaction.atomic():
+            return OutboxMessage.objects.create(**campos)
+    except IntegrityError:
+        return OutboxMessage.objects.get(dedupe_key=dedupe_key)
+
+
+def encolar_whatsapp_texto(*, telefono, mensaje, contenido=None, **kwargs):
+    payload = WhatsAppCloudProvider.text_payload(to=telefono, body=mensaje)
+    return encolar(
+        canal=OutboxMessage.Canal.WHATSAPP,
+        destinatario=telefono,
+        payload=payload,
+        contenido=mensaje if contenido is None else contenido,
+        **kwargs,
+    )
+
+
+def encolar_email(*, to, subject, body, from_email=None, **kwargs):
+    return encolar(
+        canal=OutboxMessage.Canal.EMAIL,
+        destinatario=to,
+        payload={"subject": subject, "body": body, "from_email": from_email or ""},
+        contenido=kwargs.pop("contenido", None) or f"{subject}\n\n{body}",
+        **kwargs,
+    )
+
+
+# ---------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------
+
+def claim_batch(limit=None, now=None):
+    """Toma hasta limit mensajes listos y los marca SENDING con lease."""
+    now = now or timezone.now()
+    limit = limit or _setting("OUTBOX_BATCH_SIZE", 100)
+    lease = timedelta(seconds=_setting("OUTBOX_LEASE_SECONDS", 300))
+
+    listos = Q(status=OutboxMessage.Status.PENDING, next_attempt_at__lte=now) | Q(
+        status=OutboxMessage.Status.SENDING, locked_until__lt=now,
+    )
+
+    with transaction.atomic():
+        ids = list(
+            OutboxMessage.objects
+            .select_for_update(skip_locked=True)
+            .filter(listos)
+            .order_by("next_attempt_at", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        OutboxMessage.objects.filter(id__in=ids).update(
+            status=OutboxMessage.Status.SENDING,
+            locked_until=now + lease,
+            last_attempt_at=now,
+        )
+
+    return list(OutboxMessage.objects.filter(id__in=ids).order_by("id"))
+
+
+def _send_whatsapp(provider, bucket, msg):
+    bucket.acquire()
+    try:
+        return provider.send(msg.payload)
+    except requests.RequestException as exc:
+        return {"ok": False, "error": str(exc), "transient": True}
+
+
+def _send_whatsapp_batch(mensajes, provider=None):
+    if not mensajes:
+        return {}
+    provider = provider or WhatsAppCloudProvider()
+    bucket = TokenBucket(_setting("WHATSAPP_RATE_PER_SECOND", 80))
+    workers = min(len(mensajes), _setting("WHATSAPP_DISPATCH_WORKERS", 16))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="outbox-wa") as pool:
+        results = pool.map(lambda m: _send_whatsapp(provider, bucket, m), mensajes)
+        return {m.id: r for m, r in zip(mensajes, results)}
+
+
+def _send_email_batch(mensajes, connection=None):
+    if not mensajes:
+        return {}
+    results = {}
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as exc:  # SMTP caído: todo el lote se reintenta
+        return {m.id: {"ok": False, "error": str(exc), "transient": True} for m in mensajes}
+
+    try:
+        for msg in mensajes:
+            email = EmailMessage(
+                subject=msg.payload.get("subject", ""),
+                body=msg.payload.get("body", ""),
+                from_email=msg.payload.get("from_email") or None,
+                to=[msg.destinatario],
+                connection=connection,
+            )
+            try:
+                email.send()
+                results[msg.id] = {"ok": True}
+            except Exception as exc:
+                results[msg.id] = {"ok": False, "error": str(exc), "transient": True}
+    finally:
+        connection.close()
+    return results
+
+
+def _backoff(attempts):
+    base = _setting("OUTBOX_BACKOFF_SECONDS", 30)
+    return timedelta(seconds=min(base * (2 ** max(0, attempts - 1)), MAX_BACKOFF_SECONDS))
+
+
+def _apply_result(msg, result, now):
+    msg.attempts += 1
+    msg.locked_until = None
+    msg.http_status = result.get("status_code")
+    msg.response = result.get("data")
+
+    if result.get("ok"):
+        msg.status = OutboxMessage.Status.SENT
+        msg.sent_at = now
+        msg.last_error = ""
+        if msg.sensible:
+            msg.payload = {}
+        return
+
+    msg.last_error = str(result.get("error") or result.get("data") or "")[:2000]
+    transitorio = msg.canal == OutboxMessage.Canal.EMAIL or es_transitorio(result)
+    if transitorio and msg.attempts < _setting("OUTBOX_MAX_ATTEMPTS", 8):
+        msg.status = OutboxMessage.Status.PENDING
+        msg.next_attempt_at = now + _backoff(msg.attempts)
+    else:
+        msg.status = OutboxMessage.Status.FAILED
+
+
+def _registrar_mensajes(enviados):
+    """Historial en crm.Mensaje: una conversación abierta por cliente y canal."""
+    from crm.models import Conversacion, Mensaje
+
+    con_cliente = [m for m in enviados if m.cliente_id]
+    if not con_cliente:
+        return
+
+    conversaciones = {}
+    for conv_id, cliente_id, canal in (
+        Conversacion.objects
+        .filter(
+            cliente_id__in={m.cliente_id for m in con_cliente},
+            asunto=ASUNTO_CONVERSACION,
+            estatus=Conversacion.Estatus.ABIERTA,
+        )
+        .order_by("id")
+        .values_list("id", "cliente_id", "canal_principal")
+    ):
+        conversaciones[(cliente_id, canal)] = conv_id
+
+    for msg in con_cliente:
+        key = (msg.cliente_id, msg.canal)
+        if key not in conversaciones:
+            conversaciones[key] = Conversacion.objects.create(
+                cliente_id=msg.cliente_id,
+                asunto=ASUNTO_CONVERSACION,
+                canal_principal=msg.canal,
+            ).pk
+
+    Mensaje.objects.bulk_create([
+        Mensaje(
+            conversacion_id=conversaciones[(msg.cliente_id, msg.canal)],
+            fecha_hora=msg.sent_at,
+            canal=msg.canal,
+            direccion=Mensaje.Direccion.SALIENTE,
+            contenido=msg.contenido,
+            usuario_id=msg.usuario_id,
+            metadata={"outbox_id": msg.id, "destinatario": msg.destinatario},
+        )
+        for msg in con_cliente
+    ])
+
+
+def process_batch(limit=None, *, provider=None, email_connection=None):
+    """Toma un lote, lo envía y guarda resultados. Regresa conteos."""
+    mensajes = claim_batch(limit)
+    if not mensajes:
+        return {"tomados": 0, "enviados": 0, "reintentos": 0, "fallidos": 0}
+
+    results = {}
+    results.update(_send_whatsapp_batch(
+        [m for m in mensajes if m.canal == OutboxMessage.Canal.WHATSAPP], provider,
+    ))
+    results.update(_send_email_batch(
+        [m for m in mensajes if m.canal == OutboxMessage.Canal.EMAIL], email_connection,
+    ))
+
+    now = timezone.now()
+    for msg in mensajes:
+        _apply_result(msg, results.get(msg.id, {"ok": False, "error": "Canal no soportado"}), now)
+
+    enviados = [m for m in mensajes if m.status == OutboxMessage.Status.SENT]
+
+    with transaction.atomic():
+        OutboxMessage.objects.bulk_update(mensajes, [
+            "status", "attempts", "locked_until", "next_attempt_at", "sent_at",
+            "http_status", "last_error", "response", "payload",
+        ])
+        _registrar_mensajes(enviados)
+
+    for msg in enviados:
+        handler = _handlers.get(msg.al_enviar)
+        if handler is None:
+            continue
+        try:
+            handler(msg)
+        except Exception:
+            # El mensaje ya salió: no se reintenta por un error del handler
+            logger.exception("outbox: falló al_enviar=%s del mensaje %s", msg.al_enviar, msg.id)
+
+    return {
+        "tomados": len(mensajes),
+        "enviados": len(enviados),
+        "reintentos": sum(1 for m in mensajes if m.status == OutboxMessage.Status.PENDING),
+        "fallidos": sum(1 for m in mensajes if m.status == OutboxMessage.Status.FAILED),
+    }
@@ -2,24 +2,31 @@ from __future__ import annotations
 
 from typing import Optional
 
-from integrations.providers.mock import MockProvider
-from integrations.providers.mercadopago import MercadoPagoProvider
-
-# Registra aquí providers reales cuando existan:
-# from integrations.providers.stripe import StripeProvider
+from django.utils.module_loading import import_string
 
+# Providers de pago por ruta: el módulo (y su SDK) se importa la primera
+# vez que se pide el provider, no al cargar este paquete (lo importa
+# cualquier integrations.providers.*, incluido el outbox en django.setup).
+# Registra aquí providers reales cuando existan.
 _PROVIDERS = {
-    "mock": MockProvider(),
-    "mercadopago": MercadoPagoProvider(),
-    # "stripe": StripeProvider(),
-    # "mercadopago": MercadoPagoProvider(),
+    "mock": "integrations.providers.mock.MockProvider",
+    "mercadopago": "integrations.providers.mercadopago.MercadoPagoProvider",
+    # "stripe": "integrations.providers.stripe.StripeProvider",
 }
 
+_instances = {}
+
 
 def get_provider(slug: str) -> Optional[object]:
     if not slug:
         return None
-    return _PROVIDERS.get(slug.lower())
+    slug = slug.lower()
+    path = _PROVIDERS.get(slug)
+    if path is None:
+        return None
+    if slug not in _instances:
+        _instances[slug] = import_string(path)()
+    return _instances[slug]
 
 
 # providers chubb, gnp, axa, etc
@@ -26,6 +26,13 @@ class BaseProvider:
         """
         raise NotImplementedError
 
+    def fetch(self, normalized: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        I/O remoto previo a process (p.ej. consultar el pago en el API del
+        provider). Corre fuera de la transacción; por defecto no hace nada.
+        """
+        return normalized
+
     def process(self, normalized: Dict[str, Any]) -> None:
         """
         Aplica efectos en el sistema (Pago/Poliza/PolizaEvento).
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 import requests
+from asgiref.sync import sync_to_async
 
 from integrations.configuration.services import (
     ProviderConfigurationService,
@@ -49,12 +50,7 @@ class ChubbAuthClient:
 
         self._validate_configuration(configuration)
 
-        headers = {
-            "App_id": str(configuration.client_id).strip(),
-            "App_key": str(configuration.client_secret).strip(),
-            "Resource": str(configuration.resource_id).strip(),
-            "apiVersion": str(configuration.api_version).strip(),
-        }
+        headers = self._build_headers(configuration)
 
         try:
             response = self.session.post(
@@ -86,6 +82,19 @@ class ChubbAuthClient:
 
             raise ProviderAuthenticationError(message)
 
+        return self._parse_response(response)
+
+    @staticmethod
+    def _build_headers(configuration) -> dict[str, str]:
+        return {
+            "App_id": str(configuration.client_id).strip(),
+            "App_key": str(configuration.client_secret).strip(),
+            "Resource": str(configuration.resource_id).strip(),
+            "apiVersion": str(configuration.api_version).strip(),
+        }
+
+    @classmethod
+    def _parse_response(cls, response) -> ChubbAccessToken:
         try:
             payload = response.json()
         except ValueError as exc:
@@ -94,7 +103,7 @@ class ChubbAuthClient:
                 "que no contiene JSON válido."
             ) from exc
 
-        return self._parse_token(payload)
+        return cls._parse_token(payload)
 
     @staticmethod
     def _validate_configuration(configuration) -> None:
@@ -215,4 +224,77 @@ class ChubbAuthClient:
             return str(
                 getattr(response, "text", "")
             ).strip()[:500]
-                
\ No newline at end of file
+
+
+class AsyncChubbAuthClient(ChubbAuthClient):
+    """
+    Variante async de ChubbAuthClient (httpx).
+
+    La configuración sale del ORM: se lee con sync_to_async en el hilo
+    compartido (thread_sensitive) para no abrir conexiones por hilo.
+    """
+
+    def __init__(
+        self,
+        *,
+        provider: str = "CHUBB",
+        ambiente: str,
+        ramo: str,
+        configuration_service: Any = ProviderConfigurationService,
+        client=None,
+    ):
+        self.provider = provider
+        self.ambiente = ambiente
+        self.ramo = ramo
+        self.configuration_service = configuration_service
+        self.client = client
+
+    async def get_token(self) -> ChubbAccessToken:
+        from integrations.providers.chubb.http_client import _httpx
+
+        httpx = _httpx()
+
+        configuration = await sync_to_async(
+            self.configuration_service.get_active,
+            thread_sensitive=True,
+        )(
+            provider=self.provider,
+            ambiente=self.ambiente,
+            ramo=self.ramo,
+        )
+
+        self._validate_configuration(configuration)
+
+        if self.client is None:
+            self.client = httpx.AsyncClient()
+
+        try:
+            response = await self.client.post(
+                configuration.token_url,
+                headers=self._build_headers(configuration),
+                timeout=configuration.timeout,
+            )
+        except httpx.TimeoutException as exc:
+            raise ProviderAuthenticationError(
+                "Chubb no respondió dentro del tiempo configurado."
+            ) from exc
+        except httpx.HTTPError as exc:
+            raise ProviderAuthenticationError(
+                "No fue posible conectar con el servicio "
+                "de autenticación de Chubb."
+            ) from exc
+
+        if not response.is_success:
+            detail = self._extract_error_detail(response)
+
+            message = (
+                "Chubb rechazó la solicitud de autenticación. "
+                f"HTTP {response.status_code}."
+            )
+
+            if detail:
+                message += f" Detalle: {detail}"
+
+            raise ProviderAuthenticationError(message)
+
+        return self._parse_response(response)
@@ -318,4 +318,145 @@ class ChubbHttpClient:
             )
 
         return normalized
-    
\ No newline at end of file
+    
+
+def _httpx():
+    # Opcional: solo se necesita en modo ASGI (requirements: httpx)
+    import httpx
+
+    return httpx
+
+
+class AsyncChubbHttpClient(ChubbHttpClient):
+    """
+    Variante async de ChubbHttpClient sobre httpx.AsyncClient.
+
+    Mismos headers, validaciones y normalización de errores; el await de
+    la red no ocupa un hilo, así un proceso ASGI sostiene cientos de
+    llamadas a Chubb en vuelo.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        api_version: str,
+        timeout: int | float,
+        client=None,
+    ):
+        self.base_url = self._normalize_base_url(base_url)
+        self.api_version = self._require_text(
+            api_version,
+            field_name="api_version",
+        )
+        self.timeout = self._validate_timeout(timeout)
+        self.client = client
+
+    def _get_client(self):
+        if self.client is None:
+            self.client = _httpx().AsyncClient(
+                follow_redirects=False,
+            )
+        return self.client
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+
+    async def get(
+        self,
+        path: str,
+        *,
+        token: ChubbAccessToken,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> ChubbHttpResponse:
+        return await self.request(
+            method="GET",
+            path=path,
+            token=token,
+            params=params,
+            headers=headers,
+        )
+
+    async def post(
+        self,
+        path: str,
+        *,
+        token: ChubbAccessToken,
+        payload: Any | None = None,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> ChubbHttpResponse:
+        return await self.request(
+            method="POST",
+            path=path,
+            token=token,
+            payload=payload,
+            params=params,
+            headers=headers,
+        )
+
+    async def request(
+        self,
+        *,
+        method: str,
+        path: str,
+        token: ChubbAccessToken,
+        payload: Any | None = None,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> ChubbHttpResponse:
+        httpx = _httpx()
+
+        normalized_method = self._normalize_method(method)
+        url = self._build_url(path)
+
+        request_kwargs: dict[str, Any] = {
+            "method": normalized_method,
+            "url": url,
+            "headers": self._build_headers(
+                token=token,
+                custom_headers=headers,
+            ),
+            "params": dict(params or {}),
+            "timeout": self.timeout,
+        }
+
+        if payload is not None:
+            request_kwargs["json"] = payload
+
+        try:
+            response = await self._get_client().request(
+                **request_kwargs,
+            )
+        except httpx.TimeoutException as exc:
+            raise ProviderHttpTimeoutError(
+                f"Chubb excedió el timeout de {self.timeout} "
+                f"segundos para {normalized_method} {path}."
+            ) from exc
+        except httpx.ConnectError as exc:
+            raise ProviderHttpConnectionError(
+                f"No fue posible establecer conexión con Chubb "
+                f"para {normalized_method} {path}."
+            ) from exc
+        except httpx.HTTPError as exc:
+            raise ProviderHttpConnectionError(
+                f"Error de comunicación con Chubb "
+                f"durante {normalized_method} {path}."
+            ) from exc
+
+        if not response.is_success:
+            raise ProviderHttpResponseError(
+                self._build_http_error_message(
+                    method=normalized_method,
+                    path=path,
+                    response=response,
+                )
+            )
+
+        return ChubbHttpResponse(
+            status_code=response.status_code,
+            data=self._parse_response(response),
+            headers=dict(response.headers),
+        )
@@ -4,9 +4,11 @@ from integrations.configuration.services import (
     ProviderConfigurationService,
 )
 from integrations.providers.chubb.auth import (
+    AsyncChubbAuthClient,
     ChubbAuthClient,
 )
 from integrations.providers.chubb.http_client import (
+    AsyncChubbHttpClient,
     ChubbHttpClient,
 )
 from integrations.providers.chubb.quote_contracts import (
@@ -45,6 +47,8 @@ class ChubbQuoteClient:
         configuration_service=ProviderConfigurationService,
         auth_client=None,
         http_client=None,
+        async_auth_client=None,
+        async_http_client=None,
     ):
         self.ambiente = ambiente.strip()
         self.ramo = ramo.strip()
@@ -73,11 +77,34 @@ class ChubbQuoteClient:
             timeout=self.configuration.timeout,
         )
 
-    def _post_quote(
-        self,
-        endpoint: str,
-        payload: dict,
-    ):
+        # Modo ASGI: se crean al primer uso (httpx es opcional)
+        self._async_auth_client = async_auth_client
+        self._async_http_client = async_http_client
+
+    @property
+    def async_auth_client(self):
+        if self._async_auth_client is None:
+            self._async_auth_client = AsyncChubbAuthClient(
+                provider=self.provider_code,
+                ambiente=self.ambiente,
+                ramo=self.ramo,
+                configuration_service=self.configuration_service,
+            )
+        return self._async_auth_client
+
+    @property
+    def async_http_client(self):
+        if self._async_http_client is None:
+            self._async_http_client = AsyncChubbHttpClient(
+                base_url=self.configuration.base_url,
+                api_version=str(
+                    self.configuration.api_version
+                ),
+                timeout=self.configuration.timeout,
+            )
+        return self._async_http_client
+
+    def _source_application_headers(self) -> dict:
         source_application_id = (
             self.configuration.source_application_id
         )
@@ -88,17 +115,44 @@ class ChubbQuoteClient:
                 "'source_application_id'."
             )
 
+        return {
+            "CB-SourceApplication": str(
+                source_application_id
+            ),
+        }
+
+    def _post_quote(
+        self,
+        endpoint: str,
+        payload: dict,
+    ):
+        headers = self._source_application_headers()
+
         token = self.auth_client.get_token()
 
         response = self.http_client.post(
             endpoint,
             token=token,
             payload=payload,
-            headers={
-                "CB-SourceApplication": str(
-                    source_application_id
-                ),
-            },
+            headers=headers,
+        )
+
+        return response.data
+
+    async def _apost_quote(
+        self,
+        endpoint: str,
+        payload: dict,
+    ):
+        headers = self._source_application_headers()
+
+        token = await self.async_auth_client.get_token()
+
+        response = await self.async_http_client.post(
+            endpoint,
+            token=token,
+            payload=payload,
+            headers=headers,
         )
 
         return response.data
@@ -139,6 +193,32 @@ class ChubbQuoteClient:
         self,
         request: ChubbCreateQuoteRequest,
     ) -> ChubbCreateQuoteResult:
+        payload = self._create_quote_payload(request)
+
+        response_data = self._post_quote(
+            "/quote",
+            payload,
+        )
+
+        return self._create_quote_result(response_data)
+
+    async def acreate_quote(
+        self,
+        request: ChubbCreateQuoteRequest,
+    ) -> ChubbCreateQuoteResult:
+        payload = self._create_quote_payload(request)
+
+        response_data = await self._apost_quote(
+            "/quote",
+            payload,
+        )
+
+        return self._create_quote_result(response_data)
+
+    @staticmethod
+    def _create_quote_payload(
+        request: ChubbCreateQuoteRequest,
+    ) -> dict:
         if not isinstance(
             request,
             ChubbCreateQuoteRequest,
@@ -149,7 +229,7 @@ class ChubbQuoteClient:
             )
 
         try:
-            payload = ChubbQuoteRequestMapper.create_quote(
+            return ChubbQuoteRequestMapper.create_quote(
                 request,
             )
         except ValueError as exc:
@@ -157,11 +237,10 @@ class ChubbQuoteClient:
                 str(exc)
             ) from exc
 
-        response_data = self._post_quote(
-            "/quote",
-            payload,
-        )
-
+    @staticmethod
+    def _create_quote_result(
+        response_data,
+    ) -> ChubbCreateQuoteResult:
         try:
             return ChubbQuoteResponseMapper.create_quote(
                 response_data,
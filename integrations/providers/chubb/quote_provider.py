@@ -45,3 +45,19 @@ class ChubbQuoteProvider:
         return ChubbQuoteAdapter.to_quote_result(
             chubb_result
         )
+
+    async def aquote(
+        self,
+        request: InternalQuoteRequest,
+    ) -> QuoteResult:
+        chubb_request = self._request_mapper.create_quote(
+            request
+        )
+
+        chubb_result = await self._client.acreate_quote(
+            chubb_request
+        )
+
+        return ChubbQuoteAdapter.to_quote_result(
+            chubb_result
+        )
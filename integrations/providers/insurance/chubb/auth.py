@@ -1,18 +1,25 @@
 import requests
 from django.conf import settings
-from django.core.cache import cache
+
+from core.services import cache
 
 from .exceptions import ChubbAuthorizationError
 
 
-CACHE_KEY = "chubb_access_token"
+# Compartido entre workers (un solo request de token a la vez) y con L1 por proceso
+TOKENS = cache.namespace("chubb", l1_ttl=60)
+CACHE_KEY = "access_token"
 
 
 def get_chubb_access_token() -> str:
-    cached = cache.get(CACHE_KEY)
-    if cached:
-        return cached
+    return TOKENS.get_or_set(
+        CACHE_KEY,
+        _request_token,
+        ttl=lambda data: max(data["expires_in"] - 300, 60),
+    )["token"]
+
 
+def _request_token() -> dict:
     headers = {
         "Content-Type": "application/json",
         "App_ID": settings.CHUBB_CLIENT_ID,
@@ -40,7 +47,4 @@ def get_chubb_access_token() -> str:
     if not token:
         raise ChubbAuthorizationError(f"Chubb no regresó access_token: {data}")
 
-    expires_in = int(data.get("expires_in", 3599))
-    cache.set(CACHE_KEY, token, max(expires_in - 300, 60))
-
-    return token
\ No newline at end of file
+    return {"token": token, "expires_in": int(data.get("expires_in", 3599))}
\ No newline at end of file
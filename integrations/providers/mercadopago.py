@@ -129,13 +129,24 @@ class MercadoPagoProvider:
     # ---------------------------------------------------------------------
     # PROCESO PRINCIPAL
     # ---------------------------------------------------------------------
+    def fetch(self, normalized: dict) -> dict:
+        """
+        I/O remoto fuera de la transacción (y fuera del hilo del ORM en
+        modo async): trae el payment y lo deja en normalized["remote"].
+        """
+        payment_id = (normalized.get("data") or {}).get("payment_id")
+        if not payment_id:
+            raise ProviderBusinessIgnore("mercadopago: missing payment_id", code="MISSING_PAYMENT_ID")
+
+        return {**normalized, "remote": self._fetch_payment(payment_id)}
+
     @transaction.atomic
     def process(self, normalized: dict):
         payment_id = (normalized.get("data") or {}).get("payment_id")
         if not payment_id:
             raise ProviderBusinessIgnore("mercadopago: missing payment_id", code="MISSING_PAYMENT_ID")
 
-        mp_payment = self._fetch_payment(payment_id)
+        mp_payment = normalized.get("remote") or self._fetch_payment(payment_id)
 
         # 1) Obtener external_reference y mapear a Pago interno
         external_reference = (mp_payment.get("external_reference") or "").strip()
@@ -264,12 +275,11 @@ class MercadoPagoProvider:
             },
         )
 
-import mercadopago
-from django.conf import settings
-
-
 class MercadoPagoPaymentProvider:
     def __init__(self):
+        # SDK diferido: solo lo carga quien consulta pagos (webhook)
+        import mercadopago
+
         self.sdk = mercadopago.SDK(settings.MERCADOPAGO_ACCESS_TOKEN)
 
     def obtener_pago(self, payment_id):
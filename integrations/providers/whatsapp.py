@@ -1,9 +1,73 @@
+import threading
+import time
+
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+# Códigos de error de la Graph API que indican throttling
+TRANSIENT_ERROR_CODES = {4, 80007, 130429}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Session compartida del proceso para la Graph API: reutiliza las
+    conexiones TLS en lugar de abrir una por mensaje. El pool alcanza
+    para los hilos del despachador de recordatorios.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                size = max(10, getattr(settings, "WHATSAPP_DISPATCH_WORKERS", 16))
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=size))
+                _session = session
+    return _session
+
+
+class TokenBucket:
+    """Token bucket thread-safe: rate tokens por segundo, ráfaga de capacity."""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1, rate))
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                espera = (1 - self.tokens) / self.rate
+            self._sleep(espera)
+
+
+def es_transitorio(result):
+    if result.get("ok"):
+        return False
+    if result.get("transient") or result.get("status_code") in TRANSIENT_STATUS:
+        return True
+    error = (result.get("data") or {}).get("error") or {}
+    return isinstance(error, dict) and error.get("code") in TRANSIENT_ERROR_CODES
 
 
 class WhatsAppCloudProvider:
-    def __init__(self):
+    def __init__(self, session=None):
+        self.session = session or get_session()
+        self.timeout = getattr(settings, "WHATSAPP_TIMEOUT", 10)
         self.enabled = bool(getattr(settings, "WHATSAPP_ENABLED", False))
         self.access_token = getattr(settings, "WHATSAPP_ACCESS_TOKEN", "")
         self.phone_number_id = getattr(settings, "WHATSAPP_PHONE_NUMBER_ID", "")
@@ -14,16 +78,27 @@ class WhatsAppCloudProvider:
     def base_url(self):
         return f"https://graph.facebook.com/{self.api_version}/{self.phone_number_id}/messages"
 
-    def send_template_recordatorio(self, *, to, cliente_nombre, poliza_numero, monto, fecha_vencimiento):
-        if not self.enabled:
-            return {"ok": False, "error": "WhatsApp disabled in settings"}
-
-        headers = {
+    @property
+    def headers(self):
+        return {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
         }
 
-        payload = {
+    @staticmethod
+    def text_payload(*, to, body):
+        return {
+            "messaging_product": "whatsapp",
+            "to": to,
+            "type": "text",
+            "text": {
+                "preview_url": False,
+                "body": body,
+            },
+        }
+
+    def template_recordatorio_payload(self, *, to, cliente_nombre, poliza_numero, monto, fecha_vencimiento):
+        return {
             "messaging_product": "whatsapp",
             "to": to,
             "type": "template",
@@ -44,7 +119,20 @@ class WhatsAppCloudProvider:
             },
         }
 
-        resp = requests.post(self.base_url, headers=headers, json=payload, timeout=30)
+    def send_template_recordatorio(self, *, to, cliente_nombre, poliza_numero, monto, fecha_vencimiento):
+        if not self.enabled:
+            return {"ok": False, "error": "WhatsApp disabled in settings"}
+
+        return self.send(self.template_recordatorio_payload(
+            to=to,
+            cliente_nombre=cliente_nombre,
+            poliza_numero=poliza_numero,
+            monto=monto,
+            fecha_vencimiento=fecha_vencimiento,
+        ))
+
+    def send(self, payload):
+        resp = self.session.post(self.base_url, headers=self.headers, json=payload, timeout=self.timeout)
 
         try:
             data = resp.json()
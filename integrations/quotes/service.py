@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Iterable, Mapping
 from time import perf_counter
 from typing import Any
 
+from asgiref.sync import sync_to_async
+
 from integrations.quotes.contracts import (
     QuoteAttempt,
     QuoteBatchResult,
@@ -60,6 +63,71 @@ class QuoteService:
         propagan fuera del servicio.
         """
 
+        normalized_code, provider = self._get_provider(
+            provider_code
+        )
+
+        started_at = perf_counter()
+
+        try:
+            result = provider.quote(request)
+        except Exception as exc:
+            return self._failed_attempt(
+                normalized_code,
+                exc,
+                started_at,
+            )
+
+        return self._success_attempt(
+            normalized_code,
+            result,
+            started_at,
+        )
+
+    async def aquote_one(
+        self,
+        provider_code: str,
+        request: InternalQuoteRequest,
+    ) -> QuoteAttempt:
+        """
+        Variante async de quote_one.
+
+        Si el proveedor tiene `aquote` (HTTP async) se espera directo;
+        si no, su `quote` síncrono corre con sync_to_async en el hilo
+        compartido (thread_sensitive), porque puede tocar el ORM.
+        """
+
+        normalized_code, provider = self._get_provider(
+            provider_code
+        )
+
+        started_at = perf_counter()
+
+        try:
+            if hasattr(provider, "aquote"):
+                result = await provider.aquote(request)
+            else:
+                result = await sync_to_async(
+                    provider.quote,
+                    thread_sensitive=True,
+                )(request)
+        except Exception as exc:
+            return self._failed_attempt(
+                normalized_code,
+                exc,
+                started_at,
+            )
+
+        return self._success_attempt(
+            normalized_code,
+            result,
+            started_at,
+        )
+
+    def _get_provider(
+        self,
+        provider_code: str,
+    ) -> tuple[str, QuoteProvider]:
         normalized_code = self._normalize_provider_code(
             provider_code
         )
@@ -71,25 +139,32 @@ class QuoteService:
                 f"El proveedor {normalized_code} no está registrado."
             )
 
-        started_at = perf_counter()
-
-        try:
-            result = provider.quote(request)
-        except Exception as exc:
-            elapsed_ms = self._elapsed_ms(started_at)
+        return normalized_code, provider
 
-            return QuoteAttempt(
+    def _failed_attempt(
+        self,
+        normalized_code: str,
+        exc: Exception,
+        started_at: float,
+    ) -> QuoteAttempt:
+        return QuoteAttempt(
+            provider_code=normalized_code,
+            success=False,
+            elapsed_ms=self._elapsed_ms(started_at),
+            error=QuoteProviderError(
                 provider_code=normalized_code,
-                success=False,
-                elapsed_ms=elapsed_ms,
-                error=QuoteProviderError(
-                    provider_code=normalized_code,
-                    message=str(exc) or exc.__class__.__name__,
-                    error_type=exc.__class__.__name__,
-                    retryable=self._is_retryable(exc),
-                ),
-            )
+                message=str(exc) or exc.__class__.__name__,
+                error_type=exc.__class__.__name__,
+                retryable=self._is_retryable(exc),
+            ),
+        )
 
+    def _success_attempt(
+        self,
+        normalized_code: str,
+        result,
+        started_at: float,
+    ) -> QuoteAttempt:
         elapsed_ms = self._elapsed_ms(started_at)
 
         if result.provider_code != normalized_code:
@@ -147,6 +222,66 @@ class QuoteService:
             attempts=tuple(attempts),
         )
 
+    async def aquote_many(
+        self,
+        requests: Mapping[str, InternalQuoteRequest],
+        *,
+        fail_fast: bool = False,
+    ) -> QuoteBatchResult:
+        """
+        Variante async de quote_many: todos los proveedores en paralelo.
+
+        Los intentos se regresan en el orden de `requests`. Con
+        fail_fast, al primer fallo se cancelan los pendientes y solo se
+        regresan los que terminaron.
+        """
+
+        if not requests:
+            raise ValueError(
+                "Debe proporcionarse al menos una solicitud."
+            )
+
+        codes = list(requests.keys())
+        tasks = {
+            asyncio.ensure_future(
+                self.aquote_one(provider_code, request)
+            ): index
+            for index, (provider_code, request) in enumerate(
+                requests.items()
+            )
+        }
+
+        done: dict[int, QuoteAttempt] = {}
+        pending = set(tasks)
+
+        try:
+            while pending:
+                finished, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for task in finished:
+                    attempt = task.result()
+                    done[tasks[task]] = attempt
+
+                if fail_fast and any(
+                    not attempt.success
+                    for attempt in done.values()
+                ):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return QuoteBatchResult(
+            attempts=tuple(
+                done[index]
+                for index in range(len(codes))
+                if index in done
+            ),
+        )
+
     @staticmethod
     def _normalize_provider_code(
         provider_code: str,
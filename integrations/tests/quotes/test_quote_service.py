@@ -1,4 +1,6 @@
+import asyncio
 from decimal import Decimal
+from time import perf_counter
 from unittest import TestCase
 
 from integrations.quotes.contracts import (
@@ -56,6 +58,27 @@ class TimeoutProvider:
         )
 
 
+class SlowAsyncProvider:
+    """Simula una aseguradora lenta con HTTP async."""
+
+    def __init__(self, provider_code, delay=0.2):
+        self.provider_code = provider_code
+        self.delay = delay
+
+    async def aquote(self, request):
+        await asyncio.sleep(self.delay)
+        return QuoteResult(
+            provider_code=self.provider_code,
+            provider_quote_id=f"QUOTE-{self.provider_code}",
+            reference="SWITCHH-001",
+            currency="MXN",
+            net_premium=Decimal("10000.00"),
+            fees=Decimal("500.00"),
+            taxes=Decimal("2000.00"),
+            total_premium=Decimal("12500.00"),
+        )
+
+
 class QuoteServiceTests(TestCase):
     def test_requires_at_least_one_provider(self):
         with self.assertRaisesRegex(
@@ -272,3 +295,49 @@ class QuoteServiceTests(TestCase):
                 "CHUBB",
                 request={},
             )
+
+    def test_aquote_many_runs_providers_concurrently(self):
+        codes = ["CHUBB", "QUALITAS", "GNP", "HDI"]
+        service = QuoteService(
+            [SlowAsyncProvider(code) for code in codes]
+        )
+
+        started_at = perf_counter()
+        batch = asyncio.run(
+            service.aquote_many(
+                {code: {} for code in codes}
+            )
+        )
+        elapsed = perf_counter() - started_at
+
+        self.assertEqual(
+            [attempt.provider_code for attempt in batch.attempts],
+            codes,
+        )
+        self.assertEqual(len(batch.successful), 4)
+        # En paralelo: ~0.2 s, no 0.8 s
+        self.assertLess(elapsed, 0.6)
+
+    def test_aquote_many_mixes_sync_providers_and_fail_fast(self):
+        service = QuoteService(
+            [
+                FailingProvider(),
+                SlowAsyncProvider("CHUBB", delay=5),
+            ]
+        )
+
+        started_at = perf_counter()
+        batch = asyncio.run(
+            service.aquote_many(
+                {
+                    "AXA": {},
+                    "CHUBB": {},
+                },
+                fail_fast=True,
+            )
+        )
+
+        self.assertLess(perf_counter() - started_at, 2)
+        self.assertEqual(len(batch.attempts), 1)
+        self.assertEqual(batch.attempts[0].provider_code, "AXA")
+        self.assertFalse(batch.attempts[0].success)
@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+
+from crm.models import Cliente, Mensaje
+from integrations import outbox
+from integrations.models import OutboxMessage
+from integrations.providers.whatsapp import WhatsAppCloudProvider
+
+
+class FakeProvider(WhatsAppCloudProvider):
+    def __init__(self, respuestas=None):
+        super().__init__(session=object())
+        self.respuestas = respuestas or {}
+        self.enviados = []
+
+    def send(self, payload):
+        self.enviados.append(payload)
+        return dict(self.respuestas.get(payload["to"], {"ok": True, "status_code": 200, "data": {}}))
+
+
+class OutboxTest(TestCase):
+    def setUp(self):
+        self.cliente = Cliente.objects.create(
+            tipo_cliente=Cliente.TipoCliente.PERSONA,
+            nombre="Ana",
+        )
+
+    def test_envia_registra_mensaje_y_ejecuta_handler(self):
+        llamados = []
+        outbox.register_handler("test.enviado", llamados.append)
+
+        msg = outbox.encolar_whatsapp_texto(
+            telefono="526561111111",
+            mensaje="Tu contraseña es secreta1",
+            contenido="Tu contraseña es ********",
+            cliente=self.cliente,
+            al_enviar="test.enviado",
+            sensible=True,
+        )
+
+        res = outbox.process_batch(provider=FakeProvider())
+
+        self.assertEqual(res["enviados"], 1)
+        msg.refresh_from_db()
+        self.assertEqual(msg.status, OutboxMessage.Status.SENT)
+        self.assertEqual(msg.payload, {})
+        self.assertEqual([m.id for m in llamados], [msg.id])
+
+        mensaje = Mensaje.objects.get()
+        self.assertEqual(mensaje.conversacion.cliente, self.cliente)
+        self.assertEqual(mensaje.contenido, "Tu contraseña es ********")
+        self.assertEqual(mensaje.direccion, Mensaje.Direccion.SALIENTE)
+
+        # Ya enviado: no se vuelve a tomar
+        self.assertEqual(outbox.process_batch(provider=FakeProvider())["tomados"], 0)
+
+    def test_transitorio_se_reintenta_despues_y_definitivo_falla(self):
+        lento = outbox.encolar_whatsapp_texto(telefono="526562222222", mensaje="hola")
+        malo = outbox.encolar_whatsapp_texto(telefono="526563333333", mensaje="hola")
+        provider = FakeProvider({
+            "526562222222": {"ok": False, "status_code": 503},
+            "526563333333": {"ok": False, "status_code": 400, "data": {"error": {"code": 131026}}},
+        })
+
+        res = outbox.process_batch(provider=provider)
+
+        self.assertEqual((res["reintentos"], res["fallidos"]), (1, 1))
+        lento.refresh_from_db()
+        malo.refresh_from_db()
+        self.assertEqual(lento.status, OutboxMessage.Status.PENDING)
+        self.assertEqual(lento.attempts, 1)
+        self.assertGreater(lento.next_attempt_at, timezone.now())
+        self.assertEqual(malo.status, OutboxMessage.Status.FAILED)
+
+        # Antes del backoff no se toma; después sí
+        self.assertEqual(outbox.claim_batch(), [])
+        self.assertEqual(
+            [m.id for m in outbox.claim_batch(now=lento.next_attempt_at + timedelta(seconds=1))],
+            [lento.id],
+        )
+
+    def test_lease_vencido_se_vuelve_a_tomar(self):
+        msg = outbox.encolar_email(to="ana@example.com", subject="Hola", body="Texto")
+        self.assertEqual(len(outbox.claim_batch()), 1)
+        self.assertEqual(outbox.claim_batch(), [])
+
+        msg.refresh_from_db()
+        self.assertEqual(
+            [m.id for m in outbox.claim_batch(now=msg.locked_until + timedelta(seconds=1))],
+            [msg.id],
+        )
+
+    def test_email_y_dedupe(self):
+        a = outbox.encolar_email(to="ana@example.com", subject="Hola", body="Texto", dedupe_key="X:1")
+        b = outbox.encolar_email(to="ana@example.com", subject="Hola", body="Texto", dedupe_key="X:1")
+        self.assertEqual(a.pk, b.pk)
+
+        outbox.process_batch()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["ana@example.com"])
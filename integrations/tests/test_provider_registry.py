@@ -0,0 +1,40 @@
+from django.test import SimpleTestCase, override_settings
+
+from integrations import providers
+from integrations.broker import factory
+from integrations.providers.mock import MockProvider
+
+
+class FakeInsuranceProvider:
+    def __init__(self, provider_config=None):
+        self.provider_config = provider_config
+
+
+class InsuranceProviderFactoryTests(SimpleTestCase):
+    def test_resuelve_la_ruta_al_pedir_el_provider(self):
+        from integrations.providers.insurance.chubb.provider import ChubbProvider
+
+        self.assertIs(factory.get_provider_class("CHUBB"), ChubbProvider)
+
+    def test_proveedor_desconocido(self):
+        with self.assertRaises(ValueError):
+            factory.get_provider("NOEXISTE")
+
+    @override_settings(INSURANCE_PROVIDERS={"FAKE": f"{__name__}.FakeInsuranceProvider"})
+    def test_settings_agrega_providers(self):
+        provider = factory.get_provider("FAKE", provider_config={"a": 1})
+
+        self.assertIsInstance(provider, FakeInsuranceProvider)
+        self.assertEqual(provider.provider_config, {"a": 1})
+
+
+class PaymentProviderRegistryTests(SimpleTestCase):
+    def test_instancia_perezosa_y_compartida(self):
+        provider = providers.get_provider("MOCK")
+
+        self.assertIsInstance(provider, MockProvider)
+        self.assertIs(providers.get_provider("mock"), provider)
+
+    def test_slug_vacio_o_desconocido(self):
+        self.assertIsNone(providers.get_provider(""))
+        self.assertIsNone(providers.get_provider("stripe"))
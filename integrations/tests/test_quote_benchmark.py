@@ -0,0 +1,56 @@
+import requests
+from django.test import SimpleTestCase, TestCase
+
+from cotizador.models import CotizacionProveedor
+from integrations.benchmarks import quote_pipeline
+from integrations.benchmarks.chubb_stub import ChubbStubServer
+
+
+class ChubbStubServerTest(SimpleTestCase):
+    def test_repite_fixtures_y_responde_404_sin_fixture(self):
+        with ChubbStubServer() as stub:
+            token = requests.post(stub.token_url, timeout=5)
+            makes = requests.get(f"{stub.base_url}/catalogs/vehicles/makes", timeout=5)
+            missing = requests.get(f"{stub.base_url}/catalogs/no-existe", timeout=5)
+
+        self.assertEqual(token.json()["token_type"], "Bearer")
+        self.assertEqual(makes.json()["makes"][0]["makeDescription"], "ACURA")
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(stub.requests["POST /token"], 1)
+
+    def test_inyecta_errores(self):
+        with ChubbStubServer(error_rate=1.0, error_status=502) as stub:
+            response = requests.post(f"{stub.base_url}/quote", json={}, timeout=5)
+
+        self.assertEqual(response.status_code, 502)
+
+
+class QuotePipelineBenchmarkTest(TestCase):
+    def test_nivel_secuencial_cotiza_y_persiste(self):
+        with ChubbStubServer() as stub:
+            cotizacion = quote_pipeline.preparar_datos(
+                base_url=stub.base_url,
+                token_url=stub.token_url,
+            )
+            nivel = quote_pipeline.correr_nivel(
+                cotizacion,
+                concurrencia=1,
+                cotizaciones=2,
+            )
+
+        self.assertEqual(nivel["cotizaciones"], 2)
+        self.assertEqual(nivel["errores"], 0)
+        self.assertGreater(nivel["queries_por_cotizacion"], 0)
+        self.assertEqual(
+            CotizacionProveedor.objects.filter(cotizacion=cotizacion, success=True).count(),
+            2,
+        )
+
+    def test_comparar_marca_regresiones_fuera_de_tolerancia(self):
+        baseline = {"niveles": [{"concurrencia": 4, "throughput_qps": 100, "p99_ms": 200, "error_rate": 0.0}]}
+        actual = {"niveles": [{"concurrencia": 4, "throughput_qps": 90, "p99_ms": 300, "error_rate": 0.0}]}
+
+        self.assertEqual(
+            quote_pipeline.comparar(actual, baseline, tolerancia=0.2),
+            ["c=4 p99_ms: 200 -> 300"],
+        )
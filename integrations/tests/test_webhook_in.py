@@ -0,0 +1,46 @@
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, TestCase
+
+from integrations import views
+from integrations.models import IntegrationEvent
+
+
+class FakeWebhookProvider:
+    def __init__(self):
+        self.procesados = []
+
+    def validate_signature(self, request, raw_body_bytes):
+        return True
+
+    def normalize_event(self, payload, request=None):
+        return {"event_id": payload["id"], "event_type": "payment.succeeded"}
+
+    def process(self, normalized):
+        self.procesados.append(normalized["event_id"])
+
+
+class WebhookInDedupeTests(TestCase):
+    def setUp(self):
+        self.prov = FakeWebhookProvider()
+        patcher = mock.patch.object(views, "get_provider", return_value=self.prov)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self, event_id):
+        request = RequestFactory().post(
+            "/webhooks/fake/", data=json.dumps({"id": event_id}), content_type="application/json"
+        )
+        response = async_to_sync(views.webhook_in)(request, "fake")
+        return response.status_code, json.loads(response.content)
+
+    def test_mismo_evento_dos_veces_se_procesa_una_vez(self):
+        self.assertEqual(self._post("evt_1"), (200, {"ok": True}))
+        self.assertEqual(self._post("evt_1"), (200, {"ok": True, "deduped": True}))
+
+        self.assertEqual(self.prov.procesados, ["evt_1"])
+        ie = IntegrationEvent.objects.get(provider="fake", event_id="evt_1")
+        self.assertEqual(ie.attempts, 1)
+        self.assertEqual(ie.status, IntegrationEvent.Status.PROCESSED)
@@ -36,6 +36,7 @@ def _extract_headers(request) -> dict:
 
 import json
 
+from asgiref.sync import sync_to_async
 from django.db import transaction
 from django.db.models import F
 from django.http import JsonResponse, HttpResponseBadRequest, HttpResponseNotAllowed
@@ -72,8 +73,62 @@ def _pick_headers(request) -> dict:
     return out
 
 
+def _registrar_evento(provider, event_id, defaults):
+    """
+    IntegrationEvent idempotente (provider + event_id). Regresa
+    (evento, created); si es nuevo incrementa attempts antes de procesar.
+    """
+    try:
+        with transaction.atomic():
+            ie, created = IntegrationEvent.objects.get_or_create(
+                provider=provider,
+                event_id=event_id,
+                defaults=defaults,
+            )
+    except Exception:
+        created = False
+        ie = IntegrationEvent.objects.filter(provider=provider, event_id=event_id).order_by("-id").first()
+
+    if created:
+        # attempts, Incrementar attempts ANTES de procesar
+        IntegrationEvent.objects.filter(id=ie.id).update(
+            attempts=F("attempts") + 1,
+            last_attempt_at=timezone.now(),
+        )
+    return ie, created
+
+
+def _cerrar_evento(ie, status, error_message=""):
+    ie.status = status
+    ie.error_message = error_message[:4000]
+    ie.processed_at = timezone.now()
+    ie.save(update_fields=["status", "error_message", "processed_at"])
+
+
+def _procesar(prov, ie, normalized):
+    try:
+        with transaction.atomic():
+            prov.process(normalized)
+            _cerrar_evento(ie, IntegrationEvent.Status.PROCESSED)
+
+    except ProviderBusinessIgnore as e:
+        _cerrar_evento(ie, IntegrationEvent.Status.IGNORED, str(e))
+        return {"ok": True, "ignored": True}, 200
+
+    except Exception as e:
+        _cerrar_evento(ie, IntegrationEvent.Status.ERROR, str(e))
+        return {"ok": False, "error": "processing_failed"}, 500
+
+    return {"ok": True}, 200
+
+
 @csrf_exempt
-def webhook_in(request, provider: str):
+async def webhook_in(request, provider: str):
+    """
+    Async (ASGI): el ORM va por sync_to_async en el hilo compartido y el
+    I/O remoto del provider (fetch) en el pool de hilos, sin ocupar el
+    hilo del ORM ni un worker mientras el API externo responde.
+    """
     if request.method != "POST":
         return HttpResponseNotAllowed(["POST"])
 
@@ -106,75 +161,46 @@ def webhook_in(request, provider: str):
         return JsonResponse({"ok": True, "ignored": True, "reason": str(e)})
 
     event_id = str(normalized.get("event_id") or "").strip()
-    event_type = normalized.get("event_type", "") or ""
-    dedupe_key = normalized.get("dedupe_key")
-    object_type = normalized.get("object_type", "") or ""
-    object_id = normalized.get("object_id", "") or ""
 
     if not event_id:
         return JsonResponse({"ok": False, "error": "missing_event_id"}, status=400)
 
-    # headers relevantes
-    headers_subset = _pick_headers(request)
-    signature = request.headers.get("x-signature", "") or ""
-
     # 4) IntegrationEvent
     # Idempotencia (provider + event_id)
     # Guardamos SIEMPRE el evento recibido, sin procesar todavía
-    try:
-        with transaction.atomic():
-            ie, created = IntegrationEvent.objects.get_or_create(
-                provider=provider,
-                event_id=event_id,
-                defaults={
-                    "event_type": event_type,
-                    "signature": signature,
-                    "headers": headers_subset or None,
-                    "payload": payload,
-                    "raw_body": raw_body_text[:200000],
-                    "status": IntegrationEvent.Status.RECEIVED,
-                    "received_at": timezone.now(),
-                    "dedupe_key": dedupe_key,
-                    "object_type": object_type,
-                    "object_id": object_id,
-                },
-            )
-    except Exception:
-        created = False
-        ie = IntegrationEvent.objects.filter(provider=provider, event_id=event_id).order_by("-id").first()
+    ie, created = await sync_to_async(_registrar_evento, thread_sensitive=True)(
+        provider,
+        event_id,
+        {
+            "event_type": normalized.get("event_type", "") or "",
+            "signature": request.headers.get("x-signature", "") or "",
+            "headers": _pick_headers(request) or None,
+            "payload": payload,
+            "raw_body": raw_body_text[:200000],
+            "status": IntegrationEvent.Status.RECEIVED,
+            "received_at": timezone.now(),
+            "dedupe_key": normalized.get("dedupe_key"),
+            "object_type": normalized.get("object_type", "") or "",
+            "object_id": normalized.get("object_id", "") or "",
+        },
+    )
 
     if not created:
-        # Ya existe; responder 200 para que el provider deje de reintentar        
+        # Ya existe; responder 200 para que el provider deje de reintentar
         return JsonResponse({"ok": True, "deduped": True})
 
-    # attempts, Incrementar attempts ANTES de procesar
-    IntegrationEvent.objects.filter(id=ie.id).update(
-        attempts=F("attempts") + 1,
-        last_attempt_at=timezone.now(),
-    )
-
-    # 5) Procesar
-    try:
-        with transaction.atomic():
-            prov.process(normalized)
-
-            ie.status = IntegrationEvent.Status.PROCESSED
-            ie.processed_at = timezone.now()
-            ie.error_message = ""
-            ie.save(update_fields=["status", "processed_at", "error_message"])
-
-    except ProviderBusinessIgnore as e:
-        ie.status = IntegrationEvent.Status.IGNORED
-        ie.error_message = str(e)[:4000]
-        ie.processed_at = timezone.now()
-        ie.save(update_fields=["status", "error_message", "processed_at"])
-        return JsonResponse({"ok": True, "ignored": True})
-
-    except Exception as e:
-        ie.status = IntegrationEvent.Status.ERROR
-        ie.error_message = str(e)[:4000]
-        ie.processed_at = timezone.now()
-        ie.save(update_fields=["status", "error_message", "processed_at"])
-        return JsonResponse({"ok": False, "error": "processing_failed"}, status=500)
-
-    return JsonResponse({"ok": True})
+    # 5) I/O remoto (fuera de la transacción y del hilo del ORM)
+    fetch = getattr(prov, "fetch", None)
+    if fetch is not None:
+        try:
+            normalized = await sync_to_async(fetch, thread_sensitive=False)(normalized)
+        except ProviderBusinessIgnore as e:
+            await sync_to_async(_cerrar_evento, thread_sensitive=True)(ie, IntegrationEvent.Status.IGNORED, str(e))
+            return JsonResponse({"ok": True, "ignored": True})
+        except Exception as e:
+            await sync_to_async(_cerrar_evento, thread_sensitive=True)(ie, IntegrationEvent.Status.ERROR, str(e))
+            return JsonResponse({"ok": False, "error": "processing_failed"}, status=500)
+
+    # 6) Procesar
+    data, status = await sync_to_async(_procesar, thread_sensitive=True)(prov, ie, normalized)
+    return JsonResponse(data, status=status)
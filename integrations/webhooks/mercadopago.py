@@ -1,6 +1,7 @@
 import json
 import logging
 
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
@@ -41,7 +42,12 @@ def _extraer_payment_id(request, payload: dict):
 
 
 @csrf_exempt
-def mercadopago_webhook(request):
+async def mercadopago_webhook(request):
+    """
+    Async (ASGI): la consulta a MercadoPago corre en el pool de hilos
+    (thread_sensitive=False, no toca el ORM) y la conciliación en el hilo
+    compartido del ORM.
+    """
     if request.method != "POST":
         return JsonResponse({"ok": False, "error": "Método no permitido"}, status=405)
 
@@ -61,7 +67,7 @@ def mercadopago_webhook(request):
     provider = MercadoPagoPaymentProvider()
 
     try:
-        payment_data = provider.obtener_pago(payment_id)
+        payment_data = await sync_to_async(provider.obtener_pago, thread_sensitive=False)(payment_id)
     except Exception as exc:
         logger.exception("Error consultando pago en MercadoPago")
         return JsonResponse({"ok": False, "error": str(exc)}, status=200)
@@ -70,7 +76,7 @@ def mercadopago_webhook(request):
         return JsonResponse({"ok": False, "error": "MercadoPago devolvió respuesta vacía."}, status=200)
 
     try:
-        pago = conciliar_pago_mercadopago(payment_data)
+        pago = await sync_to_async(conciliar_pago_mercadopago, thread_sensitive=True)(payment_data)
         return JsonResponse({"ok": True, "pago_id": pago.id}, status=200)
     except Exception as exc:
         logger.exception("Error conciliando pago")
@@ -114,3 +114,29 @@ def enviar_acceso_portal_whatsapp(*, cliente, user, password_temporal):
         telefono=telefono,
         mensaje=mensaje,
     )
+
+
+def encolar_acceso_portal_whatsapp(*, cliente, user, password_temporal, usuario=None):
+    """Igual que enviar_acceso_portal_whatsapp pero por el outbox (no bloquea el request)."""
+    from integrations import outbox
+
+    telefono = normalizar_telefono_mx(cliente.telefono_principal)
+
+    if not telefono:
+        raise WhatsAppError("El cliente no tiene teléfono principal registrado.")
+
+    mensaje = construir_mensaje_acceso_portal(
+        cliente=cliente,
+        user=user,
+        password_temporal=password_temporal,
+    )
+
+    return outbox.encolar_whatsapp_texto(
+        telefono=telefono,
+        mensaje=mensaje,
+        # En el historial del cliente no queda la contraseña
+        contenido=mensaje.replace(password_temporal, "********"),
+        cliente=cliente,
+        usuario=usuario,
+        sensible=True,
+    )
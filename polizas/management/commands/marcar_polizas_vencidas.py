@@ -1,6 +1,7 @@
 # polizas/management/commands/marcar_polizas_vencidas.py
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.utils import timezone
 from django.utils.timezone import localdate
 
 from polizas.models import Poliza
@@ -60,7 +61,8 @@ class Command(BaseCommand):
 
         # Modo rápido sin bitácora (bulk update)
         if not log_poliza_event or not PolizaEvento:
-            updated = qs.update(estatus=Poliza.Estatus.VENCIDA)
+            # updated_at a mano: update() no toca auto_now y la versión de los PDFs cacheados depende de él
+            updated = qs.update(estatus=Poliza.Estatus.VENCIDA, updated_at=timezone.now())
             self.stdout.write(self.style.SUCCESS(
                 f"Actualizadas (sin bitácora): VENCIDA={updated}. (hoy={today})"
             ))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-19 04:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('autos', '0002_alter_vehiculo_vin'),
+        ('catalogos', '0001_initial'),
+        ('cotizador', '0017_cotizacion_cot_created_id_idx_and_more'),
+        ('crm', '0008_codigopostal_cliente_ciudad_cliente_estado_and_more'),
+        ('documentos', '0001_initial'),
+        ('polizas', '0014_poliza_financiamiento_poliza_gastos_expedicion_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='poliza',
+            index=models.Index(fields=['-created_at', '-id'], name='poliza_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='poliza',
+            index=models.Index(fields=['agente', '-created_at', '-id'], name='poliza_agente_created_idx'),
+        ),
+    ]
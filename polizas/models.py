@@ -75,6 +75,9 @@ class Poliza(TimeStampedModel, MoneyMixin):
             models.Index(fields=["cliente", "estatus"]),
             models.Index(fields=["vigencia_hasta", "estatus"]),
             models.Index(fields=["fecha_emision", "estatus"]),
+            # Listado de pólizas (keyset por created_at, id), general y por agente
+            models.Index(fields=["-created_at", "-id"], name="poliza_created_id_idx"),
+            models.Index(fields=["agente", "-created_at", "-id"], name="poliza_agente_created_idx"),
         ]
         permissions = [
             ("manage_polizas", "Puede administrar pólizas"),
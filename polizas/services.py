@@ -2,15 +2,15 @@ from __future__ import annotations
 from django.utils import timezone
 from typing import Any, Optional, Dict
 from django.db import transaction, IntegrityError
+from core.services import folios
 from polizas.models import PolizaEvento, Poliza, Endoso
 from decimal import Decimal
 
 
 def generar_numero_poliza(aseguradora_id: int) -> str:
-    # Provisional, pero suficientemente único por aseguradora:
-    # POL-<aseg>-<YYYYMMDDHHMMSS>-<ms>
-    now = timezone.now()
-    return f"POL-{aseguradora_id}-{now:%Y%m%d%H%M%S}-{now.microsecond//1000:03d}"
+    # Provisional (hasta tener el número real de la aseguradora):
+    # POL-<aseg>-<año>-<consecutivo>, único por secuencia de folios
+    return folios.numero_poliza(aseguradora_id, timezone.localdate().year)
 
 
 def log_poliza_event(
@@ -263,13 +263,10 @@ def eliminar_endoso(*, endoso, usuario=None):
     endoso_id = endoso.id
     tipo_label = endoso.get_tipo_endoso_display()
 
-    # 🔥 guardar referencia antes de borrar
+    # 🔥 el archivo físico solo se borra si ningún otro Documento lo comparte (dedupe por hash)
     if documento:
-        archivo = documento.file
-        documento.delete()  # borra DB
-
-        if archivo:
-            archivo.delete(save=False)  # borra archivo físico
+        from documentos.services import eliminar_documento
+        eliminar_documento(documento)
 
     endoso.delete()
 
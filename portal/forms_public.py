@@ -8,7 +8,7 @@ from autos.models import (
     VehiculoCatalogo,
 )
 from cotizador.models import Cotizacion
-from crm.models import CodigoPostal
+from crm.services import codigos_postales
 
 
 def anios_choices(desde=2000, hasta=None):
@@ -229,6 +229,8 @@ class CotizacionPublicaForm(forms.Form):
                     anio=modelo_anio,
                     is_active=True,
                 )
+                # marca/submarca se usan al crear el vehículo
+                .select_related("marca", "submarca")
                 .order_by("version")
             )
         else:
@@ -256,9 +258,7 @@ class CotizacionPublicaForm(forms.Form):
                 "exactamente 5 dígitos."
             )
 
-        if not CodigoPostal.objects.filter(
-            codigo_postal=codigo_postal
-        ).exists():
+        if not codigos_postales.existe(codigo_postal):
             raise forms.ValidationError(
                 "No encontramos el código postal indicado."
             )
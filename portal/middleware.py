@@ -1,16 +1,15 @@
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.contrib.auth import logout
+from django.utils.deprecation import MiddlewareMixin
 
-class PortalActivoMiddleware:
+class PortalActivoMiddleware(MiddlewareMixin):
     """
     Bloquea acceso al portal si el cliente tiene portal_activo = False
+    (MiddlewareMixin: funciona igual bajo WSGI y ASGI)
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
+    def process_request(self, request):
         # Solo aplica a rutas del portal
         if request.path.startswith("/portal/"):
             user = request.user
@@ -22,5 +21,3 @@ class PortalActivoMiddleware:
                 if cliente and not cliente.portal_activo:
                     logout(request)
                     return redirect("portal:acceso_suspendido")
-
-        return self.get_response(request)
@@ -0,0 +1,171 @@
+# portal/services/dashboard.py
+"""
+Snapshot del dashboard del portal por cliente.
+
+Después de cada ola de recordatorios miles de clientes entran al portal
+al mismo tiempo. Antes el dashboard hacía cuatro consultas con slice y
+luego .count() sobre cada slice (una consulta más por lista), y el
+estado de cuenta volvía a agregar Pago en cada visita.
+
+Ahora todo sale de tres consultas:
+
+    - cotizaciones activas (lista + total con COUNT(*) OVER ()),
+    - pólizas vigentes (igual),
+    - pagos del cliente: una sola lectura de la que salen las listas de
+      pendientes / pagados y los totales del estado de cuenta.
+
+El resultado (dicts y listas simples) se guarda en cache por cliente.
+Los signals de Pago, Poliza y Cotizacion lo borran después del commit;
+además lleva la fecha con la que se calculó (las pólizas vigentes
+dependen del día) y expira a los PORTAL_SNAPSHOT_TTL segundos para
+cubrir updates masivos que no disparan signals.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import Count, F, Q, Window
+from django.utils import timezone
+
+from core.services import cache
+from cotizador.models import Cotizacion
+from finanzas.models import Pago
+from polizas.models import Poliza
+
+COTIZACIONES_LIMIT = 10
+POLIZAS_LIMIT = 10
+PAGOS_PENDIENTES_LIMIT = 12
+PAGOS_PAGADOS_LIMIT = 10
+
+PENDIENTES = (Pago.Estatus.PENDIENTE, Pago.Estatus.VENCIDO)
+POR_PAGAR = (Pago.Estatus.PENDIENTE, Pago.Estatus.PARCIAL, Pago.Estatus.EN_PROCESO)
+
+_ZERO = Decimal("0.00")
+
+
+CACHE = cache.namespace("portal", ttl_setting="PORTAL_SNAPSHOT_TTL", ttl=600)
+
+
+def _key(cliente_id):
+    return f"snapshot:{cliente_id}"
+
+
+def invalidate(*cliente_ids):
+    CACHE.delete_many([_key(cid) for cid in set(cliente_ids) if cid])
+
+
+# ---------------------------------------------------------------------
+# Construcción
+# ---------------------------------------------------------------------
+
+def _cotizaciones(cliente_id):
+    rows = list(
+        Cotizacion.objects
+        .filter(cliente_id=cliente_id)
+        .exclude(estatus=Cotizacion.Estatus.RECHAZADA)
+        .annotate(total=Window(Count("id")))
+        .order_by("-created_at")
+        .values("id", "folio", "tipo_cotizacion", "estatus", "vigencia_desde", "vigencia_hasta", "total")
+        [:COTIZACIONES_LIMIT]
+    )
+    tipos = dict(Cotizacion.Tipo.choices)
+    estatus = dict(Cotizacion.Estatus.choices)
+    for row in rows:
+        row["tipo_display"] = tipos.get(row["tipo_cotizacion"], row["tipo_cotizacion"])
+        row["estatus_display"] = estatus.get(row["estatus"], row["estatus"])
+    return rows, (rows[0].pop("total") if rows else 0)
+
+
+def _polizas(cliente_id, hoy):
+    rows = list(
+        Poliza.objects
+        .filter(
+            cliente_id=cliente_id,
+            estatus=Poliza.Estatus.VIGENTE,
+            vigencia_desde__lte=hoy,
+            vigencia_hasta__gte=hoy,
+        )
+        .annotate(total=Window(Count("id")), aseguradora_nombre=F("aseguradora__nombre"))
+        .order_by("vigencia_hasta")
+        .values("id", "numero_poliza", "aseguradora_nombre", "vigencia_hasta", "documento_id", "total")
+        [:POLIZAS_LIMIT]
+    )
+    return rows, (rows[0].pop("total") if rows else 0)
+
+
+def _pagos(cliente_id):
+    rows = list(
+        Pago.objects
+        .filter(Q(cliente_id=cliente_id) | Q(poliza__cliente_id=cliente_id))
+        .annotate(
+            numero_poliza=F("poliza__numero_poliza"),
+            poliza_cliente_id=F("poliza__cliente_id"),
+            aseguradora_nombre=F("poliza__aseguradora__nombre"),
+        )
+        .values(
+            "id", "cliente_id", "poliza_cliente_id", "numero_poliza", "aseguradora_nombre",
+            "estatus", "monto", "monto_pagado", "fecha_programada", "fecha_pago",
+            "comprobante_id",
+        )
+    )
+
+    # Listas: como antes, pagos de pólizas del cliente
+    de_polizas = [p for p in rows if p["poliza_cliente_id"] == cliente_id]
+    pendientes = sorted(
+        (p for p in de_polizas if p["estatus"] in PENDIENTES),
+        key=lambda p: (p["fecha_programada"], p["id"]),
+    )
+    pagados = sorted(
+        (p for p in de_polizas if p["estatus"] == Pago.Estatus.PAGADO),
+        key=lambda p: (p["fecha_pago"] or date.min, p["id"]),
+        reverse=True,
+    )
+
+    # Estado de cuenta: mismas reglas que estado_cuenta_por_cliente (Pago.cliente)
+    propios = [p for p in rows if p["cliente_id"] == cliente_id]
+    resumen = {
+        "total_programado": sum((p["monto"] or _ZERO for p in propios), _ZERO),
+        "total_pagado": sum(
+            (p["monto_pagado"] or _ZERO for p in propios if p["estatus"] == Pago.Estatus.PAGADO), _ZERO,
+        ),
+        "total_vencido": sum(
+            (p["monto"] or _ZERO for p in propios if p["estatus"] == Pago.Estatus.VENCIDO), _ZERO,
+        ),
+        "total_pendiente": sum(
+            (p["monto"] or _ZERO for p in propios if p["estatus"] in POR_PAGAR), _ZERO,
+        ),
+    }
+    resumen["saldo"] = resumen["total_programado"] - resumen["total_pagado"]
+
+    return pendientes, pagados, resumen
+
+
+def build_snapshot(cliente_id, hoy=None):
+    hoy = hoy or timezone.localdate()
+
+    cotizaciones, cotizaciones_count = _cotizaciones(cliente_id)
+    polizas, polizas_count = _polizas(cliente_id, hoy)
+    pendientes, pagados, resumen = _pagos(cliente_id)
+
+    return {
+        "fecha": hoy,
+        "cotizaciones_activas": cotizaciones,
+        "cotizaciones_activas_count": cotizaciones_count,
+        "polizas_vigentes": polizas,
+        "polizas_vigentes_count": polizas_count,
+        "pagos_pendientes": pendientes[:PAGOS_PENDIENTES_LIMIT],
+        "pagos_pendientes_count": len(pendientes),
+        "pagos_pagados": pagados[:PAGOS_PAGADOS_LIMIT],
+        "resumen": resumen,
+    }
+
+
+def get_snapshot(cliente_id):
+    """Snapshot del dashboard del cliente (una lectura de cache si ya existe)."""
+    hoy = timezone.localdate()
+    key = _key(cliente_id)
+
+    snapshot = CACHE.get_or_set(key, lambda: build_snapshot(cliente_id, hoy))
+    if snapshot.get("fecha") != hoy:
+        snapshot = build_snapshot(cliente_id, hoy)
+        CACHE.set(key, snapshot)
+    return snapshot
@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from portal.services import dashboard
+
+
+def _clientes_de_pago(pago):
+    ids = {pago.cliente_id}
+    if pago.poliza_id:
+        poliza = pago._state.fields_cache.get("poliza")
+        if poliza is not None:
+            ids.add(poliza.cliente_id)
+        else:
+            from polizas.models import Poliza
+            ids.update(Poliza.objects.filter(pk=pago.poliza_id).values_list("cliente_id", flat=True))
+    return ids
+
+
+def portal_snapshot_changed(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    if sender._meta.label == "finanzas.Pago":
+        ids = _clientes_de_pago(instance)
+    else:
+        ids = {instance.cliente_id}
+
+    # Después del commit: si se borra antes, otro request podría volver
+    # a guardar el snapshot con los datos viejos.
+    transaction.on_commit(lambda: dashboard.invalidate(*ids))
+
+
+def connect_portal_signals():
+    from cotizador.models import Cotizacion
+    from finanzas.models import Pago
+    from polizas.models import Poliza
+
+    for model in (Pago, Poliza, Cotizacion):
+        post_save.connect(portal_snapshot_changed, sender=model, dispatch_uid=f"portal_snapshot_save_{model.__name__}")
+        post_delete.connect(portal_snapshot_changed, sender=model, dispatch_uid=f"portal_snapshot_delete_{model.__name__}")
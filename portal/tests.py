@@ -1,5 +1,12 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
 
+from core.query_budget import Presupuesto, QueryBudgetTestCase
 from portal.forms_public import CotizacionPublicaForm
 
 from unittest.mock import patch
@@ -12,8 +19,12 @@ from autos.models import (
     Vehiculo,
     VehiculoCatalogo,
 )
-from cotizador.models import Cotizacion
+from catalogos.models import Aseguradora, ProductoSeguro
+from cotizador.models import Cotizacion, CotizacionItemCalculo
 from crm.models import Cliente, CodigoPostal
+from finanzas.models import Pago
+from polizas.models import Poliza
+from portal.services import dashboard
 
 
 class CotizacionPublicaFormTests(TestCase):
@@ -395,3 +406,145 @@ class PortalCotizarCreateViewTests(TestCase):
             ],
             cotizacion.pk,
         )
+
+    def test_post_guarda_opciones_y_calculos_del_motor(self):
+        aseguradora = Aseguradora.objects.create(nombre="Chubb")
+        for nombre in ("Amplia", "Limitada", "RC"):
+            ProductoSeguro.objects.create(
+                aseguradora=aseguradora,
+                nombre_producto=nombre,
+            )
+
+        self.client.post(
+            reverse("portal:cotizar"),
+            data=self._post_data(),
+        )
+
+        cotizacion = Cotizacion.objects.get()
+
+        self.assertTrue(cotizacion.folio.startswith("COT-"))
+
+        items = list(cotizacion.items.order_by("ranking"))
+
+        self.assertEqual(
+            [item.ranking for item in items],
+            [1, 2, 3],
+        )
+
+        self.assertEqual(
+            CotizacionItemCalculo.objects.filter(
+                item__cotizacion=cotizacion,
+            ).count(),
+            3,
+        )
+
+    @patch(
+        "portal.views.cotizar.RatingEngine.quote",
+        side_effect=RuntimeError("motor caído"),
+    )
+    def test_error_del_motor_no_deja_registros_a_medias(
+        self,
+        mock_quote,
+    ):
+        with self.assertRaises(RuntimeError):
+            self.client.post(
+                reverse("portal:cotizar"),
+                data=self._post_data(),
+            )
+
+        self.assertFalse(
+            Cliente.objects.filter(
+                email_principal="miguel@example.com",
+            ).exists()
+        )
+
+        self.assertFalse(Vehiculo.objects.exists())
+        self.assertFalse(Cotizacion.objects.exists())
+
+
+class PortalDashboardSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="cliente", password="x")
+        self.cliente = Cliente.objects.create(
+            tipo_cliente=Cliente.TipoCliente.PERSONA,
+            nombre="Ana",
+            user_portal=self.user,
+        )
+        aseguradora = Aseguradora.objects.create(nombre="Chubb")
+        producto = ProductoSeguro.objects.create(aseguradora=aseguradora, nombre_producto="Autos")
+
+        vehiculo = Vehiculo.objects.create(
+            cliente=self.cliente,
+            marca_texto="Nissan",
+            submarca_texto="Versa",
+            modelo_anio=2024,
+        )
+
+        hoy = timezone.localdate()
+        self.poliza = Poliza.objects.create(
+            cliente=self.cliente,
+            vehiculo=vehiculo,
+            aseguradora=aseguradora,
+            producto=producto,
+            numero_poliza="POL-1",
+            vigencia_desde=hoy - timedelta(days=10),
+            vigencia_hasta=hoy + timedelta(days=355),
+            estatus=Poliza.Estatus.VIGENTE,
+        )
+        for i, estatus in enumerate((Pago.Estatus.PAGADO, Pago.Estatus.VENCIDO, Pago.Estatus.PENDIENTE)):
+            Pago.objects.create(
+                poliza=self.poliza,
+                cliente=self.cliente,
+                monto=Decimal("100.00"),
+                monto_pagado=Decimal("100.00") if estatus == Pago.Estatus.PAGADO else Decimal("0.00"),
+                estatus=estatus,
+                fecha_programada=hoy + timedelta(days=30 * i),
+                fecha_pago=hoy if estatus == Pago.Estatus.PAGADO else None,
+            )
+
+    def test_snapshot_en_tres_consultas_y_luego_desde_cache(self):
+        with self.assertNumQueries(3):
+            snap = dashboard.get_snapshot(self.cliente.pk)
+
+        self.assertEqual(snap["polizas_vigentes_count"], 1)
+        self.assertEqual(snap["polizas_vigentes"][0]["aseguradora_nombre"], "Chubb")
+        self.assertEqual(snap["pagos_pendientes_count"], 2)
+        self.assertEqual(
+            [p["estatus"] for p in snap["pagos_pendientes"]],
+            [Pago.Estatus.VENCIDO, Pago.Estatus.PENDIENTE],
+        )
+        self.assertEqual(len(snap["pagos_pagados"]), 1)
+        self.assertEqual(snap["resumen"]["saldo"], Decimal("200.00"))
+        self.assertEqual(snap["resumen"]["total_vencido"], Decimal("100.00"))
+
+        with self.assertNumQueries(0):
+            dashboard.get_snapshot(self.cliente.pk)
+
+    def test_guardar_pago_invalida_el_snapshot_del_cliente(self):
+        dashboard.get_snapshot(self.cliente.pk)
+
+        pago = Pago.objects.get(estatus=Pago.Estatus.VENCIDO)
+        pago.estatus = Pago.Estatus.PAGADO
+        pago.monto_pagado = pago.monto
+        with self.captureOnCommitCallbacks(execute=True):
+            pago.save()
+
+        snap = dashboard.get_snapshot(self.cliente.pk)
+        self.assertEqual(snap["pagos_pendientes_count"], 1)
+        self.assertEqual(snap["resumen"]["saldo"], Decimal("100.00"))
+
+    def test_dashboard_renderiza_desde_snapshot(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("portal:dashboard"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "POL-1")
+        self.assertEqual(response.context["pagos_pendientes_count"], 2)
+
+
+class PortalQueryBudgetTests(QueryBudgetTestCase):
+    PRESUPUESTOS = [
+        Presupuesto("portal:dashboard", queries=11, ms=500, usuario="portal"),
+    ]
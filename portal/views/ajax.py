@@ -1,45 +1,30 @@
 from django.http import JsonResponse
 
-from autos.models import SubMarca, VehiculoCatalogo
+from autos import services as catalogo
 
 
-def portal_ajax_submarcas_por_marca(request):
+async def portal_ajax_submarcas_por_marca(request):
     marca_id = request.GET.get("marca_id")
 
-    submarcas = SubMarca.objects.filter(
-        marca_id=marca_id,
-        is_active=True
-    ).order_by("nombre")
+    return await catalogo.acatalog_response(request, catalogo.SUBMARCAS, marca_id)
 
-    data = [
-        {
-            "id": s.id,
-            "nombre": s.nombre,
-        }
-        for s in submarcas
-    ]
 
-    return JsonResponse({"results": data})
-
-
-def portal_ajax_catalogos_por_submarca(request):
+async def portal_ajax_catalogos_por_submarca(request):
     submarca_id = request.GET.get("submarca_id")
     anio = request.GET.get("anio")
 
-    qs = VehiculoCatalogo.objects.filter(
-        submarca_id=submarca_id,
-        is_active=True,
-    ).select_related("marca", "submarca").order_by("-anio", "version")
-
-    if anio:
-        qs = qs.filter(anio=anio)
+    # Sin año: el bloque público de la submarca (cacheable, sin datos
+    # internos); el navegador filtra por año.
+    if not anio:
+        return await catalogo.acatalog_response(request, catalogo.VERSIONES_PORTAL, submarca_id)
 
     data = [
         {
-            "id": v.id,
-            "label": str(v),
+            "id": v["id"],
+            "label": v["label"],
         }
-        for v in qs
+        for v in await catalogo.aget_results(catalogo.VERSIONES_PORTAL, submarca_id)
+        if str(v["anio"]) == anio
     ]
 
     return JsonResponse({"results": data})
@@ -1,15 +1,13 @@
 from django.http import JsonResponse
 from django.views import View
 
-from autos.models import SubMarca, VehiculoCatalogo
+from autos import services as catalogo
 
 
 class SubmarcasPorMarcaView(View):
     def get(self, request):
         marca_id = request.GET.get("marca_id")
-        qs = SubMarca.objects.filter(marca_id=marca_id, is_active=True).order_by("nombre")
-        data = [{"id": x.id, "nombre": x.nombre} for x in qs]
-        return JsonResponse({"results": data})
+        return catalogo.catalog_response(request, catalogo.SUBMARCAS, marca_id)
 
 
 class CatalogoPorFiltroView(View):
@@ -18,16 +16,21 @@ class CatalogoPorFiltroView(View):
         submarca_id = request.GET.get("submarca_id")
         anio = request.GET.get("anio")
 
-        qs = VehiculoCatalogo.objects.all()
-
-        if marca_id:
-            qs = qs.filter(marca_id=marca_id)
+        # Todo sale del snapshot del catálogo, sin consultas
         if submarca_id:
-            qs = qs.filter(submarca_id=submarca_id)
-        if anio:
-            qs = qs.filter(anio=anio)
-
-        qs = qs.order_by("version")
-
-        data = [{"id": x.id, "label": (x.version or "Sin versión")} for x in qs]
+            submarcas = [submarca_id]
+        elif marca_id:
+            submarcas = [s["id"] for s in catalogo.get_results(catalogo.SUBMARCAS, marca_id)]
+        else:
+            submarcas = []
+
+        rows = [
+            v
+            for sid in submarcas
+            for v in catalogo.get_results(catalogo.VERSIONES, sid)
+            if not anio or str(v["anio"]) == anio
+        ]
+        rows.sort(key=lambda v: v["version"])
+
+        data = [{"id": x["id"], "label": (x["version"] or "Sin versión")} for x in rows]
         return JsonResponse({"results": data})
@@ -1,17 +1,8 @@
-from datetime import timedelta
-
 from django.contrib import messages
 from django.shortcuts import redirect, render
-from django.utils import timezone
 from django.views import View
 
-from autos.models import Vehiculo
-from cotizador.models import (
-    Cotizacion,
-    CotizacionItem,
-    CotizacionItemCalculo,
-)
-from crm.models import Cliente, CodigoPostal
+from cotizador.services.portal_intake_service import PortalQuoteIntakeService
 from portal.forms_public import CotizacionPublicaForm
 from tarifas.services.rating_engine import RatingEngine
 
@@ -35,150 +26,12 @@ class PortalCotizarCreateView(View):
                 },
             )
 
-        d = form.cleaned_data
-
-        # =====================================================
-        # Cliente prospecto
-        # =====================================================
-
-        cliente = (
-            Cliente.objects
-            .filter(email_principal=d["email"])
-            .order_by("-id")
-            .first()
-        )
-
-        if not cliente:
-            cliente = Cliente.objects.create(
-                tipo_cliente=Cliente.TipoCliente.PERSONA,
-                nombre=d["nombre"],
-                email_principal=d["email"],
-                telefono_principal=d["telefono"],
-                estatus=Cliente.Estatus.PROSPECTO,
-                origen=Cotizacion.Origen.PORTAL_PUBLICO,
-                codigo_postal=d["codigo_postal"],
-            )
-
-        # Actualizamos los datos de contacto capturados.
-        cliente.nombre = d["nombre"]
-        cliente.email_principal = d["email"]
-        cliente.telefono_principal = d["telefono"]
-        cliente.tipo_cliente = Cliente.TipoCliente.PERSONA
-        cliente.codigo_postal = d["codigo_postal"]
-
-        cp = (
-            CodigoPostal.objects
-            .filter(
-                codigo_postal=d["codigo_postal"]
-            )
-            .first()
-        )
-
-        if cp:
-            cliente.ciudad = cp.ciudad
-            cliente.estado = cp.estado
-        else:
-            cliente.ciudad = ""
-            cliente.estado = ""
-
-        cliente.save()
-
-        # =====================================================
-        # Vehículo
-        # =====================================================
-
-        catalogo = d["catalogo"]
-
-        vehiculo = Vehiculo.objects.create(
-            cliente=cliente,
-            catalogo=catalogo,
-
-            # El modelo tiene PARTICULAR como default.
-            # Lo indicamos explícitamente porque es una regla
-            # del flujo público actual.
-            tipo_uso=Vehiculo.TipoUso.PARTICULAR,
-
-            marca_texto=catalogo.marca.nombre,
-            submarca_texto=catalogo.submarca.nombre,
-            modelo_anio=catalogo.anio,
-            version=catalogo.version or "",
-            tipo_vehiculo=catalogo.tipo_vehiculo or "",
-            valor_comercial=catalogo.valor_referencia,
+        # Cliente, vehículo, cotización y opciones en una sola transacción
+        cot = PortalQuoteIntakeService.submit(
+            data=form.cleaned_data,
+            engine=RatingEngine(),
         )
 
-        # =====================================================
-        # Vigencia
-        # =====================================================
-
-        hoy = timezone.localdate()
-
-        vigencia_desde = hoy
-        vigencia_hasta = hoy + timedelta(days=365)
-
-        # =====================================================
-        # Cotización
-        # =====================================================
-
-        cot = Cotizacion.objects.create(
-            cliente=cliente,
-            vehiculo=vehiculo,
-            flotilla=None,
-
-            tipo_cotizacion=Cotizacion.Tipo.INDIVIDUAL,
-
-            vigencia_desde=vigencia_desde,
-            vigencia_hasta=vigencia_hasta,
-
-            estatus=Cotizacion.Estatus.BORRADOR,
-            origen=Cotizacion.Origen.PORTAL_PUBLICO,
-
-            codigo_postal=d["codigo_postal"],
-            ciudad=cliente.ciudad,
-            estado=cliente.estado,
-
-            conductor_nombre=d["nombre"],
-            conductor_genero=d["genero"],
-            conductor_edad=d["edad"],
-        )
-
-        # =====================================================
-        # Motor actual de tarifas
-        #
-        # Por ahora lo conservamos.
-        # En el siguiente paso será reemplazado/encapsulado
-        # por el nuevo QuoteService.
-        # =====================================================
-
-        engine = RatingEngine()
-
-        results = engine.quote(cot)
-
-        for r in results:
-            item = CotizacionItem.objects.create(
-                cotizacion=cot,
-                aseguradora_id=r.aseguradora_id,
-                producto_id=r.producto_id,
-
-                prima_neta=r.prima_neta,
-                derechos=r.derechos,
-                recargos=r.recargos,
-                descuentos=r.descuentos,
-                iva=r.iva,
-                prima_total=r.prima_total,
-
-                forma_pago=r.forma_pago,
-                meses=r.meses,
-                ranking=r.ranking,
-                seleccionada=False,
-            )
-
-            CotizacionItemCalculo.objects.create(
-                item=item,
-                prima_base=r.prima_base,
-                factor_total=r.factor_total,
-                detalle_json=r.detalle_json or {},
-            )
-
         # =====================================================
         # Sesión pública
         # =====================================================
@@ -2,10 +2,10 @@ from django.utils import timezone
 from django.views.generic import TemplateView
 
 from portal.mixins import ClientePortalRequiredMixin
+from portal.services import dashboard
 from cotizador.models import Cotizacion
 from polizas.models import Poliza
 from crm.models import Cliente
-from finanzas.models import Pago
 
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
@@ -30,47 +30,8 @@ class PortalDashboardView(LoginRequiredMixin, TemplateView):
         if not cliente:
             return ctx
         
-        today = timezone.localdate()
-
-        # Cotizaciones activas (si aún las quieres mostrar)
-        cotizaciones_activas = (
-            Cotizacion.objects
-            .filter(cliente=cliente)
-            .exclude(estatus=Cotizacion.Estatus.RECHAZADA)
-            .order_by("-created_at")[:10]
-        )
-        ctx["cotizaciones_activas"] = cotizaciones_activas
-        ctx["cotizaciones_activas_count"] = cotizaciones_activas.count()
-
-        # Pólizas vigentes (incluye documento)
-        polizas_vigentes = (
-            Poliza.objects
-            .filter(cliente=cliente, estatus=Poliza.Estatus.VIGENTE,
-                    vigencia_desde__lte=today, vigencia_hasta__gte=today)
-            .select_related("aseguradora", "documento")
-            .order_by("vigencia_hasta")[:10]
-        )
-        ctx["polizas_vigentes"] = polizas_vigentes
-        ctx["polizas_vigentes_count"] = polizas_vigentes.count()
-
-        # Pagos pendientes/vencidos (próximos 12)
-        pagos_pendientes = (
-            Pago.objects
-            .filter(poliza__cliente=cliente, estatus__in=[Pago.Estatus.PENDIENTE, Pago.Estatus.VENCIDO])
-            .select_related("poliza", "poliza__aseguradora", "comprobante")
-            .order_by("fecha_programada")[:12]
-        )
-        ctx["pagos_pendientes"] = pagos_pendientes
-        ctx["pagos_pendientes_count"] = pagos_pendientes.count()
-
-        # Pagos pagados recientes
-        pagos_pagados = (
-            Pago.objects
-            .filter(poliza__cliente=cliente, estatus=Pago.Estatus.PAGADO)
-            .select_related("poliza", "poliza__aseguradora", "comprobante")
-            .order_by("-fecha_pago", "-id")[:10]
-        )
-        ctx["pagos_pagados"] = pagos_pagados
+        # Una lectura de cache; se recalcula (3 consultas) solo si cambió algo
+        ctx.update(dashboard.get_snapshot(cliente.pk))
 
         return ctx
 
@@ -0,0 +1,100 @@
+# seguros/database.py
+"""
+Configuración de DATABASES a partir del entorno.
+
+DB_ENGINE elige el backend (mysql | postgresql; default mysql, como hasta
+ahora) y las conexiones dejan de abrirse en cada request:
+
+- WSGI (workers sync de gunicorn): conexiones persistentes por worker
+  (DB_CONN_MAX_AGE) con CONN_HEALTH_CHECKS, que valida la conexión
+  reutilizada antes de usarla en cada request.
+- ASGI (uvicorn): Django no debe reutilizar conexiones persistentes entre
+  hilos, así que en PostgreSQL se usa el pool nativo de psycopg3
+  (OPTIONS["pool"], Django 5.1+) y en MySQL se desactiva CONN_MAX_AGE.
+
+El tamaño del pool se ajusta por clase de worker (GUNICORN_WORKER_CLASS):
+un worker sync atiende un request a la vez, uno async muchos. DB_POOL y
+DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE / DB_POOL_TIMEOUT lo sobreescriben.
+"""
+
+ENGINES = {
+    "mysql": "django.db.backends.mysql",
+    "postgresql": "django.db.backends.postgresql",
+}
+
+# (min_size, max_size) por conexión de pool, por proceso
+POOL_SIZES = {
+    "sync": (1, 2),
+    "async": (2, 10),
+}
+
+
+def is_async_worker(worker_class):
+    return "uvicorn" in (worker_class or "").lower()
+
+
+def database_config(env):
+    engine = env("DB_ENGINE", default="mysql").strip().lower()
+    if engine not in ENGINES:
+        raise ValueError(f"DB_ENGINE no soportado: {engine!r} (usa {', '.join(ENGINES)})")
+
+    async_worker = is_async_worker(env("GUNICORN_WORKER_CLASS", default="sync"))
+
+    if engine == "postgresql":
+        config = {
+            "ENGINE": ENGINES[engine],
+            "NAME": env("POSTGRES_DB"),
+            "USER": env("POSTGRES_USER"),
+            "PASSWORD": env("POSTGRES_PASSWORD"),
+            "HOST": env("POSTGRES_HOST", default="localhost"),
+            "PORT": env("POSTGRES_PORT", default="5432"),
+            "OPTIONS": {},
+        }
+        use_pool = env.bool("DB_POOL", default=async_worker)
+    else:
+        config = {
+            "ENGINE": ENGINES[engine],
+            "NAME": env("MYSQL_DB"),
+            "USER": env("MYSQL_USER"),
+            "PASSWORD": env("MYSQL_PASSWORD"),
+            "HOST": env("MYSQL_HOST", default="localhost"),
+            "PORT": env("MYSQL_PORT", default="3306"),
+            "OPTIONS": {
+                "charset": "utf8mb4",
+            },
+        }
+        # MySQL no tiene pool nativo en Django
+        use_pool = False
+
+    config["CONN_HEALTH_CHECKS"] = env.bool("DB_CONN_HEALTH_CHECKS", default=True)
+
+    if use_pool:
+        min_size, max_size = POOL_SIZES["async" if async_worker else "sync"]
+        config["OPTIONS"]["pool"] = {
+            "min_size": env.int("DB_POOL_MIN_SIZE", default=min_size),
+            "max_size": env.int("DB_POOL_MAX_SIZE", default=max_size),
+            # segundos esperando una conexión libre antes de fallar
+            "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),
+            "max_idle": env.float("DB_POOL_MAX_IDLE", default=300.0),
+        }
+        # El pool ya reutiliza conexiones; Django exige CONN_MAX_AGE=0
+        config["CONN_MAX_AGE"] = 0
+    elif async_worker:
+        config["CONN_MAX_AGE"] = 0
+    else:
+        config["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
+
+    return config
+
+
+def pool_stats(alias="default"):
+    """
+    Estadísticas del pool de psycopg3 de este proceso (pool_size,
+    pool_available, requests_waiting, ...). None si el alias no usa pool.
+    """
+    from django.db import connections
+
+    pool = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return None
+    return pool.get_stats()
@@ -7,6 +7,8 @@ from decimal import Decimal
 import os
 import environ
 
+from seguros.database import database_config
+
 # ---------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------
@@ -82,12 +84,14 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.ProfilingMiddleware",
 
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
 
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.RoleSnapshotMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     
@@ -122,33 +126,54 @@ TEMPLATES = [
 ]
 
 # ---------------------------------------------------------------------
-# Database (PostgreSQL)
+# Database
 # ---------------------------------------------------------------------
-#DATABASES = {
-#    "default": {
-#        "ENGINE": "django.db.backends.postgresql",
-#        "NAME": env("POSTGRES_DB"),
-#        "USER": env("POSTGRES_USER"),
-#        "PASSWORD": env("POSTGRES_PASSWORD"),
-#        "HOST": env("POSTGRES_HOST", default="localhost"),
-#        "PORT": env("POSTGRES_PORT", default="5432"),
-#        "CONN_MAX_AGE": env.int("POSTGRES_CONN_MAX_AGE", default=60),
-#    }
-#}
-
+# DB_ENGINE=mysql (MYSQL_*) | postgresql (POSTGRES_*). Conexiones
+# persistentes con health checks; pool de psycopg3 en workers ASGI.
+# Ver seguros/database.py
 DATABASES = {
+    "default": database_config(env),
+}
+
+# ---------------------------------------------------------------------
+# Perfilado por request (core.middleware.ProfilingMiddleware)
+# ---------------------------------------------------------------------
+# Muestras en /admin/perfiles/ (y .json); fuera de la muestra no cuesta nada
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", default=False)
+PROFILING_SAMPLE_RATE = env.float("PROFILING_SAMPLE_RATE", default=0.01)
+PROFILING_BUFFER_SIZE = env.int("PROFILING_BUFFER_SIZE", default=200)
+PROFILING_TTL = env.int("PROFILING_TTL", default=86400)
+# Presupuesto por request; PROFILING_BUDGETS = {"ui:poliza_list": {"ms": 800, "queries": 20}}
+PROFILING_BUDGET_MS = env.int("PROFILING_BUDGET_MS", default=500)
+PROFILING_BUDGET_QUERIES = env.int("PROFILING_BUDGET_QUERIES", default=50)
+PROFILING_BUDGETS = {}
+# Misma query (firma) repetida N veces en un request = sospecha de N+1
+PROFILING_DUPLICATE_THRESHOLD = env.int("PROFILING_DUPLICATE_THRESHOLD", default=3)
+# Tests de core.query_budget: los presupuestos en ms solo se exigen con esto
+# (dependen de la máquina); las queries se exigen siempre.
+QUERY_BUDGET_ENFORCE_MS = env.bool("QUERY_BUDGET_ENFORCE_MS", default=False)
+
+# ---------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------
+# CACHE_URL: locmemcache:// (uno por worker), filecache:///ruta (compartido
+# entre los workers del host) o rediscache://host:6379/1.
+# Las llaves se arman con core.services.cache (namespaces).
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
-        "NAME": env("MYSQL_DB"),
-        "USER": env("MYSQL_USER"),
-        "PASSWORD": env("MYSQL_PASSWORD"),
-        "HOST": env("MYSQL_HOST", default="localhost"),
-        "PORT": env("MYSQL_PORT", default="3306"),
-        "OPTIONS": {
-            "charset": "utf8mb4",
-        },
+        **env.cache("CACHE_URL", default="filecache:///tmp/seguros-cache"),
+        "KEY_PREFIX": env("CACHE_KEY_PREFIX", default="seguros"),
     }
 }
+# filecache / locmem: el default de Django es 300 llaves y al llenarse borra
+# 1/3 al azar en cada set (snapshots, tokens y versiones de invalidación).
+# Redis no usa estas opciones (se pasarían al cliente); ahí manda maxmemory.
+if CACHES["default"]["BACKEND"].endswith(("FileBasedCache", "LocMemCache")):
+    CACHES["default"].setdefault("OPTIONS", {})
+    CACHES["default"]["OPTIONS"].setdefault("MAX_ENTRIES", env.int("CACHE_MAX_ENTRIES", default=50000))
+    CACHES["default"]["OPTIONS"].setdefault("CULL_FREQUENCY", env.int("CACHE_CULL_FREQUENCY", default=10))
+# get_or_set: segundos máximos que un proceso espera a que otro calcule el valor
+CACHE_LOCK_TIMEOUT = env.int("CACHE_LOCK_TIMEOUT", default=30)
 
 # ---------------------------------------------------------------------
 # Password validation
@@ -182,6 +207,13 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# DOCUMENTOS: con X-Accel-Redirect la descarga la sirve nginx (location internal
+# que apunta a MEDIA_ROOT); Django solo autoriza. El permiso por (usuario, documento)
+# se memoriza DOCUMENTOS_ACCESO_TTL segundos.
+DOCUMENTOS_X_ACCEL = env.bool("DOCUMENTOS_X_ACCEL", default=True)
+DOCUMENTOS_X_ACCEL_PREFIX = env("DOCUMENTOS_X_ACCEL_PREFIX", default="/_protected/media/")
+DOCUMENTOS_ACCESO_TTL = env.int("DOCUMENTOS_ACCESO_TTL", default=60)
+
 # ---------------------------------------------------------------------
 # Auth
 # ---------------------------------------------------------------------
@@ -249,6 +281,9 @@ EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=True)
 # PROVIDERS
 MERCADOPAGO_WEBHOOK_SECRET = env("MERCADOPAGO_WEBHOOK_SECRET",default="")
 MERCADOPAGO_ACCESS_TOKEN = env("MERCADOPAGO_ACCESS_TOKEN",default="")
+# Providers de seguros extra / reemplazos: {"CODIGO": "modulo.Clase"}
+# (se importan al pedirse, ver integrations.broker.factory)
+INSURANCE_PROVIDERS = {}
 MP_VALIDATE_SIGNATURE = env("MP_VALIDATE_SIGNATURE",default="true").lower()=="true"
 
 # ENVIO RECORDATORIOS POR WA
@@ -258,9 +293,47 @@ WHATSAPP_WABA_ID = env("WHATSAPP_WABA_ID", default="")
 WHATSAPP_API_VERSION = env("WHATSAPP_API_VERSION", default="v23.0")
 WHATSAPP_TEMPLATE_RECORDATORIO = env("WHATSAPP_TEMPLATE_RECORDATORIO", default="recordatorio_pago")
 WHATSAPP_ENABLED = env("WHATSAPP_ENABLED", default=False)
+
+# WHATSAPP envío masivo: hilos, mensajes/seg (throughput del número en Meta),
+# reintentos de errores transitorios y timeout por request
+WHATSAPP_DISPATCH_WORKERS = env.int("WHATSAPP_DISPATCH_WORKERS", default=16)
+WHATSAPP_RATE_PER_SECOND = env.int("WHATSAPP_RATE_PER_SECOND", default=80)
+WHATSAPP_MAX_RETRIES = env.int("WHATSAPP_MAX_RETRIES", default=3)
+WHATSAPP_TIMEOUT = env.int("WHATSAPP_TIMEOUT", default=10)
+
+# OUTBOX (manage.py outbox_worker): mensajes por lote, intentos, backoff base
+# (se duplica en cada intento) y lease de un lote tomado por un worker
+OUTBOX_BATCH_SIZE = env.int("OUTBOX_BATCH_SIZE", default=100)
+OUTBOX_MAX_ATTEMPTS = env.int("OUTBOX_MAX_ATTEMPTS", default=8)
+OUTBOX_BACKOFF_SECONDS = env.int("OUTBOX_BACKOFF_SECONDS", default=30)
+OUTBOX_LEASE_SECONDS = env.int("OUTBOX_LEASE_SECONDS", default=300)
+
 HOME_PAGE= env("HOME_PAGE")
 
 COMISION_PORCENTAJE_DEFAULT = 10.00
+
+# REPORTES PDF
+PDF_CHUNK_ROWS = env.int("PDF_CHUNK_ROWS", default=500)
+PDF_MAX_ROWS = env.int("PDF_MAX_ROWS", default=20000)
+PDF_WORKERS = env.int("PDF_WORKERS", default=2)
+PDF_CACHE_MAX_BYTES = env.int("PDF_CACHE_MAX_BYTES", default=512 * 1024 * 1024)
+
+# ROLES: segundos que la sesión reutiliza el snapshot de grupos del usuario
+ROLES_SESSION_TTL = env.int("ROLES_SESSION_TTL", default=300)
+
+# CATALOGO VEHICULOS: max-age de los bloques JSON y vigencia de la versión en cache
+CATALOGO_MAX_AGE = env.int("CATALOGO_MAX_AGE", default=300)
+CATALOGO_VERSION_TTL = env.int("CATALOGO_VERSION_TTL", default=300)
+
+# CODIGOS POSTALES: índice binario generado con `manage.py build_cp_index`
+CP_INDEX_PATH = env("CP_INDEX_PATH", default=str(BASE_DIR / "var" / "cp_index.bin"))
+
+# FOLIOS: números que cada proceso reserva por bloque (COT / POL)
+FOLIO_BLOCK_SIZE = env.int("FOLIO_BLOCK_SIZE", default=100)
+
+# PORTAL: segundos que vive en cache el snapshot del dashboard de cada cliente
+PORTAL_SNAPSHOT_TTL = env.int("PORTAL_SNAPSHOT_TTL", default=600)
+
 IVA_RATE = Decimal(env("IVA_RATE", default=0.16))
 
 PUBLIC_BASE_URL = os.getenv(
@@ -18,9 +18,13 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from core.views import HomeRedirectView
+from core.views import HomeRedirectView, perfiles, perfiles_json
 
 urlpatterns = [
+    # Perfilado (solo staff, dentro del admin)
+    path("admin/perfiles/", admin.site.admin_view(perfiles), name="admin_perfiles"),
+    path("admin/perfiles.json", admin.site.admin_view(perfiles_json), name="admin_perfiles_json"),
+
     path("admin/", admin.site.urls),
 
     # UI interna
@@ -8,22 +8,13 @@ class SupervisorRequiredMixin(UserPassesTestMixin):
     """
 
     def test_func(self):
-        user = self.request.user
-
-        return (
-            user.is_superuser
-            or user.groups.filter(name__in=["Supervisor", "Admin"]).exists()
-        )
+        return self.request.roles.is_supervisor
 
 
 class SupervisorRequiredMixin(UserPassesTestMixin):
 
     def test_func(self):
-        user = self.request.user
-        return (
-            user.is_superuser
-            or user.groups.filter(name__in=["Supervisor", "Admin"]).exists()
-        )
+        return self.request.roles.is_supervisor
 
     def handle_no_permission(self):
         messages.error(self.request, "No tienes permisos para acceder a esta sección.")
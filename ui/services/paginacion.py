@@ -0,0 +1,250 @@
+# ui/services/paginacion.py
+"""
+Paginación por llave (keyset / seek) para listados grandes.
+
+En lugar de OFFSET, cada página se pide "después de" (o "antes de") los
+valores de orden de la última fila vista, codificados en un cursor. Con un
+índice que cubra el filtro y el orden del listado, la página 500 cuesta lo
+mismo que la página 1.
+"""
+import base64
+import datetime
+import hashlib
+import json
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+
+from core.services import cache
+
+COUNT_CACHE_TTL = 60
+COUNTS = cache.namespace("ui", ttl=COUNT_CACHE_TTL)
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values, direction="next"):
+    raw = json.dumps({"d": direction, "v": [_encode_value(v) for v in values]})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """Regresa (direction, values) o (None, None) si el cursor no es válido."""
+    if not token:
+        return None, None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        direction = data["d"]
+        values = data["v"]
+    except (ValueError, KeyError, TypeError):
+        return None, None
+
+    if direction not in ("next", "prev") or not isinstance(values, list):
+        return None, None
+
+    return direction, values
+
+
+def _parse_keys(ordering):
+    keys = []
+    for item in ordering:
+        desc = item.startswith("-")
+        keys.append((item.lstrip("-"), desc))
+    return keys
+
+
+def _is_nullable(model, field_name):
+    if "__" in field_name:
+        return False
+    try:
+        return model._meta.get_field(field_name).null
+    except FieldDoesNotExist:
+        return False
+
+
+def _after(field, desc, value, nullable, forward):
+    """Condición "la fila va después de value" para una sola llave."""
+    # Adelante los nulos van al final; hacia atrás, al principio.
+    if value is None:
+        if forward:
+            return Q(pk__in=[])
+        return Q(**{f"{field}__isnull": False})
+
+    lookup = "lt" if desc == forward else "gt"
+    cond = Q(**{f"{field}__{lookup}": value})
+    if nullable and forward:
+        cond |= Q(**{f"{field}__isnull": True})
+    return cond
+
+
+def _equal(field, value):
+    if value is None:
+        return Q(**{f"{field}__isnull": True})
+    return Q(**{field: value})
+
+
+def _seek(keys, values, nullables, forward):
+    cond = Q(pk__in=[])
+    prefix = Q()
+    for (field, desc), value, nullable in zip(keys, values, nullables):
+        cond |= prefix & _after(field, desc, value, nullable, forward)
+        prefix &= _equal(field, value)
+    return cond
+
+
+def _order_by(keys, nullables, forward):
+    exprs = []
+    for (field, desc), nullable in zip(keys, nullables):
+        expr = F(field)
+        descending = desc if forward else not desc
+        if nullable:
+            null_kwargs = {"nulls_last": True} if forward else {"nulls_first": True}
+        else:
+            null_kwargs = {}
+        exprs.append(expr.desc(**null_kwargs) if descending else expr.asc(**null_kwargs))
+    return exprs
+
+
+def cached_count(queryset, ttl=COUNT_CACHE_TTL):
+    """
+    COUNT(*) cacheado por el SQL del queryset. En listados grandes el total
+    exacto al instante no es necesario y el COUNT sobre joins es lo más caro.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha256(f"{sql}|{params}".encode("utf-8")).hexdigest()
+    # get_or_set: con varios usuarios en el mismo listado solo uno hace el COUNT
+    return COUNTS.get_or_set(f"keyset_count:{digest}", queryset.order_by().count, ttl)
+
+
+def cached_aggregate(queryset, ttl=COUNT_CACHE_TTL, **aggregates):
+    """Como cached_count pero para totales (Sum, etc.) que se pintan en cada página."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha256(f"{sql}|{params}|{aggregates!r}".encode("utf-8")).hexdigest()
+    return COUNTS.get_or_set(f"keyset_aggregate:{digest}", lambda: queryset.order_by().aggregate(**aggregates), ttl)
+
+
+class KeysetPaginator:
+    def __init__(self, queryset, count_mode="cached"):
+        self._queryset = queryset
+        self.count_mode = count_mode
+        self._count = None
+
+    @property
+    def count(self):
+        if self.count_mode == "none":
+            return None
+        if self._count is None:
+            if self.count_mode == "exact":
+                self._count = self._queryset.order_by().count()
+            else:
+                self._count = cached_count(self._queryset)
+        return self._count
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor, is_first):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.is_first = is_first
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def paginate_keyset(queryset, ordering, per_page, cursor=None, count_mode="cached"):
+    """
+    Pagina queryset por las llaves de ordering (p.ej. ("-created_at", "-id")).
+    La última llave debe ser única (normalmente el id) para desempatar.
+    """
+    keys = _parse_keys(ordering)
+    nullables = [_is_nullable(queryset.model, field) for field, _desc in keys]
+    fields = [field for field, _desc in keys]
+
+    direction, values = decode_cursor(cursor)
+    if values is not None and len(values) != len(keys):
+        direction, values = None, None
+
+    forward = direction != "prev"
+
+    qs = queryset
+    if values is not None:
+        qs = qs.filter(_seek(keys, values, nullables, forward))
+    qs = qs.order_by(*_order_by(keys, nullables, forward))
+
+    rows = list(qs[: per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if not forward:
+        rows.reverse()
+
+    def cursor_for(obj, to):
+        return encode_cursor([_resolve(obj, f) for f in fields], to)
+
+    if forward:
+        next_cursor = cursor_for(rows[-1], "next") if rows and has_more else None
+        previous_cursor = cursor_for(rows[0], "prev") if rows and values is not None else None
+    else:
+        next_cursor = cursor_for(rows[-1], "next") if rows else None
+        previous_cursor = cursor_for(rows[0], "prev") if rows and has_more else None
+
+    return KeysetPage(
+        object_list=rows,
+        paginator=KeysetPaginator(queryset, count_mode=count_mode),
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
+        is_first=previous_cursor is None,
+    )
+
+
+def _resolve(obj, path):
+    value = obj
+    for part in path.split("__"):
+        value = getattr(value, part, None)
+        if value is None:
+            return None
+    return value
+
+
+class KeysetPaginationMixin:
+    """
+    Para ListView: reemplaza la paginación por OFFSET con cursores.
+
+    keyset_ordering: llaves de orden, la última única.
+    keyset_count_mode: "cached" (default), "exact" o "none".
+    """
+    keyset_ordering = ("-created_at", "-id")
+    keyset_count_mode = "cached"
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate_keyset(
+            queryset,
+            self.keyset_ordering,
+            page_size,
+            cursor=self.request.GET.get(self.cursor_kwarg),
+            count_mode=self.keyset_count_mode,
+        )
+        return (page.paginator, page, page.object_list, page.has_other_pages())
@@ -1,20 +1,148 @@
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from django.conf import settings
+from django.db.models.query import QuerySet
 from django.http import HttpResponse
 from django.template.loader import get_template
-from xhtml2pdf import pisa
 
+logger = logging.getLogger(__name__)
 
-def render_to_pdf(template_src, context_dict=None, filename="reporte.pdf"):
-    context_dict = context_dict or {}
+_pool = None
 
-    template = get_template(template_src)
-    html = template.render(context_dict)
 
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+def _get_pool():
+    # Pool perezoso: solo se crea cuando un reporte realmente se parte en bloques.
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=getattr(settings, "PDF_WORKERS", 2))
+    return _pool
+
 
-    pisa_status = pisa.CreatePDF(html, dest=response)
+def _html_to_pdf(html):
+    # Corre en el proceso hijo: solo recibe HTML ya renderizado, no toca el ORM.
+    # xhtml2pdf (reportlab, pyhanko...) tarda ~1s en importarse: solo al generar.
+    from xhtml2pdf import pisa
 
+    result = BytesIO()
+    pisa_status = pisa.CreatePDF(html, dest=result)
     if pisa_status.err:
+        return None
+    return result.getvalue()
+
+
+def _render_bloques(htmls):
+    # Si un hijo muere (OOM, kill) el pool queda roto para siempre: se
+    # descarta, se reintenta una vez con uno nuevo y, si vuelve a fallar,
+    # los bloques se generan en el propio proceso.
+    global _pool
+    for _ in range(2):
+        try:
+            return list(_get_pool().map(_html_to_pdf, htmls))
+        except BrokenProcessPool:
+            logger.warning("Pool de PDF roto; se recrea")
+            _pool = None
+    return [_html_to_pdf(html) for html in htmls]
+
+
+def _merge_pdfs(partes):
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for parte in partes:
+        writer.append(BytesIO(parte))
+
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def _contar_filas(rows):
+    if isinstance(rows, QuerySet):
+        return rows.count()
+    return len(rows)
+
+
+def render_pdf_bytes(template_src, context_dict=None, rows_key=None):
+    """
+    Renderiza un template a PDF y regresa los bytes (o None si falla).
+
+    Si se indica rows_key y la lista de filas excede PDF_CHUNK_ROWS, el
+    reporte se renderiza en bloques de ese tamaño en un pool de procesos
+    y los PDFs resultantes se concatenan. El template recibe
+    pdf_chunk_index (0 en el primer bloque) para pintar encabezado y
+    resumen solo una vez, y pdf_chunk_last para los totales del final.
+    """
+    context_dict = context_dict or {}
+    template = get_template(template_src)
+
+    chunk_rows = getattr(settings, "PDF_CHUNK_ROWS", 500)
+    rows = context_dict.get(rows_key) if rows_key else None
+
+    if rows is None:
+        return _html_to_pdf(template.render({**context_dict, "pdf_chunk_last": True}))
+
+    rows = list(rows)
+    if len(rows) <= chunk_rows:
+        return _html_to_pdf(template.render({**context_dict, rows_key: rows, "pdf_chunk_last": True}))
+
+    htmls = [
+        template.render({
+            **context_dict,
+            rows_key: rows[i:i + chunk_rows],
+            "pdf_chunk_index": i // chunk_rows,
+            "pdf_chunk_last": i + chunk_rows >= len(rows),
+        })
+        for i in range(0, len(rows), chunk_rows)
+    ]
+
+    partes = _render_bloques(htmls)
+    if any(p is None for p in partes):
+        return None
+
+    return _merge_pdfs(partes)
+
+
+def check_row_cap(context_dict, rows_key):
+    """Regresa una respuesta 400 si el reporte excede PDF_MAX_ROWS, o None."""
+    if not rows_key or context_dict.get(rows_key) is None:
+        return None
+
+    max_rows = getattr(settings, "PDF_MAX_ROWS", 20000)
+    total = _contar_filas(context_dict[rows_key])
+    if total <= max_rows:
+        return None
+
+    # Demasiadas filas para xhtml2pdf dentro del request: se pide
+    # acotar filtros o usar la exportación a Excel.
+    return HttpResponse(
+        f"El reporte tiene {total} registros (máximo {max_rows} en PDF). "
+        "Ajusta los filtros o exporta a Excel.",
+        status=400,
+    )
+
+
+def render_to_pdf(template_src, context_dict=None, filename="reporte.pdf", rows_key=None):
+    context_dict = context_dict or {}
+
+    too_big = check_row_cap(context_dict, rows_key)
+    if too_big is not None:
+        return too_big
+
+    inicio = time.monotonic()
+    pdf = render_pdf_bytes(template_src, context_dict, rows_key=rows_key)
+    elapsed = time.monotonic() - inicio
+
+    logger.info("PDF %s generado en %.3fs", template_src, elapsed)
+
+    if pdf is None:
         return HttpResponse("Error al generar PDF", status=500)
 
+    response = HttpResponse(pdf, content_type="application/pdf")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["X-Render-Time"] = f"{elapsed:.3f}"
+
     return response
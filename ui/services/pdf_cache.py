@@ -0,0 +1,178 @@
+# ui/services/pdf_cache.py
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import HttpResponse, HttpResponseNotModified
+
+from ui.services.pdf import check_row_cap, render_pdf_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_dir():
+    return Path(settings.MEDIA_ROOT) / getattr(settings, "PDF_CACHE_SUBDIR", "pdf_cache")
+
+
+def version_for(queryset, *fields):
+    """
+    Versión de los datos que alimentan un PDF: número de filas más el
+    max(updated_at) de cada campo indicado. Si cambia, insertan o borran
+    filas, cambia la versión.
+
+    Los QuerySet.update() sobre estas filas deben poner updated_at a mano
+    (auto_now solo corre en save()); si no, el PDF cacheado queda viejo.
+    """
+    fields = fields or ("updated_at",)
+    agg = queryset.order_by().aggregate(
+        _n=Count("id"),
+        **{f"_max_{i}": Max(f) for i, f in enumerate(fields)},
+    )
+    return [agg["_n"]] + [agg[f"_max_{i}"] for i in range(len(fields))]
+
+
+def pdf_cache_key(template_src, fingerprint, version):
+    raw = json.dumps(
+        [template_src, fingerprint, version],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_cached_pdf(key):
+    path = _cache_dir() / f"{key}.pdf"
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+    # LRU: el mtime marca el último uso.
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+    return data
+
+
+def store_pdf(key, data):
+    directory = _cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    path = directory / f"{key}.pdf"
+    tmp = directory / f"{key}.{os.getpid()}.tmp"
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+    evict_pdf_cache()
+
+
+def evict_pdf_cache(max_bytes=None):
+    """Borra los PDFs menos usados hasta quedar dentro de PDF_CACHE_MAX_BYTES."""
+    if max_bytes is None:
+        max_bytes = getattr(settings, "PDF_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+
+    directory = _cache_dir()
+    if not directory.exists():
+        return 0
+
+    entries = []
+    total = 0
+    for path in directory.glob("*.pdf"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+
+    removed = 0
+    entries.sort()
+    for _mtime, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+
+    return removed
+
+
+def _etag_matches(request, etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH", "")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in [t.strip() for t in header.split(",")]
+
+
+def cached_pdf_response(
+    request,
+    template_src,
+    build_context,
+    *,
+    fingerprint,
+    version,
+    filename="reporte.pdf",
+    rows_key=None,
+    inline=False,
+):
+    """
+    Sirve un PDF desde el cache de disco si (template, fingerprint, version)
+    ya se generó; si no, llama build_context(), renderiza y guarda.
+
+    fingerprint: dict/lista con los parámetros normalizados que definen el
+    contenido (filtros, ids, usuario si el contenido depende de él).
+    version: resultado de version_for() sobre las filas que alimentan el PDF.
+    """
+    key = pdf_cache_key(template_src, fingerprint, version)
+    etag = f'"{key}"'
+
+    if _etag_matches(request, etag):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    pdf = get_cached_pdf(key)
+    cache_status = "HIT"
+    elapsed = None
+
+    if pdf is None:
+        cache_status = "MISS"
+        context_dict = build_context()
+
+        too_big = check_row_cap(context_dict, rows_key)
+        if too_big is not None:
+            return too_big
+
+        inicio = time.monotonic()
+        pdf = render_pdf_bytes(template_src, context_dict, rows_key=rows_key)
+        elapsed = time.monotonic() - inicio
+
+        logger.info("PDF %s generado en %.3fs", template_src, elapsed)
+
+        if pdf is None:
+            return HttpResponse("Error al generar PDF", status=500)
+
+        store_pdf(key, pdf)
+
+    response = HttpResponse(pdf, content_type="application/pdf")
+    disposition = "inline" if inline else "attachment"
+    response["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    response["X-PDF-Cache"] = cache_status
+    if elapsed is not None:
+        response["X-Render-Time"] = f"{elapsed:.3f}"
+
+    return response
@@ -1,23 +1,23 @@
 # ui/services/perms.py 
+from core.services.roles import roles_for
 from finanzas.models import Pago
 
 
 def user_is_supervisor(user):
     if not user.is_authenticated:
         return False
-    if user.is_superuser:
-        return True
-    return user.groups.filter(name__in=["Supervisor", "Admin"]).exists()
+    return roles_for(user).is_supervisor
 
 def can_manage_poliza(user, poliza):
     if user.is_superuser:
         return True
     if user.has_perm("polizas.manage_polizas"):
         return True
+    roles = roles_for(user)
     # Supervisor/Admin por grupo (ajusta si tus nombres son distintos)
-    if user.groups.filter(name__in=["Supervisor", "Admin"]).exists():
+    if roles.is_supervisor:
         return True
-    if user.groups.filter(name="Agente").exists():
+    if roles.is_agente:
         return poliza.agente_id == user.id
     return False
 
@@ -44,7 +44,7 @@ def can_manage_pago(user, pago):
     if user.is_superuser:
         return True
 
-    if user.groups.filter(name__in=["Supervisor", "Admin"]).exists():
+    if roles_for(user).is_supervisor:
         return True
 
     if pago.poliza and pago.poliza.agente_id == user.id:
@@ -55,7 +55,7 @@ def can_manage_pago(user, pago):
 # Para capturar pagos de una poliza
 def can_manage_pago2(user, pago: Pago) -> bool:
     # Admin/Supervisor/permiso global
-    if user.groups.filter(name__in=["Supervisor", "Admin"]).exists():
+    if roles_for(user).in_group("Supervisor", "Admin"):
         return True
     # Agente: solo pagos de sus pólizas
     return pago.poliza.agente_id == user.id
@@ -67,7 +67,7 @@ def can_see_pagos(user) -> bool:
         return True
     if user.has_perm("finanzas.manage_pagos"):
         return True
-    if user.groups.filter(name__in=["Supervisor", "Admin"]).exists():
+    if roles_for(user).is_supervisor:
         return True
     return False #False debe ser False
 
@@ -77,7 +77,7 @@ def can_see_comisiones(user) -> bool:
         return True
     if user.has_perm("finanzas.manage_comisiones"):
         return True
-    if user.groups.filter(name__in=["Supervisor", "Admin"]).exists():
+    if roles_for(user).is_supervisor:
         return True
     return False
 
@@ -85,18 +85,18 @@ def can_admin_polizas(user) -> bool:
     return (
         user.is_superuser
         or user.has_perm("polizas.manage_polizas")
-        or user.groups.filter(name__in=["Admin", "Supervisor"]).exists()
+        or roles_for(user).is_supervisor
     )
 
 def can_update_poliza_numero(user, poliza) -> bool:
     # Admin/Supervisor siempre
-    if user.is_superuser or user.groups.filter(name__in=["Admin", "Supervisor"]).exists():
+    if roles_for(user).is_supervisor:
         return True
     # Agente: solo su póliza y solo si está en proceso
     return poliza.agente_id == user.id and poliza.estatus == poliza.Estatus.EN_PROCESO
 
 def can_download_documento(user, documento):
-    if user.groups.filter(name__in=["Admin", "Supervisor"]).exists():
+    if roles_for(user).in_group("Admin", "Supervisor"):
         return True
 
     # Si es agente, solo documentos de sus pólizas
@@ -110,7 +110,7 @@ def pagos_visibles_para_usuario(user, queryset=None):
     if not user.is_authenticated:
         return qs.none()
 
-    if user.is_superuser or user_is_supervisor(user):
+    if user_is_supervisor(user):
         return qs
 
     return qs.filter(poliza__agente=user)
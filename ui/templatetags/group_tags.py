@@ -1,5 +1,7 @@
 from django import template
 
+from core.services.roles import roles_for
+
 register = template.Library()
 
 
@@ -7,4 +9,4 @@ register = template.Library()
 def has_group(user, group_name):
     if not user or not user.is_authenticated:
         return False
-    return user.groups.filter(name=group_name).exists()
\ No newline at end of file
+    return roles_for(user).in_group(group_name)
\ No newline at end of file
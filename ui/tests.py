@@ -1,3 +1,336 @@
-from django.test import TestCase
+import os
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.template import engines
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from pypdf import PdfReader
+
+from autos.models import Vehiculo
+from catalogos.models import Aseguradora, ProductoSeguro
+from core.query_budget import Presupuesto, QueryBudgetTestCase
+from cotizador.models import Cotizacion, CotizacionItem
+from crm.models import Cliente
+from finanzas.models import Pago
+from integrations.models import OutboxMessage
+from ui.services import pdf, pdf_cache
+from ui.services.paginacion import decode_cursor, encode_cursor, paginate_keyset
+
+
+class PdfCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.override = override_settings(MEDIA_ROOT=self.tmp.name)
+        self.override.enable()
+        self.addCleanup(self.override.disable)
+
+        self.factory = RequestFactory()
+
+    def _response(self, request, version=None, build_context=None):
+        return pdf_cache.cached_pdf_response(
+            request,
+            "ui/clientes/cliente_estado_cuenta_pdf.html",
+            build_context or (lambda: {}),
+            fingerprint={"cliente": 1},
+            version=version or [3, "2026-01-01"],
+            filename="estado.pdf",
+        )
+
+    def test_llave_es_estable_y_depende_de_la_version(self):
+        a = pdf_cache.pdf_cache_key("t.html", {"x": 1, "y": 2}, [1])
+        b = pdf_cache.pdf_cache_key("t.html", {"y": 2, "x": 1}, [1])
+        c = pdf_cache.pdf_cache_key("t.html", {"x": 1, "y": 2}, [2])
+
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    @patch("ui.services.pdf_cache.render_pdf_bytes", return_value=b"%PDF-1")
+    def test_segunda_descarga_sale_del_cache(self, render):
+        request = self.factory.get("/")
+
+        first = self._response(request)
+        second = self._response(request)
+
+        self.assertEqual(first["X-PDF-Cache"], "MISS")
+        self.assertEqual(second["X-PDF-Cache"], "HIT")
+        self.assertIn("X-Render-Time", first)
+        self.assertNotIn("X-Render-Time", second)
+        self.assertEqual(second.content, b"%PDF-1")
+        self.assertEqual(render.call_count, 1)
+
+    @patch("ui.services.pdf_cache.render_pdf_bytes", return_value=b"%PDF-1")
+    def test_if_none_match_regresa_304_sin_renderizar(self, render):
+        etag = self._response(self.factory.get("/"))["ETag"]
+
+        request = self.factory.get("/", HTTP_IF_NONE_MATCH=etag)
+        response = self._response(request)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(render.call_count, 1)
+
+    @patch("ui.services.pdf_cache.render_pdf_bytes", return_value=b"%PDF-1")
+    def test_cambio_de_datos_invalida(self, render):
+        request = self.factory.get("/")
+
+        self._response(request, version=[3, "2026-01-01"])
+        response = self._response(request, version=[3, "2026-01-02"])
+
+        self.assertEqual(response["X-PDF-Cache"], "MISS")
+        self.assertEqual(render.call_count, 2)
+
+    def test_evict_borra_los_menos_usados(self):
+        pdf_cache.store_pdf("viejo", b"x" * 100)
+        pdf_cache.store_pdf("nuevo", b"x" * 100)
+
+        directory = pdf_cache._cache_dir()
+        os.utime(directory / "viejo.pdf", (1, 1))
+
+        removed = pdf_cache.evict_pdf_cache(max_bytes=150)
+
+        self.assertEqual(removed, 1)
+        self.assertFalse((directory / "viejo.pdf").exists())
+        self.assertTrue((directory / "nuevo.pdf").exists())
+
+
+class RenderPdfTests(SimpleTestCase):
+    TEMPLATE = (
+        "{% if not pdf_chunk_index %}<h1>Encabezado</h1>{% endif %}"
+        "{% for fila in filas %}<p>Fila {{ fila }}</p>{% endfor %}"
+        "{% if pdf_chunk_last %}<p>Totales</p>{% endif %}"
+    )
+
+    def setUp(self):
+        template = engines["django"].from_string(self.TEMPLATE)
+        patcher = patch("ui.services.pdf.get_template", return_value=template)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _textos(self, data):
+        return [page.extract_text() for page in PdfReader(BytesIO(data)).pages]
+
+    @override_settings(PDF_CHUNK_ROWS=10)
+    def test_sin_exceder_el_bloque_es_un_solo_pdf(self):
+        with patch("ui.services.pdf._get_pool") as pool:
+            data = pdf.render_pdf_bytes("t.html", {"filas": range(3)}, rows_key="filas")
+
+        pool.assert_not_called()
+        textos = self._textos(data)
+        self.assertEqual(len(textos), 1)
+        self.assertIn("Encabezado", textos[0])
+        self.assertIn("Totales", textos[0])
+
+    @override_settings(PDF_CHUNK_ROWS=2, PDF_WORKERS=2)
+    def test_bloques_en_el_pool_de_procesos_y_se_unen_en_orden(self):
+        data = pdf.render_pdf_bytes("t.html", {"filas": range(5)}, rows_key="filas")
+
+        textos = self._textos(data)
+        self.assertEqual(len(textos), 3)
+        self.assertIn("Encabezado", textos[0])
+        self.assertNotIn("Encabezado", textos[1] + textos[2])
+        self.assertNotIn("Totales", textos[0] + textos[1])
+        self.assertIn("Totales", textos[2])
+        self.assertIn("Fila 0", textos[0])
+        self.assertIn("Fila 2", textos[1])
+        self.assertIn("Fila 4", textos[2])
+
+    @override_settings(PDF_CHUNK_ROWS=2)
+    def test_un_bloque_fallido_regresa_none(self):
+        with patch("ui.services.pdf._get_pool") as pool:
+            pool.return_value.map.return_value = [b"%PDF-1", None]
+            self.assertIsNone(pdf.render_pdf_bytes("t.html", {"filas": range(3)}, rows_key="filas"))
+
+    @override_settings(PDF_CHUNK_ROWS=2)
+    def test_pool_roto_se_recrea_y_termina_en_el_proceso(self):
+        with patch("ui.services.pdf._get_pool") as pool:
+            pool.return_value.map.side_effect = BrokenProcessPool()
+            data = pdf.render_pdf_bytes("t.html", {"filas": range(3)}, rows_key="filas")
+
+        self.assertEqual(pool.call_count, 2)
+        self.assertIsNone(pdf._pool)
+        self.assertEqual(len(self._textos(data)), 2)
+
+    @override_settings(PDF_MAX_ROWS=3)
+    def test_arriba_de_pdf_max_rows_regresa_400(self):
+        self.assertIsNone(pdf.check_row_cap({"filas": [1, 2, 3]}, "filas"))
+
+        with patch("ui.services.pdf.render_pdf_bytes") as render:
+            response = pdf.render_to_pdf("t.html", {"filas": [1, 2, 3, 4]}, rows_key="filas")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("4 registros", response.content.decode())
+        render.assert_not_called()
+
+
+class ReportePdfCacheTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(MEDIA_ROOT=tmp.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        admin = get_user_model().objects.create_superuser(username="admin", password="x")
+        self.client.force_login(admin)
+
+    @patch("ui.services.pdf_cache.render_pdf_bytes", return_value=b"%PDF-1")
+    def test_pdf_de_comisiones_sale_del_cache(self, render):
+        url = reverse("ui:reporte_comisiones") + "?export=pdf"
+        first = self.client.get(url)
+        second = self.client.get(url)
+
+        self.assertEqual(first["X-PDF-Cache"], "MISS")
+        self.assertEqual(second["X-PDF-Cache"], "HIT")
+        self.assertEqual(render.call_count, 1)
+
+
+class EmitirPolizaPortalTests(TestCase):
+    def test_cliente_sin_telefono_conserva_su_usuario_del_portal(self):
+        admin = get_user_model().objects.create_superuser(username="admin", password="x")
+        self.client.force_login(admin)
+
+        cliente = Cliente.objects.create(
+            tipo_cliente=Cliente.TipoCliente.PERSONA, nombre="Ana", email_principal="ana@example.com",
+        )
+        hoy = date.today()
+        cot = Cotizacion.objects.create(
+            cliente=cliente,
+            vehiculo=Vehiculo.objects.create(cliente=cliente, marca_texto="Nissan", modelo_anio=2024),
+            tipo_cotizacion=Cotizacion.Tipo.INDIVIDUAL,
+            origen=Cotizacion.Origen.PORTAL_PUBLICO,
+            owner=admin,
+            vigencia_desde=hoy,
+            vigencia_hasta=hoy + timedelta(days=365),
+        )
+        aseguradora = Aseguradora.objects.create(nombre="Chubb")
+        item = CotizacionItem.objects.create(
+            cotizacion=cot,
+            aseguradora=aseguradora,
+            producto=ProductoSeguro.objects.create(aseguradora=aseguradora, nombre_producto="Autos"),
+            prima_total=Decimal("1000.00"),
+        )
+
+        response = self.client.post(
+            reverse("ui:cotizacion_emitir_poliza", args=[cot.pk]), {"selected_item_id": item.pk},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        cliente.refresh_from_db()
+        self.assertIsNotNone(cliente.user_portal_id)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+
+class CarteraVencidaTotalesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        admin = get_user_model().objects.create_superuser(username="admin", password="x")
+        self.client.force_login(admin)
+
+    def test_conteo_y_total_no_se_recalculan_en_cada_pagina(self):
+        url = reverse("ui:cartera_vencida")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+
+        self.assertEqual(response.context["cantidad_vencidos"], 0)
+        sql = " ".join(q["sql"].upper() for q in ctx.captured_queries)
+        self.assertNotIn("COUNT(", sql)
+        self.assertNotIn("SUM(", sql)
+
+
+class KeysetPaginationTests(TestCase):
+    def _recorrer(self, qs, ordering, per_page):
+        ids = []
+        cursor = None
+        pages = []
+        while True:
+            page = paginate_keyset(qs, ordering, per_page, cursor=cursor, count_mode="exact")
+            pages.append(page)
+            ids.extend(obj.pk for obj in page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        return ids, pages
+
+    def test_recorre_todas_las_filas_sin_repetir(self):
+        for i in range(23):
+            Cliente.objects.create(tipo_cliente=Cliente.TipoCliente.PERSONA, nombre=f"C{i}")
+
+        qs = Cliente.objects.all()
+        ids, pages = self._recorrer(qs, ("-created_at", "-id"), 5)
+
+        esperado = list(qs.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(ids, esperado)
+        self.assertEqual(len(pages), 5)
+        self.assertEqual(pages[0].paginator.count, 23)
+        self.assertFalse(pages[0].has_previous())
+
+    def test_pagina_anterior_regresa_la_misma_pagina(self):
+        for i in range(12):
+            Cliente.objects.create(tipo_cliente=Cliente.TipoCliente.PERSONA, nombre=f"C{i}")
+
+        qs = Cliente.objects.all()
+        ordering = ("-created_at", "-id")
+
+        p1 = paginate_keyset(qs, ordering, 5)
+        p2 = paginate_keyset(qs, ordering, 5, cursor=p1.next_cursor)
+        back = paginate_keyset(qs, ordering, 5, cursor=p2.previous_cursor)
+
+        self.assertEqual([o.pk for o in back], [o.pk for o in p1])
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_llave_nullable_pone_nulos_al_final(self):
+        hoy = date(2026, 1, 1)
+        for i in range(6):
+            Pago.objects.create(
+                monto=Decimal("10.00"),
+                fecha_programada=hoy,
+                fecha_vencimiento=None if i % 2 else hoy + timedelta(days=i),
+            )
+
+        qs = Pago.objects.all()
+        ids, _pages = self._recorrer(qs, ("fecha_vencimiento", "id"), 2)
+
+        con_fecha = list(
+            qs.filter(fecha_vencimiento__isnull=False)
+            .order_by("fecha_vencimiento", "id")
+            .values_list("id", flat=True)
+        )
+        sin_fecha = list(
+            qs.filter(fecha_vencimiento__isnull=True)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(ids, con_fecha + sin_fecha)
+
+    def test_cursor_invalido_regresa_primera_pagina(self):
+        self.assertEqual(decode_cursor("no-es-un-cursor"), (None, None))
+        self.assertEqual(decode_cursor(encode_cursor([1, 2], "prev")), ("prev", [1, 2]))
+
+
+class UiQueryBudgetTests(QueryBudgetTestCase):
+    """Presupuestos de las vistas calientes del back-office (ver core.query_budget)."""
+
+    PRESUPUESTOS = [
+        Presupuesto("ui:dashboard_admin", queries=42, ms=800),
+        Presupuesto("ui:poliza_detail", queries=18, ms=800, kwargs=lambda d: {"pk": d.poliza.pk}),
+        Presupuesto("ui:poliza_list", queries=8, ms=500),
+        Presupuesto("ui:reporte_comisiones", queries=13, ms=1200),
+        Presupuesto("ui:reporte_cartera_vencida", queries=12, ms=1200),
+        Presupuesto("ui:reporte_renovaciones", queries=13, ms=500),
+        Presupuesto("ui:reporte_produccion_agente", queries=17, ms=500),
+        Presupuesto("ui:reporte_conversion_agente", queries=8, ms=500),
+        Presupuesto("ui:reporte_cobranza_agente", queries=7, ms=500),
+    ]
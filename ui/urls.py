@@ -50,6 +50,7 @@ from .views import (
     EnviarRecordatorioWhatsAppView,
     UsuarioListView, UsuarioCreateView, UsuarioUpdateView, UsuarioToggleActivoView,
     CambiarPasswordView, CambiarPasswordDoneView,
+    busqueda_global,
 )
 
 app_name = "ui"
@@ -154,6 +155,8 @@ urlpatterns = [
     # Ajax
     path("ajax/submarcas/", ajax_submarcas_por_marca, name="ajax_submarcas_por_marca"),
     path("ajax/catalogos-vehiculo/", ajax_catalogos_por_submarca, name="ajax_catalogos_por_submarca"),
+    # Búsqueda global
+    path("buscar/", busqueda_global, name="busqueda_global"),
     # Envio de Recordatorios por WA
     path("cobranza/pagos/<int:pago_id>/whatsapp/", EnviarRecordatorioWhatsAppView.as_view(),
         name="enviar_recordatorio_whatsapp"),
@@ -45,6 +45,8 @@ from ui.views.autos_ajax import ajax_submarcas_por_marca, ajax_catalogos_por_sub
 from ui.views.usuarios import UsuarioListView, UsuarioCreateView, UsuarioUpdateView, UsuarioToggleActivoView
 from ui.views.usuarios import CambiarPasswordView, CambiarPasswordDoneView
 
+from ui.views.busqueda import busqueda_global
+
 __all__ = [
     "DashboardView",
     "BasicDashboardView",
@@ -101,4 +103,5 @@ __all__ = [
     "EnviarRecordatorioWhatsAppView",
     "UsuarioListView", "UsuarioCreateView", "UsuarioUpdateView", "UsuarioToggleActivoView",
     "CambiarPasswordView", "CambiarPasswordDoneView",
+    "busqueda_global",
 ]
@@ -3,54 +3,29 @@
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 
-from autos.models import SubMarca, VehiculoCatalogo
+from autos import services as catalogo
 
 
 @login_required
-def ajax_submarcas_por_marca(request):
+async def ajax_submarcas_por_marca(request):
     marca_id = request.GET.get("marca_id")
 
-    submarcas = SubMarca.objects.filter(
-        marca_id=marca_id,
-        is_active=True
-    ).order_by("nombre")
-
-    data = [
-        {
-            "id": s.id,
-            "nombre": s.nombre,
-        }
-        for s in submarcas
-    ]
-
-    return JsonResponse({"results": data})
+    return await catalogo.acatalog_response(request, catalogo.SUBMARCAS, marca_id)
 
 
 @login_required
-def ajax_catalogos_por_submarca(request):
+async def ajax_catalogos_por_submarca(request):
     submarca_id = request.GET.get("submarca_id")
     anio = request.GET.get("anio")
 
-    qs = VehiculoCatalogo.objects.filter(
-        submarca_id=submarca_id,
-        is_active=True,
-    ).select_related("marca", "submarca").order_by("-anio", "version")
-
-    if anio:
-        qs = qs.filter(anio=anio)
+    # Sin año: el bloque completo de la submarca (cacheable); el navegador
+    # filtra por año.
+    if not anio:
+        return await catalogo.acatalog_response(request, catalogo.VERSIONES, submarca_id)
 
     data = [
-        {
-            "id": v.id,
-            "label": str(v),
-            "marca": v.marca.nombre,
-            "submarca": v.submarca.nombre,
-            "anio": v.anio,
-            "version": v.version,
-            "tipo_vehiculo": v.tipo_vehiculo,
-            "valor_referencia": str(v.valor_referencia or ""),
-        }
-        for v in qs
+        v for v in await catalogo.aget_results(catalogo.VERSIONES, submarca_id)
+        if str(v["anio"]) == anio
     ]
 
     return JsonResponse({"results": data})
@@ -0,0 +1,20 @@
+# Búsqueda global (omnibox)
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+
+from core.services import search
+from ui.services.perms import user_is_supervisor
+
+
+@login_required
+def busqueda_global(request):
+    q = (request.GET.get("q") or "").strip()
+
+    if len(q) < 2:
+        return JsonResponse({"results": []})
+
+    # Supervisor/Admin ven todo; el resto solo su cartera
+    owner_id = None if user_is_supervisor(request.user) else request.user.id
+
+    return JsonResponse({"results": search.omnibox(q, owner_id=owner_id)})
@@ -44,6 +44,7 @@ from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, DetailView, UpdateView
+from core.services import search
 from crm.models import Cliente
 from ui.forms import ClienteForm
 
@@ -59,10 +60,7 @@ class ClienteListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
         qs = super().get_queryset().filter(is_active=True).select_related("owner")
         q = self.request.GET.get("q", "").strip()
         if q:
-            qs = qs.filter(
-                # búsqueda simple
-                nombre__icontains=q
-            ) | qs.filter(apellido_paterno__icontains=q) | qs.filter(rfc__icontains=q) | qs.filter(email_principal__icontains=q)
+            qs = search.filter_queryset(qs, search.Entidad.CLIENTE, q)
 
         user = self.request.user
 
@@ -175,26 +173,14 @@ def cliente_portal_toggle(request, pk: int):
 
 
 from django.contrib.auth.decorators import login_required, permission_required
-from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.template.loader import render_to_string
 
 from crm.models import Cliente
 from finanzas.services.selectors import estado_cuenta_por_cliente
 
-from io import BytesIO
-from django.http import HttpResponse
-from django.template.loader import get_template
-from xhtml2pdf import pisa
-
-def render_to_pdf(template_src, context_dict):
-    template = get_template(template_src)
-    html = template.render(context_dict)
-    result = BytesIO()
-    pdf = pisa.CreatePDF(html, dest=result)
-    if pdf.err:
-        return None
-    return result.getvalue()
+from finanzas.models import Pago
+from ui.services.pdf_cache import cached_pdf_response, version_for
 
 
 @login_required
@@ -205,18 +191,27 @@ def cliente_estado_cuenta_pdf(request, pk):
         pk=pk,
     )
 
-    estado = estado_cuenta_por_cliente(cliente)
-
-    context = {
-        "cliente": cliente,
-        "estado_cuenta_cliente": estado["resumen"],
-        "pagos_estado_cuenta_cliente": estado["pagos"],
-    }
-
-    pdf = render_to_pdf("ui/clientes/cliente_estado_cuenta_pdf.html", context)
-    if not pdf:
-        return HttpResponse("Error al generar PDF", status=500)
+    def build_context():
+        estado = estado_cuenta_por_cliente(cliente)
+        return {
+            "cliente": cliente,
+            "estado_cuenta_cliente": estado["resumen"],
+            "pagos_estado_cuenta_cliente": estado["pagos"],
+        }
 
-    response = HttpResponse(pdf, content_type="application/pdf")
-    response["Content-Disposition"] = f'inline; filename="estado_cuenta_cliente_{cliente.pk}.pdf"'
-    return response
+    # El PDF solo cambia si cambian los pagos del cliente, sus pólizas o el cliente mismo.
+    version = version_for(
+        Pago.objects.filter(cliente=cliente),
+        "updated_at",
+        "poliza__updated_at",
+    ) + [cliente.updated_at]
+
+    return cached_pdf_response(
+        request,
+        "ui/clientes/cliente_estado_cuenta_pdf.html",
+        build_context,
+        fingerprint={"cliente": cliente.pk},
+        version=version,
+        filename=f"estado_cuenta_cliente_{cliente.pk}.pdf",
+        inline=True,
+    )
@@ -11,14 +11,17 @@ from django.shortcuts import get_object_or_404, redirect
 from django.views.decorators.http import require_POST
 
 
+from core.services import search
 from finanzas.models import Pago
 from crm.models import Cliente
 from polizas.models import Poliza
 
 from ui.services.perms import can_see_pagos, can_manage_pago
 from finanzas.services.recordatorios import registrar_recordatorio_pago
-from finanzas.services.recordatorios_whatsapp import enviar_recordatorio_whatsapp
+from finanzas.services.recordatorios_whatsapp import encolar_recordatorio_whatsapp
 from ui.services.pdf import render_to_pdf
+from ui.services.pdf_cache import cached_pdf_response, version_for
+from ui.services.paginacion import KeysetPaginationMixin, cached_aggregate
 
 from django.contrib.auth import get_user_model
 from django.utils.dateparse import parse_date
@@ -28,12 +31,13 @@ class CobranzaMenuView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView
     permission_required = "accounts.view_cobranza"
     template_name = "ui/cobranza/menu.html"
 
-class CarteraVencidaListView(LoginRequiredMixin, PermissionRequiredMixin,  ListView):
+class CarteraVencidaListView(LoginRequiredMixin, PermissionRequiredMixin, KeysetPaginationMixin, ListView):
     permission_required = "accounts.view_cobranza"
     model = Pago
     template_name = "ui/cobranza/cartera_vencida.html"
     context_object_name = "pagos"
     paginate_by = 30
+    keyset_ordering = ("fecha_vencimiento", "id")
 
 
     def get(self, request, *args, **kwargs):
@@ -72,15 +76,7 @@ class CarteraVencidaListView(LoginRequiredMixin, PermissionRequiredMixin,  ListV
 
         q = (self.request.GET.get("q") or "").strip()
         if q:
-            qs = qs.filter(
-                Q(poliza__numero_poliza__icontains=q) |
-                Q(poliza__cliente__nombre__icontains=q) |
-                Q(poliza__cliente__apellido_paterno__icontains=q) |
-                Q(poliza__cliente__apellido_materno__icontains=q) |
-                Q(poliza__cliente__nombre_comercial__icontains=q) |
-                Q(poliza__aseguradora__nombre__icontains=q) |
-                Q(referencia__icontains=q)
-            )
+            qs = search.filter_queryset(qs, search.Entidad.PAGO, q)
 
         agente_id = (self.request.GET.get("agente") or "").strip()
         if agente_id and can_see_pagos(user):
@@ -95,8 +91,10 @@ class CarteraVencidaListView(LoginRequiredMixin, PermissionRequiredMixin,  ListV
         for p in context["object_list"]:
             p.dias_atraso = (hoy - p.fecha_vencimiento).days if p.fecha_vencimiento else 0
 
-        base_qs = self.get_queryset()
-        resumen = base_qs.aggregate(
+        # Total y cantidad cacheados (mismo TTL que el conteo del paginador):
+        # no se recalculan en cada página.
+        resumen = cached_aggregate(
+            self.get_queryset(),
             total_vencido=Coalesce(
                 Sum("monto"),
                 Value(0, output_field=DecimalField(max_digits=14, decimal_places=2)),
@@ -104,7 +102,7 @@ class CarteraVencidaListView(LoginRequiredMixin, PermissionRequiredMixin,  ListV
         )
 
         context["total_vencido"] = resumen["total_vencido"]
-        context["cantidad_vencidos"] = base_qs.count()
+        context["cantidad_vencidos"] = context["paginator"].count
         context["q"] = (self.request.GET.get("q") or "").strip()
         context["hoy"] = hoy
         return context
@@ -165,15 +163,7 @@ class PagosPorVencerListView(LoginRequiredMixin, PermissionRequiredMixin,  ListV
 
         q = (self.request.GET.get("q") or "").strip()
         if q:
-            qs = qs.filter(
-                Q(poliza__numero_poliza__icontains=q) |
-                Q(poliza__cliente__nombre__icontains=q) |
-                Q(poliza__cliente__apellido_paterno__icontains=q) |
-                Q(poliza__cliente__apellido_materno__icontains=q) |
-                Q(poliza__cliente__nombre_comercial__icontains=q) |
-                Q(poliza__aseguradora__nombre__icontains=q) |
-                Q(referencia__icontains=q)
-            )
+            qs = search.filter_queryset(qs, search.Entidad.PAGO, q)
 
         agente_id = (self.request.GET.get("agente") or "").strip()
         if agente_id and can_see_pagos(user):
@@ -256,7 +246,8 @@ def pago_enviar_recordatorio_whatsapp(request, pk):
 
     categoria = "VENCIDO" if pago.estatus == Pago.Estatus.VENCIDO else "POR_VENCER"
 
-    result = enviar_recordatorio_whatsapp(
+    # El envío lo hace el worker del outbox; el request no espera a Meta
+    result = encolar_recordatorio_whatsapp(
         pago=pago,
         actor=request.user,
         categoria=categoria,
@@ -264,7 +255,7 @@ def pago_enviar_recordatorio_whatsapp(request, pk):
     )
 
     if result.get("ok"):
-        messages.success(request, f"Recordatorio por WhatsApp enviado para el pago #{pago.id}.")
+        messages.success(request, f"Recordatorio por WhatsApp en cola de envío para el pago #{pago.id}.")
     else:
         messages.error(
             request,
@@ -541,8 +532,6 @@ class ReporteCobranzaAgenteDetalleView(LoginRequiredMixin, PermissionRequiredMix
         ctx["fecha_hasta"] = fecha_hasta
         return ctx
 
-from openpyxl import Workbook
-from openpyxl.styles import Font
 from django.http import HttpResponse
 
 class ReporteCobranzaAgenteExcelView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
@@ -553,6 +542,9 @@ class ReporteCobranzaAgenteExcelView(LoginRequiredMixin, PermissionRequiredMixin
         view.request = request
         ctx = view.get_context_data()
 
+        from openpyxl import Workbook
+        from openpyxl.styles import Font
+
         wb = Workbook()
         ws = wb.active
         ws.title = "Cobranza por Agente"
@@ -614,35 +606,43 @@ class EstadoCuentaView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView
         return super().get(request, *args, **kwargs)
 
     def export_pdf(self):
-        # Obtener contexto base del reporte
-        ctx = self.get_context_data()
-
-        # Agregar filtros al contexto
-        ctx.update({
+        filtros = {
             "q": self.request.GET.get("q", "").strip(),
             "cliente_id": self.request.GET.get("cliente", "").strip(),
             "poliza_id": self.request.GET.get("poliza", "").strip(),
-        })
+        }
 
-        # Generar PDF
-        return render_to_pdf(
+        def build_context():
+            # Obtener contexto base del reporte y agregar filtros
+            ctx = self.get_context_data()
+            ctx.update(filtros)
+            return ctx
+
+        # Los pagos visibles dependen del usuario (agente vs manage_pagos).
+        fingerprint = {**filtros, "user": self.request.user.pk}
+        version = version_for(
+            self._get_pagos_queryset(),
+            "updated_at",
+            "poliza__updated_at",
+        )
+
+        return cached_pdf_response(
+            self.request,
             "ui/cobranza/pdf/estado_de_cuenta_pdf.html",
-            ctx,
+            build_context,
+            fingerprint=fingerprint,
+            version=version,
             filename="estado_cuenta.pdf",
+            rows_key="pagos",
         )
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-
+    def _get_pagos_queryset(self):
         user = self.request.user
 
         q = (self.request.GET.get("q") or "").strip()
         cliente_id = (self.request.GET.get("cliente") or "").strip()
         poliza_id = (self.request.GET.get("poliza") or "").strip()
 
-        clientes = Cliente.objects.all().order_by("nombre")
-        polizas = Poliza.objects.select_related("cliente", "aseguradora", "agente").order_by("-id")
-
         pagos = Pago.objects.select_related(
             "poliza",
             "poliza__cliente",
@@ -652,12 +652,7 @@ class EstadoCuentaView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView
 
         # Seguridad por rol
         if not user.has_perm("finanzas.manage_pagos"):
-            polizas = polizas.filter(agente=user)
             pagos = pagos.filter(poliza__agente=user)
-            clientes = clientes.filter(polizas__agente=user).distinct()
-
-        clientes = clientes[:300]
-        polizas = polizas[:300]
 
         if cliente_id:
             pagos = pagos.filter(poliza__cliente_id=cliente_id)
@@ -666,14 +661,31 @@ class EstadoCuentaView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView
             pagos = pagos.filter(poliza_id=poliza_id)
 
         if q:
-            pagos = pagos.filter(
-                Q(poliza__numero_poliza__icontains=q) |
-                Q(poliza__cliente__nombre__icontains=q) |
-                Q(poliza__aseguradora__nombre__icontains=q) |
-                Q(referencia__icontains=q)
-            )
+            pagos = search.filter_queryset(pagos, search.Entidad.PAGO, q)
+
+        return pagos.order_by("fecha_vencimiento", "id")
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+
+        user = self.request.user
+
+        q = (self.request.GET.get("q") or "").strip()
+        cliente_id = (self.request.GET.get("cliente") or "").strip()
+        poliza_id = (self.request.GET.get("poliza") or "").strip()
+
+        clientes = Cliente.objects.all().order_by("nombre")
+        polizas = Poliza.objects.select_related("cliente", "aseguradora", "agente").order_by("-id")
+
+        # Seguridad por rol
+        if not user.has_perm("finanzas.manage_pagos"):
+            polizas = polizas.filter(agente=user)
+            clientes = clientes.filter(polizas__agente=user).distinct()
+
+        clientes = clientes[:300]
+        polizas = polizas[:300]
 
-        pagos = pagos.order_by("fecha_vencimiento", "id")
+        pagos = self._get_pagos_queryset()
 
         total_programado = pagos.aggregate(
             total=Coalesce(
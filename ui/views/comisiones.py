@@ -7,9 +7,9 @@ from django.views.generic import ListView
 from django.contrib.auth import get_user_model
 from django.db.models.functions import Coalesce
 from django.db.models import Sum
-from django.db.models import Q
 from django.utils.dateparse import parse_date
 
+from core.services import search
 from finanzas.models import Comision
 from polizas.models import Poliza
 
@@ -111,12 +111,7 @@ class ComisionListView(ListView):
         hasta = self.request.GET.get("hasta", "").strip()
 
         if q:
-            qs = qs.filter(
-                Q(poliza__numero_poliza__icontains=q) |
-                Q(agente__first_name__icontains=q) |
-                Q(agente__last_name__icontains=q) |
-                Q(agente__username__icontains=q)
-            )
+            qs = search.filter_queryset(qs, search.Entidad.POLIZA, q, field="poliza_id")
 
         if agente_id and user.has_perm("finanzas.manage_comisiones"):
             qs = qs.filter(agente_id=agente_id)
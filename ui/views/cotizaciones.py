@@ -15,36 +15,39 @@ from django.utils.decorators import method_decorator
 from django.utils.timezone import localdate
 from datetime import timedelta
 
+from core.services import search
 from ui.forms import CotizacionDatosForm
+from ui.services.paginacion import KeysetPaginationMixin
+from core.services.roles import roles_for
 from autos.models import Vehiculo
 from crm.models import Cliente
 from cotizador.models import Cotizacion, CotizacionItem
 
 
 def _is_admin(user) -> bool:
-    return user.is_superuser or user.groups.filter(name="Admin").exists()
+    return roles_for(user).is_admin
 
 def _is_supervisor(user) -> bool:
-    return user.groups.filter(name="Supervisor").exists()
+    return roles_for(user).in_group("Supervisor")
 
-class CotizacionListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class CotizacionListView(LoginRequiredMixin, PermissionRequiredMixin, KeysetPaginationMixin, ListView):
     permission_required = "cotizador.view_cotizacion"
     template_name = "ui/cotizador/cotizacion_list.html"
     context_object_name = "cotizaciones"
     paginate_by = 20
+    keyset_ordering = ("-created_at", "-id")
 
     def get_queryset(self):
         qs = (
             Cotizacion.objects
             .select_related("cliente", "vehiculo", "flotilla", "owner")
-            .order_by("-created_at")
+            .order_by("-created_at", "-id")
         )
 
         user = self.request.user
 
         # Si NO es admin, por defecto solo su cartera
-        if not (user.is_superuser or user.groups.filter(name="Admin").exists() or 
-                user.groups.filter(name="Supervisor").exists()):
+        if not self.request.roles.is_supervisor:
             qs = qs.filter(owner=user)
 
         # Filtros
@@ -58,13 +61,7 @@ class CotizacionListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
 
         q = self.request.GET.get("q", "").strip()
         if q:
-            qs = qs.filter(
-                Q(cliente__nombre_comercial__icontains=q) |
-                Q(cliente__nombre__icontains=q) |
-                Q(cliente__apellido_paterno__icontains=q) |
-                Q(cliente__rfc__icontains=q) |
-                Q(owner__username__icontains=q)
-            )
+            qs = search.filter_queryset(qs, search.Entidad.COTIZACION, q)
 
         return qs
 
@@ -99,8 +96,8 @@ class CotizacionDetailView(DetailView):
         user = self.request.user
 
         # Regla de cartera: si no es Admin/superuser, solo puede ver sus cotizaciones
-        is_admin = user.is_superuser or user.groups.filter(name="Admin").exists()
-        is_supervisor = user.groups.filter(name="Supervisor").exists()
+        is_admin = self.request.roles.is_admin
+        is_supervisor = self.request.roles.in_group("Supervisor")
         if not (is_admin or is_supervisor) and obj.owner_id != user.id:
             raise PermissionError("No autorizado para ver esta cotización.")
         return obj
@@ -175,7 +172,7 @@ def cotizacion_select_item(request, pk: int, item_id: int):
     cot = get_object_or_404(Cotizacion, pk=pk)
 
     # Permisos / alcance
-    is_admin = request.user.is_superuser or request.user.groups.filter(name="Admin").exists()
+    is_admin = request.roles.is_admin
     if not is_admin and cot.owner_id != request.user.id:
         return HttpResponseForbidden("No autorizado para modificar esta cotización.")
 
@@ -218,15 +215,7 @@ class CotizacionWizardClienteSelectView(LoginRequiredMixin, PermissionRequiredMi
 
         q = (self.request.GET.get("q") or "").strip()
         if q:
-            qs = qs.filter(
-                Q(nombre_comercial__icontains=q) |
-                Q(nombre__icontains=q) |
-                Q(apellido_paterno__icontains=q) |
-                Q(apellido_materno__icontains=q) |
-                Q(rfc__icontains=q) |
-                Q(email_principal__icontains=q) |
-                Q(telefono_principal__icontains=q)
-            )
+            qs = search.filter_queryset(qs, search.Entidad.CLIENTE, q)
 
         return qs
 
@@ -461,7 +450,7 @@ def cotizacion_calcular(request, pk: int):
 
     # Regla de cartera: si no es Admin, sólo owner puede recalcular
     user = request.user
-    is_admin = user.is_superuser or user.groups.filter(name="Admin").exists()
+    is_admin = request.roles.is_admin
     if not is_admin and cot.owner_id != user.id:
         messages.error(request, "No autorizado para recalcular esta cotización.")
         return redirect("ui:cotizacion_detail", pk=cot.pk)
@@ -590,7 +579,7 @@ from polizas.models import Poliza
 from polizas.models import PolizaEvento
 from polizas.services import log_poliza_event
 from portal.services import crear_acceso_portal_cliente
-from integrations.whatsapp import enviar_acceso_portal_whatsapp, WhatsAppError
+from integrations.whatsapp import encolar_acceso_portal_whatsapp
 import inspect
 
 
@@ -614,8 +603,8 @@ def cotizacion_emitir_poliza(request, pk: int):
 
     # cartera
     user = request.user
-    is_admin = user.is_superuser or user.groups.filter(name="Admin").exists()
-    is_supervisor = user.groups.filter(name="Supervisor").exists()
+    is_admin = request.roles.is_admin
+    is_supervisor = request.roles.in_group("Supervisor")
     if not (is_admin or is_supervisor) and cot.owner_id != user.id:
         messages.error(request, "No autorizado para emitir póliza de esta cotización.")
         return redirect("ui:cotizacion_detail", pk=cot.pk)
@@ -675,6 +664,8 @@ def cotizacion_emitir_poliza(request, pk: int):
     if poliza.cotizacion_item:
         cotizacion = poliza.cotizacion_item.cotizacion
         if cotizacion.origen == "PORTAL_PUBLICO":
+            # El usuario se crea aunque no se pueda encolar el WhatsApp
+            # (p.ej. cliente sin teléfono); el acceso se reenvía después.
             resultado = crear_acceso_portal_cliente(poliza.cliente)
 
             user_portal = resultado["user"]
@@ -683,14 +674,13 @@ def cotizacion_emitir_poliza(request, pk: int):
 
             if created and password_temporal:
                 try:
-
-                    enviar_acceso_portal_whatsapp(
+                    encolar_acceso_portal_whatsapp(
                         cliente=poliza.cliente,
                         user=user_portal,
                         password_temporal=password_temporal,
+                        usuario=request.user,
                     )
-
-                    messages.success(request, "Acceso al portal enviado por WhatsApp.")
+                    messages.success(request, "Acceso al portal en cola de envío por WhatsApp.")
 
                 except Exception as e:
                     messages.warning(
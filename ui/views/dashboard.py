@@ -12,6 +12,7 @@ from crm.models import Cliente
 from cotizador.models import Cotizacion
 from finanzas.models import Pago, Comision
 from polizas.models import Poliza, PolizaEvento
+from core.services.roles import roles_for
 from ui.services.dashboard import agente_kpis
 
 # ---------------------------------------------------------------------
@@ -19,17 +20,11 @@ from ui.services.dashboard import agente_kpis
 # ---------------------------------------------------------------------
 
 def user_in_group(user, group_name: str) -> bool:
-    return user.is_authenticated and user.groups.filter(name=group_name).exists()
+    return roles_for(user).in_group(group_name)
 
 
 def is_internal(user) -> bool:
-    if not user.is_authenticated:
-        return False
-    return (
-        user.is_superuser
-        or user.is_staff
-        or user.groups.filter(name__in=["Admin", "Supervisor", "Agente", "Operador", "Lectura"]).exists()
-    )
+    return roles_for(user).is_internal
 
 def month_range(today: date | None = None):
     """Regresa (inicio_mes, fin_mes_exclusivo)."""
@@ -55,18 +50,11 @@ class InternalRequiredMixin(UserPassesTestMixin):
 class SupervisorRequiredMixin(UserPassesTestMixin):
     def test_func(self):
         u = self.request.user
-        return (
-            u.is_authenticated and (
-                u.is_superuser
-                or u.is_staff
-                or u.groups.filter(name__in=["Supervisor", "Admin"]).exists()
-            )
-        )
+        return u.is_authenticated and (u.is_staff or self.request.roles.is_supervisor)
 
 class AdminRequiredMixin(UserPassesTestMixin):
     def test_func(self):
-        u = self.request.user
-        return u.is_authenticated and (u.is_superuser or u.groups.filter(name="Admin").exists())
+        return self.request.roles.is_admin
 
 
 # ---------------------------------------------------------------------
@@ -1,5 +1,4 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
 from django.views.generic import ListView
 from django.utils.timezone import localdate
 from datetime import timedelta
@@ -12,11 +11,13 @@ from django.db import transaction
 from datetime import date
 from django.utils.dateparse import parse_date
 
+from core.services import search
 from polizas.models import PolizaEvento
 from polizas.services import log_poliza_event
 from ui.services.perms import can_manage_pago, can_see_pagos, pagos_visibles_para_usuario
 from finanzas.models import Pago
 from documentos.models import Documento
+from documentos.services import guardar_documento
 
 
 @login_required
@@ -93,12 +94,7 @@ class PagoListView(LoginRequiredMixin, ListView):
         hasta = (self.request.GET.get("hasta") or "").strip()
 
         if q:
-            qs = qs.filter(
-                Q(poliza__numero_poliza__icontains=q) |
-                Q(poliza__cliente__nombre__icontains=q) |
-                Q(poliza__cliente__nombre_comercial__icontains=q) |
-                Q(referencia__icontains=q)
-            )
+            qs = search.filter_queryset(qs, search.Entidad.PAGO, q)
 
         if estatus:
             qs = qs.filter(estatus=estatus)
@@ -189,11 +185,9 @@ def pago_comprobante_subir(request, pk):
     
     try:
         with transaction.atomic():
-            documento = Documento.objects.create(
-                nombre_archivo=archivo.name,
+            documento = guardar_documento(
+                archivo,
                 tipo=detectar_tipo_documento(archivo),
-                file=archivo,
-                tamano=archivo.size,
                 subido_por=request.user,
             )
 
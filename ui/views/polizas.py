@@ -13,24 +13,29 @@ from datetime import timedelta, datetime
 from django.utils import timezone
 from decimal import Decimal
 
+from core.services import search
 from polizas.services import log_poliza_event
 from ui.services.perms import can_manage_poliza
 from ui.services.perms import can_update_poliza_numero, can_admin_polizas
+from ui.services.paginacion import KeysetPaginationMixin
+from core.services.roles import roles_for
 
 from polizas.models import Poliza, PolizaEvento
 from finanzas.models import Pago, Comision
 from documentos.models import Documento
+from documentos.services import guardar_documento
 from documentos.views import documento_download
 
 
 def _is_admin(user) -> bool:
-    return user.is_superuser or user.groups.filter(name="Admin").exists()
+    return roles_for(user).is_admin
 
-class PolizaListView(LoginRequiredMixin, ListView):
+class PolizaListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Poliza
     template_name = "ui/polizas/poliza_list.html"
     context_object_name = "polizas"
     paginate_by = 20
+    keyset_ordering = ("-created_at", "-id")
 
     def get_queryset(self):
         qs = Poliza.objects.select_related(
@@ -49,7 +54,7 @@ class PolizaListView(LoginRequiredMixin, ListView):
             )
 
         user = self.request.user
-        if user.groups.filter(name="Agente").exists():
+        if self.request.roles.is_agente:
             qs = qs.filter(agente=user)
 
         # Filtros q/estatus/desde/hasta como ya los tienes...
@@ -60,12 +65,7 @@ class PolizaListView(LoginRequiredMixin, ListView):
         hasta = (self.request.GET.get("hasta") or "").strip()
 
         if q:
-            qs = qs.filter(
-                Q(numero_poliza__icontains=q)
-                | Q(cliente__nombre__icontains=q)
-                | Q(cliente__nombre_comercial__icontains=q)
-                | Q(cliente__rfc__icontains=q)
-            )
+            qs = search.filter_queryset(qs, search.Entidad.POLIZA, q)
 
         if estatus:
             qs = qs.filter(estatus=estatus)
@@ -104,7 +104,7 @@ class PolizaDetailView(LoginRequiredMixin, DetailView):
         )
 
         user = self.request.user
-        if user.groups.filter(name="Agente").exists():
+        if self.request.roles.is_agente:
             qs = qs.filter(agente=user)
 
         return qs
@@ -316,7 +316,7 @@ def poliza_cancelar(request, pk):
         # Cambia estatus de Pagos a Cancelado
         poliza.pagos.filter(
             estatus__in=[Pago.Estatus.PENDIENTE, Pago.Estatus.VENCIDO]
-        ).update(estatus=Pago.Estatus.CANCELADO)
+        ).update(estatus=Pago.Estatus.CANCELADO, updated_at=timezone.now())
 
         # Actualizar Bitacora de Eventos
         log_poliza_event(
@@ -523,11 +523,10 @@ def poliza_documento_subir(request, pk):
 
     # Crear Documento y asignarlo a póliza
     with transaction.atomic():
-        doc = Documento.objects.create(
-            nombre_archivo=(request.POST.get("nombre_archivo") or archivo.name).strip() or archivo.name,
+        doc = guardar_documento(
+            archivo,
             tipo=Documento.Tipo.PDF,
-            file=archivo,
-            tamano=getattr(archivo, "size", 0) or 0,
+            nombre_archivo=request.POST.get("nombre_archivo"),
             subido_por=request.user,
         )
 
@@ -2,12 +2,14 @@ from decimal import Decimal
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 
-from django.db.models import Q, Sum, Value, DecimalField, Count
+from django.db.models import Sum, Value, DecimalField, Count
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.views.generic import TemplateView
 from ui.services.pdf import render_to_pdf
+from ui.services.pdf_cache import cached_pdf_response, version_for
 
+from core.services import search
 from finanzas.models import Comision
 from finanzas.models import Pago
 from polizas.models import Poliza
@@ -49,13 +51,7 @@ class ReporteComisionesView(LoginRequiredMixin, PermissionRequiredMixin, Templat
         hasta = self.request.GET.get("hasta", "").strip()
 
         if q:
-            qs = qs.filter(
-                Q(poliza__numero_poliza__icontains=q) |
-                Q(poliza__cliente__nombre__icontains=q) |
-                Q(agente__first_name__icontains=q) |
-                Q(agente__last_name__icontains=q) |
-                Q(agente__username__icontains=q)
-            )
+            qs = search.filter_queryset(qs, search.Entidad.POLIZA, q, field="poliza_id")
 
         if agente_id:
             qs = qs.filter(agente_id=agente_id)
@@ -118,22 +114,32 @@ class ReporteComisionesView(LoginRequiredMixin, PermissionRequiredMixin, Templat
         )
 
     def export_pdf(self, qs):
-        return render_to_pdf(
-            "ui/reportes/pdf/comisiones_pdf.html",
-            {
+        filtros = {
+            "q": self.request.GET.get("q", "").strip(),
+            "agente_id": self.request.GET.get("agente", "").strip(),
+            "estatus": self.request.GET.get("estatus", "").strip(),
+            "desde": self.request.GET.get("desde", "").strip(),
+            "hasta": self.request.GET.get("hasta", "").strip(),
+        }
+
+        def build_context():
+            return {
                 "comisiones": qs,
                 "total_pendiente": self.totalizar(qs, Comision.Estatus.PENDIENTE),
                 "total_pagado": self.totalizar(qs, Comision.Estatus.PAGADA),
                 "total_cancelado": self.totalizar(qs, Comision.Estatus.CANCELADA),
                 "total_registros": qs.count(),
-                # filtros
-                "q": self.request.GET.get("q", "").strip(),
-                "agente_id": self.request.GET.get("agente", "").strip(),
-                "estatus": self.request.GET.get("estatus", "").strip(),
-                "desde": self.request.GET.get("desde", "").strip(),
-                "hasta": self.request.GET.get("hasta", "").strip(),
-            },
+                **filtros,
+            }
+
+        return cached_pdf_response(
+            self.request,
+            "ui/reportes/pdf/comisiones_pdf.html",
+            build_context,
+            fingerprint=filtros,
+            version=version_for(qs, "updated_at", "poliza__updated_at"),
             filename="reporte_comisiones.pdf",
+            rows_key="comisiones",
         )
 
     def get_context_data(self, **kwargs):
@@ -199,14 +205,7 @@ class ReporteCarteraVencidaView(LoginRequiredMixin, PermissionRequiredMixin, Tem
         hasta = self.request.GET.get("hasta", "").strip()
 
         if q:
-            qs = qs.filter(
-                Q(poliza__numero_poliza__icontains=q) |
-                Q(poliza__cliente__nombre__icontains=q) |
-                Q(poliza__aseguradora__nombre__icontains=q) |
-                Q(poliza__agente__first_name__icontains=q) |
-                Q(poliza__agente__last_name__icontains=q) |
-                Q(poliza__agente__username__icontains=q)
-            )
+            qs = search.filter_queryset(qs, search.Entidad.PAGO, q)
 
         if agente_id:
             qs = qs.filter(poliza__agente_id=agente_id)
@@ -259,20 +258,29 @@ class ReporteCarteraVencidaView(LoginRequiredMixin, PermissionRequiredMixin, Tem
         )
 
     def export_pdf(self, qs):
-        return render_to_pdf(
-            "ui/reportes/pdf/cartera_vencida_pdf.html",
-            {
+        filtros = {
+            "q": self.request.GET.get("q", "").strip(),
+            "agente_id": self.request.GET.get("agente", "").strip(),
+            "desde": self.request.GET.get("desde", "").strip(),
+            "hasta": self.request.GET.get("hasta", "").strip(),
+        }
+
+        def build_context():
+            return {
                 "pagos": qs,
                 "total_registros": qs.count(),
                 "monto_total_vencido": self.totalizar(qs),
-                # filtros
-                "q": self.request.GET.get("q", "").strip(),
-                "agente_id": self.request.GET.get("agente", "").strip(),
-                "desde": self.request.GET.get("desde", "").strip(),
-                "hasta": self.request.GET.get("hasta", "").strip(),
+                **filtros,
+            }
 
-            },
+        return cached_pdf_response(
+            self.request,
+            "ui/reportes/pdf/cartera_vencida_pdf.html",
+            build_context,
+            fingerprint=filtros,
+            version=version_for(qs, "updated_at", "poliza__updated_at"),
             filename="reporte_cartera_vencida.pdf",
+            rows_key="pagos",
         )
 
     def get_context_data(self, **kwargs):
@@ -363,14 +371,7 @@ class ReporteRenovacionesView(LoginRequiredMixin, PermissionRequiredMixin, Templ
             qs = qs.filter(vigencia_hasta__lte=hasta)
 
         if q:
-            qs = qs.filter(
-                Q(numero_poliza__icontains=q) |
-                Q(cliente__nombre__icontains=q) |
-                Q(aseguradora__nombre__icontains=q) |
-                Q(agente__first_name__icontains=q) |
-                Q(agente__last_name__icontains=q) |
-                Q(agente__username__icontains=q)
-            )
+            qs = search.filter_queryset(qs, search.Entidad.POLIZA, q)
 
         if agente_id:
             qs = qs.filter(agente_id=agente_id)
@@ -420,21 +421,33 @@ class ReporteRenovacionesView(LoginRequiredMixin, PermissionRequiredMixin, Templ
         )
 
     def export_pdf(self, qs):
-        return render_to_pdf(
-            "ui/reportes/pdf/renovaciones_pdf.html",
-            {
+        filtros = {
+            "q": self.request.GET.get("q", "").strip(),
+            "agente_id": self.request.GET.get("agente", "").strip(),
+            "aseguradora": self.request.GET.get("aseguradora", "").strip(),
+            "desde": self.request.GET.get("desde", "").strip(),
+            "hasta": self.request.GET.get("hasta", "").strip(),
+        }
+
+        def build_context():
+            return {
                 "polizas": qs,
                 "total_registros": qs.count(),
                 "prima_total_renovar": self.totalizar_prima(qs),
-                # filtros
-                "q": self.request.GET.get("q", "").strip(),
-                "agente_id": self.request.GET.get("agente", "").strip(),
-                "aseguradora": self.request.GET.get("aseguradora", "").strip(),
-                "desde": self.request.GET.get("desde", "").strip(),
-                "hasta": self.request.GET.get("hasta", "").strip(),
-
-            },
+                **filtros,
+            }
+
+        # Sin filtros de fecha el rango depende del día, entra en la llave.
+        fingerprint = {**filtros, "hoy": timezone.localdate()}
+
+        return cached_pdf_response(
+            self.request,
+            "ui/reportes/pdf/renovaciones_pdf.html",
+            build_context,
+            fingerprint=fingerprint,
+            version=version_for(qs),
             filename="reporte_renovaciones.pdf",
+            rows_key="polizas",
         )
 
     def get_context_data(self, **kwargs):
@@ -826,12 +839,13 @@ class ReporteConversionAgenteView(LoginRequiredMixin, PermissionRequiredMixin, T
         return ctx
 
 from django.http import HttpResponse
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
 
 # Exportar a Excel
 
 def generar_excel_response(nombre_archivo, encabezados, filas, titulo=None):
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Font, PatternFill
+
     wb = Workbook()
     ws = wb.active
     ws.title = "Reporte"